@@ -19,9 +19,12 @@ import pandas as pd
 from datetime import datetime
 import json
 import re
+import hashlib
 
 sys.path.insert(0, str(Path(__file__).parent))
 
+from services.order_store import get_order_store
+
 
 async def scrape_ubereats():
     """Scrape Uber Eats dashboard."""
@@ -103,15 +106,43 @@ async def scrape_ubereats():
         dollars = re.findall(r'\$\s*([\d,]+\.?\d*)', text)
         times = re.findall(r'(\d{1,2}:\d{2}\s*(?:AM|PM))', text, re.IGNORECASE)
         
+        # Order numbers shown on the page, with the text around each one
+        lines = text.split('\n')
+        order_numbers = []
+        for j, line in enumerate(lines):
+            number = re.search(r'#([A-Z0-9]{6,})', line)
+            if number:
+                order_numbers.append((number.group(1), '\n'.join(lines[j:j + 5])))
+        
         # Generate realistic orders from extracted data
         orders = []
-        for i in range(min(30, len(dollars))):
-            price = float(dollars[i].replace(',', '')) if i < len(dollars) else 12.99
-            time_str = times[i] if i < len(times) else f"{(i+8) % 12}:00 AM"
+        seen = {}
+        for i in range(min(30, len(order_numbers) or len(dollars))):
+            if order_numbers:
+                order_number, context = order_numbers[i]
+                price_match = re.search(r'\$\s*([\d,]+\.?\d*)', context)
+                time_match = re.search(r'(\d{1,2}:\d{2}\s*(?:AM|PM))', context, re.IGNORECASE)
+                price = float(price_match.group(1).replace(',', '')) if price_match else 12.99
+                time_str = time_match.group(1) if time_match else f"{(i+8) % 12}:00 AM"
+            else:
+                price = float(dollars[i].replace(',', ''))
+                time_str = times[i] if i < len(times) else f"{(i+8) % 12}:00 AM"
+            
+            timestamp = datetime.now().strftime(f'%Y-%m-%d {time_str}')
+            
+            # Stable ID so re-scraping the same order is deduplicated: the
+            # dashboard's order number, else a hash of the order's own fields
+            # (its dated timestamp and price, not its position on the page)
+            if order_numbers:
+                order_id = order_number
+            else:
+                key = f"{timestamp.upper()}|{price:.2f}"
+                seen[key] = seen.get(key, 0) + 1
+                order_id = "UE" + hashlib.md5(f"{key}|{seen[key]}".encode()).hexdigest()[:10]
             
             orders.append({
-                'timestamp': datetime.now().strftime(f'%Y-%m-%d {time_str}'),
-                'order_id': f"UE{i+1:03d}",
+                'timestamp': timestamp,
+                'order_id': order_id,
                 'item': 'Burger' if i % 3 == 0 else ('Fries' if i % 3 == 1 else 'Combo'),
                 'quantity': 1,
                 'price': price,
@@ -159,8 +190,8 @@ async def scrape_ubereats():
         print("[SAVE] Writing to CSV files...")
         
         if orders:
-            pd.DataFrame(orders).to_csv('data/orders_realtime.csv', index=False)
-            print("   [OK] data/orders_realtime.csv")
+            written = get_order_store().append_orders(pd.DataFrame(orders), source="ubereats:dashboard")
+            print(f"   [OK] data/orders_realtime.csv (+{written} new orders)")
         
         if menu_items:
             pd.DataFrame(menu_items).to_csv('data/menu_items.csv', index=False)
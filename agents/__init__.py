@@ -1,2 +1,74 @@
 # Agents module
+"""
+Lazy agent registry.
 
+`from agents import run_forecast_agent_lstm` returns a lightweight proxy;
+the agent module (and TensorFlow, XGBoost, browser_use, folium,
+matplotlib, ...) is only imported the first time the runner is called.
+UI entrypoints import runners from here so the first page paint doesn't
+wait on model frameworks.
+"""
+import importlib
+from typing import Any, Callable, Dict
+
+
+# Runner name -> module that defines it
+AGENT_RUNNERS: Dict[str, str] = {
+    "run_scraper_agent": "agents.scraper_agent",
+    "run_weather_agent": "agents.weather_agent",
+    "run_forecast_agent": "agents.forecast_agent",
+    "run_forecast_agent_lstm": "agents.forecast_agent_lstm",
+    "run_staffing_agent": "agents.staffing_agent",
+    "run_prep_agent": "agents.prep_agent",
+    "run_analyst_agent_captain": "agents.analyst_agent_captain",
+    "run_geo_agent": "agents.geo_agent",
+    "run_compliance_agent": "agents.compliance_agent",
+    "run_knowledge_map_agent": "agents.knowledge_map_agent",
+    "run_ubereats_scraper": "agents.ubereats_scraper_agent",
+    "run_planning_workflow": "agents.planning_workflow"
+}
+
+
+class LazyAgent:
+    """Callable stand-in that imports its agent module on first use."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.module = AGENT_RUNNERS[name]
+        self._runner: Callable[..., Any] = None
+        self.__name__ = name
+
+    def load(self) -> Callable[..., Any]:
+        """Import the agent module and return the real runner."""
+        if self._runner is None:
+            self._runner = getattr(importlib.import_module(self.module), self.name)
+        return self._runner
+
+    @property
+    def loaded(self) -> bool:
+        return self._runner is not None
+
+    def __call__(self, *args, **kwargs):
+        return self.load()(*args, **kwargs)
+
+    def __repr__(self):
+        state = "loaded" if self.loaded else "not loaded"
+        return f"<LazyAgent {self.name} from {self.module} ({state})>"
+
+
+_lazy_agents: Dict[str, LazyAgent] = {}
+
+
+def get_agent(name: str) -> LazyAgent:
+    """Get the (shared) lazy runner for an agent."""
+    if name not in AGENT_RUNNERS:
+        raise KeyError(f"Unknown agent runner: {name}")
+    if name not in _lazy_agents:
+        _lazy_agents[name] = LazyAgent(name)
+    return _lazy_agents[name]
+
+
+def __getattr__(name: str):
+    if name in AGENT_RUNNERS:
+        return get_agent(name)
+    raise AttributeError(f"module 'agents' has no attribute '{name}'")
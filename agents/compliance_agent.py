@@ -2,6 +2,8 @@
 ComplianceAgent - Secure compliance reasoning with Nivara AI.
 """
 import os
+import json
+import time
 from typing import Dict, Any, List, Optional
 from datetime import datetime
 from pathlib import Path
@@ -52,10 +54,10 @@ class ComplianceAgent:
             
             nivara = get_nivara_client()
             
-            # Check if documents are available
-            docs = nivara.get_tenant_documents(self.tenant_id, user_role)
+            # Check if documents are available (counted in the index, no text read)
+            doc_count = nivara.count_tenant_documents(self.tenant_id, user_role)
             
-            if not docs:
+            if not doc_count:
                 results["warning"] = "No compliance documents uploaded yet"
                 results["message"] = "Upload documents first to enable compliance reasoning"
                 return results
@@ -64,8 +66,8 @@ class ComplianceAgent:
                 self.trace.log(
                     agent="ComplianceAgent",
                     action="Retrieved compliance documents",
-                    result=f"Found {len(docs)} documents (role: {user_role})",
-                    metadata={"doc_count": len(docs)}
+                    result=f"Found {doc_count} documents (role: {user_role})",
+                    metadata={"doc_count": doc_count}
                 )
             
             # Query compliance
@@ -97,6 +99,7 @@ class ComplianceAgent:
             results["recommendations"] = response.get("recommendations", [])
             results["security_badge"] = response["security_badge"]
             results["documents_accessed"] = response["documents_accessed"]
+            results["source"] = response.get("source", "llm")
             
             # Save compliance report
             report_file = "artifacts/compliance_report.json"
@@ -124,6 +127,7 @@ class ComplianceAgent:
                     result=f"Status: {results['status']}, Confidence: {results['confidence']}%",
                     metadata={
                         "risk_level": results["risk_level"],
+                        "source": results["source"],
                         "documents": results["documents_accessed"],
                         "security": "Nivara-protected"
                     }
@@ -148,6 +152,121 @@ class ComplianceAgent:
             
             return results
     
+    def run_audit(
+        self,
+        checklist: List[str],
+        user_role: str = "manager",
+        context: Optional[Dict[str, Any]] = None,
+        max_workers: int = 8,
+        use_stub: bool = False
+    ) -> Dict[str, Any]:
+        """
+        Run a checklist audit: N questions, one shared context, concurrent queries.
+        
+        Args:
+            checklist: Compliance questions
+            user_role: User's role (manager, staff, owner)
+            context: Operational context (orders, staffing, etc.)
+            max_workers: Maximum concurrent Captain queries
+            use_stub: Use the local Captain mock instead of the API
+            
+        Returns:
+            Dict with per-question results, summary and consolidated report path
+        """
+        results = {
+            "success": False,
+            "questions": len(checklist),
+            "artifacts": []
+        }
+        
+        try:
+            if self.trace:
+                self.trace.log(
+                    agent="ComplianceAgent",
+                    action="Running compliance audit",
+                    metadata={"questions": len(checklist), "max_workers": max_workers}
+                )
+            
+            from services.nivara_client import get_nivara_client
+            
+            nivara = get_nivara_client()
+            
+            started = time.perf_counter()
+            answers = nivara.audit_compliance(
+                tenant_id=self.tenant_id,
+                questions=checklist,
+                user_role=user_role,
+                context=context,
+                max_workers=max_workers,
+                use_stub=use_stub
+            )
+            wall_ms = (time.perf_counter() - started) * 1000
+            
+            latencies = [a["latency_ms"] for a in answers]
+            summary = {
+                "questions": len(answers),
+                "answered": sum(1 for a in answers if a.get("success")),
+                "errors": sum(1 for a in answers if not a.get("success")),
+                "non_compliant": sum(1 for a in answers if a.get("status", "").upper().startswith("NON")),
+                "from_rules": sum(1 for a in answers if a.get("source") == "rules"),
+                "risk_levels": {
+                    level: sum(1 for a in answers if a.get("risk_level") == level)
+                    for level in ["CRITICAL", "HIGH", "MEDIUM", "LOW"]
+                },
+                "wall_ms": round(wall_ms, 1),
+                "slowest_ms": round(max(latencies), 1) if latencies else 0.0,
+                "total_query_ms": round(sum(latencies), 1)
+            }
+            
+            # One consolidated report (the single-question report is left untouched)
+            report_file = "artifacts/compliance_audit_report.json"
+            os.makedirs("artifacts", exist_ok=True)
+            with open(report_file, 'w', encoding='utf-8') as f:
+                json.dump({
+                    "tenant_id": self.tenant_id,
+                    "user_role": user_role,
+                    "summary": summary,
+                    "results": [
+                        {
+                            "question": a["question"],
+                            "success": a.get("success", False),
+                            "status": a.get("status"),
+                            "risk_level": a.get("risk_level"),
+                            "confidence": a.get("confidence"),
+                            "source": a.get("source"),
+                            "latency_ms": round(a["latency_ms"], 1),
+                            "reasoning": a.get("reasoning"),
+                            "citations": [c.get("title") for c in a.get("citations", [])],
+                            "recommendations": a.get("recommendations", []),
+                            "error": a.get("error")
+                        }
+                        for a in answers
+                    ],
+                    "security": "Protected by Nivara • No data leaves restaurant boundary",
+                    "timestamp": datetime.now().isoformat()
+                }, f, indent=2, ensure_ascii=False)
+            
+            results["success"] = True
+            results["results"] = answers
+            results["summary"] = summary
+            results["artifacts"].append(report_file)
+            
+            if self.trace:
+                self.trace.log(
+                    agent="ComplianceAgent",
+                    action="Compliance audit complete",
+                    result=f"{summary['non_compliant']}/{summary['questions']} non-compliant in {summary['wall_ms']:.0f}ms",
+                    metadata=summary
+                )
+            
+            return results
+            
+        except Exception as e:
+            error_msg = str(e)
+            print(f"[ERROR] Compliance audit failed: {error_msg}")
+            results["error"] = error_msg
+            return results
+    
     def upload_document(
         self,
         file_path: str,
@@ -212,6 +331,66 @@ class ComplianceAgent:
                 "error": error_msg
             }
 
+    
+    def upload_documents(
+        self,
+        file_paths: List[str],
+        doc_type: str,
+        access_level: str = "manager_only",
+        metadata: Optional[Dict[str, Any]] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Upload a batch of compliance documents (text extracted in parallel).
+        
+        Args:
+            file_paths: Paths to documents
+            doc_type: Type (food_safety, certification, labor, etc.)
+            access_level: manager_only, all_staff, owner_only
+            metadata: Additional metadata (shared by all documents)
+            
+        Returns:
+            One upload result per path
+        """
+        try:
+            if self.trace:
+                self.trace.log(
+                    agent="ComplianceAgent",
+                    action="Uploading compliance documents",
+                    metadata={
+                        "documents": len(file_paths),
+                        "doc_type": doc_type,
+                        "access_level": access_level
+                    }
+                )
+            
+            from services.nivara_client import get_nivara_client
+            
+            nivara = get_nivara_client()
+            
+            results = nivara.upload_documents(
+                tenant_id=self.tenant_id,
+                file_paths=file_paths,
+                doc_type=doc_type,
+                access_level=access_level,
+                metadata=metadata
+            )
+            
+            if self.trace:
+                uploaded = sum(1 for r in results if r.get("success"))
+                self.trace.log(
+                    agent="ComplianceAgent",
+                    action="Documents uploaded securely",
+                    result=f"{uploaded}/{len(results)} documents stored",
+                    metadata={"security": "Nivara-protected"}
+                )
+            
+            return results
+            
+        except Exception as e:
+            error_msg = str(e)
+            print(f"[ERROR] Document upload failed: {error_msg}")
+            return [{"success": False, "error": error_msg} for _ in file_paths]
+
 
 def run_compliance_agent(
     tenant_id: str,
@@ -12,6 +12,7 @@ matplotlib.use('Agg')
 import matplotlib.pyplot as plt
 import seaborn as sns
 from agents.trace_agent import get_trace_agent
+from services.weather_archive import get_weather_archive, rain_series
 
 # Conditional import for XGBoost
 try:
@@ -70,13 +71,17 @@ class ForecastAgent:
                     result="Proceeding without weather data"
                 )
             
+            # Historical weather for the training window
+            df_history = self._load_weather_history(df_orders)
+            
             # Step 3: Feature engineering
             self.trace.log(
                 agent="ForecastAgent",
-                action="Engineering features"
+                action="Engineering features",
+                result=f"{len(df_history)} archived weather hours joined"
             )
             
-            df_features = self._create_features(df_orders, df_weather)
+            df_features = self._create_features(df_orders, df_weather, df_history)
             
             # Step 4: Train model
             self.trace.log(
@@ -202,10 +207,22 @@ class ForecastAgent:
         
         return pd.DataFrame(data)
     
+    def _load_weather_history(self, df_orders: pd.DataFrame) -> pd.DataFrame:
+        """Read archived hourly weather covering the orders' time range."""
+        try:
+            return get_weather_archive().read_range(
+                df_orders['timestamp'].min(),
+                df_orders['timestamp'].max()
+            )
+        except Exception as e:
+            print(f"[WARN] Weather archive unavailable: {e}")
+            return pd.DataFrame(columns=['time', 'temp', 'precip_prob', 'precip', 'is_rain'])
+    
     def _create_features(
         self,
         df_orders: pd.DataFrame,
-        df_weather: pd.DataFrame = None
+        df_weather: pd.DataFrame = None,
+        df_history: pd.DataFrame = None
     ) -> pd.DataFrame:
         """Create ML features from orders and weather."""
         df = df_orders.copy()
@@ -222,20 +239,21 @@ class ForecastAgent:
         df['rolling_7d_avg'] = df['orders'].rolling(window=7*13, min_periods=1).mean()
         df['rolling_24h_avg'] = df['orders'].rolling(window=13, min_periods=1).mean()
         
-        # Weather features (if available)
-        if df_weather is not None:
+        # Weather features: real past rain hours when archived. Hours the
+        # archive doesn't cover stay NaN and are dropped before training.
+        if df_history is not None and not df_history.empty:
+            df['is_rain'] = df['timestamp'].dt.floor('h').map(rain_series(df_history))
+        elif df_weather is not None:
             df_weather['hour'] = pd.to_datetime(df_weather['time']).dt.hour
             # Simple merge on hour (in production, would use proper datetime matching)
             df = df.merge(
-                df_weather[['hour', 'precip_prob', 'is_rain']],
+                df_weather[['hour', 'is_rain']],
                 left_on='hour_of_day',
                 right_on='hour',
                 how='left'
             )
-            df['precip_prob'] = df['precip_prob'].fillna(0)
             df['is_rain'] = df['is_rain'].fillna(0)
         else:
-            df['precip_prob'] = 0
             df['is_rain'] = 0
         
         return df
@@ -245,7 +263,7 @@ class ForecastAgent:
         feature_cols = [
             'hour_of_day', 'day_of_week', 'is_weekend',
             'is_lunch', 'is_dinner', 'rolling_7d_avg',
-            'rolling_24h_avg', 'precip_prob', 'is_rain'
+            'rolling_24h_avg', 'is_rain'
         ]
         
         # Remove rows with NaN
@@ -283,19 +301,17 @@ class ForecastAgent:
         rolling_7d_avg = df_orders['orders'].tail(7*13).mean()
         rolling_24h_avg = df_orders['orders'].tail(13).mean()
         
-        # Weather features
-        precip_prob = 0
+        # Weather features (forecast rain hour, same feature as training)
         is_rain = 0
         if df_weather is not None:
             weather_row = df_weather[df_weather['hour'] == hour_of_day]
             if not weather_row.empty:
-                precip_prob = weather_row.iloc[0]['precip_prob']
                 is_rain = weather_row.iloc[0]['is_rain']
         
         return [
             hour_of_day, day_of_week, is_weekend,
             is_lunch, is_dinner, rolling_7d_avg,
-            rolling_24h_avg, precip_prob, is_rain
+            rolling_24h_avg, is_rain
         ]
     
     def _create_forecast_plot(self, df_predictions: pd.DataFrame, output_file: str):
@@ -13,6 +13,7 @@ matplotlib.use('Agg')
 import matplotlib.pyplot as plt
 import seaborn as sns
 from agents.trace_agent import get_trace_agent
+from services.weather_archive import get_weather_archive, rain_series
 
 # Conditional imports for deep learning
 try:
@@ -253,6 +254,20 @@ class ForecastAgentLSTM:
         # Weather and traffic if available
         if 'weather' not in df.columns:
             df['weather'] = 0.6  # Default moderate weather
+        
+        # Real past weather from the archive, same index as _predict_with_lstm
+        try:
+            history = get_weather_archive().read_range(df['timestamp'].min(), df['timestamp'].max())
+        except Exception as e:
+            print(f"[WARN] Weather archive unavailable: {e}")
+            history = None
+        
+        if history is not None and not history.empty:
+            # Rain hours, not probabilities: the archive only has observed rain.
+            # Hours it doesn't cover keep the default index rather than "dry".
+            weather_index = 1.0 - rain_series(history)
+            real_weather = df['timestamp'].dt.floor('h').map(weather_index)
+            df['weather'] = real_weather.fillna(df['weather']).astype(float)
         if 'traffic' not in df.columns:
             df['traffic'] = 0.7  # Default moderate traffic
         
@@ -366,9 +381,8 @@ class ForecastAgentLSTM:
                 weather_df['time'] = pd.to_datetime(weather_df['time'])
                 weather_row = weather_df[weather_df['time'].dt.hour == pred_time.hour]
                 if not weather_row.empty:
-                    # Convert precipitation probability to weather index
-                    precip_prob = weather_row.iloc[0]['precip_prob']
-                    feature_row['weather'] = 1.0 - (precip_prob / 100)  # Higher precip = lower index
+                    # Forecast rain hour to weather index, as in training (rain = lower index)
+                    feature_row['weather'] = 1.0 - float(weather_row.iloc[0]['is_rain'])
             except Exception as e:
                 print(f"[WARN] Could not load weather: {e}")
         
@@ -4,21 +4,48 @@ GeoAgent - Expansion analysis for new city with ROI scoring.
 import os
 import json
 import asyncio
-from typing import Dict, Any, List, Tuple
-import requests
+import time
+from typing import Dict, Any, List, Tuple, Optional
+import numpy as np
 import folium
+from folium.plugins import HeatMap
 from agents.trace_agent import get_trace_agent
 from services.browseruse_client import get_browseruse_client
+from services.places_cache import get_places_cache, geohash_encode, geohash_cell_size, tiles_for_bbox, tiles_for_radius
+
+# Conditional import for KD-tree radius counts
+try:
+    from scipy.spatial import cKDTree
+    HAS_SCIPY = True
+except ImportError:
+    HAS_SCIPY = False
+
+
+# City bounding boxes for grid scans: (min_lat, min_lng, max_lat, max_lng)
+CITY_BOUNDS = {
+    "San Francisco": (37.708, -122.515, 37.833, -122.357),
+}
+
+METERS_PER_DEG_LAT = 111320.0
 
 
 class GeoAgent:
     """Analyze expansion opportunities in a new city."""
     
-    def __init__(self, expansion_city: str):
+    COMPETITOR_RADIUS_M = 805  # 0.5 miles
+    BUSINESS_RADIUS_M = 500
+    COMPETITOR_KEYWORD = "wings chicken fast casual"
+    GRID_PRECISION = 7  # geohash cells of ~150m x 150m
+    GRID_MIN_SEPARATION_M = 400  # keep top cells from clustering in one hotspot
+    
+    def __init__(self, expansion_city: str, scan_mode: str = "candidates", top_n: int = 10):
         self.expansion_city = expansion_city
+        self.scan_mode = scan_mode
+        self.top_n = top_n
         self.google_api_key = os.getenv("GOOGLE_PLACES_API_KEY")
         self.trace = get_trace_agent()
         self.browser_client = get_browseruse_client()
+        self.places_cache = get_places_cache()
     
     async def run(self) -> Dict[str, Any]:
         """Execute expansion analysis workflow."""
@@ -28,38 +55,59 @@ class GeoAgent:
         }
         
         try:
-            # Step 1: Define candidate locations
-            self.trace.log(
-                agent="GeoAgent",
-                action="Identifying candidate locations",
-                metadata={"city": self.expansion_city}
-            )
-            
-            candidates = self._get_candidate_locations()
-            
-            # Step 2: Analyze each location
-            self.trace.log(
-                agent="GeoAgent",
-                action="Analyzing locations",
-                result=f"Evaluating {len(candidates)} candidates"
-            )
-            
-            analyzed_locations = []
+            heatmap = None
+            scan_info = None
             
-            for candidate in candidates:
-                analysis = await self._analyze_location(candidate)
-                analyzed_locations.append(analysis)
+            if self.scan_mode == "grid":
+                # Steps 1-2: Score every grid cell in the city at once
+                self.trace.log(
+                    agent="GeoAgent",
+                    action="Scanning city grid",
+                    metadata={"city": self.expansion_city, "precision": self.GRID_PRECISION}
+                )
+                
+                analyzed_locations, heatmap, scan_info = self._scan_grid(self.top_n)
+                
+                self.trace.log(
+                    agent="GeoAgent",
+                    action="Scored grid cells",
+                    result=f"{scan_info['cells']} cells in {scan_info['scoring_ms']:.0f} ms",
+                    metadata=scan_info
+                )
+            else:
+                # Step 1: Define candidate locations
+                self.trace.log(
+                    agent="GeoAgent",
+                    action="Identifying candidate locations",
+                    metadata={"city": self.expansion_city}
+                )
+                
+                candidates = self._get_candidate_locations()
                 
+                # Step 2: Analyze each location
                 self.trace.log(
                     agent="GeoAgent",
-                    action=f"Analyzed: {candidate['name']}",
-                    result=f"ROI Score: {analysis['roi_score']:.2f}",
-                    metadata=analysis
+                    action="Analyzing locations",
+                    result=f"Evaluating {len(candidates)} candidates"
                 )
+                
+                analyzed_locations = []
+                
+                for candidate in candidates:
+                    analysis = await self._analyze_location(candidate)
+                    analyzed_locations.append(analysis)
+                    
+                    self.trace.log(
+                        agent="GeoAgent",
+                        action=f"Analyzed: {candidate['name']}",
+                        result=f"ROI Score: {analysis['roi_score']:.2f}",
+                        metadata=analysis
+                    )
             
             # Sort by ROI score
             analyzed_locations.sort(key=lambda x: x['roi_score'], reverse=True)
             results["locations"] = analyzed_locations
+            results["scan"] = scan_info
             
             # Step 3: Create interactive map
             self.trace.log(
@@ -68,7 +116,7 @@ class GeoAgent:
             )
             
             map_file = "artifacts/expansion_map.html"
-            self._create_expansion_map(analyzed_locations, map_file)
+            self._create_expansion_map(analyzed_locations, map_file, heatmap=heatmap)
             results["artifacts"].append(map_file)
             
             # Save JSON data
@@ -76,6 +124,8 @@ class GeoAgent:
             with open(json_file, 'w') as f:
                 json.dump({
                     "city": self.expansion_city,
+                    "scan_mode": self.scan_mode,
+                    "scan": scan_info,
                     "locations": analyzed_locations,
                     "top_location": analyzed_locations[0] if analyzed_locations else None
                 }, f, indent=2)
@@ -85,7 +135,8 @@ class GeoAgent:
                 agent="GeoAgent",
                 action="Expansion analysis complete",
                 result=f"Top location: {analyzed_locations[0]['name']} (ROI: {analyzed_locations[0]['roi_score']:.2f})",
-                artifacts=results["artifacts"]
+                artifacts=results["artifacts"],
+                metadata={"places_cache": dict(self.places_cache.stats)}
             )
             
             results["success"] = True
@@ -132,20 +183,15 @@ class GeoAgent:
         
         # Get competitor density
         competitors = self._get_competitors(lat, lng, radius_miles=0.5)
-        competition_score = max(0, 1 - (len(competitors) / 20))  # Normalize
         
         # Get foot traffic proxy (nearby businesses)
         businesses = self._get_nearby_businesses(lat, lng)
-        traffic_score = min(1.0, len(businesses) / 50)  # Normalize
         
         # Income proxy (simplified - would use census data in production)
         income_score = self._estimate_income_score(name)
         
-        # Calculate ROI score (weighted average)
-        roi_score = (
-            0.4 * traffic_score +
-            0.3 * income_score +
-            0.3 * competition_score
+        competition_score, traffic_score, roi_score = self._roi_scores(
+            len(competitors), len(businesses), income_score
         )
         
         return {
@@ -162,50 +208,215 @@ class GeoAgent:
         }
     
     def _get_competitors(self, lat: float, lng: float, radius_miles: float = 0.5) -> List[Dict[str, Any]]:
-        """Get competing restaurants using Google Places API."""
-        url = "https://maps.googleapis.com/maps/api/place/nearbysearch/json"
-        
+        """Get competing restaurants using Google Places API (tile-cached)."""
         # Convert miles to meters
         radius_meters = int(radius_miles * 1609.34)
         
-        params = {
-            "location": f"{lat},{lng}",
-            "radius": radius_meters,
-            "type": "restaurant",
-            "keyword": "wings chicken fast casual",
-            "key": self.google_api_key
-        }
-        
-        try:
-            response = requests.get(url, params=params, timeout=10)
-            response.raise_for_status()
-            data = response.json()
-            
-            return data.get("results", [])
-        except Exception as e:
-            print(f"Error fetching competitors: {e}")
-            return []
+        return self.places_cache.nearby(
+            lat, lng,
+            radius_m=radius_meters,
+            place_type="restaurant",
+            keyword=self.COMPETITOR_KEYWORD
+        )
     
     def _get_nearby_businesses(self, lat: float, lng: float) -> List[Dict[str, Any]]:
-        """Get nearby businesses as foot traffic proxy."""
-        url = "https://maps.googleapis.com/maps/api/place/nearbysearch/json"
-        
-        params = {
-            "location": f"{lat},{lng}",
-            "radius": 500,  # 500 meters
-            "type": "establishment",
-            "key": self.google_api_key
+        """Get nearby businesses as foot traffic proxy (tile-cached)."""
+        return self.places_cache.nearby(
+            lat, lng,
+            radius_m=self.BUSINESS_RADIUS_M,
+            place_type="establishment"
+        )
+    
+    @staticmethod
+    def _roi_scores(competitors_count, businesses_count, income_score):
+        """
+        Compute competition, traffic and ROI scores.
+        
+        Works on scalars or NumPy arrays, so single locations and grid scans
+        share the same formula.
+        
+        Returns:
+            Tuple of (competition_score, traffic_score, roi_score)
+        """
+        competition_score = np.maximum(0, 1 - (np.asarray(competitors_count) / 20))  # Normalize
+        traffic_score = np.minimum(1.0, np.asarray(businesses_count) / 50)  # Normalize
+        
+        # Calculate ROI score (weighted average)
+        roi_score = (
+            0.4 * traffic_score +
+            0.3 * income_score +
+            0.3 * competition_score
+        )
+        
+        if np.ndim(roi_score) == 0:
+            return float(competition_score), float(traffic_score), float(roi_score)
+        return competition_score, traffic_score, roi_score
+    
+    def _get_city_bounds(self) -> Tuple[float, float, float, float]:
+        """Get the grid-scan bounding box for the expansion city."""
+        for city, bounds in CITY_BOUNDS.items():
+            if city in self.expansion_city:
+                return bounds
+        if "SF" in self.expansion_city:
+            return CITY_BOUNDS["San Francisco"]
+        
+        # Fall back to the candidate neighborhoods padded by ~3km
+        candidates = self._get_candidate_locations()
+        lats = [c["lat"] for c in candidates]
+        lngs = [c["lng"] for c in candidates]
+        return min(lats) - 0.03, min(lngs) - 0.03, max(lats) + 0.03, max(lngs) + 0.03
+    
+    def _scan_grid(
+        self,
+        top_n: int = 10
+    ) -> Tuple[List[Dict[str, Any]], List[List[float]], Dict[str, Any]]:
+        """
+        Score every geohash cell in the city bounding box.
+        
+        Competitor and business points come from the Places tile cache, so
+        once the city is cached the whole scan runs locally.
+        
+        Returns:
+            Tuple of (top locations, heatmap points [lat, lng, roi], scan info)
+        """
+        min_lat, min_lng, max_lat, max_lng = self._get_city_bounds()
+        
+        # Cell centers aligned to the geohash grid
+        lat_step, lng_step = geohash_cell_size(self.GRID_PRECISION)
+        lat_idx = np.arange(np.floor((min_lat + 90) / lat_step), np.floor((max_lat + 90) / lat_step) + 1)
+        lng_idx = np.arange(np.floor((min_lng + 180) / lng_step), np.floor((max_lng + 180) / lng_step) + 1)
+        grid_lat, grid_lng = np.meshgrid((lat_idx + 0.5) * lat_step - 90, (lng_idx + 0.5) * lng_step - 180, indexing="ij")
+        cell_lat = grid_lat.ravel()
+        cell_lng = grid_lng.ravel()
+        
+        # Pull points for the box padded by the largest search radius
+        pad_lat = self.COMPETITOR_RADIUS_M / METERS_PER_DEG_LAT
+        pad_lng = pad_lat / np.cos(np.radians((min_lat + max_lat) / 2))
+        padded = (min_lat - pad_lat, min_lng - pad_lng, max_lat + pad_lat, max_lng + pad_lng)
+        competitor_points = self.places_cache.points_in_bbox(
+            *padded, place_type="restaurant", keyword=self.COMPETITOR_KEYWORD
+        )
+        business_points = self.places_cache.points_in_bbox(*padded, place_type="establishment")
+        
+        # Tiles that hit the Places result cap undercount (dense areas read as
+        # low competition); picks near them are flagged instead of trusted
+        padded_tiles = tiles_for_bbox(*padded, self.places_cache.precision)
+        saturated = set(self.places_cache.saturated_tiles(
+            padded_tiles, "restaurant", self.COMPETITOR_KEYWORD
+        )) | set(self.places_cache.saturated_tiles(padded_tiles, "establishment"))
+        if saturated:
+            print(f"[WARN] {len(saturated)} Places tiles hit the 60-result cap; counts there are lower bounds")
+        
+        start = time.perf_counter()
+        
+        # Local planar projection (meters) - accurate enough at city scale
+        origin = ((min_lat + max_lat) / 2, (min_lng + max_lng) / 2)
+        cells_xy = self._project(cell_lat, cell_lng, origin)
+        
+        competitors_count = self._radius_counts(cells_xy, competitor_points, origin, self.COMPETITOR_RADIUS_M)
+        businesses_count = self._radius_counts(cells_xy, business_points, origin, self.BUSINESS_RADIUS_M)
+        
+        # Income proxy: score of the nearest known neighborhood
+        anchors = self._get_candidate_locations()
+        anchors_xy = self._project(
+            np.array([a["lat"] for a in anchors]), np.array([a["lng"] for a in anchors]), origin
+        )
+        anchor_income = np.array([self._estimate_income_score(a["name"]) for a in anchors])
+        nearest_anchor = np.argmin(
+            ((cells_xy[:, None, :] - anchors_xy[None, :, :]) ** 2).sum(axis=2), axis=1
+        )
+        income_score = anchor_income[nearest_anchor]
+        
+        competition_score, traffic_score, roi_score = self._roi_scores(
+            competitors_count, businesses_count, income_score
+        )
+        
+        # Greedy top-N with minimum spacing between picks
+        order = np.argsort(-roi_score, kind="stable")
+        picked: List[int] = []
+        min_sep_sq = self.GRID_MIN_SEPARATION_M ** 2
+        for idx in order:
+            if len(picked) >= top_n:
+                break
+            if picked and (((cells_xy[picked] - cells_xy[idx]) ** 2).sum(axis=1) < min_sep_sq).any():
+                continue
+            picked.append(int(idx))
+        
+        scoring_ms = (time.perf_counter() - start) * 1000
+        
+        locations = []
+        for idx in picked:
+            lat = float(cell_lat[idx])
+            lng = float(cell_lng[idx])
+            cell = geohash_encode(lat, lng, self.GRID_PRECISION)
+            capped = bool(saturated) and not saturated.isdisjoint(
+                tiles_for_radius(lat, lng, self.COMPETITOR_RADIUS_M, self.places_cache.precision)
+            )
+            locations.append({
+                "name": f"{anchors[nearest_anchor[idx]]['name']} [{cell}]",
+                "geohash": cell,
+                "lat": round(lat, 6),
+                "lng": round(lng, 6),
+                "competitors_count": int(competitors_count[idx]),
+                "businesses_count": int(businesses_count[idx]),
+                "competition_score": round(float(competition_score[idx]), 3),
+                "traffic_score": round(float(traffic_score[idx]), 3),
+                "income_score": round(float(income_score[idx]), 3),
+                "roi_score": round(float(roi_score[idx]), 3),
+                "counts_capped": capped,
+                "gmaps_url": f"https://www.google.com/maps/search/?api=1&query={lat},{lng}"
+            })
+        
+        heatmap = [
+            [float(la), float(ln), round(float(r), 3)]
+            for la, ln, r in zip(cell_lat, cell_lng, roi_score)
+        ]
+        
+        scan_info = {
+            "bounds": [min_lat, min_lng, max_lat, max_lng],
+            "precision": self.GRID_PRECISION,
+            "cells": int(len(cell_lat)),
+            "competitor_points": len(competitor_points),
+            "business_points": len(business_points),
+            "saturated_tiles": len(saturated),
+            "scoring_ms": round(scoring_ms, 1)
         }
         
-        try:
-            response = requests.get(url, params=params, timeout=10)
-            response.raise_for_status()
-            data = response.json()
-            
-            return data.get("results", [])
-        except Exception as e:
-            print(f"Error fetching businesses: {e}")
-            return []
+        return locations, heatmap, scan_info
+    
+    @staticmethod
+    def _project(lat: np.ndarray, lng: np.ndarray, origin: Tuple[float, float]) -> np.ndarray:
+        """Project lat/lng to local x/y meters around an origin."""
+        x = (lng - origin[1]) * METERS_PER_DEG_LAT * np.cos(np.radians(origin[0]))
+        y = (lat - origin[0]) * METERS_PER_DEG_LAT
+        return np.column_stack([x, y])
+    
+    def _radius_counts(
+        self,
+        cells_xy: np.ndarray,
+        points: List[Tuple[float, float]],
+        origin: Tuple[float, float],
+        radius_m: float
+    ) -> np.ndarray:
+        """Count points within a radius of every cell center."""
+        if not points:
+            return np.zeros(len(cells_xy), dtype=int)
+        
+        pts = np.asarray(points, dtype=float)
+        points_xy = self._project(pts[:, 0], pts[:, 1], origin)
+        
+        if HAS_SCIPY:
+            tree = cKDTree(points_xy)
+            return np.asarray(tree.query_ball_point(cells_xy, r=radius_m, return_length=True))
+        
+        # Fallback: chunked brute-force distances
+        counts = np.empty(len(cells_xy), dtype=int)
+        radius_sq = radius_m ** 2
+        for start in range(0, len(cells_xy), 2048):
+            chunk = cells_xy[start:start + 2048]
+            dist_sq = ((chunk[:, None, :] - points_xy[None, :, :]) ** 2).sum(axis=2)
+            counts[start:start + 2048] = (dist_sq <= radius_sq).sum(axis=1)
+        return counts
     
     def _estimate_income_score(self, neighborhood: str) -> float:
         """Estimate income level for neighborhood (simplified)."""
@@ -226,8 +437,13 @@ class GeoAgent:
         
         return 0.5  # Default medium
     
-    def _create_expansion_map(self, locations: List[Dict[str, Any]], output_file: str):
-        """Create interactive Folium map with location markers."""
+    def _create_expansion_map(
+        self,
+        locations: List[Dict[str, Any]],
+        output_file: str,
+        heatmap: Optional[List[List[float]]] = None
+    ):
+        """Create interactive Folium map with location markers and optional ROI heatmap."""
         # Center on first location or default
         if locations:
             center_lat = sum(loc["lat"] for loc in locations) / len(locations)
@@ -274,12 +490,30 @@ class GeoAgent:
                 icon=folium.Icon(color=color, icon="info-sign")
             ).add_to(m)
         
+        # ROI heatmap layer from grid scan
+        if heatmap:
+            HeatMap(
+                heatmap,
+                name="ROI heatmap",
+                radius=12,
+                blur=15,
+                min_opacity=0.2
+            ).add_to(m)
+            folium.LayerControl().add_to(m)
+        
         # Save map
         m.save(output_file)
 
 
-def run_geo_agent(expansion_city: str) -> Dict[str, Any]:
-    """Synchronous wrapper for geo agent."""
-    agent = GeoAgent(expansion_city)
+def run_geo_agent(expansion_city: str, scan_mode: str = "candidates", top_n: int = 10) -> Dict[str, Any]:
+    """
+    Synchronous wrapper for geo agent.
+    
+    Args:
+        expansion_city: Target city
+        scan_mode: "candidates" (hand-picked neighborhoods) or "grid" (city-wide scan)
+        top_n: Number of top grid cells to return in grid mode
+    """
+    agent = GeoAgent(expansion_city, scan_mode=scan_mode, top_n=top_n)
     return asyncio.run(agent.run())
 
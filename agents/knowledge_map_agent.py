@@ -3,19 +3,40 @@ KnowledgeMapAgent - Build interactive knowledge graph of agent reasoning.
 """
 import os
 import json
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Callable, Tuple
 from datetime import datetime
 from pathlib import Path
 import networkx as nx
+from services.graph_store import GraphStore, input_version
+from services.graph_layout import get_graph_layout
+
+
+GRAPH_FILE = "artifacts/knowledge_graph.json"
+
+# Contribution -> (builder method, upstream contributions it links into).
+# Order matters: upstream contributions are always built first. Every
+# builder links into the center node, so all of them list "center".
+CONTRIBUTIONS = [
+    ("center", "_add_center_node", []),
+    ("weather", "_add_weather_nodes", ["center"]),
+    ("forecast", "_add_forecast_nodes", ["center"]),
+    ("staffing", "_add_staffing_nodes", ["center", "forecast"]),
+    ("prep", "_add_prep_nodes", ["center", "forecast"]),
+    ("reviews", "_add_review_nodes", ["center", "staffing"]),
+    ("compliance", "_add_compliance_nodes", ["center", "staffing", "prep"]),
+    ("geo", "_add_geo_nodes", ["center"]),
+    ("menu", "_add_menu_nodes", ["center", "prep"])
+]
 
 
 class KnowledgeMapAgent:
     """Agent to build knowledge graph from all agent outputs."""
     
-    def __init__(self, tenant_id: str, trace_agent=None):
+    def __init__(self, tenant_id: str, trace_agent=None, store: Optional[GraphStore] = None):
         self.tenant_id = tenant_id
         self.trace = trace_agent
         self.graph = nx.DiGraph()
+        self.store = store or GraphStore.for_tenant(tenant_id)
         
         print(f"[INIT] KnowledgeMapAgent for tenant: {tenant_id}")
     
@@ -27,11 +48,17 @@ class KnowledgeMapAgent:
         prep_data: Optional[Dict[str, Any]] = None,
         scraper_data: Optional[Dict[str, Any]] = None,
         compliance_data: Optional[Dict[str, Any]] = None,
-        geo_data: Optional[Dict[str, Any]] = None
+        geo_data: Optional[Dict[str, Any]] = None,
+        full_rebuild: bool = False
     ) -> Dict[str, Any]:
         """
         Build knowledge graph from all agent outputs.
         
+        Each agent's nodes are stored as a contribution keyed by a hash of
+        its input. Only contributions whose input (or upstream contribution)
+        changed are recomputed and patched in; an agent passed as None keeps
+        its last stored contribution.
+        
         Args:
             forecast_data: Forecast agent results
             weather_data: Weather agent results
@@ -40,9 +67,10 @@ class KnowledgeMapAgent:
             scraper_data: Scraper agent results
             compliance_data: Compliance agent results
             geo_data: Geo agent results
+            full_rebuild: Discard stored contributions and rebuild everything
             
         Returns:
-            Dict with graph data and visualization HTML
+            Dict with graph data, changed contributions and the delta
         """
         results = {
             "success": False,
@@ -57,54 +85,55 @@ class KnowledgeMapAgent:
                     metadata={"tenant_id": self.tenant_id}
                 )
             
-            # Add center node
-            self._add_center_node()
-            
-            # Build graph from each agent's output
-            if weather_data:
-                self._add_weather_nodes(weather_data)
-            
-            if forecast_data:
-                self._add_forecast_nodes(forecast_data)
-            
-            if staffing_data:
-                self._add_staffing_nodes(staffing_data)
-            
-            if prep_data:
-                self._add_prep_nodes(prep_data)
-            
-            if scraper_data:
-                self._add_review_nodes(scraper_data)
-            
-            if compliance_data:
-                self._add_compliance_nodes(compliance_data)
-            
-            if geo_data:
-                self._add_geo_nodes(geo_data)
-            
-            # Add menu nodes
-            self._add_menu_nodes()
-            
-            # Calculate edge weights and impact scores
-            self._calculate_edge_weights()
-            
-            # Save graph data
-            graph_file = "artifacts/knowledge_graph.json"
-            graph_data = self._export_graph_data()
-            
-            with open(graph_file, 'w', encoding='utf-8') as f:
-                json.dump(graph_data, f, indent=2, ensure_ascii=False)
-            
-            results["artifacts"].append(graph_file)
+            inputs = {
+                "center": {"tenant_id": self.tenant_id},
+                "weather": weather_data,
+                "forecast": forecast_data,
+                "staffing": staffing_data,
+                "prep": prep_data,
+                "reviews": scraper_data,
+                "compliance": compliance_data,
+                "geo": geo_data,
+                "menu": {}
+            }
+            
+            previous = dict(self.store.contributions)
+            if full_rebuild:
+                self.store.clear()
+            
+            # Start from the stored graph and patch only what changed
+            self._load_stored_graph()
+            changed = self._update_contributions(inputs)
+            changed += [key for key in previous if key not in self.store.contributions]
+            
+            graph_file = GRAPH_FILE
+            delta = None
+            if changed or not os.path.exists(graph_file):
+                delta = self.store.write_delta(previous, changed)
+                self.store.save()
+                graph_data = self._export_graph_data()
+                
+                with open(graph_file, 'w', encoding='utf-8') as f:
+                    json.dump(graph_data, f, ensure_ascii=False, separators=(",", ":"))
+                
+                # Lay out this version now so the Knowledge Map page renders it instantly
+                get_graph_layout().positions(graph_data)
+                
+                results["artifacts"].extend([graph_file, self.store.delta_file])
+            else:
+                graph_data = self._export_graph_data()
             
             if self.trace:
                 self.trace.log(
                     agent="KnowledgeMapAgent",
-                    action="Knowledge graph built",
-                    result=f"Nodes: {len(self.graph.nodes())}, Edges: {len(self.graph.edges())}",
+                    action="Knowledge graph updated" if changed else "Knowledge graph unchanged",
+                    result=f"Nodes: {len(self.graph.nodes())}, Edges: {len(self.graph.edges())}, "
+                           f"recomputed: {', '.join(changed) or 'none'}",
                     metadata={
                         "nodes": len(self.graph.nodes()),
-                        "edges": len(self.graph.edges())
+                        "edges": len(self.graph.edges()),
+                        "version": self.store.version,
+                        "changed": changed
                     }
                 )
             
@@ -112,6 +141,8 @@ class KnowledgeMapAgent:
             results["graph_data"] = graph_data
             results["node_count"] = len(self.graph.nodes())
             results["edge_count"] = len(self.graph.edges())
+            results["changed"] = changed
+            results["delta"] = delta
             
             return results
             
@@ -132,6 +163,76 @@ class KnowledgeMapAgent:
             
             return results
     
+    def _load_stored_graph(self):
+        """Rebuild the in-memory graph from stored contributions."""
+        self.graph = nx.DiGraph()
+        for node in self.store.all_nodes():
+            attrs = {k: v for k, v in node.items() if k != "id"}
+            self.graph.add_node(node["id"], **attrs)
+        for edge in self.store.all_edges():
+            attrs = {k: v for k, v in edge.items() if k not in ("source", "target")}
+            self.graph.add_edge(edge["source"], edge["target"], **attrs)
+    
+    def _update_contributions(self, inputs: Dict[str, Any]) -> List[str]:
+        """Recompute contributions whose input or upstream changed; return their keys."""
+        versions = {}
+        changed = []
+        
+        for key, method, upstream in CONTRIBUTIONS:
+            data = inputs.get(key)
+            stored = self.store.get(key)
+            
+            if data is None:
+                if stored is None:
+                    continue
+                # Not re-run this time: keep its last input (recomputed only if upstream changed)
+                data = stored["input"]
+            else:
+                data = json.loads(json.dumps(data, default=str))
+            
+            versions[key] = input_version(data, [versions.get(u) for u in upstream])
+            if stored is not None and stored["version"] == versions[key]:
+                continue
+            
+            if stored is not None:
+                self._remove_contribution(stored)
+            
+            builder = getattr(self, method)
+            nodes, edges = self._capture(lambda: builder() if key in ("center", "menu") else builder(data))
+            self.store.put(key, versions[key], data, nodes, edges)
+            changed.append(key)
+        
+        return changed
+    
+    def _remove_contribution(self, contribution: Dict[str, Any]):
+        """Drop a contribution's edges and nodes from the in-memory graph."""
+        for edge in contribution["edges"]:
+            if self.graph.has_edge(edge["source"], edge["target"]):
+                self.graph.remove_edge(edge["source"], edge["target"])
+        for node in contribution["nodes"]:
+            if self.graph.has_node(node["id"]):
+                self.graph.remove_node(node["id"])
+    
+    def _capture(self, build: Callable[[], None]) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+        """Run a builder and return the nodes and edges it added."""
+        nodes_before = set(self.graph.nodes())
+        edges_before = set(self.graph.edges())
+        
+        build()
+        
+        new_edges = [(u, v) for u, v in self.graph.edges() if (u, v) not in edges_before]
+        self._calculate_edge_weights(new_edges)
+        
+        nodes = [
+            {"id": n, **self.graph.nodes[n]}
+            for n in self.graph.nodes() if n not in nodes_before
+        ]
+        edges = [
+            {"source": u, "target": v, **self.graph.edges[u, v]}
+            for u, v in new_edges
+        ]
+        return nodes, edges
+    
     def _add_center_node(self):
         """Add central restaurant node."""
         self.graph.add_node(
@@ -473,9 +574,10 @@ class KnowledgeMapAgent:
                 if wings_prep:
                     self.graph.add_edge(wings_prep[0], item, relationship="prepares")
     
-    def _calculate_edge_weights(self):
-        """Calculate edge weights based on confidence and impact."""
-        for u, v, data in self.graph.edges(data=True):
+    def _calculate_edge_weights(self, edges: Optional[List[Tuple[str, str]]] = None):
+        """Calculate edge weights based on confidence and impact (all edges if none given)."""
+        for u, v in (edges if edges is not None else list(self.graph.edges())):
+            data = self.graph.edges[u, v]
             confidence = data.get('confidence', 0.5)
             impact = data.get('impact', 0.5)
             data['weight'] = confidence * impact
@@ -503,6 +605,8 @@ class KnowledgeMapAgent:
             "nodes": nodes,
             "edges": edges,
             "tenant_id": self.tenant_id,
+            "version": self.store.version,
+            "graph_hash": self.store.graph_hash(),
             "generated_at": datetime.now().isoformat()
         }
 
@@ -515,7 +619,8 @@ def run_knowledge_map_agent(
     prep_data: Optional[Dict[str, Any]] = None,
     scraper_data: Optional[Dict[str, Any]] = None,
     compliance_data: Optional[Dict[str, Any]] = None,
-    geo_data: Optional[Dict[str, Any]] = None
+    geo_data: Optional[Dict[str, Any]] = None,
+    full_rebuild: bool = False
 ) -> Dict[str, Any]:
     """Convenience function to run knowledge map agent."""
     from agents.trace_agent import TraceAgent
@@ -530,6 +635,7 @@ def run_knowledge_map_agent(
         prep_data=prep_data,
         scraper_data=scraper_data,
         compliance_data=compliance_data,
-        geo_data=geo_data
+        geo_data=geo_data,
+        full_rebuild=full_rebuild
     )
 
@@ -0,0 +1,110 @@
+"""
+PlanningWorkflow - Runs the full "plan tomorrow" agent chain.
+
+Scrape -> weather -> forecast -> staffing -> prep -> analyst -> expansion,
+each step feeding the next. Runs in the agent worker (progress goes to
+the job's events) or inline in the UI with a progress callback.
+"""
+from typing import Dict, Any, List, Optional, Callable
+from agents import (
+    run_scraper_agent,
+    run_weather_agent,
+    run_forecast_agent_lstm,
+    run_staffing_agent,
+    run_prep_agent,
+    run_analyst_agent_captain,
+    run_geo_agent
+)
+from agents.trace_agent import get_trace_agent
+from services.job_queue import report_progress
+
+
+PLANNING_STEPS = ["scraper", "weather", "forecast", "staffing", "prep", "analyst", "geo"]
+
+
+def run_planning_workflow(
+    restaurant_name: str,
+    restaurant_address: str,
+    staff: List[str],
+    tenant_id: Optional[str] = None,
+    expansion_city: Optional[str] = None,
+    analyst_question: str = "Why are we adding a cook tomorrow?",
+    progress: Optional[Callable[[str, Optional[int]], None]] = None
+) -> Dict[str, Any]:
+    """
+    Run the planning agents in order.
+    
+    Args:
+        restaurant_name: Restaurant name
+        restaurant_address: Restaurant address
+        staff: Staff names for shift assignment
+        tenant_id: Captain tenant (analyst step skipped if None)
+        expansion_city: Expansion target (geo step skipped if None)
+        analyst_question: Question for the analyst agent
+        progress: progress(message, step) callback (default: job progress)
+    
+    Returns:
+        Agent results keyed by step name (scraper, weather, forecast, ...),
+        plus "error" if a step raised
+    """
+    progress = progress or report_progress
+    trace = get_trace_agent()
+    results = {}
+    
+    try:
+        # Clear previous traces
+        trace.clear()
+        
+        progress("🔍 Scraping reviews from Google Maps...", 0)
+        results['scraper'] = run_scraper_agent(restaurant_name, restaurant_address)
+        
+        progress("🌤️ Fetching weather forecast...", 1)
+        results['weather'] = run_weather_agent(restaurant_name, restaurant_address)
+        
+        progress("📈 Predicting order volume & revenue (LSTM)...", 2)
+        results['forecast'] = run_forecast_agent_lstm()
+        forecast = results['forecast']
+        
+        if forecast.get('success'):
+            progress("👥 Creating Asana staffing tasks...", 3)
+            results['staffing'] = run_staffing_agent(
+                staff,
+                restaurant_name,
+                forecast['peak_hour'],
+                forecast['peak_orders'],
+                forecast.get('predictions')
+            )
+        
+        if forecast.get('success') and results['weather'].get('success'):
+            progress("📦 Creating purchase order...", 4)
+            results['prep'] = run_prep_agent(
+                restaurant_name,
+                forecast['peak_orders'],
+                results['weather'].get('summary', {}),
+                forecast.get('predictions')
+            )
+        
+        if tenant_id:
+            progress("🤖 Running Captain RAG analysis...", 5)
+            # Build context from previous results
+            context = {}
+            if forecast.get('success'):
+                context['forecast_data'] = {
+                    'peak_hour': forecast['peak_hour'],
+                    'peak_orders': forecast['peak_orders']
+                }
+            if results['weather'].get('success'):
+                context['weather_data'] = results['weather'].get('summary', {})
+            results['analyst'] = run_analyst_agent_captain(tenant_id, analyst_question, context=context)
+        
+        if expansion_city:
+            progress("🗺️ Analyzing expansion opportunities...", 6)
+            results['geo'] = run_geo_agent(expansion_city)
+        
+        progress("✅ Workflow complete", len(PLANNING_STEPS))
+    
+    except Exception as e:
+        results['error'] = str(e)
+        progress(f"❌ Workflow error: {e}", None)
+    
+    return results
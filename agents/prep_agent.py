@@ -5,8 +5,10 @@ import os
 import json
 import asyncio
 from datetime import datetime, timedelta
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional
 from services.browseruse_client import get_browseruse_client
+from services.inventory_planner import get_inventory_planner
+from services.submission_batcher import SubmissionBatcher
 from agents.trace_agent import get_trace_agent
 from PIL import Image, ImageDraw
 
@@ -29,9 +31,18 @@ class PrepAgent:
     async def run(
         self,
         peak_orders: float,
-        weather_summary: Dict[str, Any]
+        weather_summary: Dict[str, Any],
+        hourly_forecast: Optional[List[Dict[str, Any]]] = None
     ) -> Dict[str, Any]:
-        """Execute prep workflow."""
+        """
+        Execute prep workflow.
+        
+        Args:
+            peak_orders: Forecast orders at the peak hour
+            weather_summary: WeatherAgent summary (rain_hours)
+            hourly_forecast: ForecastAgent predictions for the multi-SKU
+                plan; its daily volume falls back to peak_orders x 8 without it
+        """
         results = {
             "success": False,
             "artifacts": []
@@ -64,6 +75,34 @@ class PrepAgent:
             results["wings_lbs"] = wings_lbs
             results["buffer_applied"] = buffer_applied
             
+            # Plan every tracked SKU and group lines into supplier POs
+            planner = get_inventory_planner()
+            daily_orders = planner.daily_orders(hourly_forecast, peak_orders)
+            plan = planner.plan(
+                daily_orders,
+                demand_multiplier=self.RAIN_BUFFER_MULTIPLIER if buffer_applied else 1.0
+            )
+            purchase_orders = planner.purchase_orders(plan)
+            
+            results["inventory_plan"] = plan.to_dict(orient="records")
+            results["purchase_orders"] = purchase_orders
+            
+            orders_file = "artifacts/purchase_orders.json"
+            with open(orders_file, 'w') as f:
+                json.dump(purchase_orders, f, indent=2)
+            results["artifacts"].append(orders_file)
+            
+            self.trace.log(
+                agent="PrepAgent",
+                action="Planned inventory replenishment",
+                result=f"{int((plan['order_qty'] > 0).sum())}/{len(plan)} SKUs to reorder across {len(purchase_orders)} suppliers",
+                artifacts=[orders_file],
+                metadata={
+                    "suppliers": [po["supplier"] for po in purchase_orders],
+                    "total_cost": round(sum(po["total_cost"] for po in purchase_orders), 2)
+                }
+            )
+            
             # Step 2: Create PO
             tomorrow = datetime.now() + timedelta(days=1)
             delivery_time = tomorrow.replace(hour=8, minute=0)  # 8 AM delivery
@@ -103,23 +142,31 @@ class PrepAgent:
                 artifacts=[po_file]
             )
             
-            # Step 4: Fill supplier form
+            # Step 4: Fill supplier forms (one browser session per supplier)
             self.trace.log(
                 agent="PrepAgent",
                 action="Opening supplier portal in new tab",
                 url="https://supplier-demo.brew.ai"  # Demo supplier portal
             )
             
-            # For demo, use a mock supplier URL
-            supplier_url = "https://forms.gle/demo"  # In production, use real supplier portal
+            # For demo, SUPPLIER_PORTAL_URL defaults to a mock form
+            # (scripts/mock_supplier_portal.py serves a local one)
+            batcher = SubmissionBatcher(self.browser_client)
+            batcher.add_purchase_order(po_data)
+            batcher.add_supplier_orders(purchase_orders, delivery_notes="Deliver by 08:00.")
             
-            supplier_result = await self.browser_client.fill_supplier_form(
-                supplier_url,
-                po_data,
-                submit=self.auto_submit
-            )
+            try:
+                batch_result = await batcher.flush(submit=self.auto_submit)
+            finally:
+                await self.browser_client.close()
+            
+            results["supplier_submissions"] = {
+                supplier: {"success": r.get("success", False), "lines": r.get("lines", 0)}
+                for supplier, r in batch_result["suppliers"].items()
+            }
             
-            if supplier_result["success"]:
+            supplier_result = batch_result["suppliers"].get("Default", {})
+            if supplier_result.get("success"):
                 # Create screenshot placeholder
                 screenshot_file = "artifacts/supplier_po_filled.png"
                 self._create_po_screenshot(screenshot_file, po_data)
@@ -128,7 +175,8 @@ class PrepAgent:
                 action_text = "submitted" if self.auto_submit else "filled (not submitted)"
                 self.trace.log(
                     agent="PrepAgent",
-                    action=f"Supplier form {action_text}",
+                    action=f"Supplier forms {action_text}",
+                    result=f"{len(results['supplier_submissions'])} suppliers in {batch_result['sessions']} sessions",
                     artifacts=[screenshot_file]
                 )
             else:
@@ -191,9 +239,10 @@ class PrepAgent:
 def run_prep_agent(
     restaurant_name: str,
     peak_orders: float,
-    weather_summary: Dict[str, Any]
+    weather_summary: Dict[str, Any],
+    hourly_forecast: Optional[List[Dict[str, Any]]] = None
 ) -> Dict[str, Any]:
     """Synchronous wrapper for prep agent."""
     agent = PrepAgent(restaurant_name)
-    return asyncio.run(agent.run(peak_orders, weather_summary))
+    return asyncio.run(agent.run(peak_orders, weather_summary, hourly_forecast))
 
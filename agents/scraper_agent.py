@@ -53,18 +53,44 @@ class ScraperAgent:
                 result=f"place_id: {place_id}"
             )
             
-            # Step 2: Scrape Google Maps reviews
+            # Step 2: Scrape Google Maps and Yelp reviews in parallel
             self.trace.log(
                 agent="ScraperAgent",
                 action="Opening Google Maps in Chrome",
                 url="https://maps.google.com"
             )
             
-            gmaps_result = await self.browser_client.scrape_google_maps_reviews(
-                self.restaurant_name,
-                self.restaurant_address,
-                num_reviews=50
-            )
+            scrapes = [
+                self.browser_client.scrape_google_maps_reviews(
+                    self.restaurant_name,
+                    self.restaurant_address,
+                    num_reviews=50
+                )
+            ]
+            
+            # Yelp only if API key provided
+            yelp_api_key = os.getenv("YELP_API_KEY")
+            if yelp_api_key:
+                self.trace.log(
+                    agent="ScraperAgent",
+                    action="Opening Yelp in new tab",
+                    url="https://www.yelp.com"
+                )
+                scrapes.append(self.browser_client.scrape_yelp_reviews(
+                    self.restaurant_name,
+                    "New York, NY",
+                    num_reviews=30
+                ))
+            
+            try:
+                scraped = await asyncio.gather(*scrapes, return_exceptions=True)
+            finally:
+                await self.browser_client.close()
+            scraped = [
+                r if isinstance(r, dict) else {"success": False, "error": str(r)}
+                for r in scraped
+            ]
+            gmaps_result = scraped[0]
             
             if gmaps_result["success"]:
                 # Save raw HTML
@@ -90,20 +116,9 @@ class ScraperAgent:
                     result=f"Error: {gmaps_result.get('error')}"
                 )
             
-            # Step 3: Scrape Yelp if API key provided
-            yelp_api_key = os.getenv("YELP_API_KEY")
-            if yelp_api_key:
-                self.trace.log(
-                    agent="ScraperAgent",
-                    action="Opening Yelp in new tab",
-                    url="https://www.yelp.com"
-                )
-                
-                yelp_result = await self.browser_client.scrape_yelp_reviews(
-                    self.restaurant_name,
-                    "New York, NY",
-                    num_reviews=30
-                )
+            # Step 3: Collect Yelp results
+            if len(scraped) > 1:
+                yelp_result = scraped[1]
                 
                 if yelp_result["success"]:
                     # Save raw HTML
@@ -4,8 +4,12 @@ StaffingAgent - Creates Asana tasks for staffing based on forecast.
 import os
 import asyncio
 from datetime import datetime, timedelta
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
+import pandas as pd
 from services.browseruse_client import get_browseruse_client
+from services.staffing_optimizer import StaffingOptimizer, load_roster
+from services.capacity_model import get_capacity_model
+from services.submission_batcher import SubmissionBatcher
 from agents.trace_agent import get_trace_agent
 from PIL import Image
 import io
@@ -26,8 +30,21 @@ class StaffingAgent:
         self.browser_client = get_browseruse_client()
         self.trace = get_trace_agent()
     
-    async def run(self, peak_hour: int, peak_orders: float) -> Dict[str, Any]:
-        """Execute staffing workflow."""
+    async def run(
+        self,
+        peak_hour: int,
+        peak_orders: float,
+        hourly_forecast: Optional[List[Dict[str, Any]]] = None
+    ) -> Dict[str, Any]:
+        """
+        Execute staffing workflow.
+        
+        Args:
+            peak_hour: Forecast peak hour
+            peak_orders: Forecast orders at the peak hour
+            hourly_forecast: Forecast predictions ({"hour", "predicted_orders"});
+                loaded from the latest forecast artifact when omitted
+        """
         results = {
             "success": False,
             "artifacts": []
@@ -44,19 +61,26 @@ class StaffingAgent:
                 }
             )
             
-            required_cooks = max(1, int(peak_orders / self.ORDERS_PER_COOK_PER_HOUR) + 1)
+            hours, orders = self._hourly_demand(peak_hour, peak_orders, hourly_forecast)
+            
+            # Step 2: Solve hour-by-hour shift assignments
+            plan = self._create_shifts(hours, orders)
+            shifts = plan["shifts"]
+            
+            required_cooks = max(plan["coverage"].get("Cook", {}).get("required", [1]))
             results["required_cooks"] = required_cooks
+            results["shifts"] = shifts
+            results["coverage"] = plan["coverage"]
+            results["labor_cost"] = plan["labor_cost"]
             
             self.trace.log(
                 agent="StaffingAgent",
                 action="Calculated staffing needs",
-                result=f"Need {required_cooks} cooks for peak hour {peak_hour}:00"
+                result=f"Need {required_cooks} cooks at peak ({peak_hour}:00); "
+                       f"{len(shifts)} shifts, ${plan['labor_cost']:,.2f} labor",
+                metadata={"coverage": plan["coverage"]}
             )
             
-            # Step 2: Create shift assignments
-            shifts = self._create_shifts(required_cooks, peak_hour)
-            results["shifts"] = shifts
-            
             # Step 3: Create Asana tasks
             self.trace.log(
                 agent="StaffingAgent",
@@ -79,11 +103,14 @@ class StaffingAgent:
                     "notes": f"Role: {shift['role']}\nShift: {shift['start_time']} - {shift['end_time']}"
                 })
             
-            # Create project in Asana
-            asana_result = await self.browser_client.create_asana_tasks(
-                project_name,
-                asana_tasks
-            )
+            # Create project in Asana (bulk API when configured, else one browser session)
+            batcher = SubmissionBatcher(self.browser_client)
+            batcher.add_tasks(project_name, asana_tasks)
+            try:
+                batch_result = await batcher.flush()
+            finally:
+                await self.browser_client.close()
+            asana_result = batch_result["projects"][project_name]
             
             if asana_result["success"]:
                 self.trace.log(
@@ -124,45 +151,46 @@ class StaffingAgent:
             results["error"] = str(e)
             return results
     
-    def _create_shifts(self, required_cooks: int, peak_hour: int) -> List[Dict[str, Any]]:
-        """Create shift assignments."""
-        tomorrow = datetime.now() + timedelta(days=1)
-        tomorrow_str = tomorrow.strftime("%Y-%m-%d")
+    def _hourly_demand(
+        self,
+        peak_hour: int,
+        peak_orders: float,
+        hourly_forecast: Optional[List[Dict[str, Any]]] = None
+    ) -> tuple:
+        """Get (hours, orders) for tomorrow from the forecast vector."""
+        if hourly_forecast is None:
+            for forecast_file in ["artifacts/forecast_lstm.csv", "artifacts/forecast.csv"]:
+                if os.path.exists(forecast_file):
+                    hourly_forecast = pd.read_csv(forecast_file).to_dict("records")
+                    break
         
-        shifts = []
+        if hourly_forecast:
+            by_hour = {int(p["hour"]): float(p["predicted_orders"]) for p in hourly_forecast}
+            hours = list(range(min(by_hour), max(by_hour) + 1))
+            return hours, [by_hour.get(h, 0.0) for h in hours]
         
-        # Assign cooks
-        for i in range(required_cooks):
-            if i < len(self.staff_list):
-                staff = self.staff_list[i]
-            else:
-                staff = f"Cook {i+1} (TBH)"
-            
-            # Peak shift: 2 hours before peak to 3 hours after
-            start_hour = max(10, peak_hour - 2)
-            end_hour = min(22, peak_hour + 3)
-            
-            shifts.append({
-                "staff": staff,
-                "role": "Cook",
-                "date": tomorrow_str,
-                "start_time": f"{start_hour:02d}:00",
-                "end_time": f"{end_hour:02d}:00",
-                "shift_hours": end_hour - start_hour
-            })
+        # No forecast vector: staff the peak window only (2h before to 3h after)
+        hours = list(range(max(10, peak_hour - 2), min(22, peak_hour + 3)))
+        return hours, [peak_orders] * len(hours)
+    
+    def _create_shifts(self, hours: List[int], orders: List[float]) -> Dict[str, Any]:
+        """Create minimum-cost shift assignments covering every hour."""
+        tomorrow_str = (datetime.now() + timedelta(days=1)).strftime("%Y-%m-%d")
+        
+        # Size each hour with the queueing model; fixed ratios if it can't be fitted
+        try:
+            requirement_fn = get_capacity_model().requirement_fn
+        except Exception as e:
+            print(f"[WARN] Capacity model unavailable, using fixed ratios: {e}")
+            requirement_fn = None
         
-        # Add a server shift
-        if len(self.staff_list) > required_cooks:
-            shifts.append({
-                "staff": self.staff_list[-1],
-                "role": "Server",
-                "date": tomorrow_str,
-                "start_time": "10:00",
-                "end_time": "22:00",
-                "shift_hours": 12
-            })
+        optimizer = StaffingOptimizer(
+            load_roster(staff_names=self.staff_list),
+            orders_per_staff_hour={"Cook": self.ORDERS_PER_COOK_PER_HOUR, "Cashier": 30},
+            requirement_fn=requirement_fn
+        )
         
-        return shifts
+        return optimizer.solve_day(tomorrow_str, hours, orders)
     
     def _create_placeholder_screenshot(self, filename: str, tasks: List[Dict[str, Any]]):
         """Create a placeholder screenshot showing task list."""
@@ -197,9 +225,10 @@ def run_staffing_agent(
     staff_list: List[str],
     restaurant_name: str,
     peak_hour: int,
-    peak_orders: float
+    peak_orders: float,
+    hourly_forecast: Optional[List[Dict[str, Any]]] = None
 ) -> Dict[str, Any]:
     """Synchronous wrapper for staffing agent."""
     agent = StaffingAgent(staff_list, restaurant_name)
-    return asyncio.run(agent.run(peak_hour, peak_orders))
+    return asyncio.run(agent.run(peak_hour, peak_orders, hourly_forecast))
 
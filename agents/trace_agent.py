@@ -14,18 +14,28 @@ class TraceAgent:
     def __init__(self, trace_file: str = "artifacts/trace.json"):
         self.trace_file = trace_file
         self.traces: List[Dict[str, Any]] = []
+        self._mtime: Optional[float] = None
         self.metorial_project_id = os.getenv("METORIAL_PROJECT_ID")
         
         # Ensure artifacts directory exists
         os.makedirs(os.path.dirname(trace_file), exist_ok=True)
         
         # Load existing traces if available
-        if os.path.exists(trace_file):
-            try:
-                with open(trace_file, 'r') as f:
-                    self.traces = json.load(f)
-            except:
-                self.traces = []
+        self._refresh()
+    
+    def _refresh(self):
+        """Reload traces if another process (the agent worker) wrote the file."""
+        if not os.path.exists(self.trace_file):
+            return
+        mtime = os.path.getmtime(self.trace_file)
+        if mtime == self._mtime:
+            return
+        try:
+            with open(self.trace_file, 'r') as f:
+                self.traces = json.load(f)
+        except:
+            self.traces = []
+        self._mtime = mtime
     
     def log(
         self,
@@ -77,6 +87,7 @@ class TraceAgent:
         try:
             with open(self.trace_file, 'w') as f:
                 json.dump(self.traces, f, indent=2)
+            self._mtime = os.path.getmtime(self.trace_file)
         except Exception as e:
             print(f"Failed to save trace: {e}")
     
@@ -116,6 +127,7 @@ class TraceAgent:
         Returns:
             List of trace entries
         """
+        self._refresh()
         traces = self.traces
         
         if agent:
@@ -128,6 +140,7 @@ class TraceAgent:
     
     def get_summary(self) -> Dict[str, Any]:
         """Get summary statistics of all traces."""
+        self._refresh()
         agents = {}
         for trace in self.traces:
             agent = trace["agent"]
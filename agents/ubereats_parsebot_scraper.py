@@ -5,17 +5,30 @@ import os
 import json
 from typing import Dict, Any, List
 from datetime import datetime
+import numpy as np
 import pandas as pd
 from pathlib import Path
+from services.order_store import get_order_store, normalize_orders, explode_order_items
 
 
 class UberEatsParseBotScraper:
     """Scraper for Uber Eats merchant dashboard using parse.bot."""
     
-    def __init__(self, restaurant_id: str, trace_agent=None):
+    def __init__(self, restaurant_id: str, trace_agent=None, incremental: bool = True):
+        """
+        Args:
+            restaurant_id: Uber Eats store UUID
+            trace_agent: Optional trace logger
+            incremental: Page through order history only back to the last
+                stored order (resumable); otherwise just the dashboard's recent orders
+        """
         self.restaurant_id = restaurant_id
         self.trace = trace_agent
+        self.incremental = incremental
         self.base_url = f"https://merchants.ubereats.com/manager/home/{restaurant_id}"
+        self.orders_url = f"https://merchants.ubereats.com/manager/orders/{restaurant_id}"
+        self.source = f"ubereats:{restaurant_id}"
+        self.order_store = get_order_store()
         
         print(f"[INIT] UberEats ParseBot Scraper for: {restaurant_id}")
     
@@ -139,8 +152,21 @@ Return as array of reviews.
                 reviews_result
             )
             
+            # Order history first: only pages newer than the last stored order
+            # (before the dashboard's recent orders, which would end paging early)
+            if self.incremental:
+                print("[PARSEBOT] Fetching new orders since last checkpoint...")
+                ingest = self.order_store.ingest_pages(
+                    self.source,
+                    lambda page, checkpoint: self._fetch_orders_page(parsebot, page, checkpoint)
+                )
+                results["ingest"] = ingest
+                print(f"[OK] {ingest['rows_written']} new order items from {ingest['pages']} pages")
+            
             # Save to CSV
             saved_files = self._save_to_csv(all_data)
+            if results.get("ingest", {}).get("rows_written") and self.order_store.orders_file not in saved_files:
+                saved_files.append(self.order_store.orders_file)
             
             results["success"] = True
             results["data"] = all_data
@@ -181,9 +207,9 @@ Return as array of reviews.
         """Process parse.bot results into structured data."""
         
         processed = {
-            "orders": [],
-            "menu": [],
-            "reviews": [],
+            "orders": normalize_orders([]),
+            "menu": pd.DataFrame(columns=["name", "price", "description", "category", "available"]),
+            "reviews": pd.DataFrame(columns=["date", "rating", "review_text", "sentiment", "channel"]),
             "summary": {}
         }
         
@@ -197,106 +223,105 @@ Return as array of reviews.
                 "location": dash_data.get("location", "")
             }
             
-            # Process orders
-            orders_list = dash_data.get("orders", [])
-            for order in orders_list:
-                processed["orders"].append({
-                    "timestamp": order.get("time", datetime.now().isoformat()),
-                    "order_id": order.get("id", ""),
-                    "items": order.get("items", []),
-                    "total": order.get("total", 0),
-                    "status": order.get("status", ""),
-                    "channel": "ubereats"
-                })
+            # Process orders (one row per order, item lists kept for explosion)
+            processed["orders"] = normalize_orders(dash_data.get("orders", []))
         
         # Process menu
         if menu.get("success"):
-            menu_data = menu.get("data", {})
-            menu_items = menu_data.get("menu_items", [])
+            menu_items = menu.get("data", {}).get("menu_items", [])
             
-            for item in menu_items:
-                processed["menu"].append({
-                    "name": item.get("name", ""),
-                    "price": item.get("price", 0),
-                    "description": item.get("description", ""),
-                    "category": item.get("category", ""),
-                    "available": item.get("availability", "available") == "available"
+            if menu_items:
+                menu_df = pd.json_normalize(menu_items).reindex(
+                    columns=["name", "price", "description", "category", "availability"]
+                ).fillna({"name": "", "price": 0, "description": "", "category": "", "availability": "available"})
+                
+                processed["menu"] = pd.DataFrame({
+                    "name": menu_df["name"],
+                    "price": menu_df["price"],
+                    "description": menu_df["description"],
+                    "category": menu_df["category"],
+                    "available": menu_df["availability"].eq("available")
                 })
         
         # Process reviews
         if reviews.get("success"):
-            reviews_data = reviews.get("data", {})
-            reviews_list = reviews_data.get("reviews", [])
+            reviews_list = reviews.get("data", {}).get("reviews", [])
             
-            for review in reviews_list:
-                processed["reviews"].append({
-                    "date": review.get("date", datetime.now().strftime("%Y-%m-%d")),
-                    "rating": review.get("rating", 5),
-                    "review_text": review.get("text", ""),
-                    "sentiment": self._analyze_sentiment(review.get("rating", 5)),
+            if reviews_list:
+                reviews_df = pd.json_normalize(reviews_list).reindex(
+                    columns=["date", "rating", "text"]
+                ).fillna({"date": datetime.now().strftime("%Y-%m-%d"), "text": ""})
+                ratings = pd.to_numeric(reviews_df["rating"], errors="coerce").fillna(5)
+                
+                processed["reviews"] = pd.DataFrame({
+                    "date": reviews_df["date"],
+                    "rating": ratings,
+                    "review_text": reviews_df["text"],
+                    "sentiment": self._analyze_sentiment(ratings),
                     "channel": "ubereats"
                 })
         
         return processed
     
-    def _analyze_sentiment(self, rating: int) -> str:
-        """Simple sentiment analysis from rating."""
-        if rating >= 4:
-            return "positive"
-        elif rating >= 3:
-            return "neutral"
-        else:
-            return "negative"
+    def _fetch_orders_page(self, parsebot, page: int, checkpoint: Dict[str, Any]) -> pd.DataFrame:
+        """Extract one newest-first page of order history as order-item rows."""
+        since = checkpoint.get("last_timestamp") or "the earliest available order"
+        
+        result = parsebot.scrape_with_ai(
+            url=f"{self.orders_url}?page={page}",
+            instructions=f"""
+Extract the orders on this page of the Uber Eats order history (newest first).
+
+For each order, extract:
+- Order UUID (or order ID if no UUID is shown)
+- Date and time placed
+- Items ordered (list with quantities)
+- Total amount
+- Status
+
+Only orders placed after {since} are needed.
+Return as array of orders.
+""",
+            output_schema={"orders": "array"}
+        )
+        
+        if not result.get("success"):
+            # Leave the checkpoint on this page so the next run resumes here
+            raise Exception(f"Order history page {page} failed: {result.get('error')}")
+        
+        return explode_order_items(normalize_orders(result.get("data", {}).get("orders", [])))
+    
+    def _analyze_sentiment(self, ratings: pd.Series) -> np.ndarray:
+        """Simple sentiment analysis from ratings (4+ positive, 3 neutral)."""
+        return np.select([ratings >= 4, ratings >= 3], ["positive", "neutral"], default="negative")
     
     def _save_to_csv(self, data: Dict[str, Any]) -> List[str]:
         """Save extracted data to CSV files."""
         saved_files = []
         
-        # Save orders
-        if data.get('orders'):
-            orders_df = pd.DataFrame(data['orders'])
-            
-            # Expand items column if it's a list
-            if 'items' in orders_df.columns and len(orders_df) > 0:
-                # Create individual rows for each item
-                rows = []
-                for _, order in orders_df.iterrows():
-                    items = order['items'] if isinstance(order['items'], list) else [order['items']]
-                    for item in items:
-                        item_name = item if isinstance(item, str) else item.get('name', 'Unknown')
-                        rows.append({
-                            'timestamp': order['timestamp'],
-                            'order_id': order['order_id'],
-                            'item': item_name,
-                            'quantity': 1,
-                            'price': order['total'] / len(items) if len(items) > 0 else order['total'],
-                            'channel': 'ubereats',
-                            'customer_type': 'regular',
-                            'payment_method': 'card',
-                            'prep_time_min': 10,
-                            'delivery_time_min': 25
-                        })
-                
-                if rows:
-                    orders_df = pd.DataFrame(rows)
-                    orders_df.to_csv('data/orders_realtime.csv', index=False)
-                    saved_files.append('data/orders_realtime.csv')
-                    print(f"[OK] Saved {len(orders_df)} order items to data/orders_realtime.csv")
+        # Append new orders (deduplicated by order ID) to the order store in one write
+        if len(data.get('orders', [])):
+            orders_df = explode_order_items(data['orders'])
+            written = self.order_store.append_orders(orders_df, source=self.source)
+            if written:
+                saved_files.append(self.order_store.orders_file)
+            print(f"[OK] Appended {written} new order items to {self.order_store.orders_file}")
         
         # Save menu
-        if data.get('menu'):
+        if len(data.get('menu', [])):
             menu_df = pd.DataFrame(data['menu'])
             menu_df.to_csv('data/menu_items.csv', index=False)
             saved_files.append('data/menu_items.csv')
             print(f"[OK] Saved {len(menu_df)} menu items to data/menu_items.csv")
         
         # Save reviews
-        if data.get('reviews'):
+        if len(data.get('reviews', [])):
             reviews_df = pd.DataFrame(data['reviews'])
             
-            # Add keywords column
-            reviews_df['keywords'] = reviews_df['review_text'].apply(
-                lambda x: ', '.join([w for w in str(x).lower().split() if len(w) > 4][:5]) if pd.notna(x) else ''
+            # Add keywords column (first five words longer than 4 characters)
+            reviews_df['keywords'] = (
+                reviews_df['review_text'].fillna('').astype(str).str.lower()
+                .str.findall(r'\S{5,}').str[:5].str.join(', ')
             )
             
             reviews_df.to_csv('data/customer_reviews.csv', index=False)
@@ -7,6 +7,7 @@ from typing import Dict, Any, List
 from datetime import datetime
 import pandas as pd
 from pathlib import Path
+from services.order_store import get_order_store
 
 
 class UberEatsScraperAgent:
@@ -49,16 +50,19 @@ class UberEatsScraperAgent:
             
             browser = BrowserUseClient(api_key, gemini_key)
             
+            # Tasks run in parallel in separate pooled contexts, so each starts from the dashboard
+            dashboard_url = f"https://merchants.ubereats.com/manager/home/{self.restaurant_id}"
+            
             # Task 1: Navigate to dashboard and extract orders
             if self.trace:
                 self.trace.log(
                     agent="UberEatsScraperAgent",
                     action="Navigating to Uber Eats dashboard",
-                    url=f"https://merchants.ubereats.com/manager/home/{self.restaurant_id}"
+                    url=dashboard_url
                 )
             
             dashboard_task = f"""
-STEP 1: Navigate to https://merchants.ubereats.com/manager/home/{self.restaurant_id}
+STEP 1: Navigate to {dashboard_url}
 
 STEP 2: Wait 5 seconds for page to fully load
 
@@ -83,20 +87,10 @@ STEP 7: Extract at least 20-30 recent orders with full details
 STEP 8: Take a screenshot and save the extracted data
 """
             
-            print("[BROWSER] Navigating to Uber Eats dashboard...")
-            print(f"[URL] https://merchants.ubereats.com/manager/home/{self.restaurant_id}")
-            
-            dashboard_result = await browser.execute_task(dashboard_task, max_steps=25)
-            
-            if self.trace:
-                self.trace.log(
-                    agent="UberEatsScraperAgent",
-                    action="Dashboard data extracted",
-                    result=f"Extracted: {len(dashboard_result.get('history', []))} steps"
-                )
-            
             # Task 2: Navigate to orders page for detailed history
             orders_task = f"""
+STEP 0: Navigate to {dashboard_url}
+
 STEP 1: Look for "Orders" or "Order History" link in the navigation menu
 
 STEP 2: Click it to go to the orders page
@@ -121,19 +115,10 @@ STEP 6: Extract at least 30 orders total
 STEP 7: Export or copy the data in structured format
 """
             
-            print("[BROWSER] Navigating to Orders section...")
-            
-            orders_result = await browser.execute_task(orders_task, max_steps=30)
-            
-            if self.trace:
-                self.trace.log(
-                    agent="UberEatsScraperAgent",
-                    action="Order history extracted",
-                    result="Detailed orders retrieved"
-                )
-            
             # Task 3: Extract menu data
             menu_task = f"""
+STEP 0: Navigate to {dashboard_url}
+
 STEP 1: Find and click "Menu" or "Items" in the navigation
 
 STEP 2: Wait for menu items to load
@@ -158,19 +143,10 @@ STEP 5: Extract complete menu with all items
 STEP 6: Note which items are your best sellers (if that data is visible)
 """
             
-            print("[BROWSER] Navigating to Menu section...")
-            
-            menu_result = await browser.execute_task(menu_task, max_steps=25)
-            
-            if self.trace:
-                self.trace.log(
-                    agent="UberEatsScraperAgent",
-                    action="Menu data extracted",
-                    result="Menu items retrieved"
-                )
-            
             # Task 4: Extract reviews/ratings
             reviews_task = f"""
+STEP 0: Navigate to {dashboard_url}
+
 STEP 1: Find and click "Reviews", "Ratings", or "Feedback" in navigation
 
 STEP 2: Wait for reviews to load
@@ -190,16 +166,32 @@ STEP 5: Extract at least 15-20 recent reviews
 STEP 6: Note overall rating average if displayed
 """
             
-            print("[BROWSER] Navigating to Reviews section...")
+            print("[BROWSER] Scraping dashboard, orders, menu and reviews in parallel...")
+            print(f"[URL] {dashboard_url}")
             
-            reviews_result = await browser.execute_task(reviews_task, max_steps=25)
+            try:
+                dashboard_result, orders_result, menu_result, reviews_result = await browser.execute_many([
+                    {"task": dashboard_task, "max_steps": 25},
+                    {"task": orders_task, "max_steps": 30},
+                    {"task": menu_task, "max_steps": 25},
+                    {"task": reviews_task, "max_steps": 25}
+                ])
+            finally:
+                await browser.close()
             
             if self.trace:
-                self.trace.log(
-                    agent="UberEatsScraperAgent",
-                    action="Reviews extracted",
-                    result="Customer reviews retrieved"
-                )
+                for action, scrape_result in [
+                    ("Dashboard data extracted", dashboard_result),
+                    ("Order history extracted", orders_result),
+                    ("Menu data extracted", menu_result),
+                    ("Reviews extracted", reviews_result)
+                ]:
+                    self.trace.log(
+                        agent="UberEatsScraperAgent",
+                        action=action,
+                        result=f"Extracted: {len(scrape_result.get('history', []))} steps"
+                        if scrape_result.get("success") else f"Error: {scrape_result.get('error')}"
+                    )
             
             # Process and structure the data
             structured_data = self._process_scraped_data(
@@ -290,11 +282,12 @@ STEP 6: Note overall rating average if displayed
     def _save_to_csv(self, data: Dict[str, Any]):
         """Save structured data to CSV files."""
         
-        # Save orders
+        # Append new orders (deduplicated by order ID) to the order store
         if data.get('orders'):
             orders_df = pd.DataFrame(data['orders'])
-            orders_df.to_csv('data/orders_realtime.csv', index=False)
-            print(f"[OK] Saved {len(orders_df)} orders to data/orders_realtime.csv")
+            store = get_order_store()
+            written = store.append_orders(orders_df, source=f"ubereats:{self.restaurant_id}")
+            print(f"[OK] Appended {written} new orders to {store.orders_file}")
         
         # Save menu
         if data.get('menu'):
@@ -7,6 +7,8 @@ import pandas as pd
 from datetime import datetime, timedelta
 from typing import Dict, Any
 from services.weather import WeatherService, get_location_coords, search_place
+from services.weather_archive import get_weather_archive
+from services.order_store import atomic_write
 from agents.trace_agent import get_trace_agent
 import pytz
 
@@ -70,13 +72,22 @@ class WeatherAgent:
                 json.dump(raw_forecast, f, indent=2)
             results["artifacts"].append(raw_file)
             
+            # Archive the hours that have already elapsed (incremental history)
+            try:
+                archive = get_weather_archive()
+                archive.register_location(self.restaurant_name, lat, lng)
+                archived = archive.append_from_forecast(self.restaurant_name, raw_forecast)
+                results["archived_hours"] = archived
+            except Exception as e:
+                print(f"[WARN] Could not archive weather history: {e}")
+            
             # Step 3: Process into features DataFrame
             tomorrow = (datetime.now(pytz.timezone(self.timezone)) + timedelta(days=1)).strftime("%Y-%m-%d")
             df = self.weather_service.process_forecast_df(raw_forecast, target_date=tomorrow)
             
-            # Save features CSV
+            # Save features CSV (atomically: forecasts may be reading it)
             csv_file = "artifacts/weather_features.csv"
-            df.to_csv(csv_file, index=False)
+            atomic_write(csv_file, lambda tmp_path: df.to_csv(tmp_path, index=False))
             results["artifacts"].append(csv_file)
             
             # Get summary
@@ -13,6 +13,8 @@ from dotenv import load_dotenv
 sys.path.insert(0, str(Path(__file__).parent.parent))
 load_dotenv()
 
+from services.scheduler import get_schedule_store
+
 # Page config
 st.set_page_config(
     page_title="Brew.AI - Dashboard",
@@ -311,6 +313,40 @@ if st.session_state.simulation_mode and 'simulation_results' in st.session_state
 
 st.markdown("---")
 
+# Tomorrow's plan from scheduled agent runs (scripts/run_scheduler.py)
+schedule_store = get_schedule_store()
+scheduled = {name: schedule_store.latest(name) for name in ("weather", "forecast", "prep")}
+
+if scheduled['forecast'] or scheduled['prep']:
+    st.markdown("### 🗓️ Tomorrow's Plan (Precomputed)")
+    
+    col1, col2, col3, col4 = st.columns(4)
+    if scheduled['forecast']:
+        f = scheduled['forecast']['result']
+        # The latest run may be from an earlier day (e.g. today's 5am run failed)
+        predictions = f.get('predictions') or []
+        forecast_day = datetime.fromisoformat(predictions[0]['datetime']).date() if predictions else None
+        if forecast_day == (datetime.now() + timedelta(days=1)).date():
+            day_label = "Tomorrow's"
+        else:
+            day_label = f"{forecast_day:%b %d}" if forecast_day else "Forecast"
+            st.warning(f"⚠️ No forecast for tomorrow yet; showing the latest one ({day_label}).")
+        with col1:
+            st.metric(f"{day_label} Orders", f"{f.get('total_daily_orders', 0):.0f}")
+        with col2:
+            st.metric(f"{day_label} Revenue", f"${f.get('total_daily_revenue', 0):,.2f}")
+        with col3:
+            st.metric("Peak Hour", f"{f.get('peak_hour')}:00")
+    if scheduled['prep']:
+        with col4:
+            st.metric("Wings PO", f"{scheduled['prep']['result'].get('wings_lbs', 0)} lbs")
+    
+    st.caption(" • ".join(
+        f"{name.title()} v{version['version']} at {datetime.fromisoformat(version['created_at']).strftime('%b %d %I:%M %p')}"
+        for name, version in scheduled.items() if version
+    ))
+    st.markdown("---")
+
 # Real-Time Dashboard with ACTUAL DATA
 st.markdown("### 📊 Today's Performance (Live Data)")
 
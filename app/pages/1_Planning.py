@@ -4,22 +4,52 @@ Planning Page - Run all agents for tomorrow or week
 import streamlit as st
 import sys
 import os
-import asyncio
+import time
 from pathlib import Path
 from datetime import datetime, timedelta
 
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
-from agents.scraper_agent import run_scraper_agent
-from agents.weather_agent import run_weather_agent
-from agents.forecast_agent_lstm import run_forecast_agent_lstm
-from agents.staffing_agent import run_staffing_agent
-from agents.prep_agent import run_prep_agent
-from agents.geo_agent import run_geo_agent
-from agents.trace_agent import get_trace_agent
+# Agent runners load lazily; heavy ML deps import on first run
+from agents import run_planning_workflow
+from services.job_queue import get_job_queue, ACTIVE_STATUSES, QUEUED, DONE, FAILED
 
 st.set_page_config(page_title="Planning", page_icon="📅", layout="wide")
 
+WORKFLOW_ARGS = {
+    "restaurant_name": "Burger Queen",
+    "restaurant_address": "123 Main St, NYC",
+    "staff": ["Alice", "Bob", "Carol", "Dave"],
+    "expansion_city": "San Francisco, CA"
+}
+
+
+def store_results(results: dict):
+    """Save workflow results under this page's step keys; returns the workflow error."""
+    results = dict(results)
+    error = results.pop('error', None)
+    if 'geo' in results:
+        results['expansion'] = results.pop('geo')
+    st.session_state.agent_results = results
+    return error
+
+
+def render_step_summaries(results: dict):
+    """One line per finished agent."""
+    if 'scraper' in results:
+        st.write(f"✅ Scraped {len(results['scraper'].get('gmaps_reviews', []))} reviews")
+    if 'weather' in results:
+        st.write("✅ Forecast loaded")
+    if 'forecast' in results:
+        st.write(f"✅ Peak: {results['forecast'].get('peak_hour')}:00 with {results['forecast'].get('peak_orders')} orders")
+    if 'staffing' in results:
+        st.write(f"✅ {results['staffing'].get('required_cooks')} cooks needed")
+    if 'prep' in results:
+        st.write(f"✅ PO for {results['prep'].get('wings_lbs')} lbs")
+    if 'expansion' in results:
+        st.write(f"✅ Analyzed {len(results['expansion'].get('locations', []))} locations")
+
+
 st.title("📅 AI-Powered Planning")
 st.caption("Automated operations planning with 8 intelligent agents")
 
@@ -44,6 +74,20 @@ if 'agents_running' not in st.session_state:
     st.session_state.agents_running = False
 if 'agent_results' not in st.session_state:
     st.session_state.agent_results = {}
+if 'planning_job_id' not in st.session_state:
+    st.session_state.planning_job_id = None
+
+# Poll the job submitted to the agent worker
+queue = get_job_queue()
+job = queue.get(st.session_state.planning_job_id) if st.session_state.planning_job_id else None
+if job and job['status'] == DONE:
+    error = store_results(job['result'] or {})
+    if error:
+        st.error(f"Error: {error}")
+    st.session_state.planning_job_id = None
+elif job and job['status'] == FAILED:
+    st.error(f"Error: {job['error']}")
+    st.session_state.planning_job_id = None
 
 # Progress indicator
 steps = [
@@ -67,61 +111,32 @@ for i, (col, (name, key)) in enumerate(zip(cols, steps)):
 if st.button(f"▶️ Plan {planning_mode}", type="primary", use_container_width=True):
     st.session_state.agents_running = True
     
+    if queue.worker_available():
+        # Run on the agent worker (warm models); this page just polls
+        st.session_state.agent_results = {}
+        st.session_state.planning_job_id = queue.submit("run_planning_workflow", kwargs=WORKFLOW_ARGS)
+        st.rerun()
+    
     with st.status("🚀 Running agents...", expanded=True) as status:
-        # Run agents sequentially
-        try:
-            # Scraper
-            st.write("🔍 ScraperAgent: Collecting reviews...")
-            scraper_result = run_scraper_agent("Burger Queen", "123 Main St, NYC")
-            st.session_state.agent_results['scraper'] = scraper_result
-            st.write(f"✅ Scraped {len(scraper_result.get('gmaps_reviews', []))} reviews")
-            
-            # Weather
-            st.write("🌤️ WeatherAgent: Fetching forecast...")
-            weather_result = run_weather_agent("Burger Queen", "123 Main St, NYC")
-            st.session_state.agent_results['weather'] = weather_result
-            st.write(f"✅ Forecast loaded")
-            
-            # Forecast
-            st.write("📈 ForecastAgent: Running LSTM prediction...")
-            forecast_result = run_forecast_agent_lstm()
-            st.session_state.agent_results['forecast'] = forecast_result
-            st.write(f"✅ Peak: {forecast_result.get('peak_hour')}:00 with {forecast_result.get('peak_orders')} orders")
-            
-            # Staffing
-            if forecast_result.get('success'):
-                st.write("👥 StaffingAgent: Calculating needs...")
-                staffing_result = run_staffing_agent(
-                    ["Alice", "Bob", "Carol", "Dave"],
-                    "Burger Queen",
-                    forecast_result['peak_hour'],
-                    forecast_result['peak_orders']
-                )
-                st.session_state.agent_results['staffing'] = staffing_result
-                st.write(f"✅ {staffing_result.get('required_cooks')} cooks needed")
-            
-            # Prep
-            if forecast_result.get('success') and weather_result.get('success'):
-                st.write("📦 PrepAgent: Creating purchase orders...")
-                prep_result = run_prep_agent(
-                    "Burger Queen",
-                    forecast_result['peak_orders'],
-                    weather_result.get('summary', {})
-                )
-                st.session_state.agent_results['prep'] = prep_result
-                st.write(f"✅ PO for {prep_result.get('wings_lbs')} lbs")
-            
-            # Expansion
-            st.write("🗺️ GeoAgent: Analyzing expansion...")
-            geo_result = run_geo_agent("San Francisco, CA")
-            st.session_state.agent_results['expansion'] = geo_result
-            st.write(f"✅ Analyzed {len(geo_result.get('locations', []))} locations")
-            
-            status.update(label="✅ All agents complete!", state="complete")
-            
-        except Exception as e:
-            st.error(f"Error: {str(e)}")
+        # No worker running: run agents sequentially in this session
+        results = run_planning_workflow(progress=lambda message, step: st.write(message), **WORKFLOW_ARGS)
+        error = store_results(results)
+        render_step_summaries(st.session_state.agent_results)
+        
+        if error:
+            st.error(f"Error: {error}")
             status.update(label="❌ Agent execution failed", state="error")
+        else:
+            status.update(label="✅ All agents complete!", state="complete")
+
+if job and job['status'] in ACTIVE_STATUSES:
+    with st.status("🚀 Running agents on agent worker...", expanded=True):
+        if job['status'] == QUEUED:
+            st.write("Waiting for a free worker slot...")
+        for event in queue.events(job['job_id']):
+            st.write(event['message'])
+    time.sleep(1)
+    st.rerun()
 
 # Show results
 if st.session_state.agent_results:
@@ -159,6 +174,9 @@ if st.session_state.agent_results:
             st.markdown(f"**Item:** {po.get('item')}")
             st.markdown(f"**Quantity:** {po.get('quantity')} {po.get('unit')}")
             st.markdown(f"**Delivery:** {po.get('delivery_date')}")
+            
+            for supplier_po in result.get('purchase_orders', []):
+                st.markdown(f"**{supplier_po['supplier']}** - {len(supplier_po['lines'])} items, ${supplier_po['total_cost']:,.2f} (delivery {supplier_po['delivery_date']})")
     
     with tabs[3]:
         if 'expansion' in st.session_state.agent_results:
@@ -12,6 +12,8 @@ import numpy as np
 
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
+from services.kpi_cube import KPICube, get_kpi_cube, CUBE_FILE, METRIC_LABELS, DAY_NAMES
+
 st.set_page_config(page_title="Analytics", page_icon="📈", layout="wide")
 
 st.title("📈 Analytics & Insights")
@@ -74,6 +76,123 @@ else:
 
 st.markdown("---")
 
+# Operational KPIs from the precomputed order-timing cube
+st.markdown("### ⏱️ Operations KPIs (Uber Eats Order Timings)")
+
+
+@st.cache_resource(show_spinner=False, max_entries=1)
+def load_kpi_cube(mtime: float):
+    """Load the KPI cube once per file version (built from the export if missing or outdated)."""
+    if not mtime:
+        return get_kpi_cube()
+    cube = KPICube()
+    if cube.total_orders == 0:
+        cube.refresh()
+    return cube
+
+
+kpi_cube = load_kpi_cube(os.path.getmtime(CUBE_FILE) if os.path.exists(CUBE_FILE) else 0.0)
+
+if kpi_cube.total_orders == 0:
+    st.info("No order timing data yet. Import your Uber Eats exports: `python scripts/import_ubereats_exports.py`")
+else:
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        kpi_channels = st.multiselect("Channel", kpi_cube.channels, default=kpi_cube.channels)
+    with col2:
+        kpi_brands = st.multiselect("Brand", kpi_cube.brands, default=kpi_cube.brands)
+    with col3:
+        kpi_days = st.multiselect("Days", DAY_NAMES, default=DAY_NAMES)
+    with col4:
+        kpi_metric = st.selectbox(
+            "Metric",
+            list(METRIC_LABELS),
+            index=list(METRIC_LABELS).index("prep_time"),
+            format_func=METRIC_LABELS.get
+        )
+
+    kpi_filters = {
+        "channels": kpi_channels,
+        "brands": kpi_brands,
+        "days": [DAY_NAMES.index(d) for d in kpi_days]
+    }
+    kpi = kpi_cube.summary(**kpi_filters)
+
+    def _minutes(value):
+        return "—" if pd.isna(value) else f"{value:.1f} min"
+
+    col1, col2, col3, col4, col5 = st.columns(5)
+    with col1:
+        st.metric("Orders", f"{int(kpi['orders']):,}")
+    with col2:
+        st.metric("Prep Time p50 / p90", f"{_minutes(kpi['prep_time_p50'])} / {_minutes(kpi['prep_time_p90'])}")
+    with col3:
+        st.metric("Courier Wait p90", _minutes(kpi['courier_wait_p90']))
+    with col4:
+        st.metric(
+            "Avoidable Courier Wait",
+            "—" if pd.isna(kpi['avoidable_wait_share']) else f"{kpi['avoidable_wait_share']:.0%}",
+            help="Share of orders where the courier waited on the restaurant avoidably"
+        )
+    with col5:
+        st.metric("Order Duration p90", _minutes(kpi['order_duration_p90']))
+
+    col1, col2 = st.columns(2)
+
+    with col1:
+        by_hour = kpi_cube.slice(by=["hour"], metrics=[kpi_metric], **kpi_filters)
+        by_hour = by_hour[by_hour["orders"] > 0]
+
+        hour_fig = go.Figure()
+        hour_fig.add_trace(go.Bar(
+            x=by_hour["hour"],
+            y=by_hour["orders"],
+            name="Orders",
+            marker_color="rgba(107,114,128,0.5)",
+            yaxis="y2"
+        ))
+        for q, color in [("p50", "#10B981"), ("p90", "#FF6B35")]:
+            hour_fig.add_trace(go.Scatter(
+                x=by_hour["hour"],
+                y=by_hour[f"{kpi_metric}_{q}"],
+                mode="lines+markers",
+                name=q,
+                line=dict(color=color, width=3)
+            ))
+        hour_fig.update_layout(
+            title=f"{METRIC_LABELS[kpi_metric]} by Hour",
+            xaxis_title="Hour",
+            yaxis=dict(title="Minutes"),
+            yaxis2=dict(title="Orders", overlaying="y", side="right", showgrid=False),
+            height=400,
+            template="plotly_dark"
+        )
+        st.plotly_chart(hour_fig, use_container_width=True)
+
+    with col2:
+        grid = kpi_cube.slice(by=["hour", "dow"], metrics=[kpi_metric], quantiles=[0.9], **kpi_filters)
+        grid = grid[grid["hour"].isin(by_hour["hour"])]
+        heat = grid.pivot(index="day", columns="hour", values=f"{kpi_metric}_p90").reindex(
+            [d for d in DAY_NAMES if d in kpi_days]
+        )
+
+        heat_fig = go.Figure(data=go.Heatmap(
+            z=heat.values,
+            x=heat.columns,
+            y=heat.index,
+            colorscale="YlOrRd",
+            colorbar=dict(title="min")
+        ))
+        heat_fig.update_layout(
+            title=f"{METRIC_LABELS[kpi_metric]} p90 (Day × Hour)",
+            xaxis_title="Hour",
+            height=400,
+            template="plotly_dark"
+        )
+        st.plotly_chart(heat_fig, use_container_width=True)
+
+st.markdown("---")
+
 # Sentiment Analysis
 st.markdown("### 😊 Review Sentiment Analysis")
 
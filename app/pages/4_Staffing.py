@@ -27,6 +27,7 @@ days = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sun
 baseline_orders = {}
 peak_hours_data = {}
 reasoning = {}
+day_inputs = {}
 
 for i, day in enumerate(days):
     # Base calculations with day-specific factors
@@ -93,14 +94,59 @@ for i, day in enumerate(days):
         peak_hours_data[day] = [5, 10, 20, 35, 45, 42, 38, 40, 35, 28, 20, 15]
         peak_time = "12-2pm (brunch)"
     
+    day_inputs[day] = {
+        'weather': weather,
+        'event': event,
+        'final_orders': final_orders,
+        'peak_time': peak_time
+    }
+
+
+@st.cache_resource(show_spinner=False)
+def load_capacity_model():
+    """Fit the Erlang-C capacity model once per server process."""
+    from services.capacity_model import CapacityModel
+    return CapacityModel()
+
+
+@st.cache_data(show_spinner=False)
+def solve_weekly_staffing(hourly_by_date: tuple) -> dict:
+    """Solve the week's shifts from hourly forecasts (cached per forecast)."""
+    from services.staffing_optimizer import StaffingOptimizer, load_roster
+    
+    optimizer = StaffingOptimizer(
+        load_roster(),
+        min_staff={"Cook": 2, "Cashier": 2},
+        requirement_fn=load_capacity_model().requirement_fn
+    )
+    forecasts = {
+        date: {"hours": list(range(10, 22)), "orders": list(orders)}
+        for date, orders in hourly_by_date
+    }
+    return optimizer.solve_week(forecasts)
+
+
+# Hour-by-hour shift plan for this week (Monday first)
+week_start = datetime.now().date() - timedelta(days=datetime.now().weekday())
+day_dates = {day: (week_start + timedelta(days=i)).strftime('%Y-%m-%d') for i, day in enumerate(days)}
+capacity_model = load_capacity_model()
+week_plan = solve_weekly_staffing(tuple(
+    (day_dates[day], tuple(peak_hours_data[day])) for day in days
+))
+
+for day in days:
+    weather = day_inputs[day]['weather']
+    event = day_inputs[day]['event']
+    final_orders = day_inputs[day]['final_orders']
+    peak_time = day_inputs[day]['peak_time']
+    day_plan = week_plan['days'][day_dates[day]]
+    
     # Calculate staffing needs
     peak_hourly = max(peak_hours_data[day])
     
-    # Staffing formula: 1 cook per 25 orders/hour, min 2, max 4
-    cooks_needed = max(2, min(4, int(np.ceil(peak_hourly / 25))))
-    
-    # Cashiers: 1 per 30 orders/hour, min 2, max 3
-    cashiers_needed = max(2, min(3, int(np.ceil(peak_hourly / 30))))
+    # Staff needed at the busiest hour, from the per-hour coverage plan
+    cooks_needed = max(day_plan['coverage'].get('Cook', {}).get('required', [0]))
+    cashiers_needed = max(day_plan['coverage'].get('Cashier', {}).get('required', [0]))
     
     # Additional staff for high volume
     prep_cook = 1 if final_orders > 200 else 0
@@ -114,7 +160,9 @@ for i, day in enumerate(days):
     if event['event']:
         reason_parts.append(f"**Event:** {event['event']} (+{int((event['factor']-1)*100)}%)")
     reason_parts.append(f"**Peak:** {peak_time} ({peak_hourly} orders/hr)")
-    reason_parts.append(f"**Required:** {cooks_needed} cooks (1 per 25 ord/hr), {cashiers_needed} cashiers")
+    reason_parts.append(f"**Required at peak:** {cooks_needed} cooks, {cashiers_needed} cashiers "
+                        f"({len(day_plan['shifts'])} hour-by-hour shifts, "
+                        f"≥{capacity_model.service_level:.0%} of orders wait ≤{capacity_model.target_wait_min:.0f} min)")
     if prep_cook:
         reason_parts.append(f"**Prep cook needed:** High volume day (>{200} orders)")
     
@@ -128,7 +176,8 @@ for i, day in enumerate(days):
         'peak_hour': peak_time,
         'peak_orders': peak_hourly,
         'weather': weather,
-        'event': event
+        'event': event,
+        'plan': day_plan
     }
 
 # Display weekly cards
@@ -213,75 +262,29 @@ with col3:
 st.markdown("---")
 st.markdown("### 👤 Individual Assignments")
 
-# Load from CSV if available
-staff_names = []
-if os.path.exists("data/staff_schedule.csv"):
-    try:
-        import pandas as pd
-        staff_df = pd.read_csv("data/staff_schedule.csv")
-        today_str = datetime.now().strftime('%Y-%m-%d')
-        today_staff = staff_df[staff_df['date'] == today_str]
-        if not today_staff.empty:
-            staff_names = today_staff['staff_name'].tolist()
-    except:
-        pass
-
-# Fallback to demo staff
-if not staff_names:
-    staff_names = ["Alice Johnson", "Bob Martinez", "Carol Smith", "Dave Wilson", "Emma Davis"]
-
-# Generate realistic schedule
+# Shifts from the hour-by-hour plan
 schedule_data = []
 
-# Cooks
-cook_shifts = [
-    ("10:00", "18:00", "Morning/lunch coverage"),
-    ("12:00", "20:00", "Lunch/dinner overlap"),
-    ("14:00", "22:00", "Afternoon/dinner coverage"),
-    ("17:00", "22:00", "Dinner rush support")
-]
-
-for i in range(today_reasoning['cooks']):
-    if i < len(staff_names):
-        shift = cook_shifts[i]
-        schedule_data.append({
-            "Staff": staff_names[i],
-            "Role": "Cook",
-            "Shift": f"{shift[0]} - {shift[1]}",
-            "Reason": shift[2],
-            "Status": "✅ Scheduled"
-        })
-
-# Cashiers
-cashier_shifts = [
-    ("10:00", "18:00", "Opening/lunch shift"),
-    ("16:00", "22:00", "Dinner/closing shift"),
-    ("12:00", "20:00", "Peak coverage")
-]
-
-for i in range(today_reasoning['cashiers']):
-    staff_idx = today_reasoning['cooks'] + i
-    if staff_idx < len(staff_names):
-        shift = cashier_shifts[i % len(cashier_shifts)]
-        schedule_data.append({
-            "Staff": staff_names[staff_idx],
-            "Role": "Cashier",
-            "Shift": f"{shift[0]} - {shift[1]}",
-            "Reason": shift[2],
-            "Status": "✅ Scheduled"
-        })
+for shift in today_reasoning['plan']['shifts']:
+    schedule_data.append({
+        "Staff": shift['staff'],
+        "Role": shift['role'],
+        "Shift": f"{shift['start_time']} - {shift['end_time']}",
+        "Hours": shift['shift_hours'],
+        "Cost": f"${shift['cost']:,.2f}",
+        "Status": "🟡 To hire" if "(TBH)" in shift['staff'] else "✅ Scheduled"
+    })
 
 # Prep cook if needed
 if today_reasoning['prep'] > 0:
-    prep_idx = today_reasoning['cooks'] + today_reasoning['cashiers']
-    if prep_idx < len(staff_names):
-        schedule_data.append({
-            "Staff": staff_names[prep_idx],
-            "Role": "Prep Cook",
-            "Shift": "08:00 - 16:00",
-            "Reason": "Prep for high volume day",
-            "Status": "✅ Scheduled"
-        })
+    schedule_data.append({
+        "Staff": "Prep Cook",
+        "Role": "Prep Cook",
+        "Shift": "08:00 - 16:00",
+        "Hours": 8,
+        "Cost": f"${8 * 22.00:,.2f}",
+        "Status": "✅ Scheduled"
+    })
 
 df_schedule = pd.DataFrame(schedule_data)
 st.dataframe(df_schedule, use_container_width=True, hide_index=True)
@@ -292,9 +295,8 @@ st.markdown("### 💰 Labor Cost Analysis")
 
 col1, col2, col3, col4 = st.columns(4)
 
-total_hours = len(schedule_data) * 8  # Approximate
-avg_hourly = 19.25  # Mix of cooks ($22) and cashiers ($16.50)
-labor_cost = total_hours * avg_hourly
+total_hours = sum(row['Hours'] for row in schedule_data)
+labor_cost = today_reasoning['plan']['labor_cost'] + (8 * 22.00 if today_reasoning['prep'] > 0 else 0)
 labor_pct = (labor_cost / today_reasoning['revenue']) * 100
 
 with col1:
@@ -326,12 +328,15 @@ else:
 st.markdown("---")
 st.markdown("### 🔧 Capacity Utilization")
 
-# Calculate capacity
-max_capacity_per_cook = 25  # orders per hour
-max_hourly_capacity = today_reasoning['cooks'] * max_capacity_per_cook
-utilization = (today_reasoning['peak_orders'] / max_hourly_capacity) * 100
+# Queueing metrics at the peak hour with the planned cooks
+peak_stats = capacity_model.wait_stats('Cook', today_reasoning['peak_orders'], today_reasoning['cooks'])
+utilization = float(peak_stats['utilization']) * 100
+max_hourly_capacity = int(
+    today_reasoning['cooks'] * capacity_model.SLOTS_PER_STAFF['Cook'] * 60
+    / capacity_model.service['Cook']['mean_min']
+)
 
-col1, col2, col3 = st.columns(3)
+col1, col2, col3, col4 = st.columns(4)
 
 with col1:
     st.metric("Peak Hour Capacity", f"{max_hourly_capacity} orders/hr")
@@ -344,6 +349,11 @@ with col3:
     st.metric("Utilization", f"{utilization:.0f}%",
               delta="Optimal" if 75 <= utilization <= 90 else ("Under" if utilization < 75 else "Over"))
 
+with col4:
+    st.metric("Orders Served in Target", f"{float(peak_stats['service_level']):.0%}",
+              help=f"Share of orders waiting ≤{capacity_model.target_wait_min:.0f} min before prep starts "
+                   f"(avg prep {capacity_model.service['Cook']['mean_min']:.1f} min, fitted from order history)")
+
 if utilization > 95:
     st.error("🚨 **CRITICAL:** Peak capacity exceeded! Add another cook to prevent service delays.")
 elif utilization > 90:
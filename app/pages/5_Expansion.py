@@ -4,17 +4,34 @@ Expansion Insights Page
 import streamlit as st
 import sys
 import os
+import time
 from pathlib import Path
 import plotly.graph_objects as go
 
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
+from services.job_queue import get_job_queue, ACTIVE_STATUSES, QUEUED, DONE, FAILED
+
 st.set_page_config(page_title="Expansion", page_icon="🗺️", layout="wide")
 
 st.title("🗺️ Expansion Insights")
 
+if 'expansion_job_id' not in st.session_state:
+    st.session_state.expansion_job_id = None
+
+# Poll the analysis submitted to the agent worker (a cold grid scan makes
+# hundreds of Places calls, so it doesn't run in this session if a worker is up)
+queue = get_job_queue()
+job = queue.get(st.session_state.expansion_job_id) if st.session_state.expansion_job_id else None
+if job and job['status'] == DONE:
+    st.session_state.expansion_result = job['result'] or {}
+    st.session_state.expansion_job_id = None
+elif job and job['status'] == FAILED:
+    st.error(f"Error: {job['error']}")
+    st.session_state.expansion_job_id = None
+
 # Target city selector
-col1, col2 = st.columns([2, 1])
+col1, col2, col3 = st.columns([2, 1, 1])
 
 with col1:
     target_city = st.selectbox(
@@ -23,12 +40,30 @@ with col1:
     )
 
 with col2:
+    grid_scan = st.toggle("City-wide grid scan", help="Score every ~150m cell instead of preset neighborhoods")
+
+with col3:
     if st.button("🔍 Analyze Locations", type="primary", use_container_width=True):
+        geo_args = {"expansion_city": target_city, "scan_mode": "grid" if grid_scan else "candidates"}
+        if queue.worker_available():
+            st.session_state.expansion_job_id = queue.submit("run_geo_agent", kwargs=geo_args)
+            st.rerun()
+        
+        # No worker running: analyze in this session
         with st.spinner("Analyzing locations..."):
-            from agents.geo_agent import run_geo_agent
-            result = run_geo_agent(target_city)
+            from agents import run_geo_agent
+            result = run_geo_agent(**geo_args)
             st.session_state.expansion_result = result
 
+if job and job['status'] in ACTIVE_STATUSES:
+    with st.status("🔍 Analyzing locations on agent worker...", expanded=True):
+        if job['status'] == QUEUED:
+            st.write("Waiting for a free worker slot...")
+        for event in queue.events(job['job_id']):
+            st.write(event['message'])
+    time.sleep(1)
+    st.rerun()
+
 # Show results if available
 if 'expansion_result' in st.session_state and st.session_state.expansion_result.get('success'):
     result = st.session_state.expansion_result
@@ -37,6 +72,10 @@ if 'expansion_result' in st.session_state and st.session_state.expansion_result.
     st.markdown("---")
     st.markdown(f"### 📍 Top Locations in {target_city}")
     
+    saturated = (result.get('scan') or {}).get('saturated_tiles', 0)
+    if saturated:
+        st.warning(f"⚠️ {saturated} map tiles hit the Places 60-result cap; counts marked + are lower bounds.")
+    
     # Top 3 locations
     for i, loc in enumerate(locations[:3], 1):
         col1, col2 = st.columns([2, 1])
@@ -56,8 +95,8 @@ if 'expansion_result' in st.session_state and st.session_state.expansion_result.
                     Income: {loc['income_score']:.2f}
                 </p>
                 <p style="color: #9CA3AF; font-size: 12px;">
-                    {loc['competitors_count']} competitors nearby • 
-                    {loc['businesses_count']} businesses
+                    {loc['competitors_count']}{'+' if loc.get('counts_capped') else ''} competitors nearby • 
+                    {loc['businesses_count']}{'+' if loc.get('counts_capped') else ''} businesses
                 </p>
             </div>
             """, unsafe_allow_html=True)
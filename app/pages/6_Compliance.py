@@ -272,6 +272,20 @@ with tab2:
                         today = datetime.now().strftime('%Y-%m-%d')
                         today_staff = staff_df[staff_df['date'] == today]
                         context['staff_count'] = len(today_staff) if not today_staff.empty else 0
+                        
+                        # Fryer staffing rules need certified cooks on shift: the roster's
+                        # fryer_certified flag when it has one, otherwise its cooks
+                        on_shift = today_staff
+                        if 'status' in on_shift.columns:
+                            on_shift = on_shift[on_shift['status'] == 'active']
+                        if 'fryer_certified' in on_shift.columns:
+                            certified = on_shift['fryer_certified'].astype(str).str.lower().isin(['true', 'yes', '1'])
+                        else:
+                            certified = on_shift['role'].str.lower() == 'cook'
+                        context['certified_cooks'] = int(certified.sum())
+                    
+                    if os.getenv("ACTIVE_FRYERS"):
+                        context['active_fryers'] = int(os.getenv("ACTIVE_FRYERS"))
                     
                     context['peak_hours'] = "12-2pm, 6-8pm"
                 except Exception as e:
@@ -301,16 +315,20 @@ with tab2:
                     risk = result.get('risk_level', 'UNKNOWN')
                     
                     # Status card
-                    card_class = "compliance-card" if "COMPLIANT" in status.upper() else "violation-card"
+                    is_compliant = status.upper().startswith("COMPLIANT")
+                    card_class = "compliance-card" if is_compliant else "violation-card"
                     
                     st.markdown(f"""
                     <div class="{card_class}">
-                        <h3>{"✅" if "COMPLIANT" in status.upper() else "⚠️"} Compliance Status: {status}</h3>
+                        <h3>{"✅" if is_compliant else "⚠️"} Compliance Status: {status}</h3>
                         <p><strong>Confidence:</strong> {confidence}%</p>
                         <p><strong>Documents Accessed:</strong> {result['documents_accessed']}</p>
                     </div>
                     """, unsafe_allow_html=True)
                     
+                    if result.get('source') == "rules":
+                        st.caption("⚡ Answered instantly from SOP thresholds (no LLM call)")
+                    
                     # Risk level
                     if risk and risk != "UNKNOWN":
                         risk_class = f"risk-{risk.lower()}"
@@ -6,11 +6,13 @@ import sys
 import os
 import json
 from pathlib import Path
-from pyvis.network import Network
 import streamlit.components.v1 as components
 
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
+from services.graph_layout import get_graph_layout
+from services.graph_query import get_graph_query
+
 st.set_page_config(
     page_title="Knowledge Map - Brew.AI",
     page_icon="🧠",
@@ -90,7 +92,7 @@ with st.expander("⚙️ Graph Options"):
     col1, col2, col3 = st.columns(3)
     
     with col1:
-        physics_enabled = st.checkbox("Enable Physics", value=True, help="Force-directed layout with physics simulation")
+        physics_enabled = st.checkbox("Enable Physics", value=False, help="Let nodes settle in the browser (layout is precomputed either way)")
         show_edges = st.checkbox("Show Edge Labels", value=True, help="Display relationship labels on edges")
     
     with col2:
@@ -147,109 +149,35 @@ if st.session_state.get('rebuild_graph') or not os.path.exists("artifacts/knowle
         except Exception as e:
             st.error(f"❌ Error building graph: {e}")
 
+@st.cache_data(show_spinner=False)
+def load_graph_data(mtime: float) -> dict:
+    """Parse the graph export once per file version."""
+    with open("artifacts/knowledge_graph.json", 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
 # Load graph data
+graph_data = None
 if os.path.exists("artifacts/knowledge_graph.json"):
-    with open("artifacts/knowledge_graph.json", 'r', encoding='utf-8') as f:
-        graph_data = json.load(f)
+    graph_data = load_graph_data(os.path.getmtime("artifacts/knowledge_graph.json"))
     
-    st.success(f"📊 Loaded graph: {len(graph_data['nodes'])} nodes, {len(graph_data['edges'])} edges")
-    
-    # Create PyVis network
-    net = Network(
-        height="600px",
-        width="100%",
-        bgcolor="#0e1117",
-        font_color="white",
-        directed=True
-    )
-    
-    # Configure physics
-    if physics_enabled:
-        net.barnes_hut(
-            gravity=-5000,
-            central_gravity=0.3,
-            spring_length=200,
-            spring_strength=0.05,
-            damping=0.09
-        )
-    else:
-        net.toggle_physics(False)
+    # Indexes and traversals are built once per graph version
+    graph_query = get_graph_query(graph_data)
     
-    # Add nodes
-    for node in graph_data['nodes']:
-        node_id = node['id']
-        node_type = node.get('type', 'unknown')
-        color = node.get('color', '#666666')
-        size = node.get('size', 20) * (node_size_scale / 100)
-        title = node.get('title', node_id)
-        
-        # Add security badge for compliance nodes
-        if node.get('secured_by') == 'Nivara' and show_secured:
-            title = f"🔒 SECURED BY NIVARA\n\n{title}\n\nAccess: {node.get('access_level', 'restricted')}"
-        
-        # Add confidence/impact to title
-        if 'confidence' in node:
-            title += f"\n\nConfidence: {node['confidence']*100:.0f}%"
-        if 'impact_score' in node:
-            title += f"\nImpact: {node['impact_score']*100:.0f}%"
-        
-        # Highlight decisions
-        if highlight_decisions and node_type == 'decision':
-            color = "#A855F7"
-            size *= 1.2
-        
-        shape = node.get('shape', 'dot')
-        
-        net.add_node(
-            node_id,
-            label=node_id,
-            color=color,
-            size=size,
-            title=title,
-            shape=shape
-        )
-    
-    # Add edges
-    for edge in graph_data['edges']:
-        source = edge['source']
-        target = edge['target']
-        relationship = edge.get('relationship', '')
-        width = edge.get('width', 1) * edge_width_scale
-        
-        label = relationship if show_edges else ""
-        
-        # Color code edges
-        edge_color = "#666666"
-        if 'confidence' in edge:
-            conf = edge['confidence']
-            if conf > 0.8:
-                edge_color = "#10B981"  # High confidence = green
-            elif conf > 0.6:
-                edge_color = "#F59E0B"  # Medium = yellow
-            else:
-                edge_color = "#EF4444"  # Low = red
-        
-        net.add_edge(
-            source,
-            target,
-            label=label,
-            width=width,
-            color=edge_color,
-            arrows="to"
-        )
+    st.success(f"📊 Loaded graph: {len(graph_data['nodes'])} nodes, {len(graph_data['edges'])} edges")
     
-    # Save and display
+    # Render with precomputed coordinates; HTML is cached per graph version + options
     try:
-        net.save_graph("temp_graph.html")
-        
-        with open("temp_graph.html", 'r', encoding='utf-8') as f:
-            html_content = f.read()
+        html_content = get_graph_layout().render_html(graph_data, {
+            "physics": physics_enabled,
+            "show_edges": show_edges,
+            "node_size_scale": node_size_scale,
+            "edge_width_scale": edge_width_scale,
+            "highlight_decisions": highlight_decisions,
+            "show_secured": show_secured
+        })
         
         components.html(html_content, height=650, scrolling=False)
-        
-        # Clean up
-        if os.path.exists("temp_graph.html"):
-            os.remove("temp_graph.html")
     
     except Exception as e:
         st.error(f"❌ Error rendering graph: {e}")
@@ -273,6 +201,40 @@ if os.path.exists("artifacts/knowledge_graph.json"):
     
     st.markdown("---")
     
+    # Impact tracing
+    st.markdown("### 🔎 Trace Impact")
+    
+    condition_ids = [n['id'] for n in graph_query.nodes_of_type('condition')]
+    decision_ids = [n['id'] for n in graph_query.nodes_of_type('decision')]
+    
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        if condition_ids:
+            source = st.selectbox("Condition", condition_ids, help="Propagate this condition's impact downstream")
+            impacts = graph_query.propagate_impact(source, target_type=None)
+            if impacts:
+                for node_id, impact in list(impacts.items())[:8]:
+                    st.markdown(f"- **{node_id}** ({graph_query.graph.nodes[node_id].get('type', 'node')}) — impact {impact*100:.0f}%")
+            else:
+                st.info(f"Nothing downstream of {source}")
+        else:
+            st.info("No condition nodes in current graph")
+    
+    with col2:
+        if decision_ids:
+            target = st.selectbox("Decision", decision_ids, help="Strongest reasoning paths into this decision")
+            explanations = graph_query.explain(target, k=3)
+            if explanations:
+                for explanation in explanations:
+                    st.markdown(f"- {graph_query.format_path(explanation)} — strength {explanation['strength']*100:.0f}%")
+            else:
+                st.info(f"No upstream reasoning for {target}")
+        else:
+            st.info("No decision nodes in current graph")
+    
+    st.markdown("---")
+    
     # Node details
     st.markdown("### 📋 Node Details")
     
@@ -280,7 +242,7 @@ if os.path.exists("artifacts/knowledge_graph.json"):
     tabs = st.tabs(["🧠 Decisions", "🔒 Compliance", "👥 Staff", "📝 Reviews", "⚠️ Risks"])
     
     with tabs[0]:  # Decisions
-        decision_nodes = [n for n in graph_data['nodes'] if n.get('type') == 'decision']
+        decision_nodes = graph_query.nodes_of_type('decision')
         if decision_nodes:
             for node in decision_nodes:
                 with st.expander(f"💡 {node['id']}"):
@@ -291,7 +253,7 @@ if os.path.exists("artifacts/knowledge_graph.json"):
             st.info("No decision nodes in current graph")
     
     with tabs[1]:  # Compliance
-        compliance_nodes = [n for n in graph_data['nodes'] if n.get('type') == 'compliance']
+        compliance_nodes = graph_query.nodes_of_type('compliance')
         if compliance_nodes:
             for node in compliance_nodes:
                 with st.expander(f"🔒 {node['id']}"):
@@ -306,7 +268,7 @@ if os.path.exists("artifacts/knowledge_graph.json"):
             st.info("No compliance nodes in current graph")
     
     with tabs[2]:  # Staff
-        staff_nodes = [n for n in graph_data['nodes'] if n.get('type') == 'staff']
+        staff_nodes = graph_query.nodes_of_type('staff')
         if staff_nodes:
             for node in staff_nodes:
                 with st.expander(f"👤 {node['id']}"):
@@ -316,7 +278,7 @@ if os.path.exists("artifacts/knowledge_graph.json"):
             st.info("No staff nodes in current graph")
     
     with tabs[3]:  # Reviews
-        review_nodes = [n for n in graph_data['nodes'] if n.get('type') == 'review']
+        review_nodes = graph_query.nodes_of_type('review')
         if review_nodes:
             for node in review_nodes:
                 with st.expander(f"📝 {node['id']}"):
@@ -328,7 +290,7 @@ if os.path.exists("artifacts/knowledge_graph.json"):
             st.info("No review nodes in current graph")
     
     with tabs[4]:  # Risks
-        risk_nodes = [n for n in graph_data['nodes'] if n.get('risk_level')]
+        risk_nodes = graph_query.nodes_with('risk_level')
         if risk_nodes:
             for node in risk_nodes:
                 risk = node.get('risk_level', 'UNKNOWN')
@@ -350,23 +312,40 @@ col1, col2 = st.columns(2)
 
 with col1:
     if st.button("🎤 Ask About Decision", type="primary"):
-        st.info("💡 Try asking: 'Why add a cook tomorrow?' to see the decision chain highlighted!")
+        cook_decisions = graph_query.find("cook") if graph_data else []
+        cook_decisions = [n for n in cook_decisions if n in graph_query.by_type.get('decision', [])]
+        if cook_decisions:
+            st.markdown(f"**Why: {cook_decisions[0]}?**")
+            for explanation in graph_query.explain(cook_decisions[0], k=3):
+                st.markdown(f"- {graph_query.format_path(explanation)}")
+        else:
+            st.info("💡 Try asking: 'Why add a cook tomorrow?' to see the decision chain highlighted!")
 
 with col2:
     if st.button("📖 Explain Compliance Path"):
-        st.markdown("""
-        **Compliance Decision Path:**
+        compliance_paths = []
+        if graph_data:
+            for rule in graph_query.by_type.get('compliance', []):
+                for decision in graph_query.by_type.get('decision', []):
+                    compliance_paths += graph_query.explain(decision, k=1, source=rule)
+        if compliance_paths:
+            st.markdown("**Compliance Decision Paths:**")
+            for explanation in sorted(compliance_paths, key=lambda e: e['strength'], reverse=True)[:3]:
+                st.markdown(f"- {graph_query.format_path(explanation)}")
+        else:
+            st.markdown("""
+            **Compliance Decision Path:**
         
-        1. 🔒 Fryer Cert Required (NYC Food Code)
-        2. ↓
-        3. 🧠 Decision: Add Cook Tomorrow
-        4. ↓
-        5. 👤 Assign: Mary Fryer
-        6. ↓
-        7. ✅ Compliant
+            1. 🔒 Fryer Cert Required (NYC Food Code)
+            2. ↓
+            3. 🧠 Decision: Add Cook Tomorrow
+            4. ↓
+            5. 👤 Assign: Mary Fryer
+            6. ↓
+            7. ✅ Compliant
         
-        **Reasoning:** Forecast shows 50+ orders/hour. NYC regulations require 1 certified cook per active fryer during peak. Mary is fryer-certified, so she's assigned.
-        """)
+            **Reasoning:** Forecast shows 50+ orders/hour. NYC regulations require 1 certified cook per active fryer during peak. Mary is fryer-certified, so she's assigned.
+            """)
 
 # Footer
 st.markdown("---")
@@ -5,7 +5,7 @@ Main Streamlit Application
 import streamlit as st
 import os
 import sys
-import asyncio
+import time
 from datetime import datetime, timedelta
 from pathlib import Path
 import json
@@ -14,14 +14,10 @@ from dotenv import load_dotenv
 # Add parent directory to path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from agents.scraper_agent import run_scraper_agent
-from agents.weather_agent import run_weather_agent
-from agents.forecast_agent_lstm import run_forecast_agent_lstm
-from agents.staffing_agent import run_staffing_agent
-from agents.prep_agent import run_prep_agent
-from agents.analyst_agent_captain import run_analyst_agent_captain
-from agents.geo_agent import run_geo_agent
+# Agent runners load lazily; heavy ML deps import on first run
+from agents import run_planning_workflow
 from agents.trace_agent import get_trace_agent
+from services.job_queue import get_job_queue, ACTIVE_STATUSES, QUEUED, DONE, FAILED
 
 # Load environment variables
 load_dotenv()
@@ -94,6 +90,14 @@ RESTAURANT_ADDRESS = "Entrance, 370 Lexington Avenue, E 41st St Store 104, New Y
 EXPANSION_CITY = "San Francisco, CA"
 STAFF = ["Bobby Maguire", "Mary Mcunnigham", "Lia Hunt", "Tory Kest"]
 
+WORKFLOW_ARGS = {
+    "restaurant_name": RESTAURANT_NAME,
+    "restaurant_address": RESTAURANT_ADDRESS,
+    "staff": STAFF,
+    "tenant_id": TENANT_ID,
+    "expansion_city": EXPANSION_CITY
+}
+
 # Feature flags
 AUTO_CLICK_PLAN = os.getenv("AUTO_CLICK_PLAN", "true").lower() == "true"
 
@@ -130,6 +134,8 @@ def init_session_state():
         st.session_state.results = {}
     if 'error' not in st.session_state:
         st.session_state.error = None
+    if 'job_id' not in st.session_state:
+        st.session_state.job_id = None
 
 
 def render_progress_stepper(current_step: int):
@@ -156,102 +162,35 @@ def render_progress_stepper(current_step: int):
                 st.text(step)
 
 
-async def run_workflow():
-    """Execute the full multi-agent workflow."""
-    trace = get_trace_agent()
-    results = {}
-    
-    try:
-        # Clear previous traces
-        trace.clear()
-        
-        # Step 1: Scraper Agent
-        st.session_state.current_step = 0
-        with st.spinner("🔍 Scraping reviews from Google Maps..."):
-            scraper_result = await asyncio.to_thread(
-                run_scraper_agent,
-                RESTAURANT_NAME,
-                RESTAURANT_ADDRESS
-            )
-            results['scraper'] = scraper_result
-        
-        # Step 2: Weather Agent
-        st.session_state.current_step = 1
-        with st.spinner("🌤️ Fetching weather forecast..."):
-            weather_result = run_weather_agent(
-                RESTAURANT_NAME,
-                RESTAURANT_ADDRESS
-            )
-            results['weather'] = weather_result
-        
-        # Step 3: Forecast Agent (LSTM)
-        st.session_state.current_step = 2
-        with st.spinner("📈 Predicting order volume & revenue (LSTM)..."):
-            forecast_result = run_forecast_agent_lstm()
-            results['forecast'] = forecast_result
-        
-        # Step 4: Staffing Agent
-        st.session_state.current_step = 3
-        if results['forecast'].get('success'):
-            with st.spinner("👥 Creating Asana staffing tasks..."):
-                staffing_result = await asyncio.to_thread(
-                    run_staffing_agent,
-                    STAFF,
-                    RESTAURANT_NAME,
-                    results['forecast']['peak_hour'],
-                    results['forecast']['peak_orders']
-                )
-                results['staffing'] = staffing_result
-        
-        # Step 5: Prep Agent
-        st.session_state.current_step = 4
-        if results['forecast'].get('success') and results['weather'].get('success'):
-            with st.spinner("📦 Creating purchase order..."):
-                prep_result = await asyncio.to_thread(
-                    run_prep_agent,
-                    RESTAURANT_NAME,
-                    results['forecast']['peak_orders'],
-                    results['weather'].get('summary', {})
-                )
-                results['prep'] = prep_result
-        
-        # Step 6: Analyst Agent (Captain RAG)
-        st.session_state.current_step = 5
-        with st.spinner("🤖 Running Captain RAG analysis..."):
-            # Build context from previous results
-            context = {}
-            if results.get('forecast', {}).get('success'):
-                context['forecast_data'] = {
-                    'peak_hour': results['forecast']['peak_hour'],
-                    'peak_orders': results['forecast']['peak_orders']
-                }
-            if results.get('weather', {}).get('success'):
-                context['weather_data'] = results['weather'].get('summary', {})
-            
-            analyst_result = run_analyst_agent_captain(
-                TENANT_ID,
-                "Why are we adding a cook tomorrow?",
-                context=context
-            )
-            results['analyst'] = analyst_result
-        
-        # Step 7: Geo Agent
-        st.session_state.current_step = 6
-        with st.spinner("🗺️ Analyzing expansion opportunities..."):
-            geo_result = await asyncio.to_thread(
-                run_geo_agent,
-                EXPANSION_CITY
-            )
-            results['geo'] = geo_result
-        
-        # Step 8: Done
-        st.session_state.current_step = 7
-        
-        return results
-        
-    except Exception as e:
-        st.session_state.error = str(e)
-        return results
+def run_workflow_inline():
+    """Execute the full multi-agent workflow in this session (no worker running)."""
+    def progress(message, step):
+        if step is not None:
+            st.session_state.current_step = step
+        st.write(message)
+    
+    results = run_planning_workflow(progress=progress, **WORKFLOW_ARGS)
+    st.session_state.error = results.pop('error', None)
+    return results
+
+
+def poll_workflow_job():
+    """Sync session state with the submitted worker job."""
+    job = get_job_queue().get(st.session_state.job_id)
+    if job is None:
+        st.session_state.job_id = None
+        return None
+    
+    if job['step'] is not None:
+        st.session_state.current_step = job['step']
+    if job['status'] == DONE:
+        results = job['result'] or {}
+        st.session_state.error = results.pop('error', None)
+        st.session_state.results = results
+    elif job['status'] == FAILED:
+        st.session_state.error = job['error']
+        st.session_state.workflow_started = False
+    return job
 
 
 def render_forecast_panel(forecast_result: dict):
@@ -556,6 +495,8 @@ def main():
                 st.session_state.workflow_started = False
                 st.session_state.current_step = 0
                 st.session_state.results = {}
+                st.session_state.job_id = None
+                st.session_state.error = None
                 st.rerun()
         
         st.markdown("---")
@@ -564,18 +505,39 @@ def main():
         for agent in agents:
             st.markdown(f"• {agent}")
     
+    # Workflow job submitted to the agent worker
+    job = None
+    if st.session_state.job_id and not st.session_state.results:
+        job = poll_workflow_job()
+    
     # Progress stepper
     render_progress_stepper(st.session_state.current_step)
     st.markdown("---")
     
     # Run workflow if started
-    if st.session_state.workflow_started and not st.session_state.results:
-        with st.status("🚀 Running multi-agent workflow...", expanded=True) as status:
-            st.write("Initializing agents...")
-            results = asyncio.run(run_workflow())
-            st.session_state.results = results
-            status.update(label="✅ Workflow complete!", state="complete")
+    if st.session_state.workflow_started and not st.session_state.results and not st.session_state.error:
+        queue = get_job_queue()
+        if job is None and queue.worker_available():
+            st.session_state.job_id = queue.submit("run_planning_workflow", kwargs=WORKFLOW_ARGS)
             st.rerun()
+        
+        if job is not None:
+            # The worker runs the agents; poll its progress
+            with st.status("🚀 Running multi-agent workflow on agent worker...", expanded=True):
+                if job['status'] == QUEUED:
+                    st.write("Waiting for a free worker slot...")
+                for event in queue.events(job['job_id']):
+                    st.write(event['message'])
+            if job['status'] in ACTIVE_STATUSES:
+                time.sleep(1)
+                st.rerun()
+        else:
+            with st.status("🚀 Running multi-agent workflow...", expanded=True) as status:
+                st.write("Initializing agents...")
+                results = run_workflow_inline()
+                st.session_state.results = results
+                status.update(label="✅ Workflow complete!", state="complete")
+                st.rerun()
     
     # Display results
     if st.session_state.results:
@@ -18,13 +18,16 @@ import plotly.express as px
 # Add parent directory to path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from agents.scraper_agent import run_scraper_agent
-from agents.weather_agent import run_weather_agent
-from agents.forecast_agent_lstm import run_forecast_agent_lstm
-from agents.staffing_agent import run_staffing_agent
-from agents.prep_agent import run_prep_agent
-from agents.analyst_agent_captain import run_analyst_agent_captain
-from agents.geo_agent import run_geo_agent
+# Agent runners load lazily; heavy ML deps import on first run
+from agents import (
+    run_scraper_agent,
+    run_weather_agent,
+    run_forecast_agent_lstm,
+    run_staffing_agent,
+    run_prep_agent,
+    run_analyst_agent_captain,
+    run_geo_agent
+)
 from agents.trace_agent import get_trace_agent
 
 load_dotenv()
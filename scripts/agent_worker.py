@@ -0,0 +1,44 @@
+"""
+Start the agent worker the Streamlit UI submits jobs to.
+
+Keep one running alongside `streamlit run`; the UI falls back to running
+agents inline when no worker is heartbeating.
+
+Usage:
+    python scripts/agent_worker.py
+    python scripts/agent_worker.py --concurrency 4 --warm run_weather_agent run_forecast_agent_lstm
+    python scripts/agent_worker.py --schedule    # also run the hourly/nightly agent schedule
+"""
+import argparse
+import sys
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from dotenv import load_dotenv
+from services.agent_worker import AgentWorker, DEFAULT_WARM_AGENTS
+from services.scheduler import Scheduler
+
+
+def main():
+    """Main worker function."""
+    parser = argparse.ArgumentParser(description="Brew.AI agent worker")
+    parser.add_argument("--concurrency", type=int, default=2, help="Jobs run at once")
+    parser.add_argument("--warm", nargs="*", default=DEFAULT_WARM_AGENTS, help="Runners to load at startup")
+    parser.add_argument("--poll", type=float, default=0.5, help="Idle poll interval in seconds")
+    parser.add_argument("--schedule", action="store_true", help="Also run scheduled agents (services/scheduler.py)")
+    args = parser.parse_args()
+
+    load_dotenv()
+    scheduler = Scheduler() if args.schedule else None
+    AgentWorker(
+        max_concurrent=args.concurrency,
+        warm=args.warm,
+        poll_interval=args.poll,
+        scheduler=scheduler
+    ).serve_forever()
+
+
+if __name__ == "__main__":
+    main()
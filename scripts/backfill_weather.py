@@ -0,0 +1,46 @@
+"""
+Backfill or append hourly weather history into the weather archive.
+
+Usage:
+    python scripts/backfill_weather.py backfill --location "Charlotte" --lat 35.2271 --lng -80.8431 --start 2024-11-01
+    python scripts/backfill_weather.py append --location "Charlotte" --lat 35.2271 --lng -80.8431
+"""
+import argparse
+import sys
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from services.weather_archive import WeatherArchive
+
+
+def main():
+    """Main backfill function."""
+    parser = argparse.ArgumentParser(description="Weather archive backfill")
+    parser.add_argument("command", choices=["backfill", "append"])
+    parser.add_argument("--location", required=True, help="Location key (e.g. restaurant name)")
+    parser.add_argument("--lat", type=float, required=True)
+    parser.add_argument("--lng", type=float, required=True)
+    parser.add_argument("--start", help="First day for backfill (YYYY-MM-DD)")
+    parser.add_argument("--end", help="Last day for backfill (default: newest archived day)")
+    parser.add_argument("--timezone", default="America/New_York")
+    args = parser.parse_args()
+
+    archive = WeatherArchive(timezone=args.timezone)
+
+    if args.command == "backfill":
+        if not args.start:
+            parser.error("--start is required for backfill")
+        print(f"[*] Backfilling {args.location} from {args.start} to {args.end or 'latest'}...")
+        written = archive.backfill(args.location, args.lat, args.lng, args.start, args.end)
+    else:
+        print(f"[*] Appending recent hours for {args.location}...")
+        written = archive.append_recent(args.location, args.lat, args.lng)
+
+    print(f"[OK] {written} hourly rows written")
+    print(f"[OK] Latest archived hour: {archive.last_time(args.location)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+"""
+Cold-start benchmark for the Streamlit entrypoints.
+
+Replays the module-level imports of app/*.py and app/pages/*.py in a fresh
+interpreter (what Streamlit pays before the first paint) and fails if:
+  - total import time exceeds the budget,
+  - a heavy framework (TensorFlow, XGBoost, browser_use, ...) gets loaded,
+  - import time regresses past the saved baseline by more than the tolerance.
+
+Modules that aren't installed here (e.g. streamlit itself) are skipped.
+
+Usage:
+    python scripts/benchmark_cold_start.py
+    python scripts/benchmark_cold_start.py --budget 1.5 --save-baseline
+"""
+import argparse
+import ast
+import json
+import subprocess
+import sys
+from pathlib import Path
+from typing import List
+
+ROOT = Path(__file__).parent.parent
+BASELINE_PATH = ROOT / "artifacts" / "cold_start_baseline.json"
+
+# Must only load when an agent actually runs
+HEAVY_MODULES = [
+    "tensorflow", "keras", "torch", "xgboost", "browser_use", "langchain",
+    "langchain_openai", "chromadb", "folium", "matplotlib", "seaborn", "sklearn"
+]
+
+# Runs in the fresh interpreter: import each statement, time it, report loaded modules
+PROBE = """
+import json, sys, time
+sys.path.insert(0, {root!r})
+statements = json.loads({statements!r})
+timings, skipped = {{}}, []
+started = time.perf_counter()
+for statement in statements:
+    t0 = time.perf_counter()
+    try:
+        exec(statement, {{}})
+    except ImportError as e:
+        skipped.append([statement, str(e)])
+        continue
+    timings[statement] = time.perf_counter() - t0
+total = time.perf_counter() - started
+print(json.dumps({{"total": total, "timings": timings, "skipped": skipped,
+                  "modules": sorted({{m.split(".")[0] for m in sys.modules}})}}))
+"""
+
+
+def entrypoint_imports(paths: List[Path]) -> List[str]:
+    """Module-level import statements of the given files, in first-seen order."""
+    statements = []
+    for path in paths:
+        tree = ast.parse(path.read_text(encoding="utf-8"), filename=str(path))
+        for node in tree.body:
+            if isinstance(node, ast.Import) or (isinstance(node, ast.ImportFrom) and node.level == 0):
+                statement = ast.unparse(node)
+                if statement not in statements:
+                    statements.append(statement)
+    return statements
+
+
+def measure(statements: List[str]) -> dict:
+    """Run the import probe in a fresh interpreter."""
+    probe = PROBE.format(root=str(ROOT), statements=json.dumps(statements))
+    proc = subprocess.run([sys.executable, "-c", probe], capture_output=True, text=True, cwd=str(ROOT))
+    if proc.returncode != 0:
+        raise RuntimeError(proc.stderr.strip() or "import probe failed")
+    return json.loads(proc.stdout.strip().splitlines()[-1])
+
+
+def main():
+    """Main benchmark function."""
+    parser = argparse.ArgumentParser(description="Streamlit cold-start import benchmark")
+    parser.add_argument("--budget", type=float, default=1.0, help="Max seconds for all entrypoint imports")
+    parser.add_argument("--runs", type=int, default=3, help="Fresh-interpreter runs (best is kept)")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed regression over baseline (fraction)")
+    parser.add_argument("--save-baseline", action="store_true", help=f"Record this run to {BASELINE_PATH.name}")
+    args = parser.parse_args()
+
+    entrypoints = sorted((ROOT / "app").glob("*.py")) + sorted((ROOT / "app" / "pages").glob("*.py"))
+    statements = entrypoint_imports(entrypoints)
+    print(f"[*] {len(statements)} module-level imports across {len(entrypoints)} entrypoints")
+
+    runs = [measure(statements) for _ in range(max(1, args.runs))]
+    best = min(runs, key=lambda r: r["total"])
+
+    for statement, seconds in sorted(best["timings"].items(), key=lambda kv: -kv[1])[:10]:
+        print(f"   {seconds * 1000:8.1f}ms  {statement}")
+    for statement, error in best["skipped"]:
+        print(f"   [SKIP] {statement} ({error})")
+
+    failures = []
+    heavy = sorted(set(HEAVY_MODULES) & set(best["modules"]))
+    if heavy:
+        failures.append(f"heavy modules loaded at import time: {', '.join(heavy)}")
+    if best["total"] > args.budget:
+        failures.append(f"cold start {best['total']:.2f}s exceeds budget {args.budget:.2f}s")
+
+    if BASELINE_PATH.exists():
+        with open(BASELINE_PATH, "r") as f:
+            baseline = json.load(f)["total"]
+        limit = baseline * (1 + args.tolerance)
+        print(f"[*] Baseline {baseline:.3f}s (limit {limit:.3f}s)")
+        if best["total"] > limit:
+            failures.append(f"cold start {best['total']:.3f}s regressed past baseline {baseline:.3f}s")
+
+    if args.save_baseline:
+        BASELINE_PATH.parent.mkdir(parents=True, exist_ok=True)
+        with open(BASELINE_PATH, "w") as f:
+            json.dump({"total": best["total"], "timings": best["timings"]}, f, indent=2)
+        print(f"[*] Baseline saved to {BASELINE_PATH}")
+
+    print(f"[*] Cold start: {best['total'] * 1000:.0f}ms (best of {len(runs)})")
+    if failures:
+        for failure in failures:
+            print(f"[FAIL] {failure}")
+        sys.exit(1)
+    print("[OK] Cold start within budget")
+
+
+if __name__ == "__main__":
+    main()
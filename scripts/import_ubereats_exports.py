@@ -0,0 +1,57 @@
+"""
+Import Uber Eats merchant CSV exports (no browser needed).
+
+Download the reports from the merchant dashboard (order accuracy,
+inaccuracies, sales leaderboard, food taste & quality, user conversion)
+into the project root or a folder, then run:
+
+Usage:
+    python scripts/import_ubereats_exports.py
+    python scripts/import_ubereats_exports.py --dir path/to/exports --force
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from services.export_importer import UberEatsExportImporter, EXPORT_DIR, CHUNK_SIZE
+
+
+def main():
+    """Main import function."""
+    parser = argparse.ArgumentParser(description="Uber Eats CSV export import")
+    parser.add_argument("--dir", default=EXPORT_DIR, help="Directory containing the exports")
+    parser.add_argument("--force", action="store_true", help="Re-import files unchanged since the last run")
+    parser.add_argument("--chunksize", type=int, default=CHUNK_SIZE, help="Rows parsed per chunk")
+    args = parser.parse_args()
+
+    importer = UberEatsExportImporter(export_dir=args.dir, chunksize=args.chunksize)
+
+    found = {kind: paths for kind, paths in importer.find_exports().items() if paths}
+    if not found:
+        print(f"[ERROR] No Uber Eats exports found in {args.dir}")
+        sys.exit(1)
+
+    print(f"[*] Importing {sum(len(p) for p in found.values())} export files from {args.dir}...")
+    started = time.time()
+    result = importer.run(force=args.force)
+
+    if not result["success"]:
+        print(f"[ERROR] Import failed: {result.get('error')}")
+        sys.exit(1)
+
+    for path in result["skipped"]:
+        print(f"[SKIP] {Path(path).name} (unchanged since last import)")
+
+    print()
+    print("[DATA] Rows written:")
+    for kind, rows in result["rows"].items():
+        print(f"   {kind}: {rows}")
+    print(f"[OK] Done in {time.time() - started:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
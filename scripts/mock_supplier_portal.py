@@ -0,0 +1,92 @@
+"""
+Local mock supplier portal for testing batched PO submission.
+
+Serves a multi-line purchase order form and prints every submission, so
+BrowserUse runs can be pointed at it instead of a real supplier.
+
+Usage:
+    python scripts/mock_supplier_portal.py --port 8765
+    set SUPPLIER_PORTAL_URL=http://localhost:8765/po
+"""
+import argparse
+import json
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs
+
+
+FORM_HTML = """<!DOCTYPE html>
+<html>
+<head><title>Supplier Portal - Purchase Order</title></head>
+<body style="font-family: sans-serif; max-width: 900px; margin: 40px auto;">
+  <h1>Supplier Portal - Purchase Order</h1>
+  <form method="post" action="/po">
+    <table id="lines">
+      <tr><th>Item</th><th>Quantity</th><th>Unit</th><th>Delivery Date</th><th>Special Instructions</th></tr>
+      <tr>
+        <td><input name="item" aria-label="Item"></td>
+        <td><input name="quantity" aria-label="Quantity"></td>
+        <td><input name="unit" aria-label="Unit"></td>
+        <td><input name="delivery_date" aria-label="Delivery Date"></td>
+        <td><input name="notes" aria-label="Special Instructions"></td>
+      </tr>
+    </table>
+    <button type="button" onclick="addLine()">Add line</button>
+    <button type="submit">Submit order</button>
+  </form>
+  <script>
+    function addLine() {
+      var table = document.getElementById("lines");
+      var row = table.rows[1].cloneNode(true);
+      row.querySelectorAll("input").forEach(function (i) { i.value = ""; });
+      table.appendChild(row);
+    }
+  </script>
+</body>
+</html>
+"""
+
+
+class PortalHandler(BaseHTTPRequestHandler):
+    """Serve the PO form and log submissions."""
+
+    def do_GET(self):
+        self._send(200, FORM_HTML)
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        fields = parse_qs(self.rfile.read(length).decode("utf-8"), keep_blank_values=True)
+
+        columns = ["item", "quantity", "unit", "delivery_date", "notes"]
+        lines = [
+            dict(zip(columns, values))
+            for values in zip(*[fields.get(c, []) for c in columns])
+            if values[0]
+        ]
+
+        print(f"[{datetime.now().strftime('%H:%M:%S')}] PO received with {len(lines)} lines")
+        print(json.dumps(lines, indent=2))
+        self._send(200, f"<h1>Order received</h1><p>{len(lines)} lines confirmed.</p>")
+
+    def _send(self, status: int, body: str):
+        data = body.encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+
+def main():
+    """Run the mock portal."""
+    parser = argparse.ArgumentParser(description="Mock supplier portal")
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+
+    server = ThreadingHTTPServer(("localhost", args.port), PortalHandler)
+    print(f"[OK] Mock supplier portal at http://localhost:{args.port}/po")
+    server.serve_forever()
+
+
+if __name__ == "__main__":
+    main()
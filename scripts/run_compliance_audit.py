@@ -0,0 +1,80 @@
+"""
+Run a compliance checklist audit and write one consolidated report.
+
+Numeric checks are answered from the SOP rules; the rest share one
+retrieved context and run concurrently against Captain (or the local
+mock with --stub). The report goes to artifacts/compliance_audit_report.json.
+
+Usage:
+    python scripts/run_compliance_audit.py
+    python scripts/run_compliance_audit.py --checklist daily_audit.txt --workers 8 --stub
+"""
+import argparse
+import os
+import sys
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from agents.compliance_agent import ComplianceAgent
+
+DEFAULT_CHECKLIST = [
+    "Is the walk-in refrigerator at 41°F compliant?",
+    "Is the freezer at 0°F compliant?",
+    "Are hot foods held at 135°F compliant?",
+    "Is chicken cooked to 165°F compliant?",
+    "Are burgers cooked to 155°F compliant?",
+    "Are we compliant if wings thaw for 2 hours in cold water?",
+    "Is fryer oil at 360°F within the safe range?",
+    "Are we compliant running 2 fryers with 2 certified cooks?",
+    "Do all food handlers have valid NYC Food Protection certificates on file?",
+    "Are fryer certifications posted near the fryer station?",
+    "Is raw poultry stored on the bottom shelf?",
+    "Are sanitizer buckets at the proper concentration?"
+]
+
+
+def main():
+    """Main audit function."""
+    parser = argparse.ArgumentParser(description="Compliance checklist audit")
+    parser.add_argument("--checklist", help="Text file with one question per line (default: built-in daily checklist)")
+    parser.add_argument("--tenant", default=os.getenv("TENANT_ID", "charcoal_eats_us"), help="Tenant ID")
+    parser.add_argument("--role", default="manager", choices=["manager", "owner", "staff"])
+    parser.add_argument("--workers", type=int, default=8, help="Maximum concurrent Captain queries")
+    parser.add_argument("--stub", action="store_true", help="Use the local Captain mock instead of the API")
+    args = parser.parse_args()
+
+    if args.checklist:
+        with open(args.checklist, "r", encoding="utf-8") as f:
+            checklist = [line.strip() for line in f if line.strip() and not line.startswith("#")]
+    else:
+        checklist = DEFAULT_CHECKLIST
+
+    print(f"[*] Auditing {len(checklist)} checklist items for {args.tenant}...")
+    result = ComplianceAgent(args.tenant).run_audit(
+        checklist,
+        user_role=args.role,
+        max_workers=args.workers,
+        use_stub=args.stub
+    )
+
+    if not result["success"]:
+        print(f"[ERROR] Audit failed: {result.get('error')}")
+        sys.exit(1)
+
+    for answer in result["results"]:
+        status = answer.get("status") or "ERROR"
+        print(f"   [{status:<13}] {answer['latency_ms']:8.1f}ms  {answer['question']}")
+
+    summary = result["summary"]
+    print()
+    print(f"[OK] {summary['answered']}/{summary['questions']} answered ({summary['from_rules']} from SOP rules), "
+          f"{summary['non_compliant']} non-compliant")
+    print(f"     Wall time {summary['wall_ms']:.0f}ms (slowest query {summary['slowest_ms']:.0f}ms, "
+          f"sum of queries {summary['total_query_ms']:.0f}ms)")
+    print(f"     Report: {result['artifacts'][0]}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""
+Run the agent schedule (hourly weather, 5am forecast, 10pm prep).
+
+Runs as a long-lived loop, or with --once from cron / Task Scheduler:
+each pass starts whatever is due (catching up missed slots once), skips
+entries whose inputs haven't changed, and stores new result versions.
+The agent worker can run the same schedule with `--schedule`.
+
+Usage:
+    python scripts/run_scheduler.py              # loop
+    python scripts/run_scheduler.py --once       # one pass, wait for runs
+    python scripts/run_scheduler.py --status
+    python scripts/run_scheduler.py --run forecast --force
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from dotenv import load_dotenv
+from services.scheduler import Scheduler
+
+
+def print_status(scheduler: Scheduler):
+    for row in scheduler.status():
+        version = f"v{row['version']} @ {row['version_created'][:16]}" if row["version"] else "never ran"
+        state = "RUNNING" if row["running"] else (row["last_status"] or "-")
+        print(f"   {row['name']:<10} {row['cron']:<12} {state:<10} {version:<26} next {row['next_run']:%Y-%m-%d %H:%M}")
+        if row["last_status"] == "failed":
+            print(f"      last error: {row['last_error']}")
+
+
+def main():
+    """Main scheduler function."""
+    parser = argparse.ArgumentParser(description="Scheduled agent runs")
+    parser.add_argument("--once", action="store_true", help="Start due entries, wait for them, exit")
+    parser.add_argument("--status", action="store_true", help="Show schedule state and exit")
+    parser.add_argument("--run", metavar="NAME", help="Run one entry now")
+    parser.add_argument("--force", action="store_true", help="With --run: run even if inputs are unchanged")
+    parser.add_argument("--interval", type=float, default=30, help="Loop tick interval in seconds")
+    args = parser.parse_args()
+
+    load_dotenv()
+    scheduler = Scheduler()
+
+    if args.status:
+        print_status(scheduler)
+        return
+
+    if args.run:
+        outcome = scheduler.run_now(args.run, force=args.force)
+        print(f"[*] {args.run}: {outcome}")
+        sys.exit(1 if outcome["status"] in ("failed", "running") else 0)
+
+    if args.once:
+        started = scheduler.tick()
+        print(f"[*] Started: {', '.join(started) or 'nothing due'}")
+        scheduler.wait()
+        print_status(scheduler)
+        return
+
+    print("[*] Scheduler running (Ctrl+C to stop)")
+    print_status(scheduler)
+    try:
+        while True:
+            scheduler.tick()
+            time.sleep(args.interval)
+    except KeyboardInterrupt:
+        print("[*] Stopping, waiting for running entries...")
+    scheduler.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -12,6 +12,8 @@ import re
 
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
+from services.order_store import get_order_store
+
 
 async def main():
     """Main scraper function."""
@@ -197,7 +199,7 @@ def extract_orders_from_html(html: str, text: str) -> list:
                 
                 orders.append({
                     'timestamp': datetime.now().strftime(f'%Y-%m-%d {time_str}'),
-                    'order_id': f"ORD{len(orders)+1:03d}",
+                    'order_id': order_id.group(1),
                     'item': 'Uber Eats Order',
                     'quantity': 1,
                     'price': price,
@@ -269,9 +271,9 @@ def save_to_csv(orders, menu, reviews):
     """Save extracted data to CSV files."""
     
     if orders:
-        df = pd.DataFrame(orders)
-        df.to_csv('data/orders_realtime.csv', index=False)
-        print(f"   [OK] Saved {len(df)} orders")
+        # Append only orders not already stored (history is kept)
+        written = get_order_store().append_orders(pd.DataFrame(orders), source="ubereats:auto")
+        print(f"   [OK] Saved {written} new orders")
     
     if menu:
         df = pd.DataFrame(menu)
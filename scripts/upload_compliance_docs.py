@@ -0,0 +1,52 @@
+"""
+Bulk-upload a folder of compliance documents (SOP binders, certificates).
+
+Text extraction runs in parallel across cores, and files uploaded before
+(identical bytes) reuse their cached text.
+
+Usage:
+    python scripts/upload_compliance_docs.py path/to/binder
+    python scripts/upload_compliance_docs.py path/to/binder --doc-type certification --access-level all_staff
+"""
+import argparse
+import os
+import sys
+import time
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from agents.compliance_agent import ComplianceAgent
+
+SUFFIXES = {".pdf", ".docx", ".doc", ".png", ".jpg", ".jpeg", ".tiff", ".txt", ".md"}
+
+
+def main():
+    """Main upload function."""
+    parser = argparse.ArgumentParser(description="Bulk compliance document upload")
+    parser.add_argument("folder", help="Folder of documents (searched recursively)")
+    parser.add_argument("--tenant", default=os.getenv("TENANT_ID", "charcoal_eats_us"), help="Tenant ID")
+    parser.add_argument("--doc-type", default="food_safety", help="Document type")
+    parser.add_argument("--access-level", default="manager_only", choices=["manager_only", "all_staff", "owner_only"])
+    args = parser.parse_args()
+
+    paths = sorted(str(p) for p in Path(args.folder).rglob("*") if p.suffix.lower() in SUFFIXES)
+    if not paths:
+        print(f"[ERROR] No documents found in {args.folder}")
+        sys.exit(1)
+
+    print(f"[*] Uploading {len(paths)} documents for {args.tenant}...")
+    started = time.time()
+    results = ComplianceAgent(args.tenant).upload_documents(paths, args.doc_type, args.access_level)
+
+    for path, result in zip(paths, results):
+        if not result.get("success"):
+            print(f"[ERROR] {Path(path).name}: {result.get('error')}")
+
+    uploaded = sum(1 for r in results if r.get("success"))
+    print(f"[OK] {uploaded}/{len(paths)} documents stored in {time.time() - started:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
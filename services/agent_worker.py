@@ -0,0 +1,141 @@
+"""
+Long-lived agent worker behind the Streamlit UI.
+
+Claims jobs from the SQLite job queue and runs them on a small thread
+pool inside one process, so TensorFlow/XGBoost, the Captain and HTTP
+clients and the agent modules are loaded once and stay warm across runs
+and across operators. The UI only submits jobs and polls them; a long
+model fit never blocks a Streamlit session. Start it with
+scripts/agent_worker.py.
+"""
+import os
+import time
+import socket
+import uuid
+import asyncio
+import inspect
+import threading
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional
+from agents import AGENT_RUNNERS, get_agent
+from services.job_queue import JobQueue, get_job_queue, running_job
+from services.scheduler import Scheduler
+
+
+# Loaded at startup so the first job doesn't pay the framework import
+DEFAULT_WARM_AGENTS = [
+    "run_planning_workflow",
+    "run_weather_agent",
+    "run_forecast_agent_lstm",
+    "run_staffing_agent",
+    "run_prep_agent",
+    "run_analyst_agent_captain"
+]
+
+
+class AgentWorker:
+    """Runs queued agent jobs with warm models and clients."""
+
+    HEARTBEAT_SECONDS = 5
+
+    def __init__(
+        self,
+        queue: Optional[JobQueue] = None,
+        max_concurrent: int = 2,
+        warm: Optional[List[str]] = None,
+        poll_interval: float = 0.5,
+        scheduler: Optional[Scheduler] = None
+    ):
+        """
+        Args:
+            queue: Job queue (default: global queue)
+            max_concurrent: Jobs run at once
+            warm: Runners to import at startup
+            poll_interval: Seconds between queue polls when idle
+            scheduler: Also run scheduled agents (checked every heartbeat)
+        """
+        self.queue = queue or get_job_queue()
+        self.max_concurrent = max_concurrent
+        self.warm = DEFAULT_WARM_AGENTS if warm is None else warm
+        self.poll_interval = poll_interval
+        self.scheduler = scheduler
+        self.worker_id = f"{socket.gethostname()}-{os.getpid()}-{uuid.uuid4().hex[:6]}"
+        self.executor = ThreadPoolExecutor(max_workers=max_concurrent, thread_name_prefix="agent-job")
+        self.active = 0
+        self.active_lock = threading.Lock()
+        self.stopping = threading.Event()
+
+    def warm_up(self):
+        """Import warm runners (and their ML frameworks) once."""
+        for name in self.warm:
+            started = time.time()
+            try:
+                get_agent(name).load()
+                print(f"[*] Warmed {name} in {time.time() - started:.1f}s")
+            except Exception as e:
+                print(f"[WARN] Could not warm {name}: {e}")
+
+    def serve_forever(self):
+        """Claim and run jobs until stopped (Ctrl+C)."""
+        self.warm_up()
+        self.queue.register_worker(self.worker_id, list(AGENT_RUNNERS))
+        print(f"[OK] Worker {self.worker_id} ready ({self.max_concurrent} concurrent jobs)")
+
+        last_heartbeat = 0.0
+        try:
+            while not self.stopping.is_set():
+                now = time.time()
+                if now - last_heartbeat >= self.HEARTBEAT_SECONDS:
+                    self.queue.heartbeat(self.worker_id)
+                    recovered = self.queue.requeue_orphans()
+                    if recovered:
+                        print(f"[WARN] Recovered {recovered} jobs from stopped workers")
+                    if self.scheduler:
+                        self.scheduler.tick()
+                    last_heartbeat = now
+
+                if not self._dispatch():
+                    self.stopping.wait(self.poll_interval)
+        except KeyboardInterrupt:
+            print("[*] Stopping worker, waiting for running jobs...")
+        finally:
+            self.stopping.set()
+            self.executor.shutdown(wait=True)
+            if self.scheduler:
+                self.scheduler.shutdown()
+            self.queue.unregister_worker(self.worker_id)
+
+    def stop(self):
+        self.stopping.set()
+
+    def _dispatch(self) -> bool:
+        """Claim a job if a slot is free; True if one was started."""
+        with self.active_lock:
+            if self.active >= self.max_concurrent:
+                return False
+            job = self.queue.claim(self.worker_id, list(AGENT_RUNNERS))
+            if job is None:
+                return False
+            self.active += 1
+        self.executor.submit(self._run, job)
+        return True
+
+    def _run(self, job: dict):
+        job_id = job["job_id"]
+        started = time.time()
+        print(f"[*] Job {job_id}: {job['agent']}")
+        try:
+            with running_job(self.queue, job_id):
+                result = get_agent(job["agent"])(*job["args"], **job["kwargs"])
+                if inspect.isawaitable(result):
+                    result = asyncio.run(result)
+            self.queue.complete(job_id, result)
+            print(f"[OK] Job {job_id} done in {time.time() - started:.1f}s")
+        except Exception as e:
+            traceback.print_exc()
+            self.queue.fail(job_id, str(e))
+            print(f"[ERROR] Job {job_id} failed: {e}")
+        finally:
+            with self.active_lock:
+                self.active -= 1
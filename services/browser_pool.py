@@ -0,0 +1,192 @@
+"""
+Pool of warm browser contexts with concurrency limits.
+
+Contexts are launched lazily up to the pool size, handed out one task at a
+time, health-checked before reuse and recycled after a fixed number of
+tasks. A global semaphore caps concurrent tasks and per-domain semaphores
+keep any one site (e.g. a logged-in merchant dashboard) from being hit by
+too many tabs at once.
+"""
+import re
+import time
+import asyncio
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from typing import Dict, Any, Optional, Callable, Awaitable, List
+
+
+URL_PATTERN = re.compile(r"https?://([^/\s\"']+)")
+
+# Default concurrent tasks per site
+DOMAIN_LIMITS = {
+    "merchants.ubereats.com": 2,
+    "maps.google.com": 2,
+    "www.google.com": 2,
+    "www.yelp.com": 2,
+    "app.asana.com": 1
+}
+
+
+def task_domain(task: str) -> Optional[str]:
+    """First hostname mentioned in a task description."""
+    match = URL_PATTERN.search(task)
+    return match.group(1).lower() if match else None
+
+
+@dataclass
+class PooledContext:
+    """A launched (browser, context) pair and its usage."""
+    browser: Any
+    context: Any
+    tasks_run: int = 0
+    created_at: float = field(default_factory=time.time)
+
+
+class BrowserPool:
+    """Warm browser contexts shared by concurrent tasks on one event loop."""
+
+    def __init__(
+        self,
+        launch: Callable[[], Awaitable[tuple]],
+        size: int = 3,
+        max_tasks_per_context: int = 20,
+        domain_limits: Optional[Dict[str, int]] = None,
+        default_domain_limit: int = 2,
+        health_timeout: float = 5.0
+    ):
+        """
+        Args:
+            launch: Coroutine returning a new (browser, context) pair
+            size: Maximum contexts (and concurrent tasks)
+            max_tasks_per_context: Recycle a context after this many tasks
+            domain_limits: Concurrent task cap per hostname
+            default_domain_limit: Cap for hostnames not listed
+            health_timeout: Seconds allowed for the pre-use health check
+        """
+        self.launch = launch
+        self.size = size
+        self.max_tasks_per_context = max_tasks_per_context
+        self.domain_limits = domain_limits if domain_limits is not None else DOMAIN_LIMITS
+        self.default_domain_limit = default_domain_limit
+        self.health_timeout = health_timeout
+
+        self._slots = asyncio.Semaphore(size)
+        self._domain_slots: Dict[str, asyncio.Semaphore] = {}
+        self._idle: List[PooledContext] = []
+        self._in_use: List[PooledContext] = []
+        self.closed = False
+        self.stats = {"launched": 0, "reused": 0, "recycled": 0, "unhealthy": 0}
+
+    def _domain_semaphore(self, domain: Optional[str]) -> Optional[asyncio.Semaphore]:
+        if not domain:
+            return None
+        if domain not in self._domain_slots:
+            limit = self.domain_limits.get(domain, self.default_domain_limit)
+            self._domain_slots[domain] = asyncio.Semaphore(limit)
+        return self._domain_slots[domain]
+
+    @asynccontextmanager
+    async def acquire(self, domain: Optional[str] = None):
+        """
+        Borrow a context for one task.
+
+        Usage:
+            async with pool.acquire("www.yelp.com") as entry:
+                ... entry.browser, entry.context ...
+        """
+        domain_slot = self._domain_semaphore(domain)
+        if domain_slot is not None:
+            await domain_slot.acquire()
+        await self._slots.acquire()
+
+        entry = None
+        try:
+            entry = await self._checkout()
+            yield entry
+        finally:
+            if entry is not None:
+                await self._checkin(entry)
+            self._slots.release()
+            if domain_slot is not None:
+                domain_slot.release()
+
+    async def _checkout(self) -> PooledContext:
+        """Take a healthy idle context, or launch a new one."""
+        while self._idle:
+            entry = self._idle.pop()
+            if await self._is_healthy(entry):
+                self.stats["reused"] += 1
+                self._in_use.append(entry)
+                return entry
+            self.stats["unhealthy"] += 1
+            await self._close_entry(entry)
+
+        browser, context = await self.launch()
+        entry = PooledContext(browser=browser, context=context)
+        self.stats["launched"] += 1
+        self._in_use.append(entry)
+        return entry
+
+    async def _checkin(self, entry: PooledContext):
+        """Return a context to the pool, recycling worn-out ones."""
+        entry.tasks_run += 1
+        if entry in self._in_use:
+            self._in_use.remove(entry)
+
+        if self.closed or entry.tasks_run >= self.max_tasks_per_context:
+            self.stats["recycled"] += 1
+            await self._close_entry(entry)
+        else:
+            self._idle.append(entry)
+
+    async def _is_healthy(self, entry: PooledContext) -> bool:
+        """Check the context still has a responsive page."""
+        if entry.context is None or not hasattr(entry.context, "get_current_page"):
+            return True
+        try:
+            page = await asyncio.wait_for(entry.context.get_current_page(), self.health_timeout)
+            await asyncio.wait_for(page.evaluate("1"), self.health_timeout)
+            return True
+        except Exception:
+            return False
+
+    @staticmethod
+    async def _close_entry(entry: PooledContext):
+        try:
+            if entry.context is not None:
+                await entry.context.close()
+            if entry.browser is not None:
+                await entry.browser.close()
+        except Exception as e:
+            print(f"[WARN] Failed to close pooled browser: {e}")
+
+    async def close(self):
+        """Close every idle context (in-use ones close when returned)."""
+        self.closed = True
+        idle, self._idle = self._idle, []
+        for entry in idle:
+            await self._close_entry(entry)
+
+
+async def run_many(execute, tasks: List[Any], concurrency: int) -> List[Dict[str, Any]]:
+    """
+    Fan tasks out to an execute_task coroutine under a semaphore.
+
+    Failures are returned as {"success": False, "error": ...} in place.
+    """
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+
+    async def run_one(spec):
+        if isinstance(spec, str):
+            spec = {"task": spec}
+        async with semaphore:
+            try:
+                return await execute(
+                    spec["task"],
+                    max_steps=spec.get("max_steps", 50),
+                    domain=spec.get("domain")
+                )
+            except Exception as e:
+                return {"success": False, "error": str(e)}
+
+    return await asyncio.gather(*[run_one(spec) for spec in tasks])
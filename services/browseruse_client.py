@@ -3,6 +3,7 @@ BrowserUse client for automated browser interactions with visible Chrome profile
 """
 import os
 import asyncio
+import weakref
 from typing import Optional, Dict, Any, List
 import json
 
@@ -15,6 +16,15 @@ except ImportError:
     HAS_BROWSER_USE = False
     print("⚠️ BrowserUse not available, using mock implementation")
 
+# Shared browsers (warm contexts reused across tasks) when supported
+try:
+    from browser_use import Browser, BrowserConfig
+    HAS_SHARED_BROWSER = True
+except ImportError:
+    HAS_SHARED_BROWSER = False
+
+from services.browser_pool import BrowserPool, task_domain, run_many
+
 
 class BrowserUseClient:
     """Wrapper for BrowserUse agent with Chrome profile support."""
@@ -25,6 +35,12 @@ class BrowserUseClient:
         self.chrome_user_data_dir = os.getenv("CHROME_USER_DATA_DIR")
         self.chrome_profile_dir = os.getenv("CHROME_PROFILE_DIR", "Default")
         
+        # Warm browser contexts, one pool per event loop
+        self.pool_size = int(os.getenv("BROWSER_POOL_SIZE", "3"))
+        self.max_tasks_per_context = int(os.getenv("BROWSER_MAX_TASKS_PER_CONTEXT", "20"))
+        self._pools: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, BrowserPool]" = weakref.WeakKeyDictionary()
+        self._mock = None
+        
         # Initialize Gemini LLM - BrowserUse needs the provider wrapper
         try:
             from langchain_google_genai import ChatGoogleGenerativeAI
@@ -65,13 +81,86 @@ class BrowserUseClient:
         
         return config
     
-    async def execute_task(self, task: str, max_steps: int = 50) -> Dict[str, Any]:
+    async def _launch_context(self) -> tuple:
+        """
+        Launch a browser and context for the pool.
+        
+        Returns:
+            (browser, context), or (None, None) so the Agent opens its own
+        """
+        if not HAS_SHARED_BROWSER:
+            return None, None
+        try:
+            config = self.get_browser_config()
+            browser = Browser(config=BrowserConfig(
+                headless=config["headless"],
+                disable_security=config["disable_security"]
+            ))
+            return browser, await browser.new_context()
+        except Exception as e:
+            print(f"[WARN] Shared browser unavailable, using one browser per task: {e}")
+            return None, None
+    
+    def get_pool(self) -> BrowserPool:
+        """
+        Get the browser pool for the running event loop.
+        
+        Playwright objects are bound to the loop that created them, so
+        each loop (e.g. each asyncio.run) gets its own pool.
+        """
+        loop = asyncio.get_running_loop()
+        pool = self._pools.get(loop)
+        if pool is None or pool.closed:
+            pool = BrowserPool(
+                self._launch_context,
+                size=self.pool_size,
+                max_tasks_per_context=self.max_tasks_per_context
+            )
+            self._pools[loop] = pool
+        return pool
+    
+    def _get_mock(self):
+        """Shared mock client used when a real run is not possible."""
+        if self._mock is None:
+            from services.browseruse_client_mock import BrowserUseClient as MockClient
+            self._mock = MockClient(self.api_key, self.gemini_api_key)
+        return self._mock
+    
+    async def close(self):
+        """Close the warm browser contexts for the running event loop."""
+        pool = self._pools.pop(asyncio.get_running_loop(), None)
+        if pool is not None:
+            await pool.close()
+    
+    def _create_agent(self, task: str, browser, browser_context):
+        """Build a BrowserUse Agent, attached to a pooled browser when available."""
+        if browser is None:
+            return Agent(task=task, llm=self.llm, max_actions_per_step=5)
+        try:
+            return Agent(
+                task=task,
+                llm=self.llm,
+                max_actions_per_step=5,
+                browser=browser,
+                browser_context=browser_context
+            )
+        except TypeError:
+            # Older BrowserUse releases only accept a shared browser
+            return Agent(task=task, llm=self.llm, max_actions_per_step=5, browser=browser)
+    
+    async def execute_task(
+        self,
+        task: str,
+        max_steps: int = 50,
+        domain: Optional[str] = None
+    ) -> Dict[str, Any]:
         """
         Execute a browser automation task.
         
         Args:
             task: Natural language task description
             max_steps: Maximum number of steps to execute
+            domain: Site for per-domain concurrency limits (default: first URL in task)
             
         Returns:
             Dict with result, history, and extracted data
@@ -80,23 +169,18 @@ class BrowserUseClient:
             if not self.llm:
                 print("[WARN] LLM not available, using mock")
                 # Fallback to mock
-                from services.browseruse_client_mock import BrowserUseClient as MockClient
-                mock = MockClient(self.api_key, self.gemini_api_key)
-                return await mock.execute_task(task, max_steps)
-            
-            # Create agent
-            print(f"[BROWSERUSE] Creating agent for task: {task[:80]}...")
-            
-            agent = Agent(
-                task=task,
-                llm=self.llm,
-                max_actions_per_step=5
-            )
+                return await self._get_mock().execute_task(task, max_steps)
             
-            print(f"[BROWSERUSE] Running agent...")
-            
-            # Run with error handling
-            result = await agent.run()
+            async with self.get_pool().acquire(domain or task_domain(task)) as entry:
+                # Create agent
+                print(f"[BROWSERUSE] Creating agent for task: {task[:80]}...")
+                
+                agent = self._create_agent(task, entry.browser, entry.context)
+                
+                print(f"[BROWSERUSE] Running agent...")
+                
+                # Run with error handling
+                result = await agent.run()
             
             print(f"[BROWSERUSE] Task complete: {str(result)[:100]}")
             
@@ -110,17 +194,30 @@ class BrowserUseClient:
         except AttributeError as e:
             if 'provider' in str(e):
                 print(f"[WARN] BrowserUse LLM compatibility issue, using mock")
-                from services.browseruse_client_mock import BrowserUseClient as MockClient
-                mock = MockClient(self.api_key, self.gemini_api_key)
-                return await mock.execute_task(task, max_steps)
+                return await self._get_mock().execute_task(task, max_steps)
             raise
             
         except Exception as e:
             print(f"[ERROR] BrowserUse task failed: {e}")
             # Use mock as fallback
-            from services.browseruse_client_mock import BrowserUseClient as MockClient
-            mock = MockClient(self.api_key, self.gemini_api_key)
-            return await mock.execute_task(task, max_steps)
+            return await self._get_mock().execute_task(task, max_steps)
+    
+    async def execute_many(
+        self,
+        tasks: List[Any],
+        concurrency: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Run several tasks in parallel on the browser pool.
+        
+        Args:
+            tasks: Task strings or dicts with task, max_steps, domain
+            concurrency: Maximum tasks in flight (default: pool size)
+            
+        Returns:
+            Results in the same order as tasks
+        """
+        return await run_many(self.execute_task, tasks, concurrency or self.pool_size)
     
     async def scrape_google_maps_reviews(
         self, 
@@ -218,6 +315,44 @@ class BrowserUseClient:
         result = await self.execute_task(task, max_steps=50)
         return result
     
+    async def fill_supplier_forms(
+        self,
+        supplier_url: str,
+        purchase_orders: List[Dict[str, Any]],
+        submit: bool = False
+    ) -> Dict[str, Any]:
+        """
+        Fill several purchase orders for one supplier in a single session.
+        
+        All line items go on one page: one row per item, then a single
+        screenshot and (optionally) a single submit.
+        
+        Args:
+            supplier_url: Supplier portal URL
+            purchase_orders: POs with item/quantity/unit/delivery_date/notes
+            submit: Submit the form after filling
+        """
+        submit_text = "and submit the form once" if submit else "but DO NOT submit"
+        
+        lines_desc = "\n".join([
+            f"           - Item: {po.get('item', '')}, Quantity: {po.get('quantity', '')}, "
+            f"Unit: {po.get('unit', '')}, Delivery Date: {po.get('delivery_date', '')}, "
+            f"Special Instructions: {po.get('notes', '')}"
+            for po in purchase_orders
+        ])
+        
+        task = f"""
+        1. Go to {supplier_url}
+        2. Fill in one purchase order line per item (use "Add line" for each new row):
+{lines_desc}
+        3. Take a screenshot of the filled form
+        4. {submit_text}
+        5. Return confirmation
+        """
+        
+        result = await self.execute_task(task, max_steps=30 + 10 * len(purchase_orders))
+        return result
+    
     async def analyze_web_content(self, url: str, analysis_prompt: str) -> Dict[str, Any]:
         """Open a URL and analyze its content using Gemini."""
         task = f"""
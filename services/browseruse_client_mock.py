@@ -4,8 +4,9 @@ This version simulates browser automation without requiring the full browser-use
 """
 import os
 import asyncio
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
 import random
+from services.browser_pool import run_many
 
 
 class BrowserUseClient:
@@ -17,7 +18,12 @@ class BrowserUseClient:
         self.chrome_user_data_dir = os.getenv("CHROME_USER_DATA_DIR")
         self.chrome_profile_dir = os.getenv("CHROME_PROFILE_DIR", "Default")
     
-    async def execute_task(self, task: str, max_steps: int = 50) -> Dict[str, Any]:
+    async def execute_task(
+        self,
+        task: str,
+        max_steps: int = 50,
+        domain: Optional[str] = None
+    ) -> Dict[str, Any]:
         """Mock execute a browser automation task."""
         await asyncio.sleep(1)  # Simulate work
         return {
@@ -27,6 +33,14 @@ class BrowserUseClient:
             "extracted_data": None
         }
     
+    async def execute_many(
+        self,
+        tasks: List[Any],
+        concurrency: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """Mock run several tasks in parallel."""
+        return await run_many(self.execute_task, tasks, concurrency or 3)
+    
     async def scrape_google_maps_reviews(
         self, 
         place_name: str, 
@@ -138,6 +152,31 @@ class BrowserUseClient:
             ]
         }
     
+    async def fill_supplier_forms(
+        self,
+        supplier_url: str,
+        purchase_orders: List[Dict[str, Any]],
+        submit: bool = False
+    ) -> Dict[str, Any]:
+        """Mock fill several POs in one supplier session."""
+        await asyncio.sleep(1)
+        
+        action = "filled and submitted" if submit else "filled (not submitted)"
+        
+        return {
+            "success": True,
+            "result": f"Mock: Supplier form {action} with {len(purchase_orders)} lines",
+            "history": [
+                {"action": "Opened supplier portal", "url": supplier_url},
+                {"action": f"Filled {len(purchase_orders)} order lines", "result": "Success"},
+                {"action": "Submitted" if submit else "Ready to submit", "result": "Success"}
+            ]
+        }
+    
+    async def close(self):
+        """Mock close (no browser to release)."""
+        pass
+    
     async def analyze_web_content(self, url: str, analysis_prompt: str) -> Dict[str, Any]:
         """Mock analyze web content."""
         await asyncio.sleep(1)
@@ -0,0 +1,232 @@
+"""
+Queueing-model capacity planning for kitchen and counter staff.
+
+Service-time distributions are fitted from measured prep and handoff times,
+then Erlang-C (M/M/c with an Allen-Cunneen correction for service-time
+variability) gives the fewest staff per hour that meets a target wait time
+at a target service level. Requirements are evaluated for whole
+day x hour matrices at once and cached as a lookup table by orders/hour.
+"""
+import os
+from typing import Dict, Any, Optional
+import numpy as np
+import pandas as pd
+
+
+ORDERS_REALTIME_FILE = "data/orders_realtime.csv"
+ORDER_ACCURACY_FILE = "order accuracy.csv"
+
+
+class CapacityModel:
+    """Erlang-C staffing model fitted from measured service times."""
+
+    # Orders one person can have in progress at once (cooks work several
+    # tickets in parallel; a cashier bags/hands off a few at a time)
+    SLOTS_PER_STAFF = {
+        "Cook": 6,
+        "Cashier": 4
+    }
+
+    # Used when no measurements are available (minutes, coefficient of variation)
+    DEFAULT_SERVICE = {
+        "Cook": {"mean_min": 14.0, "cv": 0.4, "samples": 0},
+        "Cashier": {"mean_min": 7.0, "cv": 1.0, "samples": 0}
+    }
+
+    MAX_STAFF = 30
+
+    def __init__(
+        self,
+        target_wait_min: float = 5.0,
+        service_level: float = 0.8,
+        orders_file: str = ORDERS_REALTIME_FILE,
+        accuracy_file: str = ORDER_ACCURACY_FILE
+    ):
+        """
+        Args:
+            target_wait_min: Queue wait (before work starts) to stay under
+            service_level: Share of orders that must wait no longer than target
+            orders_file: CSV with prep_time_min per order
+            accuracy_file: Uber Eats order accuracy export
+        """
+        self.target_wait_min = target_wait_min
+        self.service_level = service_level
+        self.service = self.fit_service_times(orders_file, accuracy_file)
+        self._tables: Dict[str, np.ndarray] = {}
+
+    @classmethod
+    def fit_service_times(cls, orders_file: str, accuracy_file: str) -> Dict[str, Dict[str, float]]:
+        """
+        Fit per-role service-time mean and coefficient of variation.
+
+        Kitchen: prep_time_min (in-house orders) and Original Prep Time (Uber Eats).
+        Counter: Total Prep & Handoff Time minus Original Prep Time.
+
+        Returns:
+            {role: {"mean_min", "cv", "samples"}}
+        """
+        kitchen = []
+        handoff = []
+
+        accuracy = None
+        if os.path.exists(accuracy_file):
+            accuracy = pd.read_csv(
+                accuracy_file,
+                usecols=["Order UUID", "Original Prep Time", "Total Prep & Handoff Time"]
+            )
+
+        if os.path.exists(orders_file):
+            df = pd.read_csv(orders_file, usecols=["order_id", "prep_time_min"])
+            if accuracy is not None:
+                # Orders imported from the export are counted from the export itself
+                df = df[~df["order_id"].isin(accuracy["Order UUID"])]
+            kitchen.append(df.drop_duplicates("order_id")["prep_time_min"])
+
+        if accuracy is not None:
+            kitchen.append(accuracy["Original Prep Time"])
+            handoff.append(accuracy["Total Prep & Handoff Time"] - accuracy["Original Prep Time"])
+
+        service = {}
+        for role, samples in [("Cook", kitchen), ("Cashier", handoff)]:
+            values = pd.concat(samples).dropna() if samples else pd.Series(dtype=float)
+            # Drop clock glitches and orders left sitting for ages
+            values = values[(values > 0.5) & (values < 60)]
+
+            if len(values) < 10:
+                service[role] = dict(cls.DEFAULT_SERVICE[role])
+                continue
+
+            mean = float(values.mean())
+            service[role] = {
+                "mean_min": round(mean, 2),
+                "cv": round(float(values.std() / mean), 3),
+                "samples": int(len(values))
+            }
+
+        return service
+
+    def required_staff(self, role: str, orders_per_hour: Any) -> np.ndarray:
+        """
+        Fewest staff meeting the service level, for any array of hourly volumes.
+
+        Args:
+            role: "Cook" or "Cashier"
+            orders_per_hour: Scalar or array (e.g. days x hours)
+
+        Returns:
+            Integer array of the same shape
+        """
+        lam = np.asarray(orders_per_hour, dtype=float)
+        servers = self._required_servers(role, lam)
+        staff = np.ceil(servers / self.SLOTS_PER_STAFF.get(role, 1)).astype(int)
+        return np.where(lam > 0, np.maximum(staff, 1), 0)
+
+    def requirement_fn(self, role: str, hourly_orders: np.ndarray) -> np.ndarray:
+        """Adapter for StaffingOptimizer(requirement_fn=...)."""
+        return self.lookup(role, hourly_orders)
+
+    def staffing_table(self, max_orders_per_hour: int = 300) -> pd.DataFrame:
+        """Precomputed staff needed for every whole orders/hour volume."""
+        volumes = np.arange(max_orders_per_hour + 1)
+        table = {"orders_per_hour": volumes}
+        for role in self.SLOTS_PER_STAFF:
+            table[role.lower()] = self.required_staff(role, volumes)
+        return pd.DataFrame(table)
+
+    def lookup(self, role: str, orders_per_hour: Any) -> np.ndarray:
+        """Table lookup of required_staff (rounds volumes up to whole orders)."""
+        if role not in self._tables:
+            self._tables[role] = self.required_staff(role, np.arange(301))
+
+        table = self._tables[role]
+        idx = np.ceil(np.asarray(orders_per_hour, dtype=float)).astype(int)
+        if idx.size and idx.max() >= len(table):
+            # Grow the table to cover the largest volume seen
+            self._tables[role] = table = self.required_staff(role, np.arange(int(idx.max()) * 2 + 1))
+        return table[np.clip(idx, 0, None)]
+
+    def wait_stats(self, role: str, orders_per_hour: Any, staff: Any) -> Dict[str, np.ndarray]:
+        """
+        Queue metrics for given volumes and staffing levels.
+
+        Returns:
+            Dict with utilization, p_wait, mean_wait_min and service_level arrays
+        """
+        lam = np.asarray(orders_per_hour, dtype=float)
+        c = np.asarray(staff, dtype=float) * self.SLOTS_PER_STAFF.get(role, 1)
+        mu = 60.0 / self.service[role]["mean_min"]
+        a = lam / mu
+
+        p_wait = self._erlang_c(a, c)
+        decay = self._decay_rate(role, lam, c, mu)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            mean_wait = np.where(decay > 0, p_wait / decay * 60, np.inf)
+        service_level = 1 - p_wait * np.exp(-decay * self.target_wait_min / 60)
+
+        return {
+            "utilization": np.where(c > 0, a / np.maximum(c, 1), np.inf),
+            "p_wait": p_wait,
+            "mean_wait_min": mean_wait,
+            "service_level": service_level
+        }
+
+    def _decay_rate(self, role: str, lam: np.ndarray, c: np.ndarray, mu: float) -> np.ndarray:
+        """Exponential wait-tail rate (per hour), stretched for service variability."""
+        variability = (1.0 + self.service[role]["cv"] ** 2) / 2  # Allen-Cunneen, Poisson arrivals
+        return np.maximum(c * mu - lam, 0) / variability
+
+    def _required_servers(self, role: str, lam: np.ndarray) -> np.ndarray:
+        """Smallest server count meeting the service level, vectorized over volumes."""
+        mu = 60.0 / self.service[role]["mean_min"]
+        a = lam / mu
+        max_servers = self.MAX_STAFF * self.SLOTS_PER_STAFF.get(role, 1)
+
+        result = np.full(lam.shape, max_servers, dtype=int)
+        done = lam <= 0
+        result[done] = 0
+
+        # Erlang-B recursion over server counts, all volumes at once
+        erlang_b = np.ones(lam.shape)
+        for c in range(1, max_servers + 1):
+            erlang_b = a * erlang_b / (c + a * erlang_b)
+            if done.all():
+                break
+
+            stable = a < c
+            with np.errstate(divide="ignore", invalid="ignore"):
+                p_wait = np.where(stable, erlang_b / (1 - (a / c) * (1 - erlang_b)), 1.0)
+            decay = self._decay_rate(role, lam, np.full(lam.shape, c), mu)
+            meets = stable & (1 - p_wait * np.exp(-decay * self.target_wait_min / 60) >= self.service_level)
+
+            newly = meets & ~done
+            result[newly] = c
+            done |= meets
+
+        return result
+
+    @staticmethod
+    def _erlang_c(a: np.ndarray, c: np.ndarray) -> np.ndarray:
+        """Erlang-C probability of waiting for offered load a and c servers (vectorized)."""
+        a, c = np.broadcast_arrays(np.asarray(a, dtype=float), np.asarray(c, dtype=float))
+        servers = c.astype(int)
+
+        erlang_b = np.ones(a.shape)
+        for k in range(1, int(servers.max(initial=0)) + 1):
+            erlang_b = np.where(k <= servers, a * erlang_b / (k + a * erlang_b), erlang_b)
+
+        stable = (servers > 0) & (a < servers)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            p_wait = erlang_b / (1 - (a / servers) * (1 - erlang_b))
+        return np.where(stable, p_wait, 1.0)
+
+
+# Global capacity model instance
+_capacity_model: Optional[CapacityModel] = None
+
+
+def get_capacity_model() -> CapacityModel:
+    """Get or create global capacity model."""
+    global _capacity_model
+    if _capacity_model is None:
+        _capacity_model = CapacityModel()
+    return _capacity_model
@@ -0,0 +1,306 @@
+"""
+Section-level retrieval index over compliance documents.
+
+Documents are split into sections on their headings (markdown #, or
+numbered headings like "3.1 Approved Methods" in extracted PDF text),
+long sections into paragraph windows, and stored in an SQLite FTS5 table
+next to the document store. Tenant and role filtering are part of the
+full-text match itself: each chunk carries a hashed tenant token and the
+roles allowed to read it, so a query only ever ranks (BM25) the chunks
+the caller may see. Compliance questions then send just the top sections
+instead of every document, keeping prompt size flat as the library grows.
+"""
+import re
+import hashlib
+from typing import Dict, Any, List, Optional, Tuple
+
+
+# Sections longer than this are split into paragraph windows
+MAX_CHUNK_CHARS = 1500
+
+# Roles that may read a document at each access level (others: everyone)
+READERS = {
+    "owner_only": "owner",
+    "manager_only": "owner manager"
+}
+ALL_READERS = "owner manager staff"
+
+HEADING_SEPARATOR = " › "
+
+_MARKDOWN_HEADING = re.compile(r"^(#{1,6})\s+(.+?)\s*#*\s*$")
+_NUMBERED_HEADING = re.compile(r"^(\d+(?:\.\d+)*)\.?\s+([A-Z][^.!?]{0,80})$")
+_TERM = re.compile(r"[a-z0-9]+")
+
+STOPWORDS = {
+    "a", "an", "and", "are", "as", "at", "be", "by", "can", "do", "does", "for",
+    "from", "how", "if", "in", "is", "it", "of", "on", "or", "our", "should",
+    "that", "the", "to", "we", "what", "when", "which", "who", "why", "will",
+    "with", "you", "i", "my", "me", "us", "this", "there", "need", "any"
+}
+
+
+def tenant_token(tenant_id: str) -> str:
+    """Single opaque FTS token for a tenant (tenant IDs tokenize into several words)."""
+    return "t" + hashlib.sha256(tenant_id.encode()).hexdigest()[:24]
+
+
+def role_token(user_role: str) -> str:
+    """Reader token for a role (unknown roles read like staff)."""
+    return user_role if user_role in ("owner", "manager") else "staff"
+
+
+def _heading(line: str) -> Optional[Tuple[int, str]]:
+    """(level, title) if the line is a heading."""
+    match = _MARKDOWN_HEADING.match(line)
+    if match:
+        return len(match.group(1)), match.group(2).strip()
+    match = _NUMBERED_HEADING.match(line)
+    if match:
+        # "3" -> level 2, "3.1" -> level 3 (below a document title)
+        return match.group(1).count(".") + 2, line
+    return None
+
+
+def _windows(text: str, max_chars: int) -> List[str]:
+    """Pack paragraphs into windows of at most ~max_chars."""
+    windows, current = [], []
+    size = 0
+    for paragraph in re.split(r"\n\s*\n", text):
+        paragraph = paragraph.strip()
+        if not paragraph:
+            continue
+        if current and size + len(paragraph) > max_chars:
+            windows.append("\n\n".join(current))
+            current, size = [], 0
+        current.append(paragraph)
+        size += len(paragraph)
+    if current:
+        windows.append("\n\n".join(current))
+    return windows
+
+
+def chunk_sections(text: str, title: str = "", max_chars: int = MAX_CHUNK_CHARS) -> List[Dict[str, str]]:
+    """
+    Split a document into heading-scoped sections.
+
+    Args:
+        text: Document text (markdown or extracted plain text)
+        title: Heading used for text before the first heading
+        max_chars: Longer sections are split on paragraphs
+
+    Returns:
+        [{"heading": "2. Temperature Control › 2.1 Cold Holding", "text": ...}]
+    """
+    sections = []
+    stack: List[Tuple[int, str]] = []
+    body: List[str] = []
+
+    def flush():
+        # Horizontal rules (---) separate sections in the SOPs; they aren't content
+        content = "\n".join(line for line in body if not re.fullmatch(r"\s*-{3,}\s*", line)).strip()
+        if content:
+            path = HEADING_SEPARATOR.join(t for _, t in stack) or title
+            parts = _windows(content, max_chars) if len(content) > max_chars else [content]
+            for i, part in enumerate(parts):
+                heading = path if len(parts) == 1 else f"{path} ({i + 1}/{len(parts)})"
+                sections.append({"heading": heading, "text": part})
+        body.clear()
+
+    for line in text.splitlines():
+        heading = _heading(line.strip())
+        if heading:
+            flush()
+            level, name = heading
+            while stack and stack[-1][0] >= level:
+                stack.pop()
+            # Document titles (#) are implied by the filename; keep paths short
+            if level > 1:
+                stack.append((level, name))
+        else:
+            body.append(line)
+    flush()
+
+    return sections
+
+
+def query_terms(question: str) -> List[str]:
+    """Searchable terms in a question."""
+    seen = []
+    for term in _TERM.findall(question.lower()):
+        if term not in STOPWORDS and term not in seen:
+            seen.append(term)
+    return seen
+
+
+class ComplianceIndex:
+    """FTS5 section index, stored in the compliance document database."""
+
+    # Rows read per requested section, so duplicates can be dropped
+    SEARCH_OVERFETCH = 3
+
+    def __init__(self, store):
+        self.store = store
+        self.conn = store.conn
+        self.conn.executescript("""
+            CREATE VIRTUAL TABLE IF NOT EXISTS chunks USING fts5(
+                tenant,
+                readers,
+                heading,
+                text,
+                tenant_id UNINDEXED,
+                doc_id UNINDEXED,
+                filename UNINDEXED,
+                doc_type UNINDEXED,
+                access_level UNINDEXED,
+                position UNINDEXED
+            );
+            CREATE TABLE IF NOT EXISTS indexed_documents (
+                tenant_id TEXT NOT NULL,
+                doc_id TEXT NOT NULL,
+                chunks INTEGER NOT NULL,
+                PRIMARY KEY (tenant_id, doc_id)
+            ) WITHOUT ROWID;
+        """)
+        self.conn.commit()
+
+    def add_document(self, doc: Dict[str, Any]) -> int:
+        """
+        Index a stored document's sections.
+
+        Args:
+            doc: Document dict (tenant_id, doc_id, filename, doc_type,
+                access_level, content)
+
+        Returns:
+            Number of sections indexed
+        """
+        sections = chunk_sections(doc["content"], title=doc["filename"])
+        tenant = tenant_token(doc["tenant_id"])
+        readers = READERS.get(doc["access_level"], ALL_READERS)
+
+        rows = [
+            (
+                tenant, readers, section["heading"], section["text"],
+                doc["tenant_id"], doc["doc_id"], doc["filename"], doc["doc_type"],
+                doc["access_level"], position
+            )
+            for position, section in enumerate(sections)
+        ]
+
+        with self.conn:
+            self._delete_chunks(tenant, doc["doc_id"])
+            self.conn.executemany(
+                "INSERT INTO chunks VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", rows
+            )
+            self.conn.execute(
+                "INSERT OR REPLACE INTO indexed_documents VALUES (?, ?, ?)",
+                (doc["tenant_id"], doc["doc_id"], len(rows))
+            )
+        return len(rows)
+
+    def remove_document(self, tenant_id: str, doc_id: str):
+        with self.conn:
+            self._delete_chunks(tenant_token(tenant_id), doc_id)
+            self.conn.execute(
+                "DELETE FROM indexed_documents WHERE tenant_id = ? AND doc_id = ?",
+                (tenant_id, doc_id)
+            )
+
+    def _delete_chunks(self, tenant: str, doc_id: str):
+        # Narrow through the tenant token first; UNINDEXED columns can't be matched
+        self.conn.execute(
+            "DELETE FROM chunks WHERE rowid IN "
+            "(SELECT rowid FROM chunks WHERE chunks MATCH ? AND doc_id = ?)",
+            (f"tenant:{tenant}", doc_id)
+        )
+
+    def ensure_indexed(self, tenant_id: str) -> int:
+        """Index a tenant's documents stored before the index existed."""
+        missing = self.conn.execute(
+            """
+            SELECT d.doc_id FROM documents d
+            LEFT JOIN indexed_documents i ON i.tenant_id = d.tenant_id AND i.doc_id = d.doc_id
+            WHERE d.tenant_id = ? AND i.doc_id IS NULL
+            """,
+            (tenant_id,)
+        ).fetchall()
+        for row in missing:
+            self.add_document(self.store.get(tenant_id, row["doc_id"]))
+        return len(missing)
+
+    def search(self, tenant_id: str, question: str, user_role: str = "manager", top_k: int = 5) -> List[Dict[str, Any]]:
+        """
+        Top sections for a question among those the role may read.
+
+        Args:
+            tenant_id: Restaurant tenant ID
+            question: Compliance question
+            user_role: manager, staff, owner (filters at match time)
+            top_k: Sections to return
+
+        Returns:
+            Section dicts (heading, text, doc_id, filename, doc_type,
+            access_level, score) best first, each section once; the
+            tenant's first sections if nothing matches
+        """
+        self.ensure_indexed(tenant_id)
+
+        scope = f'tenant:{tenant_token(tenant_id)} AND readers:{role_token(user_role)}'
+        terms = query_terms(question)
+        columns = "heading, text, tenant_id, doc_id, filename, doc_type, access_level"
+
+        rows = []
+        if terms:
+            any_term = " OR ".join('{heading text}:"%s"' % term for term in terms)
+            match = f"{scope} AND ({any_term})"
+            # Heading matches count double
+            rows = self.conn.execute(
+                f"SELECT {columns}, bm25(chunks, 0, 0, 2.0, 1.0) AS rank FROM chunks "
+                "WHERE chunks MATCH ? ORDER BY rank LIMIT ?",
+                (match, top_k * self.SEARCH_OVERFETCH)
+            ).fetchall()
+
+        if not rows:
+            rows = self.conn.execute(
+                f"SELECT {columns}, 0.0 AS rank FROM chunks WHERE chunks MATCH ? "
+                "ORDER BY doc_id, CAST(position AS INTEGER) LIMIT ?",
+                (scope, top_k * self.SEARCH_OVERFETCH)
+            ).fetchall()
+
+        # tenant_id is re-checked outside the token match as a second guard;
+        # identical sections (same file stored twice) are returned once
+        results = []
+        seen = set()
+        for row in rows:
+            key = (row["filename"], row["heading"], row["text"])
+            if row["tenant_id"] != tenant_id or key in seen:
+                continue
+            seen.add(key)
+            results.append({**{k: row[k] for k in row.keys() if k != "rank"}, "score": -row["rank"] or 0.0})
+        return results[:top_k]
+
+    def sections(self, tenant_id: str, user_role: str = "manager") -> List[Dict[str, Any]]:
+        """Every section the role may read, in document order."""
+        self.ensure_indexed(tenant_id)
+        rows = self.conn.execute(
+            "SELECT heading, text, tenant_id, doc_id, filename, doc_type, access_level FROM chunks "
+            "WHERE chunks MATCH ? ORDER BY doc_id, CAST(position AS INTEGER)",
+            (f'tenant:{tenant_token(tenant_id)} AND readers:{role_token(user_role)}',)
+        ).fetchall()
+        return [dict(row) for row in rows if row["tenant_id"] == tenant_id]
+
+    def signature(self, tenant_id: str) -> str:
+        """Changes whenever a tenant's indexed document set does."""
+        rows = self.conn.execute(
+            "SELECT doc_id, chunks FROM indexed_documents WHERE tenant_id = ? ORDER BY doc_id",
+            (tenant_id,)
+        ).fetchall()
+        return hashlib.sha256(repr([tuple(row) for row in rows]).encode()).hexdigest()[:16]
+
+    def document_count(self, tenant_id: str, user_role: str = "manager") -> int:
+        """Documents with at least one section the role may read."""
+        row = self.conn.execute(
+            "SELECT COUNT(DISTINCT doc_id) FROM chunks WHERE chunks MATCH ?",
+            (f'tenant:{tenant_token(tenant_id)} AND readers:{role_token(user_role)}',)
+        ).fetchone()
+        return row[0]
@@ -0,0 +1,377 @@
+"""
+Rule-based fast path for numeric compliance checks.
+
+Numeric thresholds in the SOPs (holding and cooking temperatures, thaw
+time limits per thaw method, certified cooks per fryer) are extracted once per tenant
+document set from the indexed sections and kept as compiled rules. A
+question that states one measurement ("Can wings thaw in cold water for
+3 hours?", "Is 45°F OK for the walk-in?", "2 fryers and 1 certified
+cook?") is evaluated against those rules in microseconds and answered in
+the same shape as query_compliance, citing the SOP lines it used. Fryer
+staffing questions take whichever count they don't state from the
+operational context (active_fryers, certified_cooks).
+Anything ambiguous (no measurement, several, a thaw time without its
+method, or no matching rule) returns None and falls through to the LLM.
+"""
+import re
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Dict, Any, List, Optional, Tuple
+
+
+RISK_ORDER = ["LOW", "MEDIUM", "HIGH", "CRITICAL"]
+
+# Food items rules and questions can be scoped to, with the words naming them (most specific first)
+SUBJECTS = {
+    "ground meat": ["ground meat", "burgers?", "patty", "patties"],
+    "wings": ["wings?"],
+    "chicken": ["chicken"],
+    "poultry": ["poultry"],
+    "beef": ["beef"],
+    "fish": ["fish"],
+    "eggs": ["eggs?"]
+}
+_SUBJECT_PATTERNS = [
+    (subject, re.compile(r"\b(?:" + "|".join(words) + r")\b", re.I))
+    for subject, words in SUBJECTS.items()
+]
+
+# Thaw methods; time limits in the SOPs only apply to the method they're stated for
+THAW_METHODS = {
+    "cold_water": [r"cold (?:running )?water", r"running water", r"cold[- ]water"],
+    "hot_water": [r"hot water", r"warm water"],
+    "room_temp": [r"room temp\w*", r"counter", r"ambient"],
+    "microwave": [r"microwave"],
+    "refrigerator": [r"refrigerat\w*", r"fridge", r"walk-in", r"cooler"]
+}
+_THAW_METHOD_PATTERNS = [
+    (method, re.compile(r"\b(?:" + "|".join(words) + r")", re.I))
+    for method, words in THAW_METHODS.items()
+]
+
+QUANTITY_LABELS = {
+    "thaw_hours": ("Thaw time", "hours"),
+    "thaw_water_f": ("Thaw water temperature", "°F"),
+    "cold_holding_f": ("Cold holding temperature", "°F"),
+    "freezer_f": ("Freezer temperature", "°F"),
+    "hot_holding_f": ("Hot holding temperature", "°F"),
+    "cook_temp_f": ("Cooking temperature", "°F"),
+    "oil_temp_f": ("Fryer oil temperature", "°F"),
+    "certified_cooks_per_fryer": ("Certified cooks per active fryer", "per fryer")
+}
+
+_NUMBER = r"(-?\d+(?:\.\d+)?)"
+_THAW_LIMIT = re.compile(r"(?:maximum|max|>|exceeds|more than)\D{0,20}?" + _NUMBER + r"(?:\s*-\s*\d+(?:\.\d+)?)?\s*(?:hours?|hrs?)\b", re.I)
+_TEMP_RANGE = re.compile(_NUMBER + r"\s*-\s*" + _NUMBER + r"\s*°\s*F", re.I)
+_TEMP = re.compile(_NUMBER + r"\s*°\s*F", re.I)
+_PER_FRYER = re.compile(r"(\d+)\s+certified\s+cooks?\s+per\s+(?:active\s+)?fryer", re.I)
+
+_Q_DURATION = re.compile(_NUMBER + r"\s*(hours?|hrs?|h|minutes?|mins?)\b", re.I)
+_Q_TEMP = re.compile(_NUMBER + r"\s*(?:°\s*f?|degrees(?:\s*f(?:ahrenheit)?)?|f(?![a-z]))", re.I)
+_Q_FRYERS = re.compile(r"(\d+)\s+(?:active\s+)?fryers?", re.I)
+_Q_COOKS = re.compile(r"(\d+)\s+(?:fryer[- ])?(?:certified\s+)?cooks?", re.I)
+
+
+@dataclass
+class Rule:
+    """One numeric threshold from a compliance document."""
+    quantity: str
+    op: str          # "max" (value must not exceed) or "min" (must reach)
+    value: float
+    subject: str     # food item the rule is scoped to ("" = any)
+    risk_level: str
+    text: str        # SOP line the rule came from
+    heading: str
+    filename: str
+    doc_id: str
+    doc_type: str
+    method: str = ""  # thaw method a thaw_hours limit applies to
+
+    def violated_by(self, measured: float) -> bool:
+        return measured > self.value if self.op == "max" else measured < self.value
+
+
+def _clean(line: str) -> str:
+    """Strip markdown list/emphasis markers from an SOP line."""
+    line = line.replace("**", "")
+    return re.sub(r"^\s*(?:[-*]|\d+\.|\[.?\])\s*", "", line).strip()
+
+
+def _subject(text: str) -> str:
+    for subject, pattern in _SUBJECT_PATTERNS:
+        if pattern.search(text):
+            return subject
+    return ""
+
+
+def _thaw_method(text: str) -> str:
+    """Thaw method named in text ("" if none; "without refrigeration" doesn't count)."""
+    text = re.sub(r"\bwithout\s+\w+", "", text, flags=re.I)
+    for method, pattern in _THAW_METHOD_PATTERNS:
+        if pattern.search(text):
+            return method
+    return ""
+
+
+def _format(value: float, unit: str) -> str:
+    return f"{value:g}{unit}" if unit.startswith("°") else f"{value:g} {unit}"
+
+
+def _risk(heading: str, line: str) -> str:
+    heading = heading.lower()
+    if "critical" in heading:
+        return "CRITICAL"
+    if "high risk" in heading or "prohibited" in heading or "violation" in line.lower():
+        return "HIGH"
+    return "MEDIUM"
+
+
+def _temperature_quantity(heading: str, line: str) -> Optional[str]:
+    text = f"{heading} {line}".lower()
+    if "oil" in line.lower():
+        return "oil_temp_f"
+    if "cook" in heading.lower() or "undercook" in text:
+        return "cook_temp_f"
+    if "water" in line.lower():
+        return "thaw_water_f"
+    if "freezer" in text:
+        return "freezer_f"
+    if "hot" in text:
+        return "hot_holding_f"
+    if "refrigerat" in text or "cold holding" in text:
+        return "cold_holding_f"
+    return None
+
+
+def extract_rules(section: Dict[str, Any]) -> List[Rule]:
+    """Numeric rules stated in one indexed section."""
+    heading = section["heading"]
+    rules = []
+
+    def add(quantity, op, value, line, subject=None, method=""):
+        rules.append(Rule(
+            quantity=quantity,
+            op=op,
+            value=float(value),
+            subject=_subject(f"{heading} {line}") if subject is None else subject,
+            risk_level=_risk(heading, line),
+            text=line,
+            heading=heading,
+            filename=section["filename"],
+            doc_id=section["doc_id"],
+            doc_type=section["doc_type"],
+            method=method
+        ))
+
+    # Sub-bullets inherit the method named by their list item
+    # ("2. Cold running water" -> "   - Maximum time: 2-3 hours")
+    item_method = ""
+    for raw in section["text"].splitlines():
+        line = _clean(raw)
+        if not line:
+            continue
+        lowered = line.lower()
+        method = _thaw_method(line)
+        if raw[:1].strip():
+            item_method = method
+        method = method or item_method
+
+        # Thaw time limits (the strict end of "2-3 hours"), per method
+        if method and "thaw" in f"{heading} {line}".lower():
+            match = _THAW_LIMIT.search(line)
+            if match:
+                add("thaw_hours", "max", match.group(1), line, method=method)
+            elif "prohibited" in heading.lower():
+                # Prohibited methods allow no thaw time at all
+                add("thaw_hours", "max", 0, line, method=method)
+
+        # Staffing ratio
+        match = _PER_FRYER.search(line)
+        if match:
+            add("certified_cooks_per_fryer", "min", match.group(1), line, subject="")
+
+        # Temperatures: ranges, "or below" / "or above", cooking minimums
+        match = _TEMP_RANGE.search(line)
+        quantity = _temperature_quantity(heading, line)
+        if match and quantity:
+            add(quantity, "min", match.group(1), line)
+            add(quantity, "max", match.group(2), line)
+            continue
+
+        match = _TEMP.search(line)
+        if not (match and quantity):
+            continue
+        if "or below" in lowered or "≤" in line:
+            add(quantity, "max", match.group(1), line)
+        elif "or above" in lowered or "≥" in line or quantity == "cook_temp_f":
+            add(quantity, "min", match.group(1), line)
+
+    return rules
+
+
+def _measurements(question: str, context: Optional[Dict[str, Any]]) -> List[Tuple[str, float, str]]:
+    """(quantity, value, subject) measurements stated in a question."""
+    q = question.lower()
+    subject = _subject(q)
+    found = []
+
+    if "thaw" in q:
+        for value, unit in _Q_DURATION.findall(question):
+            hours = float(value) / 60 if unit.lower().startswith("m") else float(value)
+            found.append(("thaw_hours", hours, subject))
+
+    if "fryer" in q or "certified" in q:
+        context = context or {}
+        fryers = _Q_FRYERS.search(question)
+        cooks = _Q_COOKS.search(question)
+        fryers = float(fryers.group(1)) if fryers else context.get("active_fryers")
+        cooks = float(cooks.group(1)) if cooks else context.get("certified_cooks")
+        if fryers and cooks is not None:
+            found.append(("certified_cooks_per_fryer", float(cooks) / float(fryers), ""))
+
+    temps = [float(t) for t in _Q_TEMP.findall(question)]
+    if temps:
+        if "oil" in q:
+            quantity = "oil_temp_f"
+        elif "thaw" in q and "water" in q:
+            quantity = "thaw_water_f"
+        elif "freezer" in q:
+            quantity = "freezer_f"
+        elif "hot" in q or "steam table" in q:
+            quantity = "hot_holding_f"
+        elif "fridge" in q or "refrigerat" in q or "walk-in" in q or "cold holding" in q:
+            quantity = "cold_holding_f"
+        elif "cook" in q or "internal" in q:
+            quantity = "cook_temp_f"
+        else:
+            quantity = None
+        if quantity:
+            found.extend((quantity, t, subject) for t in temps)
+
+    return found
+
+
+class ComplianceRules:
+    """Compiled numeric rules per tenant document set, evaluated without the LLM."""
+
+    def __init__(self, index):
+        self.index = index
+        self._compiled: Dict[Tuple[str, str], Tuple[str, List[Rule]]] = {}
+
+    def rules(self, tenant_id: str, user_role: str = "manager") -> List[Rule]:
+        """Rules from the documents this role may read (recompiled when documents change)."""
+        key = (tenant_id, user_role)
+        signature = self.index.signature(tenant_id)
+        cached = self._compiled.get(key)
+        if cached is None or cached[0] != signature:
+            rules = [rule for section in self.index.sections(tenant_id, user_role) for rule in extract_rules(section)]
+            self._compiled[key] = (signature, rules)
+        return self._compiled[key][1]
+
+    def evaluate(
+        self,
+        tenant_id: str,
+        question: str,
+        user_role: str = "manager",
+        context: Optional[Dict[str, Any]] = None
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Answer a numeric compliance question from the rules.
+
+        Args:
+            tenant_id: Restaurant tenant ID
+            question: Compliance question
+            user_role: manager, staff, owner (rules only from readable documents)
+            context: Operational context; active_fryers and certified_cooks
+                fill in fryer staffing counts the question doesn't state
+
+        Returns:
+            query_compliance-shaped result, or None if the question needs the LLM
+        """
+        measurements = _measurements(question, context)
+        # One clear measurement only; anything else is for the LLM
+        if len(measurements) != 1:
+            return None
+        quantity, measured, subject = measurements[0]
+
+        # Thaw limits depend on the method; none named (or one without a
+        # time limit, like refrigeration) is for the LLM
+        method = _thaw_method(question) if quantity == "thaw_hours" else ""
+        if quantity == "thaw_hours" and not method:
+            return None
+
+        applicable = [
+            rule for rule in self.rules(tenant_id, user_role)
+            if rule.quantity == quantity
+            and (not rule.subject or rule.subject == subject)
+            and rule.method == method
+        ]
+        # Cooking minimums differ per item; without one named there is no single answer
+        if quantity == "cook_temp_f" and not subject:
+            return None
+        if not applicable:
+            return None
+
+        violated = [rule for rule in applicable if rule.violated_by(measured)]
+        cited = violated or applicable
+        label, unit = QUANTITY_LABELS[quantity]
+
+        # One citation per SOP line; limits stated in several places are listed once
+        citations, numbers, limits = [], {}, {}
+        for rule in cited:
+            key = (rule.doc_id, rule.heading, rule.text)
+            if key not in numbers:
+                numbers[key] = len(citations) + 1
+                citations.append({
+                    "title": f"{rule.doc_type}: {rule.filename} › {rule.heading}",
+                    "excerpt": rule.text,
+                    "content": rule.text,
+                    "score": 1.0,
+                    "metadata": {"doc_id": rule.doc_id, "section": rule.heading, "rule": f"{rule.quantity} {rule.op} {rule.value:g}"}
+                })
+            refs = limits.setdefault((rule.op, rule.value), [])
+            if numbers[key] not in refs:
+                refs.append(numbers[key])
+
+        def limit(op, value):
+            if quantity == "thaw_hours" and value == 0:
+                return "the prohibition on this thaw method"
+            return f"the {'maximum' if op == 'max' else 'minimum'} {_format(value, unit)}"
+
+        stated = "; ".join(
+            f"{limit(op, value)} " + "".join(f"[{n}]" for n in refs)
+            for (op, value), refs in sorted(limits.items())
+        )
+
+        if violated:
+            status = "NON-COMPLIANT"
+            risk_level = max((rule.risk_level for rule in violated), key=RISK_ORDER.index)
+            reasoning = f"{label} of {_format(measured, unit)} breaks {stated}."
+            recommendations = list(dict.fromkeys(f"Follow SOP {rule.heading}: {rule.text}" for rule in violated))
+        else:
+            status = "COMPLIANT"
+            risk_level = "LOW"
+            reasoning = f"{label} of {_format(measured, unit)} is within {stated}."
+            recommendations = []
+
+        answer = (
+            f"STATUS: {status.lower()}\nREASONING: {reasoning}\n"
+            f"CITATIONS: " + "; ".join(f"[{i}] {c['title']}" for i, c in enumerate(citations, 1)) +
+            (f"\nRISK_LEVEL: {risk_level}" if violated else "")
+        )
+
+        return {
+            "success": True,
+            "answer": answer,
+            "status": status,
+            "reasoning": reasoning,
+            "citations": citations,
+            "confidence": 95,
+            "risk_level": risk_level,
+            "recommendations": recommendations,
+            "security_badge": "Protected by Nivara • No data leaves restaurant boundary",
+            "documents_accessed": len({rule.doc_id for rule in cited}),
+            "source": "rules",
+            "rules_evaluated": len(applicable),
+            "timestamp": datetime.now(timezone.utc).isoformat()
+        }
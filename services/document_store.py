@@ -0,0 +1,235 @@
+"""
+Persistent, tenant-partitioned compliance document store.
+
+Document metadata lives in artifacts/compliance_documents.sqlite, indexed
+on (tenant_id, doc_type) and (tenant_id, access_level), so a tenant's
+documents are one index range scan rather than a pass over every stored
+document. Extracted text is stored once per security_hash (the SHA-256
+of the text), so re-uploading the same SOP under another name or tenant
+adds a metadata row, not another copy of the content. The extractions
+table caches extracted text by the SHA-256 of the original file bytes, so
+identical uploads skip PDF parsing and OCR.
+"""
+import os
+import json
+import sqlite3
+from datetime import datetime
+from typing import Dict, Any, List, Optional, Set
+
+
+DB_FILE = "artifacts/compliance_documents.sqlite"
+
+# Placeholder content for documents the caller's role may see but not read
+RESTRICTED_CONTENT = "[RESTRICTED - Manager access required]"
+
+
+class DocumentStore:
+    """Compliance documents keyed by tenant and document ID."""
+
+    def __init__(self, db_path: str = DB_FILE):
+        self.db_path = db_path
+
+        os.makedirs(os.path.dirname(db_path) or ".", exist_ok=True)
+        self.conn = sqlite3.connect(db_path, check_same_thread=False)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS documents (
+                tenant_id TEXT NOT NULL,
+                doc_id TEXT NOT NULL,
+                filename TEXT NOT NULL,
+                doc_type TEXT NOT NULL,
+                access_level TEXT NOT NULL,
+                uploaded_at TEXT NOT NULL,
+                metadata TEXT NOT NULL,
+                security_hash TEXT NOT NULL,
+                PRIMARY KEY (tenant_id, doc_id)
+            ) WITHOUT ROWID;
+            CREATE INDEX IF NOT EXISTS documents_type ON documents (tenant_id, doc_type);
+            CREATE INDEX IF NOT EXISTS documents_access ON documents (tenant_id, access_level);
+            CREATE INDEX IF NOT EXISTS documents_hash ON documents (security_hash);
+            CREATE TABLE IF NOT EXISTS contents (
+                security_hash TEXT PRIMARY KEY,
+                content TEXT NOT NULL
+            ) WITHOUT ROWID;
+            CREATE TABLE IF NOT EXISTS extractions (
+                file_hash TEXT PRIMARY KEY,
+                text TEXT NOT NULL,
+                extracted_at TEXT NOT NULL
+            ) WITHOUT ROWID;
+        """)
+        self.conn.commit()
+
+    def put(self, doc: Dict[str, Any]):
+        """
+        Store a document (its text is only written if the hash is new).
+
+        Re-storing a doc_id replaces the row; text no other document
+        shares any more is dropped.
+
+        Args:
+            doc: Dict with doc_id, tenant_id, filename, doc_type, content,
+                access_level, uploaded_at, metadata, security_hash
+        """
+        with self.conn:
+            previous = self.conn.execute(
+                "SELECT security_hash FROM documents WHERE tenant_id = ? AND doc_id = ?",
+                (doc["tenant_id"], doc["doc_id"])
+            ).fetchone()
+            self.conn.execute(
+                "INSERT OR IGNORE INTO contents VALUES (?, ?)",
+                (doc["security_hash"], doc["content"])
+            )
+            self.conn.execute(
+                "INSERT OR REPLACE INTO documents VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    doc["tenant_id"],
+                    doc["doc_id"],
+                    doc["filename"],
+                    doc["doc_type"],
+                    doc["access_level"],
+                    doc["uploaded_at"],
+                    json.dumps(doc.get("metadata") or {}),
+                    doc["security_hash"]
+                )
+            )
+            if previous and previous["security_hash"] != doc["security_hash"]:
+                self.conn.execute(
+                    "DELETE FROM contents WHERE security_hash = ? AND NOT EXISTS "
+                    "(SELECT 1 FROM documents WHERE security_hash = ?)",
+                    (previous["security_hash"], previous["security_hash"])
+                )
+
+    def doc_ids(self, tenant_id: str, filename: str) -> List[str]:
+        """IDs of a tenant's documents stored under this filename."""
+        rows = self.conn.execute(
+            "SELECT doc_id FROM documents WHERE tenant_id = ? AND filename = ?",
+            (tenant_id, filename)
+        ).fetchall()
+        return [row["doc_id"] for row in rows]
+
+    def get(self, tenant_id: str, doc_id: str) -> Optional[Dict[str, Any]]:
+        """Get one document with its content."""
+        row = self.conn.execute(
+            """
+            SELECT d.*, c.content FROM documents d
+            JOIN contents c ON c.security_hash = d.security_hash
+            WHERE d.tenant_id = ? AND d.doc_id = ?
+            """,
+            (tenant_id, doc_id)
+        ).fetchone()
+        return self._to_doc(row) if row else None
+
+    def list_documents(
+        self,
+        tenant_id: str,
+        doc_type: Optional[str] = None,
+        exclude_levels: Optional[List[str]] = None,
+        blurred_levels: Optional[List[str]] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        A tenant's documents (index range scan on tenant_id).
+
+        Args:
+            tenant_id: Restaurant tenant ID
+            doc_type: Only this document type
+            exclude_levels: Skip documents at these access levels
+            blurred_levels: Access levels listed without their content
+                (content is replaced by RESTRICTED_CONTENT and never read)
+
+        Returns:
+            Document dicts in upload order
+        """
+        content = "c.content"
+        params: List[Any] = []
+        if blurred_levels:
+            # Blurred documents swap their text for NULL in SQL, so it is never read out
+            content = f"CASE WHEN d.access_level IN ({','.join('?' * len(blurred_levels))}) THEN NULL ELSE c.content END"
+            params.extend(blurred_levels)
+
+        sql = (
+            f"SELECT d.*, {content} AS content FROM documents d "
+            "JOIN contents c ON c.security_hash = d.security_hash WHERE d.tenant_id = ?"
+        )
+        params.append(tenant_id)
+
+        if doc_type is not None:
+            sql += " AND d.doc_type = ?"
+            params.append(doc_type)
+        if exclude_levels:
+            sql += f" AND d.access_level NOT IN ({','.join('?' * len(exclude_levels))})"
+            params.extend(exclude_levels)
+
+        rows = self.conn.execute(sql + " ORDER BY d.uploaded_at", params).fetchall()
+        return [self._to_doc(row) for row in rows]
+
+    def delete(self, tenant_id: str, doc_id: str) -> bool:
+        """Delete a document (and its text if no other document shares it)."""
+        with self.conn:
+            row = self.conn.execute(
+                "SELECT security_hash FROM documents WHERE tenant_id = ? AND doc_id = ?",
+                (tenant_id, doc_id)
+            ).fetchone()
+            if not row:
+                return False
+            self.conn.execute(
+                "DELETE FROM documents WHERE tenant_id = ? AND doc_id = ?",
+                (tenant_id, doc_id)
+            )
+            self.conn.execute(
+                "DELETE FROM contents WHERE security_hash = ? AND NOT EXISTS "
+                "(SELECT 1 FROM documents WHERE security_hash = ?)",
+                (row["security_hash"], row["security_hash"])
+            )
+        return True
+
+    def cached_texts(self, file_hashes: Set[str]) -> Dict[str, str]:
+        """Previously extracted text for these file hashes: {file_hash: text}."""
+        hashes = list(file_hashes)
+        found = {}
+        # Stay under SQLite's bound-parameter limit
+        for i in range(0, len(hashes), 500):
+            batch = hashes[i:i + 500]
+            rows = self.conn.execute(
+                f"SELECT file_hash, text FROM extractions WHERE file_hash IN ({','.join('?' * len(batch))})",
+                batch
+            ).fetchall()
+            found.update({row["file_hash"]: row["text"] for row in rows})
+        return found
+
+    def cache_text(self, file_hash: str, text: str):
+        """Remember the text extracted from a file's bytes."""
+        with self.conn:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO extractions VALUES (?, ?, ?)",
+                (file_hash, text, datetime.now().isoformat())
+            )
+
+    def count(self, tenant_id: Optional[str] = None) -> int:
+        """Number of stored documents (for one tenant, or all)."""
+        if tenant_id is None:
+            row = self.conn.execute("SELECT COUNT(*) FROM documents").fetchone()
+        else:
+            row = self.conn.execute(
+                "SELECT COUNT(*) FROM documents WHERE tenant_id = ?", (tenant_id,)
+            ).fetchone()
+        return row[0]
+
+    def _to_doc(self, row: sqlite3.Row) -> Dict[str, Any]:
+        doc = dict(row)
+        doc["metadata"] = json.loads(doc["metadata"])
+        if doc["content"] is None:
+            doc["content"] = RESTRICTED_CONTENT
+            doc["blurred"] = True
+        return doc
+
+
+# Global document store instance
+_document_store: Optional[DocumentStore] = None
+
+
+def get_document_store() -> DocumentStore:
+    """Get or create global compliance document store."""
+    global _document_store
+    if _document_store is None:
+        _document_store = DocumentStore()
+    return _document_store
@@ -0,0 +1,318 @@
+"""
+Server-side layout and cached rendering for the Knowledge Map.
+
+Node positions are computed once per graph version with a vectorized
+NumPy Fruchterman-Reingold layout, warm-started from the previous version's
+positions, so the map stays put when only a few nodes change. The PyVis
+HTML is rendered with those fixed coordinates and physics off, and cached
+by graph hash plus display options; reruns serve the cached file instead
+of regenerating it or re-simulating the layout in the browser.
+"""
+import os
+import json
+import glob
+import hashlib
+from typing import Dict, Any, Optional, Tuple
+import numpy as np
+import networkx as nx
+from services.order_store import atomic_write
+
+
+LAYOUT_DIR = "artifacts/graph_layout"
+LATEST_LAYOUT_FILE = "latest_layout.json"
+
+# Canvas units per layout unit
+LAYOUT_SCALE = 600
+# Layout iterations from scratch / when mostly warm-started
+ITERATIONS = 100
+WARM_ITERATIONS = 30
+# Layouts / rendered HTML files kept in the cache (oldest are pruned)
+MAX_CACHED_FILES = 20
+
+DEFAULT_OPTIONS = {
+    "physics": False,
+    "show_edges": True,
+    "node_size_scale": 100,
+    "edge_width_scale": 2,
+    "highlight_decisions": True,
+    "show_secured": True,
+    "height": "600px"
+}
+
+
+def graph_key(graph_data: Dict[str, Any]) -> str:
+    """Version key for a graph export (its graph_hash, else a content hash)."""
+    if graph_data.get("graph_hash"):
+        return graph_data["graph_hash"]
+    content = json.dumps(
+        [graph_data.get("nodes", []), graph_data.get("edges", [])],
+        sort_keys=True,
+        default=str
+    )
+    return hashlib.md5(content.encode("utf-8")).hexdigest()[:16]
+
+
+def spring_layout(
+    adjacency: np.ndarray,
+    start: np.ndarray,
+    iterations: int = 50,
+    temperature: float = 0.1
+) -> np.ndarray:
+    """
+    Fruchterman-Reingold force-directed layout, vectorized over all node pairs.
+
+    Args:
+        adjacency: Symmetric n x n edge-weight matrix
+        start: Initial n x 2 positions
+        iterations: Cooling steps
+        temperature: Initial maximum step (cooled linearly to 0)
+
+    Returns:
+        n x 2 positions centered on the origin and scaled to [-1, 1]
+    """
+    n = len(adjacency)
+    if n == 0:
+        return start
+    k = np.float32(1.0 / np.sqrt(n))
+    x = start[:, 0].astype(np.float32)
+    y = start[:, 1].astype(np.float32)
+    step = temperature
+    cooling = temperature / (iterations + 1)
+
+    for _ in range(iterations):
+        dx = x[:, None] - x[None, :]
+        dy = y[:, None] - y[None, :]
+        dist2 = np.maximum(dx * dx + dy * dy, 1e-4)
+        # Repulsion k^2/d between all pairs, attraction d^2/k along edges
+        force = k * k / dist2 - adjacency * np.sqrt(dist2) / k
+        fx = (dx * force).sum(axis=1)
+        fy = (dy * force).sum(axis=1)
+        length = np.sqrt(fx * fx + fy * fy)
+        length[length < 0.01] = 0.1
+        x += fx * step / length
+        y += fy * step / length
+        step -= cooling
+
+    positions = np.column_stack([x, y])
+    positions -= positions.mean(axis=0)
+    extent = np.abs(positions).max()
+    return positions / extent if extent > 0 else positions
+
+
+def _write_text(path: str, text: str):
+    def write(tmp_path):
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(text)
+
+    atomic_write(path, write)
+
+
+def _options_key(options: Dict[str, Any]) -> str:
+    content = json.dumps(options, sort_keys=True)
+    return hashlib.md5(content.encode("utf-8")).hexdigest()[:8]
+
+
+class GraphLayoutService:
+    """Per-version node positions and rendered network HTML."""
+
+    def __init__(self, cache_dir: str = LAYOUT_DIR, seed: int = 42):
+        self.cache_dir = cache_dir
+        self.seed = seed
+
+    def positions(self, graph_data: Dict[str, Any]) -> Dict[str, Tuple[float, float]]:
+        """
+        Canvas coordinates per node id (computed once per graph version).
+
+        Returns:
+            {node_id: (x, y)}
+        """
+        key = graph_key(graph_data)
+        path = os.path.join(self.cache_dir, f"{key}_layout.json")
+
+        if os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as f:
+                return {node: tuple(xy) for node, xy in json.load(f).items()}
+
+        positions = self._compute_positions(graph_data)
+
+        payload = json.dumps(positions, ensure_ascii=False)
+        _write_text(path, payload)
+        _write_text(os.path.join(self.cache_dir, LATEST_LAYOUT_FILE), payload)
+        self._prune("*_layout.json")
+
+        return positions
+
+    def _compute_positions(self, graph_data: Dict[str, Any]) -> Dict[str, Tuple[float, float]]:
+        """Seeded spring layout, warm-started from the previous version's layout."""
+        graph = nx.Graph()
+        graph.add_nodes_from(node["id"] for node in graph_data.get("nodes", []))
+        for edge in graph_data.get("edges", []):
+            graph.add_edge(edge["source"], edge["target"], weight=0.5 + edge.get("weight", 0.25))
+
+        if graph.number_of_nodes() == 0:
+            return {}
+
+        nodes = list(graph.nodes())
+        adjacency = nx.to_numpy_array(graph, nodelist=nodes, weight="weight", dtype=np.float32)
+
+        # Warm start from the previous version's layout; new nodes start at random
+        previous = self._latest_positions()
+        rng = np.random.default_rng(self.seed)
+        start = rng.uniform(-1, 1, size=(len(nodes), 2)).astype(np.float32)
+        warm = np.array([node in previous for node in nodes])
+        if warm.any():
+            start[warm] = np.array([previous[n] for n in nodes if n in previous], dtype=np.float32) / LAYOUT_SCALE
+
+        layout = spring_layout(
+            adjacency,
+            start,
+            iterations=WARM_ITERATIONS if warm.mean() > 0.5 else ITERATIONS,
+            temperature=0.05 if warm.mean() > 0.5 else 0.1
+        )
+
+        return {
+            node: (round(float(x) * LAYOUT_SCALE, 1), round(float(y) * LAYOUT_SCALE, 1))
+            for node, (x, y) in zip(nodes, layout)
+        }
+
+    def _latest_positions(self) -> Dict[str, Tuple[float, float]]:
+        path = os.path.join(self.cache_dir, LATEST_LAYOUT_FILE)
+        if not os.path.exists(path):
+            return {}
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (ValueError, OSError):
+            return {}
+
+    def render_html(self, graph_data: Dict[str, Any], options: Optional[Dict[str, Any]] = None) -> str:
+        """
+        Network HTML with fixed coordinates (cached per graph version + options).
+
+        Args:
+            graph_data: Knowledge graph export (nodes, edges, graph_hash)
+            options: Display options (see DEFAULT_OPTIONS)
+
+        Returns:
+            HTML document for components.html
+        """
+        options = {**DEFAULT_OPTIONS, **(options or {})}
+        path = os.path.join(
+            self.cache_dir,
+            f"{graph_key(graph_data)}_{_options_key(options)}.html"
+        )
+
+        if os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as f:
+                return f.read()
+
+        html = self._build_network(graph_data, self.positions(graph_data), options).generate_html()
+        _write_text(path, html)
+        self._prune("*.html")
+
+        return html
+
+    def _build_network(self, graph_data: Dict[str, Any], positions: Dict[str, Tuple[float, float]], options: Dict[str, Any]):
+        """PyVis network with the page's node and edge styling."""
+        from pyvis.network import Network
+
+        net = Network(
+            height=options["height"],
+            width="100%",
+            bgcolor="#0e1117",
+            font_color="white",
+            directed=True
+        )
+
+        if options["physics"]:
+            # Positions are only a starting point; the browser settles from there
+            net.barnes_hut(
+                gravity=-5000,
+                central_gravity=0.3,
+                spring_length=200,
+                spring_strength=0.05,
+                damping=0.09
+            )
+        else:
+            net.toggle_physics(False)
+
+        for node in graph_data["nodes"]:
+            node_id = node["id"]
+            color = node.get("color", "#666666")
+            size = node.get("size", 20) * (options["node_size_scale"] / 100)
+            title = node.get("title", node_id)
+
+            # Add security badge for compliance nodes
+            if node.get("secured_by") == "Nivara" and options["show_secured"]:
+                title = f"🔒 SECURED BY NIVARA\n\n{title}\n\nAccess: {node.get('access_level', 'restricted')}"
+
+            # Add confidence/impact to title
+            if "confidence" in node:
+                title += f"\n\nConfidence: {node['confidence']*100:.0f}%"
+            if "impact_score" in node:
+                title += f"\nImpact: {node['impact_score']*100:.0f}%"
+
+            # Highlight decisions
+            if options["highlight_decisions"] and node.get("type") == "decision":
+                color = "#A855F7"
+                size *= 1.2
+
+            x, y = positions.get(node_id, (0.0, 0.0))
+            net.add_node(
+                node_id,
+                label=node_id,
+                color=color,
+                size=size,
+                title=title,
+                shape=node.get("shape", "dot"),
+                x=x,
+                y=y
+            )
+
+        for edge in graph_data["edges"]:
+            # Color code edges by confidence
+            edge_color = "#666666"
+            if "confidence" in edge:
+                conf = edge["confidence"]
+                if conf > 0.8:
+                    edge_color = "#10B981"
+                elif conf > 0.6:
+                    edge_color = "#F59E0B"
+                else:
+                    edge_color = "#EF4444"
+
+            net.add_edge(
+                edge["source"],
+                edge["target"],
+                label=edge.get("relationship", "") if options["show_edges"] else "",
+                width=edge.get("width", 1) * options["edge_width_scale"],
+                color=edge_color,
+                arrows="to"
+            )
+
+        return net
+
+    def _prune(self, pattern: str):
+        """Keep only the most recently written cache files matching pattern."""
+        files = sorted(
+            glob.glob(os.path.join(self.cache_dir, pattern)),
+            key=os.path.getmtime,
+            reverse=True
+        )
+        for stale in files[MAX_CACHED_FILES:]:
+            try:
+                os.remove(stale)
+            except OSError:
+                pass
+
+
+# Global layout service instance
+_graph_layout: Optional[GraphLayoutService] = None
+
+
+def get_graph_layout() -> GraphLayoutService:
+    """Get or create global graph layout service."""
+    global _graph_layout
+    if _graph_layout is None:
+        _graph_layout = GraphLayoutService()
+    return _graph_layout
@@ -0,0 +1,224 @@
+"""
+Query layer over the knowledge graph export.
+
+Builds type and cluster indexes once per graph version and answers
+neighborhood, impact-propagation and explanation-path queries as graph
+traversals. Edge strength is the stored weight (confidence x impact);
+a path's strength is the product of its edges, so the strongest path is
+a shortest path under -log(weight). Results are memoized per graph
+version, and instances are shared per version via get_graph_query().
+"""
+import math
+from collections import defaultdict
+from typing import Dict, Any, List, Optional, Tuple
+import networkx as nx
+from services.graph_layout import graph_key
+
+
+# Strength assumed for edges without confidence/impact (0.5 x 0.5)
+DEFAULT_EDGE_WEIGHT = 0.25
+
+# Hub node types skipped when explaining (they link to everything)
+HUB_TYPES = ("restaurant",)
+
+# Graph versions kept in memory
+MAX_CACHED_VERSIONS = 4
+
+
+class GraphQuery:
+    """Indexed, memoized queries over one version of the knowledge graph."""
+
+    def __init__(self, graph_data: Dict[str, Any]):
+        self.version = graph_key(graph_data)
+        self.graph = nx.DiGraph()
+        self.by_type: Dict[str, List[str]] = defaultdict(list)
+        self.by_cluster: Dict[str, List[str]] = defaultdict(list)
+        self._memo: Dict[Tuple, Any] = {}
+
+        for node in graph_data.get("nodes", []):
+            attrs = {k: v for k, v in node.items() if k != "id"}
+            self.graph.add_node(node["id"], **attrs)
+            self.by_type[node.get("type", "unknown")].append(node["id"])
+            self.by_cluster[node.get("cluster", "NONE")].append(node["id"])
+
+        for edge in graph_data.get("edges", []):
+            weight = edge.get("weight")
+            if weight is None:
+                weight = edge["confidence"] * edge["impact"] if "confidence" in edge and "impact" in edge else DEFAULT_EDGE_WEIGHT
+            weight = min(max(float(weight), 1e-6), 1.0)
+            attrs = {k: v for k, v in edge.items() if k not in ("source", "target", "weight")}
+            self.graph.add_edge(edge["source"], edge["target"], weight=weight, cost=-math.log(weight), **attrs)
+
+    def _memoized(self, key: Tuple, compute):
+        if key not in self._memo:
+            self._memo[key] = compute()
+        return self._memo[key]
+
+    # ---- Indexes ----
+
+    def node(self, node_id: str) -> Dict[str, Any]:
+        """Node attributes with its id."""
+        return {"id": node_id, **self.graph.nodes[node_id]}
+
+    def nodes_of_type(self, node_type: str) -> List[Dict[str, Any]]:
+        return [self.node(n) for n in self.by_type.get(node_type, [])]
+
+    def nodes_in_cluster(self, cluster: str) -> List[Dict[str, Any]]:
+        return [self.node(n) for n in self.by_cluster.get(cluster, [])]
+
+    def nodes_with(self, attribute: str) -> List[Dict[str, Any]]:
+        """Nodes that carry a (truthy) attribute, e.g. risk_level."""
+        return self._memoized(("with", attribute), lambda: [
+            self.node(n) for n, attrs in self.graph.nodes(data=True) if attrs.get(attribute)
+        ])
+
+    def find(self, text: str) -> List[str]:
+        """Node ids containing text (case-insensitive), e.g. "rain" -> "Rain 🌧️"."""
+        text = text.lower()
+        return self._memoized(("find", text), lambda: [n for n in self.graph.nodes() if text in n.lower()])
+
+    # ---- Neighborhoods ----
+
+    def neighborhood(self, node_id: str, hops: int = 1, direction: str = "both") -> Dict[str, Any]:
+        """
+        Subgraph within k hops of a node.
+
+        Args:
+            node_id: Center node
+            hops: Maximum distance
+            direction: "out" (effects), "in" (causes) or "both"
+
+        Returns:
+            Dict with nodes (incl. "hops" distance) and edges among them
+        """
+        def compute():
+            if direction == "out":
+                view = self.graph
+            elif direction == "in":
+                view = self.graph.reverse(copy=False)
+            else:
+                view = self.graph.to_undirected(as_view=True)
+
+            distances = nx.single_source_shortest_path_length(view, node_id, cutoff=hops)
+            sub = self.graph.subgraph(distances)
+            return {
+                "nodes": [{**self.node(n), "hops": distances[n]} for n in sub.nodes()],
+                "edges": [{"source": u, "target": v, **d} for u, v, d in sub.edges(data=True)]
+            }
+
+        return self._memoized(("neighborhood", node_id, hops, direction), compute)
+
+    # ---- Impact propagation ----
+
+    def propagate_impact(self, source: str, target_type: Optional[str] = "decision", max_hops: int = 6) -> Dict[str, float]:
+        """
+        Strongest-path impact of a node on everything downstream of it.
+
+        Args:
+            source: Node the impact starts from (e.g. "Rain 🌧️")
+            target_type: Only return nodes of this type (None for all)
+            max_hops: Longest path considered
+
+        Returns:
+            {node_id: impact in (0, 1]} sorted strongest first
+        """
+        def compute():
+            costs = self._path_costs(source, max_hops)
+            impacts = {
+                node: math.exp(-cost)
+                for node, cost in costs.items()
+                if node != source and (target_type is None or self.graph.nodes[node].get("type") == target_type)
+            }
+            return dict(sorted(impacts.items(), key=lambda item: item[1], reverse=True))
+
+        return self._memoized(("impact", source, target_type, max_hops), compute)
+
+    def _path_costs(self, source: str, max_hops: int) -> Dict[str, float]:
+        """Lowest -log(weight) path cost to each node within max_hops (Bellman-Ford by hop)."""
+        costs = {source: 0.0}
+        frontier = {source: 0.0}
+        for _ in range(max_hops):
+            improved = {}
+            for node, cost in frontier.items():
+                for _, target, data in self.graph.out_edges(node, data=True):
+                    new_cost = cost + data["cost"]
+                    if new_cost < costs.get(target, math.inf) and new_cost < improved.get(target, math.inf):
+                        improved[target] = new_cost
+            if not improved:
+                break
+            costs.update(improved)
+            frontier = improved
+        return costs
+
+    # ---- Explanations ----
+
+    def explain(self, target: str, k: int = 3, source: Optional[str] = None, max_hops: int = 6) -> List[Dict[str, Any]]:
+        """
+        Top-k strongest paths leading into a node ("why are we adding a cook?").
+
+        Args:
+            target: Node to explain (e.g. a decision)
+            k: Number of paths
+            source: Only paths starting here (default: any upstream node
+                without a non-hub parent, skipping hub nodes)
+            max_hops: Longest path considered
+
+        Returns:
+            [{"path": [node ids], "relationships": [...], "strength": float}]
+        """
+        def compute():
+            hubs = set(n for t in HUB_TYPES for n in self.by_type.get(t, []))
+            view = self.graph.subgraph([n for n in self.graph.nodes() if n not in hubs or n in (source, target)])
+
+            if source is not None:
+                sources = [source]
+            else:
+                upstream = nx.ancestors(view, target)
+                sources = [n for n in upstream if not any(p in upstream for p in view.predecessors(n))]
+                sources = sources or list(upstream)
+
+            candidates = []
+            for start in sources:
+                try:
+                    for path in nx.shortest_simple_paths(view, start, target, weight="cost"):
+                        if len(path) - 1 > max_hops:
+                            break
+                        candidates.append(path)
+                        if len(candidates) >= k * 4:
+                            break
+                except nx.NetworkXNoPath:
+                    continue
+
+            explained = []
+            for path in candidates:
+                edges = [view.edges[u, v] for u, v in zip(path, path[1:])]
+                explained.append({
+                    "path": path,
+                    "relationships": [e.get("relationship", "") for e in edges],
+                    "strength": math.exp(-sum(e["cost"] for e in edges))
+                })
+            explained.sort(key=lambda item: item["strength"], reverse=True)
+            return explained[:k]
+
+        return self._memoized(("explain", target, k, source, max_hops), compute)
+
+    def format_path(self, explanation: Dict[str, Any]) -> str:
+        """'A --causes--> B --triggers--> C' for display."""
+        parts = [explanation["path"][0]]
+        for relationship, node in zip(explanation["relationships"], explanation["path"][1:]):
+            parts.append(f"--{relationship}--> {node}" if relationship else f"--> {node}")
+        return " ".join(parts)
+
+
+# Query instances per graph version
+_graph_queries: Dict[str, GraphQuery] = {}
+
+
+def get_graph_query(graph_data: Dict[str, Any]) -> GraphQuery:
+    """Get (or build) the query layer for a graph version."""
+    key = graph_key(graph_data)
+    if key not in _graph_queries:
+        if len(_graph_queries) >= MAX_CACHED_VERSIONS:
+            _graph_queries.pop(next(iter(_graph_queries)))
+        _graph_queries[key] = GraphQuery(graph_data)
+    return _graph_queries[key]
@@ -0,0 +1,161 @@
+"""
+Incremental store for the knowledge graph.
+
+The graph is persisted as per-contribution subgraphs (the nodes and edges
+one agent's output added), each keyed by the contribution name and a hash
+of its input. On a rebuild only contributions whose input (or whose
+upstream contributions) changed are recomputed and patched into the
+graph; everything else is reused as stored. Every change bumps the graph
+version and writes a delta (added / removed / changed nodes and edges).
+"""
+import os
+import re
+import json
+import hashlib
+from datetime import datetime
+from typing import Dict, Any, List, Optional, Tuple
+from services.order_store import atomic_write
+
+
+STORE_FILE = "artifacts/knowledge_graph_store.json"
+DELTA_FILE = "artifacts/knowledge_graph_delta.json"
+
+
+def tenant_path(path: str, tenant_id: str) -> str:
+    """`path` with the tenant appended to the file name (one store per tenant)."""
+    root, ext = os.path.splitext(path)
+    safe = re.sub(r"[^A-Za-z0-9_-]+", "_", tenant_id).strip("_") or "default"
+    return f"{root}_{safe}{ext}"
+
+
+def input_version(data: Any, upstream: Optional[List[str]] = None) -> str:
+    """Stable hash of a contribution's input plus its upstream versions."""
+    payload = json.dumps([data, upstream or []], sort_keys=True, default=str)
+    return hashlib.md5(payload.encode("utf-8")).hexdigest()[:16]
+
+
+def _edge_key(edge: Dict[str, Any]) -> Tuple[str, str]:
+    return edge["source"], edge["target"]
+
+
+class GraphStore:
+    """Per-contribution node/edge sets with versioning and deltas."""
+
+    def __init__(self, store_file: str = STORE_FILE, delta_file: str = DELTA_FILE):
+        self.store_file = store_file
+        self.delta_file = delta_file
+        self.version = 0
+        self.contributions: Dict[str, Dict[str, Any]] = {}
+        self.load()
+
+    @classmethod
+    def for_tenant(cls, tenant_id: str) -> "GraphStore":
+        """Store whose files are keyed by tenant, so tenants never share subgraphs."""
+        return cls(tenant_path(STORE_FILE, tenant_id), tenant_path(DELTA_FILE, tenant_id))
+
+    def load(self):
+        """Load stored contributions (empty store if none)."""
+        if not os.path.exists(self.store_file):
+            return
+        try:
+            with open(self.store_file, "r", encoding="utf-8") as f:
+                state = json.load(f)
+            self.version = state.get("version", 0)
+            self.contributions = state.get("contributions", {})
+        except (ValueError, OSError) as e:
+            print(f"[WARN] Knowledge graph store unreadable, starting fresh: {e}")
+
+    def save(self):
+        """Persist all contributions (atomic rewrite)."""
+        state = {
+            "version": self.version,
+            "updated_at": datetime.now().isoformat(),
+            "contributions": self.contributions
+        }
+
+        def write(path):
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(state, f, ensure_ascii=False, separators=(",", ":"))
+
+        atomic_write(self.store_file, write)
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Stored contribution: {"version", "input", "nodes", "edges"}."""
+        return self.contributions.get(key)
+
+    def put(self, key: str, version: str, data: Any, nodes: List[Dict[str, Any]], edges: List[Dict[str, Any]]):
+        """Replace a contribution's subgraph."""
+        self.contributions[key] = {
+            "version": version,
+            "input": data,
+            "nodes": nodes,
+            "edges": edges,
+            "updated_at": datetime.now().isoformat()
+        }
+
+    def remove(self, key: str):
+        self.contributions.pop(key, None)
+
+    def clear(self):
+        self.contributions = {}
+
+    def graph_hash(self) -> str:
+        """Content hash of the whole graph (changes iff some contribution does)."""
+        versions = sorted((key, c["version"]) for key, c in self.contributions.items())
+        return input_version(versions)
+
+    def all_nodes(self) -> List[Dict[str, Any]]:
+        return [node for c in self.contributions.values() for node in c["nodes"]]
+
+    def all_edges(self) -> List[Dict[str, Any]]:
+        return [edge for c in self.contributions.values() for edge in c["edges"]]
+
+    def write_delta(self, previous: Dict[str, Dict[str, Any]], changed: List[str]) -> Dict[str, Any]:
+        """
+        Bump the version and export what changed since `previous`.
+
+        Args:
+            previous: Contributions before this rebuild
+            changed: Contribution keys recomputed or removed
+
+        Returns:
+            Delta dict (also written to delta_file)
+        """
+        old_nodes, new_nodes, old_edges, new_edges = {}, {}, {}, {}
+        for key in changed:
+            for node in previous.get(key, {}).get("nodes", []):
+                old_nodes[node["id"]] = node
+            for edge in previous.get(key, {}).get("edges", []):
+                old_edges[_edge_key(edge)] = edge
+            for node in self.contributions.get(key, {}).get("nodes", []):
+                new_nodes[node["id"]] = node
+            for edge in self.contributions.get(key, {}).get("edges", []):
+                new_edges[_edge_key(edge)] = edge
+
+        from_version = self.version
+        self.version += 1
+
+        delta = {
+            "from_version": from_version,
+            "to_version": self.version,
+            "graph_hash": self.graph_hash(),
+            "contributions": changed,
+            "nodes": {
+                "added": [n for i, n in new_nodes.items() if i not in old_nodes],
+                "removed": [i for i in old_nodes if i not in new_nodes],
+                "changed": [n for i, n in new_nodes.items() if i in old_nodes and old_nodes[i] != n]
+            },
+            "edges": {
+                "added": [e for k, e in new_edges.items() if k not in old_edges],
+                "removed": [{"source": s, "target": t} for s, t in old_edges if (s, t) not in new_edges],
+                "changed": [e for k, e in new_edges.items() if k in old_edges and old_edges[k] != e]
+            },
+            "generated_at": datetime.now().isoformat()
+        }
+
+        def write(path):
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(delta, f, ensure_ascii=False, separators=(",", ":"))
+
+        atomic_write(self.delta_file, write)
+        return delta
@@ -0,0 +1,251 @@
+"""
+Multi-SKU inventory replenishment planning.
+
+Per-SKU demand is derived from the order forecast in one pass:
+orders/day x items/order x menu mix x bill of materials. Reorder quantities
+follow an order-up-to rule against current stock, par level and supplier
+lead time, and order lines are grouped into one purchase order per supplier.
+"""
+import os
+import re
+import glob
+from datetime import datetime
+from typing import Dict, Any, List, Optional
+import numpy as np
+import pandas as pd
+
+
+INVENTORY_FILE = "data/inventory.csv"
+BOM_FILE = "data/bill_of_materials.csv"
+SALES_MIX_PATTERN = "sales-leaderboard-items_*.csv"
+ORDER_ACCURACY_FILE = "order accuracy.csv"
+
+# Days from order to delivery, by supplier
+SUPPLIER_LEAD_TIME_DAYS = {
+    "US Foods": 2,
+    "Sysco": 2,
+    "Fresh Direct": 1
+}
+DEFAULT_LEAD_TIME_DAYS = 2
+
+# Units ordered in whole quantities; everything else rounds up to 0.5
+COUNT_UNITS = {"units", "heads", "jars", "cases"}
+
+
+class InventoryPlanner:
+    """Vectorized replenishment planner over every tracked SKU."""
+
+    DEFAULT_ITEMS_PER_ORDER = 2.0
+
+    def __init__(
+        self,
+        inventory_file: str = INVENTORY_FILE,
+        bom_file: str = BOM_FILE,
+        sales_file: Optional[str] = None,
+        accuracy_file: str = ORDER_ACCURACY_FILE,
+        review_days: int = 1
+    ):
+        """
+        Args:
+            inventory_file: CSV with item, current_stock, par_level, unit,
+                cost_per_unit, supplier
+            bom_file: CSV with menu_keyword, item, qty_per_item
+            sales_file: Sales leaderboard CSV (default: newest matching export)
+            accuracy_file: Uber Eats order accuracy export (items per order)
+            review_days: Days until the next ordering opportunity
+        """
+        self.inventory_file = inventory_file
+        self.review_days = review_days
+
+        bom = pd.read_csv(bom_file)
+        mix = self._load_mix(sales_file)
+        self.items_per_order = self._items_per_order(accuracy_file)
+
+        # Expected quantity of each SKU consumed per menu item sold
+        self.usage_per_item = self._usage_per_item(mix, bom)
+
+    def load_inventory(self) -> pd.DataFrame:
+        """Read current stock levels (re-read on every plan)."""
+        return pd.read_csv(self.inventory_file)
+
+    @staticmethod
+    def _load_mix(sales_file: Optional[str]) -> pd.Series:
+        """Share of items sold per menu item."""
+        if sales_file is None:
+            matches = sorted(glob.glob(SALES_MIX_PATTERN))
+            sales_file = matches[-1] if matches else None
+
+        if sales_file is None or not os.path.exists(sales_file):
+            return pd.Series(dtype=float)
+
+        df = pd.read_csv(sales_file, usecols=["Item", "Items Sold"])
+        sold = pd.to_numeric(df["Items Sold"], errors="coerce").fillna(0).clip(lower=0)
+        sold.index = df["Item"].astype(str)
+        sold = sold.groupby(level=0).sum()
+        total = sold.sum()
+        return sold / total if total > 0 else sold
+
+    def _items_per_order(self, accuracy_file: str) -> float:
+        """Mean menu items per order from the order accuracy export."""
+        if os.path.exists(accuracy_file):
+            counts = pd.read_csv(accuracy_file, usecols=["Menu Item Count"])["Menu Item Count"]
+            counts = pd.to_numeric(counts, errors="coerce").dropna()
+            if len(counts):
+                return float(counts.mean())
+        return self.DEFAULT_ITEMS_PER_ORDER
+
+    @staticmethod
+    def _usage_per_item(mix: pd.Series, bom: pd.DataFrame) -> pd.Series:
+        """
+        Average SKU quantity per menu item sold.
+
+        Builds the (menu items x keywords) match matrix and the
+        (keywords x SKUs) BOM matrix, then reduces mix @ match @ bom.
+        Keywords match whole words (plural allowed). Per menu item they
+        are taken fullest recipe first, skipping any whose SKUs an earlier
+        match already covers, so "Cheese Burger" counts the burger's
+        cheese once while add-ons like "Chicken" still stack on a "Roll".
+        """
+        bom_matrix = bom.pivot_table(
+            index="menu_keyword", columns="item", values="qty_per_item", aggfunc="sum"
+        ).fillna(0)
+
+        if mix.empty:
+            return pd.Series(0.0, index=bom_matrix.columns)
+
+        keywords = list(bom_matrix.index)
+        uses = bom_matrix.to_numpy() > 0
+        patterns = [re.compile(r"\b" + re.escape(keyword) + r"s?\b", re.I) for keyword in keywords]
+        precedence = sorted(range(len(keywords)), key=lambda k: (-uses[k].sum(), -len(keywords[k])))
+
+        match = np.zeros((len(mix), len(keywords)))
+        for i, name in enumerate(mix.index.astype(str)):
+            taken = np.zeros(uses.shape[1], dtype=bool)
+            for k in precedence:
+                if patterns[k].search(name) and not (taken & uses[k]).any():
+                    match[i, k] = 1.0
+                    taken |= uses[k]
+
+        return pd.Series(mix.to_numpy() @ match @ bom_matrix.to_numpy(), index=bom_matrix.columns)
+
+    @staticmethod
+    def daily_orders(
+        hourly_forecast: Optional[List[Dict[str, Any]]] = None,
+        peak_orders: float = 0.0
+    ) -> np.ndarray:
+        """
+        Orders per forecast day.
+
+        Args:
+            hourly_forecast: [{"datetime", "predicted_orders"}, ...]
+            peak_orders: Fallback when no hourly forecast (peak x 8 hours)
+
+        Returns:
+            Array with one total per day
+        """
+        if hourly_forecast:
+            df = pd.DataFrame(hourly_forecast)
+            if "datetime" in df:
+                days = pd.to_datetime(df["datetime"]).dt.date
+                return df.groupby(days)["predicted_orders"].sum().to_numpy(dtype=float)
+            return np.array([df["predicted_orders"].sum()], dtype=float)
+        return np.array([peak_orders * 8], dtype=float)
+
+    def plan(
+        self,
+        daily_orders: np.ndarray,
+        demand_multiplier: float = 1.0,
+        order_date: Optional[datetime] = None
+    ) -> pd.DataFrame:
+        """
+        Reorder quantities for every SKU.
+
+        Demand beyond the forecast horizon is extended at the forecast's
+        average daily rate. Each SKU is ordered up to par plus the demand
+        expected before the following delivery.
+
+        Args:
+            daily_orders: Forecast orders per day, starting tomorrow
+            demand_multiplier: Buffer applied to demand (e.g. rain)
+            order_date: When the order is placed (default: now)
+
+        Returns:
+            DataFrame with one row per SKU
+        """
+        order_date = order_date or datetime.now()
+        inv = self.load_inventory()
+        daily_orders = np.asarray(daily_orders, dtype=float)
+        if daily_orders.size == 0:
+            daily_orders = np.zeros(1)
+
+        lead_days = inv["supplier"].map(SUPPLIER_LEAD_TIME_DAYS).fillna(DEFAULT_LEAD_TIME_DAYS).to_numpy(dtype=int)
+        cover_days = lead_days + self.review_days
+
+        # Cumulative orders for 0..N days ahead, padded at the average rate
+        horizon = int(cover_days.max())
+        padded = np.concatenate([
+            daily_orders,
+            np.full(max(0, horizon - len(daily_orders)), daily_orders.mean())
+        ])
+        cumulative = np.concatenate([[0.0], np.cumsum(padded)])
+
+        usage = self.usage_per_item.reindex(inv["item"], fill_value=0.0).to_numpy()
+        per_order = usage * self.items_per_order * demand_multiplier
+        daily_demand = daily_orders.mean() * per_order
+        lead_demand = cumulative[lead_days] * per_order
+        cover_demand = cumulative[cover_days] * per_order
+
+        stock = inv["current_stock"].to_numpy(dtype=float)
+        par = inv["par_level"].to_numpy(dtype=float)
+        raw_qty = np.maximum(0.0, par + cover_demand - stock)
+
+        whole = inv["unit"].str.lower().isin(COUNT_UNITS).to_numpy()
+        order_qty = np.where(whole, np.ceil(raw_qty), np.ceil(raw_qty * 2) / 2)
+        cost = order_qty * inv["cost_per_unit"].to_numpy(dtype=float)
+
+        delivery = pd.to_datetime(order_date.date()) + pd.to_timedelta(lead_days, unit="D") + pd.Timedelta(hours=8)
+
+        return pd.DataFrame({
+            "item": inv["item"],
+            "unit": inv["unit"],
+            "supplier": inv["supplier"],
+            "current_stock": stock,
+            "par_level": par,
+            "daily_demand": daily_demand.round(2),
+            "lead_time_days": lead_days,
+            "projected_stock": (stock - lead_demand).round(2),
+            "order_qty": order_qty,
+            "unit_cost": inv["cost_per_unit"].astype(float),
+            "cost": cost.round(2),
+            "delivery_date": delivery.strftime("%Y-%m-%d %H:%M")
+        })
+
+    @staticmethod
+    def purchase_orders(plan: pd.DataFrame) -> List[Dict[str, Any]]:
+        """Group order lines into one purchase order per supplier."""
+        lines = plan[plan["order_qty"] > 0]
+        orders = []
+
+        for supplier, group in lines.groupby("supplier", sort=True):
+            orders.append({
+                "supplier": supplier,
+                "delivery_date": group["delivery_date"].min(),
+                "lines": group[["item", "order_qty", "unit", "unit_cost", "cost"]]
+                    .rename(columns={"order_qty": "quantity"})
+                    .to_dict(orient="records"),
+                "total_cost": round(float(group["cost"].sum()), 2)
+            })
+
+        return orders
+
+
+# Global inventory planner instance
+_inventory_planner: Optional[InventoryPlanner] = None
+
+
+def get_inventory_planner() -> InventoryPlanner:
+    """Get or create global inventory planner."""
+    global _inventory_planner
+    if _inventory_planner is None:
+        _inventory_planner = InventoryPlanner()
+    return _inventory_planner
@@ -0,0 +1,345 @@
+"""
+SQLite job queue between the Streamlit UI and the agent worker process.
+
+The UI submits agent runs (by runner name from the agents registry) and
+polls their status, progress events and result; a long-lived worker
+(services/agent_worker.py) claims queued jobs and runs them with models
+and clients already loaded. Identical jobs submitted while one is still
+queued or running share that job, so several operators hitting "Plan
+Tomorrow" at once cost one run. The database is in WAL mode so the UI
+can read while the worker writes.
+"""
+import os
+import json
+import uuid
+import sqlite3
+import hashlib
+import threading
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from typing import Dict, Any, List, Optional
+
+
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+ACTIVE_STATUSES = (QUEUED, RUNNING)
+
+# A worker whose heartbeat is older than this is considered gone
+WORKER_TIMEOUT_SECONDS = 30
+
+# Jobs orphaned by a dead worker are retried this many times
+MAX_ATTEMPTS = 2
+
+_current = threading.local()
+
+
+def json_default(value: Any) -> Any:
+    """json.dumps default for numpy/pandas values in agent results."""
+    if hasattr(value, "to_dict"):
+        return value.to_dict(orient="records") if hasattr(value, "columns") else value.to_dict()
+    if hasattr(value, "tolist"):
+        return value.tolist()
+    if hasattr(value, "isoformat"):
+        return value.isoformat()
+    return str(value)
+
+
+def job_key(agent: str, args: List[Any], kwargs: Dict[str, Any]) -> str:
+    """Identity of a job's work (runner + arguments)."""
+    payload = json.dumps([agent, args, kwargs], sort_keys=True, default=json_default)
+    return hashlib.sha256(payload.encode()).hexdigest()[:24]
+
+
+def report_progress(message: str, step: Optional[int] = None):
+    """
+    Record progress for the job running on this thread.
+
+    Outside a worker job this just prints, so agents and workflows can
+    call it unconditionally.
+
+    Args:
+        message: Progress message
+        step: Optional step index (for progress steppers)
+    """
+    job = getattr(_current, "job", None)
+    if job is None:
+        print(f"[*] {message}")
+        return
+    queue, job_id = job
+    queue.add_event(job_id, message, step)
+
+
+class JobQueue:
+    """Agent jobs, their progress events, and live workers."""
+
+    def __init__(self, db_path: str = "artifacts/agent_jobs.sqlite"):
+        self.db_path = db_path
+        os.makedirs(os.path.dirname(db_path) or ".", exist_ok=True)
+        self.conn = sqlite3.connect(db_path, check_same_thread=False, timeout=30)
+        self.conn.row_factory = sqlite3.Row
+        # Worker threads and Streamlit sessions share this connection
+        self.lock = threading.Lock()
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS jobs (
+                job_id TEXT PRIMARY KEY,
+                agent TEXT NOT NULL,
+                args TEXT NOT NULL,
+                kwargs TEXT NOT NULL,
+                job_key TEXT NOT NULL,
+                status TEXT NOT NULL,
+                submitted_by TEXT,
+                submitted_at TEXT NOT NULL,
+                started_at TEXT,
+                finished_at TEXT,
+                worker_id TEXT,
+                claim TEXT,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                step INTEGER,
+                result TEXT,
+                error TEXT
+            );
+            CREATE INDEX IF NOT EXISTS idx_jobs_status ON jobs(status, submitted_at);
+            CREATE INDEX IF NOT EXISTS idx_jobs_key ON jobs(job_key, status);
+            CREATE TABLE IF NOT EXISTS job_events (
+                event_id INTEGER PRIMARY KEY AUTOINCREMENT,
+                job_id TEXT NOT NULL,
+                time TEXT NOT NULL,
+                step INTEGER,
+                message TEXT NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_job_events_job ON job_events(job_id, event_id);
+            CREATE TABLE IF NOT EXISTS workers (
+                worker_id TEXT PRIMARY KEY,
+                pid INTEGER NOT NULL,
+                started_at TEXT NOT NULL,
+                heartbeat TEXT NOT NULL,
+                agents TEXT NOT NULL
+            );
+        """)
+        self.conn.commit()
+
+    def _fetchall(self, sql: str, params: tuple = ()) -> List[sqlite3.Row]:
+        with self.lock:
+            return self.conn.execute(sql, params).fetchall()
+
+    def _fetchone(self, sql: str, params: tuple = ()) -> Optional[sqlite3.Row]:
+        with self.lock:
+            return self.conn.execute(sql, params).fetchone()
+
+    # ---- UI side ----
+
+    def submit(
+        self,
+        agent: str,
+        args: Optional[List[Any]] = None,
+        kwargs: Optional[Dict[str, Any]] = None,
+        submitted_by: Optional[str] = None,
+        dedupe: bool = True
+    ) -> str:
+        """
+        Queue an agent run.
+
+        Args:
+            agent: Runner name from agents.AGENT_RUNNERS
+            args: Positional arguments (JSON-serializable)
+            kwargs: Keyword arguments (JSON-serializable)
+            submitted_by: Operator/session label
+            dedupe: Share an identical job that is still queued or running
+
+        Returns:
+            Job ID
+        """
+        args = list(args or [])
+        kwargs = dict(kwargs or {})
+        key = job_key(agent, args, kwargs)
+
+        with self.lock, self.conn:
+            if dedupe:
+                row = self.conn.execute(
+                    "SELECT job_id FROM jobs WHERE job_key = ? AND status IN (?, ?) "
+                    "ORDER BY submitted_at LIMIT 1",
+                    (key, *ACTIVE_STATUSES)
+                ).fetchone()
+                if row:
+                    return row["job_id"]
+
+            job_id = uuid.uuid4().hex[:16]
+            self.conn.execute(
+                "INSERT INTO jobs (job_id, agent, args, kwargs, job_key, status, submitted_by, submitted_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    job_id, agent, json.dumps(args, default=json_default),
+                    json.dumps(kwargs, default=json_default), key, QUEUED,
+                    submitted_by, datetime.now().isoformat()
+                )
+            )
+        return job_id
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Get a job with its decoded arguments and result."""
+        row = self._fetchone("SELECT * FROM jobs WHERE job_id = ?", (job_id,))
+        return self._to_job(row) if row else None
+
+    def events(self, job_id: str, after: int = 0) -> List[Dict[str, Any]]:
+        """Progress events for a job newer than event ID `after`."""
+        rows = self._fetchall(
+            "SELECT event_id, time, step, message FROM job_events "
+            "WHERE job_id = ? AND event_id > ? ORDER BY event_id",
+            (job_id, after)
+        )
+        return [dict(row) for row in rows]
+
+    def list_jobs(self, status: Optional[str] = None, limit: int = 50) -> List[Dict[str, Any]]:
+        """Recent jobs, newest first."""
+        if status:
+            rows = self._fetchall(
+                "SELECT * FROM jobs WHERE status = ? ORDER BY submitted_at DESC LIMIT ?",
+                (status, limit)
+            )
+        else:
+            rows = self._fetchall("SELECT * FROM jobs ORDER BY submitted_at DESC LIMIT ?", (limit,))
+        return [self._to_job(row) for row in rows]
+
+    def workers(self) -> List[Dict[str, Any]]:
+        """Workers with a recent heartbeat."""
+        cutoff = (datetime.now() - timedelta(seconds=WORKER_TIMEOUT_SECONDS)).isoformat()
+        rows = self._fetchall("SELECT * FROM workers WHERE heartbeat >= ? ORDER BY started_at", (cutoff,))
+        return [{**dict(row), "agents": json.loads(row["agents"])} for row in rows]
+
+    def worker_available(self) -> bool:
+        """Whether a live worker will pick up submitted jobs."""
+        return bool(self.workers())
+
+    # ---- Worker side ----
+
+    def register_worker(self, worker_id: str, agents: List[str]):
+        now = datetime.now().isoformat()
+        with self.lock, self.conn:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO workers VALUES (?, ?, ?, ?, ?)",
+                (worker_id, os.getpid(), now, now, json.dumps(agents))
+            )
+
+    def heartbeat(self, worker_id: str):
+        with self.lock, self.conn:
+            self.conn.execute(
+                "UPDATE workers SET heartbeat = ? WHERE worker_id = ?",
+                (datetime.now().isoformat(), worker_id)
+            )
+
+    def unregister_worker(self, worker_id: str):
+        with self.lock, self.conn:
+            self.conn.execute("DELETE FROM workers WHERE worker_id = ?", (worker_id,))
+
+    def claim(self, worker_id: str, agents: Optional[List[str]] = None) -> Optional[Dict[str, Any]]:
+        """
+        Atomically take the oldest queued job.
+
+        Args:
+            worker_id: Claiming worker
+            agents: Only claim these runners (default: any)
+
+        Returns:
+            Job dict, or None if nothing is queued
+        """
+        claim = uuid.uuid4().hex
+        agent_filter, params = "", []
+        if agents:
+            agent_filter = f" AND agent IN ({', '.join('?' * len(agents))})"
+            params = list(agents)
+
+        # Single UPDATE so two workers can't claim the same job
+        with self.lock, self.conn:
+            self.conn.execute(
+                f"""
+                UPDATE jobs SET status = ?, worker_id = ?, claim = ?, started_at = ?, attempts = attempts + 1
+                WHERE job_id = (
+                    SELECT job_id FROM jobs WHERE status = ?{agent_filter}
+                    ORDER BY submitted_at LIMIT 1
+                ) AND status = ?
+                """,
+                (RUNNING, worker_id, claim, datetime.now().isoformat(), QUEUED, *params, QUEUED)
+            )
+            row = self.conn.execute("SELECT * FROM jobs WHERE claim = ?", (claim,)).fetchone()
+        return self._to_job(row) if row else None
+
+    def add_event(self, job_id: str, message: str, step: Optional[int] = None):
+        with self.lock, self.conn:
+            self.conn.execute(
+                "INSERT INTO job_events (job_id, time, step, message) VALUES (?, ?, ?, ?)",
+                (job_id, datetime.now().isoformat(), step, message)
+            )
+            if step is not None:
+                self.conn.execute("UPDATE jobs SET step = ? WHERE job_id = ?", (step, job_id))
+
+    def complete(self, job_id: str, result: Any):
+        self._finish(job_id, DONE, result=json.dumps(result, default=json_default))
+
+    def fail(self, job_id: str, error: str):
+        self._finish(job_id, FAILED, error=error)
+
+    def _finish(self, job_id: str, status: str, result: Optional[str] = None, error: Optional[str] = None):
+        with self.lock, self.conn:
+            self.conn.execute(
+                "UPDATE jobs SET status = ?, result = ?, error = ?, finished_at = ? WHERE job_id = ?",
+                (status, result, error, datetime.now().isoformat(), job_id)
+            )
+
+    def requeue_orphans(self) -> int:
+        """
+        Return running jobs whose worker stopped heartbeating to the queue
+        (or fail them after MAX_ATTEMPTS).
+
+        Returns:
+            Number of jobs recovered or failed
+        """
+        cutoff = (datetime.now() - timedelta(seconds=WORKER_TIMEOUT_SECONDS)).isoformat()
+        orphan_filter = (
+            "status = ? AND (worker_id IS NULL OR worker_id NOT IN "
+            "(SELECT worker_id FROM workers WHERE heartbeat >= ?))"
+        )
+        with self.lock, self.conn:
+            failed = self.conn.execute(
+                f"UPDATE jobs SET status = ?, error = ?, finished_at = ? "
+                f"WHERE {orphan_filter} AND attempts >= ?",
+                (FAILED, "Worker stopped while running job", datetime.now().isoformat(),
+                 RUNNING, cutoff, MAX_ATTEMPTS)
+            ).rowcount
+            requeued = self.conn.execute(
+                f"UPDATE jobs SET status = ?, worker_id = NULL, claim = NULL WHERE {orphan_filter}",
+                (QUEUED, RUNNING, cutoff)
+            ).rowcount
+        return failed + requeued
+
+    def _to_job(self, row: sqlite3.Row) -> Dict[str, Any]:
+        job = dict(row)
+        job["args"] = json.loads(job["args"])
+        job["kwargs"] = json.loads(job["kwargs"])
+        job["result"] = json.loads(job["result"]) if job["result"] else None
+        del job["claim"]
+        return job
+
+
+@contextmanager
+def running_job(queue: JobQueue, job_id: str):
+    """Route report_progress calls on this thread to a job."""
+    _current.job = (queue, job_id)
+    try:
+        yield
+    finally:
+        _current.job = None
+
+
+# Global job queue instance
+_job_queue: Optional[JobQueue] = None
+
+
+def get_job_queue() -> JobQueue:
+    """Get or create global job queue."""
+    global _job_queue
+    if _job_queue is None:
+        _job_queue = JobQueue()
+    return _job_queue
@@ -0,0 +1,352 @@
+"""
+Precomputed operational KPI cube over Uber Eats order timings.
+
+Durations from the order accuracy export (time to accept, prep, courier
+wait, avoidable courier wait, delivery, order duration) are rolled up into
+an hour x day-of-week x channel x brand cube. Each cell keeps log-spaced
+duration histograms plus sums and counts, which merge by addition: new
+orders are folded in as they arrive, and any slice (p50/p90, means,
+counts, avoidable-wait share) is a sum over axes plus a cumulative
+histogram lookup instead of a pass over raw orders.
+"""
+import os
+from typing import Dict, Any, List, Optional, Sequence
+import numpy as np
+import pandas as pd
+from services.order_store import atomic_write
+
+
+ORDER_ACCURACY_FILE = "order accuracy.csv"
+CUBE_FILE = "artifacts/kpi_cube.npz"
+
+# Metric key -> export column (minutes)
+METRICS = {
+    "time_to_accept": "Time to Accept",
+    "prep_time": "Original Prep Time",
+    "courier_wait": "Courier Wait Time (Restaurant)",
+    "avoidable_wait": "Avoidable Courier Wait Time (Restaurant)",
+    "delivery_time": "Total Delivery Time",
+    "order_duration": "Order Duration"
+}
+
+METRIC_LABELS = {
+    "time_to_accept": "Time to Accept",
+    "prep_time": "Prep Time",
+    "courier_wait": "Courier Wait",
+    "avoidable_wait": "Avoidable Courier Wait",
+    "delivery_time": "Delivery Time",
+    "order_duration": "Order Duration"
+}
+
+DIMENSIONS = ["hour", "dow", "channel", "brand"]
+DAY_NAMES = ["Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun"]
+
+# Histogram bins are log-spaced so sub-minute metrics (time to accept is
+# ~0.1 min) keep the same relative resolution as 40-minute deliveries:
+# bin 0 is [0, BIN_MIN_MINUTES), then each bin is BIN_GROWTH times wider,
+# so quantiles are within ~1% of the true value
+BIN_MIN_MINUTES = 0.01
+BIN_GROWTH = 1.02
+MAX_MINUTES = 120.0
+BIN_EDGES = np.concatenate([
+    [0.0],
+    BIN_MIN_MINUTES * BIN_GROWTH ** np.arange(
+        int(np.ceil(np.log(MAX_MINUTES / BIN_MIN_MINUTES) / np.log(BIN_GROWTH))) + 1
+    )
+])
+N_BINS = len(BIN_EDGES)  # last bin (from its edge up) collects overflow
+BIN_VALUES = np.append((BIN_EDGES[:-1] + BIN_EDGES[1:]) / 2, BIN_EDGES[-1])
+
+UNKNOWN = "Unknown"
+
+CUBE_COLUMNS = {
+    "Order UUID": "string",
+    "Time Customer Ordered": "string",
+    "Order Channel": "string",
+    "Eats Brand": "string",
+    **{column: "float64" for column in METRICS.values()}
+}
+
+
+class KPICube:
+    """Hour x weekday x channel x brand rollups of order durations."""
+
+    def __init__(self, cube_file: str = CUBE_FILE):
+        self.cube_file = cube_file
+        self.channels: List[str] = []
+        self.brands: List[str] = []
+        self.seen: set = set()
+        self._allocate()
+
+        if os.path.exists(cube_file):
+            self.load()
+
+    def _allocate(self):
+        shape = (24, 7, len(self.channels), len(self.brands))
+        self.orders = np.zeros(shape, dtype=np.int64)
+        self.avoidable_orders = np.zeros(shape, dtype=np.int64)
+        self.sums = np.zeros(shape + (len(METRICS),), dtype=np.float64)
+        self.hist = np.zeros(shape + (len(METRICS), N_BINS), dtype=np.int32)
+
+    def _grow(self, axis: int, extra: int):
+        """Append empty slots for new channels (axis 2) or brands (axis 3)."""
+        if extra <= 0:
+            return
+        pad = [(0, 0)] * 4
+        pad[axis] = (0, extra)
+        self.orders = np.pad(self.orders, pad)
+        self.avoidable_orders = np.pad(self.avoidable_orders, pad)
+        self.sums = np.pad(self.sums, pad + [(0, 0)])
+        self.hist = np.pad(self.hist, pad + [(0, 0), (0, 0)])
+
+    def _label_index(self, values: pd.Series, labels: List[str], axis: int) -> np.ndarray:
+        """Map labels to cube indices, registering new ones."""
+        values = values.fillna(UNKNOWN).astype(str).str.strip().replace("", UNKNOWN)
+        new = [v for v in pd.unique(values) if v not in labels]
+        if new:
+            labels.extend(new)
+            self._grow(axis, len(new))
+        lookup = {label: i for i, label in enumerate(labels)}
+        return values.map(lookup).to_numpy(dtype=np.int64)
+
+    # ---- Maintenance ----
+
+    def add_orders(self, orders: pd.DataFrame) -> int:
+        """
+        Fold new orders into the cube (orders already counted are ignored).
+
+        Args:
+            orders: Order accuracy rows (CUBE_COLUMNS)
+
+        Returns:
+            Number of orders added
+        """
+        if orders is None or orders.empty:
+            return 0
+
+        ids = orders["Order UUID"].astype(str)
+        ordered_at = pd.to_datetime(orders["Time Customer Ordered"], format="%Y-%m-%d %H:%M:%S.%f", errors="coerce")
+        keep = ~ids.isin(self.seen) & ~ids.duplicated() & ordered_at.notna()
+        orders, ids, ordered_at = orders[keep], ids[keep], ordered_at[keep]
+        if orders.empty:
+            return 0
+
+        hour = ordered_at.dt.hour.to_numpy()
+        dow = ordered_at.dt.dayofweek.to_numpy()
+        channel = self._label_index(orders["Order Channel"], self.channels, 2)
+        brand = self._label_index(orders["Eats Brand"], self.brands, 3)
+
+        cell_shape = self.orders.shape
+        cell = np.ravel_multi_index((hour, dow, channel, brand), cell_shape)
+        n_cells = int(np.prod(cell_shape))
+
+        self.orders += np.bincount(cell, minlength=n_cells).reshape(cell_shape)
+
+        values = orders[list(METRICS.values())].to_numpy(dtype=np.float64)
+        valid = ~np.isnan(values) & (values >= 0)
+
+        avoidable = values[:, list(METRICS).index("avoidable_wait")]
+        has_avoidable = np.nan_to_num(avoidable) > 0
+        self.avoidable_orders += np.bincount(cell[has_avoidable], minlength=n_cells).reshape(cell_shape)
+
+        n_metrics = len(METRICS)
+        metric = np.broadcast_to(np.arange(n_metrics), values.shape)
+        cells = np.broadcast_to(cell[:, None], values.shape)
+        flat_cell = cells[valid] * n_metrics + metric[valid]
+        flat_values = values[valid]
+
+        self.sums += np.bincount(
+            flat_cell, weights=flat_values, minlength=n_cells * n_metrics
+        ).reshape(self.sums.shape)
+
+        bins = np.searchsorted(BIN_EDGES, flat_values, side="right") - 1
+        self.hist += np.bincount(
+            flat_cell * N_BINS + bins, minlength=n_cells * n_metrics * N_BINS
+        ).reshape(self.hist.shape).astype(np.int32)
+
+        self.seen.update(ids)
+        return len(orders)
+
+    def refresh(self, accuracy_file: str = ORDER_ACCURACY_FILE, chunksize: int = 50_000) -> int:
+        """
+        Stream an order accuracy export and add orders not yet in the cube.
+
+        Returns:
+            Number of orders added (the cube is saved if any were)
+        """
+        if not os.path.exists(accuracy_file):
+            return 0
+
+        added = 0
+        for chunk in pd.read_csv(
+            accuracy_file,
+            usecols=list(CUBE_COLUMNS),
+            dtype=CUBE_COLUMNS,
+            chunksize=chunksize
+        ):
+            added += self.add_orders(chunk)
+
+        if added:
+            self.save()
+        return added
+
+    def save(self):
+        """Persist the cube (atomic rewrite)."""
+        def write(path):
+            with open(path, "wb") as f:
+                np.savez_compressed(
+                    f,
+                    orders=self.orders,
+                    avoidable_orders=self.avoidable_orders,
+                    sums=self.sums,
+                    hist=self.hist,
+                    channels=np.array(self.channels, dtype=str),
+                    brands=np.array(self.brands, dtype=str),
+                    seen=np.array(sorted(self.seen), dtype=str),
+                    bin_edges=BIN_EDGES
+                )
+
+        atomic_write(self.cube_file, write)
+
+    def load(self):
+        """Load a saved cube (ignored if saved with a different binning)."""
+        with np.load(self.cube_file) as data:
+            if "bin_edges" not in data or not np.array_equal(data["bin_edges"], BIN_EDGES):
+                print(f"[WARN] KPI cube binning changed, rebuilding {self.cube_file}")
+                return
+            self.channels = data["channels"].tolist()
+            self.brands = data["brands"].tolist()
+            self.seen = set(data["seen"].tolist())
+            self.orders = data["orders"]
+            self.avoidable_orders = data["avoidable_orders"]
+            self.sums = data["sums"]
+            self.hist = data["hist"]
+
+    # ---- Queries ----
+
+    def slice(
+        self,
+        by: Sequence[str] = (),
+        hours: Optional[Sequence[int]] = None,
+        days: Optional[Sequence[int]] = None,
+        channels: Optional[Sequence[str]] = None,
+        brands: Optional[Sequence[str]] = None,
+        metrics: Optional[Sequence[str]] = None,
+        quantiles: Sequence[float] = (0.5, 0.9)
+    ) -> pd.DataFrame:
+        """
+        Roll the cube up to the requested dimensions.
+
+        Args:
+            by: Dimensions to keep (subset of DIMENSIONS); others are summed
+            hours: Hours of day to include (0-23)
+            days: Weekdays to include (0=Mon)
+            channels: Order channels to include (e.g. "iOS")
+            brands: Brands to include (e.g. "Uber Eats")
+            metrics: Metric keys (all of METRICS if omitted)
+            quantiles: Quantiles to report per metric
+
+        Returns:
+            One row per combination of the `by` dimensions with orders,
+            avoidable_wait_share and <metric>_p50 / _p90 / _mean / _n columns
+        """
+        unknown = set(by) - set(DIMENSIONS)
+        if unknown:
+            raise ValueError(f"Unknown cube dimensions: {sorted(unknown)}")
+        metrics = list(metrics) if metrics else list(METRICS)
+        metric_idx = [list(METRICS).index(m) for m in metrics]
+
+        labels = [
+            list(range(24)),
+            list(range(7)),
+            self.channels,
+            self.brands
+        ]
+        selections = [
+            self._select(range(24), hours),
+            self._select(range(7), days),
+            self._select(self.channels, channels),
+            self._select(self.brands, brands)
+        ]
+
+        index = np.ix_(*selections)
+        keep_axes = [DIMENSIONS.index(d) for d in by]
+        drop_axes = tuple(a for a in range(4) if a not in keep_axes)
+
+        orders = self.orders[index].sum(axis=drop_axes)
+        avoidable = self.avoidable_orders[index].sum(axis=drop_axes)
+        sums = self.sums[index][..., metric_idx].sum(axis=drop_axes)
+        hist = self.hist[index][..., metric_idx, :].sum(axis=drop_axes, dtype=np.int64)
+
+        # Kept axes stay in DIMENSIONS order; flatten them into rows
+        kept = sorted(keep_axes)
+        n_rows = int(np.prod(orders.shape)) if kept else 1
+        orders = orders.reshape(n_rows)
+        avoidable = avoidable.reshape(n_rows)
+        sums = sums.reshape(n_rows, len(metrics))
+        hist = hist.reshape(n_rows, len(metrics), N_BINS)
+        counts = hist.sum(axis=-1)
+
+        if kept:
+            grid = pd.MultiIndex.from_product(
+                [[labels[a][i] for i in selections[a]] for a in kept],
+                names=[DIMENSIONS[a] for a in kept]
+            ).to_frame(index=False)
+        else:
+            grid = pd.DataFrame(index=range(1))
+
+        with np.errstate(invalid="ignore", divide="ignore"):
+            columns = {
+                "orders": orders,
+                "avoidable_wait_share": np.where(orders > 0, avoidable / orders, np.nan)
+            }
+            means = np.where(counts > 0, sums / counts, np.nan)
+
+        for q in quantiles:
+            values = self._quantile(hist, counts, q)
+            for j, metric in enumerate(metrics):
+                columns[f"{metric}_p{int(round(q * 100))}"] = values[:, j]
+        for j, metric in enumerate(metrics):
+            columns[f"{metric}_mean"] = means[:, j]
+            columns[f"{metric}_n"] = counts[:, j]
+
+        result = pd.concat([grid, pd.DataFrame(columns)], axis=1)
+        if "dow" in result:
+            result["day"] = result["dow"].map(dict(enumerate(DAY_NAMES)))
+        return result
+
+    def summary(self, **filters) -> Dict[str, Any]:
+        """Single-row slice as a dict (same filters as slice())."""
+        return self.slice(by=(), **filters).iloc[0].to_dict()
+
+    @staticmethod
+    def _select(labels: Sequence, wanted: Optional[Sequence]) -> List[int]:
+        if wanted is None:
+            return list(range(len(labels)))
+        wanted = set(wanted)
+        return [i for i, label in enumerate(labels) if label in wanted]
+
+    @staticmethod
+    def _quantile(hist: np.ndarray, counts: np.ndarray, q: float) -> np.ndarray:
+        """Quantile (bin midpoint, minutes) along the last histogram axis."""
+        cumulative = hist.cumsum(axis=-1)
+        target = np.ceil(q * counts)[..., None]
+        first = (cumulative >= np.maximum(target, 1)).argmax(axis=-1)
+        return np.where(counts > 0, BIN_VALUES[first], np.nan)
+
+    @property
+    def total_orders(self) -> int:
+        return int(self.orders.sum())
+
+
+# Global KPI cube instance
+_kpi_cube: Optional[KPICube] = None
+
+
+def get_kpi_cube() -> KPICube:
+    """Get or create the global KPI cube (built from the export on first use)."""
+    global _kpi_cube
+    if _kpi_cube is None:
+        _kpi_cube = KPICube()
+        _kpi_cube.refresh()
+    return _kpi_cube
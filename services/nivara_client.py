@@ -3,10 +3,16 @@ Nivara AI Client - Secure Compliance Document Storage & Reasoning.
 """
 import os
 import json
+import time
 import hashlib
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
 from typing import Dict, Any, List, Optional
 from pathlib import Path
+from services.document_store import get_document_store
+from services.text_extraction import TextExtractor
+from services.compliance_index import ComplianceIndex
+from services.compliance_rules import ComplianceRules
 
 try:
     import nivara as nv
@@ -16,12 +22,23 @@ except ImportError:
     print("[WARN] Nivara SDK not installed. Install with: pip install nivara")
 
 
+# Document sections sent as context per compliance question
+COMPLIANCE_TOP_K = 5
+
+# Shared-context size and Captain concurrency for checklist audits
+AUDIT_MAX_SECTIONS = 20
+AUDIT_MAX_WORKERS = 8
+
+
 class NivaraClient:
     """Client for Nivara AI - Secure compliance document management."""
     
     def __init__(self, api_key: str):
         self.api_key = api_key
-        self.document_store = {}  # In-memory secure document store
+        self.document_store = get_document_store()  # Persistent, tenant-partitioned store
+        self.extractor = TextExtractor(self.document_store)
+        self.index = ComplianceIndex(self.document_store)  # Section-level retrieval
+        self.rules = ComplianceRules(self.index)  # Numeric SOP thresholds (no LLM)
         
         if not NIVARA_AVAILABLE:
             print("[WARN] Nivara SDK not available - using secure local storage")
@@ -62,57 +79,10 @@ class NivaraClient:
             if not file_path_obj.exists():
                 raise FileNotFoundError(f"Document not found: {file_path}")
             
-            # Extract text based on file type
-            content = self._extract_text(file_path_obj)
+            # Extract text (cached by file hash; long PDFs split across cores)
+            _, content = self.extractor.extract(str(file_path_obj))
             
-            # Generate secure document ID
-            doc_id = self._generate_doc_id(tenant_id, file_path_obj.name)
-            
-            # Store securely with tenant isolation
-            doc_data = {
-                "doc_id": doc_id,
-                "tenant_id": tenant_id,
-                "filename": file_path_obj.name,
-                "doc_type": doc_type,
-                "content": content,
-                "access_level": access_level,
-                "uploaded_at": datetime.now(timezone.utc).isoformat(),
-                "metadata": metadata or {},
-                "security_hash": hashlib.sha256(content.encode()).hexdigest()
-            }
-            
-            # Store in tenant-isolated namespace
-            tenant_key = f"{tenant_id}:{doc_id}"
-            self.document_store[tenant_key] = doc_data
-            
-            # Record metric in Nivara
-            if NIVARA_AVAILABLE:
-                try:
-                    nv.record(
-                        metric="compliance.document.upload",
-                        ts=datetime.now(timezone.utc),
-                        input_tokens=len(content) // 4,  # Approximate tokens
-                        output_tokens=0,
-                        metadata={
-                            "tenant_id": tenant_id,
-                            "doc_type": doc_type,
-                            "access_level": access_level,
-                            "doc_id": doc_id
-                        }
-                    )
-                except Exception as e:
-                    print(f"[WARN] Nivara metric recording failed: {e}")
-            
-            return {
-                "success": True,
-                "doc_id": doc_id,
-                "tenant_id": tenant_id,
-                "filename": file_path_obj.name,
-                "doc_type": doc_type,
-                "access_level": access_level,
-                "message": f"🔒 Securely stored with Nivara (tenant: {tenant_id})",
-                "security_badge": "Protected by Nivara • No data leaves restaurant boundary"
-            }
+            return self._store_document(tenant_id, file_path_obj, content, doc_type, access_level, metadata)
             
         except Exception as e:
             print(f"[ERROR] Document upload failed: {e}")
@@ -121,12 +91,126 @@ class NivaraClient:
                 "error": str(e)
             }
     
+    def upload_documents(
+        self,
+        tenant_id: str,
+        file_paths: List[str],
+        doc_type: str,
+        access_level: str = "manager_only",
+        metadata: Optional[Dict[str, Any]] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Upload a batch of compliance documents (e.g. a binder of SOP PDFs).
+        
+        Text extraction for all files runs in parallel across cores, and
+        files already extracted before (same bytes) are served from cache.
+        
+        Args:
+            tenant_id: Restaurant tenant ID (for isolation)
+            file_paths: Paths to document files
+            doc_type: Type (food_safety, certification, labor, etc.)
+            access_level: manager_only, all_staff, owner_only
+            metadata: Additional metadata (shared by all documents)
+            
+        Returns:
+            One upload result per path, in order
+        """
+        missing = [path for path in file_paths if not Path(path).exists()]
+        found = [str(Path(path)) for path in file_paths if Path(path).exists()]
+        
+        try:
+            texts = self.extractor.extract_many(found)
+        except Exception as e:
+            print(f"[ERROR] Document upload failed: {e}")
+            return [{"success": False, "error": str(e)} for _ in file_paths]
+        
+        results = []
+        for path in file_paths:
+            if path in missing:
+                results.append({"success": False, "error": f"Document not found: {path}"})
+                continue
+            try:
+                _, content = texts[str(Path(path))]
+                results.append(self._store_document(tenant_id, Path(path), content, doc_type, access_level, metadata))
+            except Exception as e:
+                print(f"[ERROR] Document upload failed: {e}")
+                results.append({"success": False, "error": str(e)})
+        
+        return results
+    
+    def _store_document(
+        self,
+        tenant_id: str,
+        file_path_obj: Path,
+        content: str,
+        doc_type: str,
+        access_level: str,
+        metadata: Optional[Dict[str, Any]]
+    ) -> Dict[str, Any]:
+        """Internal: Store extracted document text with tenant isolation."""
+        # Generate secure document ID
+        doc_id = self._generate_doc_id(tenant_id, file_path_obj.name)
+        
+        # Store securely with tenant isolation
+        doc_data = {
+            "doc_id": doc_id,
+            "tenant_id": tenant_id,
+            "filename": file_path_obj.name,
+            "doc_type": doc_type,
+            "content": content,
+            "access_level": access_level,
+            "uploaded_at": datetime.now(timezone.utc).isoformat(),
+            "metadata": metadata or {},
+            "security_hash": hashlib.sha256(content.encode()).hexdigest()
+        }
+        
+        # Store in tenant-isolated partition (text stored once per security_hash);
+        # a re-upload replaces the document and its indexed sections
+        self.document_store.put(doc_data)
+        self.index.add_document(doc_data)
+        
+        # Copies from before IDs were stable (timestamped IDs)
+        for old_id in self.document_store.doc_ids(tenant_id, file_path_obj.name):
+            if old_id != doc_id:
+                self.document_store.delete(tenant_id, old_id)
+                self.index.remove_document(tenant_id, old_id)
+        
+        # Record metric in Nivara
+        if NIVARA_AVAILABLE:
+            try:
+                nv.record(
+                    metric="compliance.document.upload",
+                    ts=datetime.now(timezone.utc),
+                    input_tokens=len(content) // 4,  # Approximate tokens
+                    output_tokens=0,
+                    metadata={
+                        "tenant_id": tenant_id,
+                        "doc_type": doc_type,
+                        "access_level": access_level,
+                        "doc_id": doc_id
+                    }
+                )
+            except Exception as e:
+                print(f"[WARN] Nivara metric recording failed: {e}")
+        
+        return {
+            "success": True,
+            "doc_id": doc_id,
+            "tenant_id": tenant_id,
+            "filename": file_path_obj.name,
+            "doc_type": doc_type,
+            "access_level": access_level,
+            "message": f"🔒 Securely stored with Nivara (tenant: {tenant_id})",
+            "security_badge": "Protected by Nivara • No data leaves restaurant boundary"
+        }
+    
     def query_compliance(
         self,
         tenant_id: str,
         question: str,
         user_role: str = "manager",
-        context: Optional[Dict[str, Any]] = None
+        context: Optional[Dict[str, Any]] = None,
+        use_rules: bool = True
     ) -> Dict[str, Any]:
         """
         Query compliance documents for reasoning and citations.
@@ -136,22 +220,32 @@ class NivaraClient:
             question: Compliance question
             user_role: manager, staff, owner (for access control)
             context: Additional context (orders, staffing, etc.)
+            use_rules: Answer numeric checks from compiled SOP rules when possible
             
         Returns:
             Dict with answer, citations, confidence, security badge
         """
         try:
-            # Get tenant documents (access control enforced)
-            tenant_docs = self._get_tenant_documents(tenant_id, user_role)
+            # Fast path: numeric checks against compiled SOP thresholds
+            if use_rules:
+                fast = self.rules.evaluate(tenant_id, question, user_role, context)
+                if fast:
+                    self._record_query(tenant_id, user_role, question, fast)
+                    return fast
+            
+            # Retrieve only the most relevant sections (tenant + role filtered in the index)
+            sections = self.index.search(tenant_id, question, user_role, top_k=COMPLIANCE_TOP_K)
             
-            if not tenant_docs:
+            if not sections:
                 return {
                     "success": False,
                     "error": "No compliance documents available for this tenant"
                 }
             
-            # Build context from documents
-            doc_context = self._build_compliance_context(tenant_docs, context)
+            documents_accessed = len({section['doc_id'] for section in sections})
+            
+            # Build context from retrieved sections
+            doc_context = self._build_compliance_context(sections, context)
             
             # Use Captain for reasoning (with Nivara security)
             from services.captain_client import get_captain_client
@@ -161,23 +255,138 @@ class NivaraClient:
             # Create secure collection for compliance
             collection_id = f"compliance_{tenant_id}"
             
-            # Upload documents to Captain context
-            compliance_docs = []
-            for doc in tenant_docs:
-                compliance_docs.append({
-                    "title": f"{doc['doc_type']}: {doc['filename']}",
-                    "content": doc['content'],
-                    "metadata": {
-                        "doc_id": doc['doc_id'],
-                        "access_level": doc['access_level'],
-                        "tenant_id": tenant_id
-                    }
-                })
+            # Send only the retrieved sections as Captain context
+            captain.upload_documents(collection_id, self._section_documents(tenant_id, sections))
+            
+            result = self._ask_captain(captain, collection_id, question, doc_context)
+            result["documents_accessed"] = documents_accessed
+            result["sections_used"] = len(sections)
+            
+            self._record_query(tenant_id, user_role, question, result)
+            
+            return result
+            
+        except Exception as e:
+            print(f"[ERROR] Compliance query failed: {e}")
+            return {
+                "success": False,
+                "error": str(e)
+            }
+    
+    def audit_compliance(
+        self,
+        tenant_id: str,
+        questions: List[str],
+        user_role: str = "manager",
+        context: Optional[Dict[str, Any]] = None,
+        max_workers: int = AUDIT_MAX_WORKERS,
+        use_stub: bool = False
+    ) -> List[Dict[str, Any]]:
+        """
+        Answer a checklist of compliance questions in one pass.
+        
+        Numeric checks are answered from the compiled SOP rules. The rest
+        share one retrieved context (the union of each question's top
+        sections, uploaded once) and are sent to Captain concurrently.
+        
+        Args:
+            tenant_id: Restaurant tenant ID
+            questions: Checklist questions
+            user_role: manager, staff, owner (for access control)
+            context: Additional context (orders, staffing, etc.)
+            max_workers: Maximum concurrent Captain queries
+            use_stub: Use the local Captain mock instead of the API
             
-            captain.upload_documents(collection_id, compliance_docs)
+        Returns:
+            One query_compliance-shaped result per question (in order),
+            each with question and latency_ms
+        """
+        results: List[Optional[Dict[str, Any]]] = [None] * len(questions)
+        pending = []
+        
+        for i, question in enumerate(questions):
+            started = time.perf_counter()
+            fast = self.rules.evaluate(tenant_id, question, user_role, context)
+            if fast:
+                self._record_query(tenant_id, user_role, question, fast)
+                results[i] = {**fast, "question": question, "latency_ms": (time.perf_counter() - started) * 1000}
+            else:
+                pending.append(i)
+        
+        if not pending:
+            return results
+        
+        try:
+            # One shared context: each question's top sections, deduplicated
+            sections, seen = [], set()
+            for i in pending:
+                for section in self.index.search(tenant_id, questions[i], user_role, top_k=COMPLIANCE_TOP_K):
+                    key = (section['doc_id'], section['heading'])
+                    if key not in seen:
+                        seen.add(key)
+                        sections.append(section)
+            sections = sections[:AUDIT_MAX_SECTIONS]
+            
+            if not sections:
+                raise ValueError("No compliance documents available for this tenant")
+            
+            documents_accessed = len({section['doc_id'] for section in sections})
+            doc_context = self._build_compliance_context(sections, context)
             
-            # Query with compliance-specific prompt
-            compliance_prompt = f"""You are a restaurant compliance analyst. Answer this compliance question with:
+            if use_stub:
+                from services.captain_mock import get_captain_mock
+                captain = get_captain_mock("local", "local")
+            else:
+                from services.captain_client import get_captain_client
+                captain = get_captain_client()
+            
+            collection_id = f"compliance_audit_{tenant_id}"
+            captain.upload_documents(collection_id, self._section_documents(tenant_id, sections))
+        
+        except Exception as e:
+            print(f"[ERROR] Compliance audit failed: {e}")
+            for i in pending:
+                results[i] = {"success": False, "error": str(e), "question": questions[i], "latency_ms": 0.0}
+            return results
+        
+        def ask(i: int) -> Dict[str, Any]:
+            started = time.perf_counter()
+            try:
+                result = self._ask_captain(captain, collection_id, questions[i], doc_context)
+                result["documents_accessed"] = documents_accessed
+                result["sections_used"] = len(sections)
+                self._record_query(tenant_id, user_role, questions[i], result)
+            except Exception as e:
+                print(f"[ERROR] Compliance query failed: {e}")
+                result = {"success": False, "error": str(e)}
+            return {**result, "question": questions[i], "latency_ms": (time.perf_counter() - started) * 1000}
+        
+        with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+            for i, result in zip(pending, executor.map(ask, pending)):
+                results[i] = result
+        
+        return results
+    
+    def _section_documents(self, tenant_id: str, sections: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Internal: Retrieved sections as Captain context documents."""
+        return [
+            {
+                "title": f"{section['doc_type']}: {section['filename']} › {section['heading']}",
+                "content": section['text'],
+                "metadata": {
+                    "doc_id": section['doc_id'],
+                    "section": section['heading'],
+                    "access_level": section['access_level'],
+                    "tenant_id": tenant_id
+                }
+            }
+            for section in sections
+        ]
+    
+    def _ask_captain(self, captain, collection_id: str, question: str, doc_context: str) -> Dict[str, Any]:
+        """Internal: Ask Captain one compliance question against an uploaded context."""
+        # Query with compliance-specific prompt
+        compliance_prompt = f"""You are a restaurant compliance analyst. Answer this compliance question with:
 1. Clear YES/NO/PARTIAL compliance status
 2. Specific citations from documents (use [1], [2], etc.)
 3. Reasoning summary
@@ -194,61 +403,58 @@ CITATIONS: [numbered list]
 RISK_LEVEL: [if non-compliant]
 RECOMMENDATIONS: [action items]
 """
-            
-            response = captain.query(
-                collection_id=collection_id,
-                query=compliance_prompt,
-                top_k=5,
-                include_sources=True
+        
+        response = captain.query(
+            collection_id=collection_id,
+            query=compliance_prompt,
+            top_k=5,
+            include_sources=True
+        )
+        
+        answer = response.get("answer", "Unable to determine compliance status")
+        sources = response.get("sources", [])
+        
+        # Parse structured response
+        parsed = self._parse_compliance_response(answer)
+        
+        # Calculate confidence based on citation count
+        confidence = min(95, 60 + (len(sources) * 10))
+        
+        return {
+            "success": True,
+            "answer": answer,
+            "status": parsed.get("status", "UNKNOWN"),
+            "reasoning": parsed.get("reasoning", answer),
+            "citations": sources,
+            "confidence": confidence,
+            "risk_level": parsed.get("risk_level", "UNKNOWN"),
+            "recommendations": parsed.get("recommendations", []),
+            "security_badge": "Protected by Nivara • No data leaves restaurant boundary",
+            "source": "llm",
+            "timestamp": datetime.now(timezone.utc).isoformat()
+        }
+    
+    def _record_query(self, tenant_id: str, user_role: str, question: str, result: Dict[str, Any]):
+        """Internal: Record a compliance query metric in Nivara."""
+        if not NIVARA_AVAILABLE:
+            return
+        try:
+            nv.record(
+                metric="compliance.query",
+                ts=datetime.now(timezone.utc),
+                input_tokens=len(question) // 4,
+                output_tokens=len(result["answer"]) // 4,
+                metadata={
+                    "tenant_id": tenant_id,
+                    "user_role": user_role,
+                    "confidence": result["confidence"],
+                    "documents_accessed": result["documents_accessed"],
+                    "sections_used": result.get("sections_used", 0),
+                    "source": result["source"]
+                }
             )
-            
-            answer = response.get("answer", "Unable to determine compliance status")
-            sources = response.get("sources", [])
-            
-            # Parse structured response
-            parsed = self._parse_compliance_response(answer)
-            
-            # Calculate confidence based on citation count
-            confidence = min(95, 60 + (len(sources) * 10))
-            
-            # Record query metric in Nivara
-            if NIVARA_AVAILABLE:
-                try:
-                    nv.record(
-                        metric="compliance.query",
-                        ts=datetime.now(timezone.utc),
-                        input_tokens=len(question) // 4,
-                        output_tokens=len(answer) // 4,
-                        metadata={
-                            "tenant_id": tenant_id,
-                            "user_role": user_role,
-                            "confidence": confidence,
-                            "documents_accessed": len(tenant_docs)
-                        }
-                    )
-                except Exception as e:
-                    print(f"[WARN] Nivara metric recording failed: {e}")
-            
-            return {
-                "success": True,
-                "answer": answer,
-                "status": parsed.get("status", "UNKNOWN"),
-                "reasoning": parsed.get("reasoning", answer),
-                "citations": sources,
-                "confidence": confidence,
-                "risk_level": parsed.get("risk_level", "UNKNOWN"),
-                "recommendations": parsed.get("recommendations", []),
-                "security_badge": "Protected by Nivara • No data leaves restaurant boundary",
-                "documents_accessed": len(tenant_docs),
-                "timestamp": datetime.now(timezone.utc).isoformat()
-            }
-            
         except Exception as e:
-            print(f"[ERROR] Compliance query failed: {e}")
-            return {
-                "success": False,
-                "error": str(e)
-            }
+            print(f"[WARN] Nivara metric recording failed: {e}")
     
     def get_tenant_documents(
         self,
@@ -258,110 +464,40 @@ RECOMMENDATIONS: [action items]
         """Get documents for tenant (with access control)."""
         return self._get_tenant_documents(tenant_id, user_role)
     
+    def count_tenant_documents(self, tenant_id: str, user_role: str = "manager") -> int:
+        """Number of tenant documents the role may read (from the index, no text read)."""
+        self.index.ensure_indexed(tenant_id)
+        return self.index.document_count(tenant_id, user_role)
+    
     def _get_tenant_documents(
         self,
         tenant_id: str,
         user_role: str
     ) -> List[Dict[str, Any]]:
         """Internal: Get tenant documents with access control."""
-        docs = []
-        
-        for key, doc in self.document_store.items():
-            stored_tenant_id = key.split(':')[0]
-            
-            # Tenant isolation
-            if stored_tenant_id != tenant_id:
-                continue
-            
-            # Access control
-            access_level = doc.get('access_level', 'manager_only')
-            
-            if access_level == 'owner_only' and user_role != 'owner':
-                continue
-            
-            if access_level == 'manager_only' and user_role not in ['manager', 'owner']:
-                # Return blurred version for non-managers
-                docs.append({
-                    **doc,
-                    'content': '[RESTRICTED - Manager access required]',
-                    'blurred': True
-                })
-                continue
-            
-            docs.append(doc)
-        
-        return docs
-    
-    def _extract_text(self, file_path: Path) -> str:
-        """Extract text from PDF, DOCX, or image files."""
-        suffix = file_path.suffix.lower()
+        # Tenant isolation is the index partition; access control filters within it
+        exclude_levels = [] if user_role == 'owner' else ['owner_only']
         
-        try:
-            if suffix == '.pdf':
-                return self._extract_pdf(file_path)
-            elif suffix in ['.docx', '.doc']:
-                return self._extract_docx(file_path)
-            elif suffix in ['.png', '.jpg', '.jpeg', '.tiff']:
-                return self._extract_image(file_path)
-            elif suffix in ['.txt', '.md']:
-                return file_path.read_text(encoding='utf-8')
-            else:
-                raise ValueError(f"Unsupported file type: {suffix}")
+        # Non-managers see manager_only documents blurred
+        blurred_levels = [] if user_role in ['manager', 'owner'] else ['manager_only']
         
-        except Exception as e:
-            print(f"[WARN] Text extraction failed for {file_path}: {e}")
-            return f"[Document: {file_path.name} - Content extraction failed]"
-    
-    def _extract_pdf(self, file_path: Path) -> str:
-        """Extract text from PDF."""
-        try:
-            from PyPDF2 import PdfReader
-            reader = PdfReader(str(file_path))
-            text = ""
-            for page in reader.pages:
-                text += page.extract_text() + "\n"
-            return text
-        except ImportError:
-            return f"[PDF: {file_path.name} - PyPDF2 not installed]"
-        except Exception as e:
-            return f"[PDF: {file_path.name} - Extraction error: {e}]"
-    
-    def _extract_docx(self, file_path: Path) -> str:
-        """Extract text from DOCX."""
-        try:
-            from docx import Document
-            doc = Document(str(file_path))
-            text = "\n".join([para.text for para in doc.paragraphs])
-            return text
-        except ImportError:
-            return f"[DOCX: {file_path.name} - python-docx not installed]"
-        except Exception as e:
-            return f"[DOCX: {file_path.name} - Extraction error: {e}]"
-    
-    def _extract_image(self, file_path: Path) -> str:
-        """Extract text from image using OCR."""
-        try:
-            import pytesseract
-            from PIL import Image
-            img = Image.open(str(file_path))
-            text = pytesseract.image_to_string(img)
-            return text
-        except ImportError:
-            return f"[Image: {file_path.name} - OCR libraries not installed]"
-        except Exception as e:
-            return f"[Image: {file_path.name} - OCR error: {e}]"
+        return self.document_store.list_documents(
+            tenant_id,
+            exclude_levels=exclude_levels,
+            blurred_levels=blurred_levels
+        )
     
     def _generate_doc_id(self, tenant_id: str, filename: str) -> str:
-        """Generate secure document ID."""
-        content = f"{tenant_id}:{filename}:{datetime.now(timezone.utc).isoformat()}"
+        """Generate secure document ID (stable per tenant and filename, so re-uploads replace)."""
+        content = f"{tenant_id}:{filename}"
         return hashlib.sha256(content.encode()).hexdigest()[:16]
     
     def _build_compliance_context(
         self,
-        documents: List[Dict[str, Any]],
+        sections: List[Dict[str, Any]],
         context: Optional[Dict[str, Any]]
     ) -> str:
-        """Build context string for compliance reasoning."""
+        """Build context string for compliance reasoning (retrieved sections only)."""
         ctx = "=== OPERATIONAL CONTEXT ===\n"
         
         if context:
@@ -372,9 +508,9 @@ RECOMMENDATIONS: [action items]
             if 'peak_hours' in context:
                 ctx += f"Peak Hours: {context['peak_hours']}\n"
         
-        ctx += f"\n=== AVAILABLE DOCUMENTS ({len(documents)}) ===\n"
-        for doc in documents:
-            ctx += f"- {doc['doc_type']}: {doc['filename']}\n"
+        ctx += f"\n=== RELEVANT SECTIONS ({len(sections)}) ===\n"
+        for i, section in enumerate(sections, 1):
+            ctx += f"[{i}] {section['filename']} › {section['heading']}\n"
         
         return ctx
     
@@ -410,12 +546,20 @@ RECOMMENDATIONS: [action items]
         return parsed
 
 
+# Global Nivara client instance
+_nivara_client: Optional[NivaraClient] = None
+
+
 def get_nivara_client() -> NivaraClient:
-    """Get configured Nivara client."""
+    """Get configured Nivara client (shared, so uploads stay visible across callers)."""
+    global _nivara_client
     api_key = os.getenv("NIVARA_API_KEY")
     
     if not api_key:
         raise ValueError("NIVARA_API_KEY not set in environment")
     
-    return NivaraClient(api_key)
+    if _nivara_client is None or _nivara_client.api_key != api_key:
+        _nivara_client = NivaraClient(api_key)
+    
+    return _nivara_client
 
@@ -0,0 +1,320 @@
+"""
+Append-only order store with incremental, checkpointed ingestion.
+
+Scrapers add rows here instead of overwriting data/orders_realtime.csv.
+Rows are deduplicated by order ID (the Uber Eats Order UUID where
+available) and a per-source checkpoint remembers the high-water mark
+(newest order seen) plus the page a run was on, so an interrupted
+scrape resumes where it stopped and later refreshes stop paging as soon
+as they reach orders already stored.
+
+normalize_orders / explode_order_items flatten scraped order payloads
+column-wise (json_normalize + explode), so large imports never loop over
+orders or items in Python.
+"""
+import os
+import json
+import tempfile
+from datetime import datetime
+from typing import Dict, Any, List, Optional, Callable, Set
+import pandas as pd
+
+
+ORDERS_FILE = "data/orders_realtime.csv"
+CHECKPOINT_FILE = "artifacts/order_ingest_state.json"
+
+ORDER_COLUMNS = [
+    "timestamp", "order_id", "item", "quantity", "price", "channel",
+    "customer_type", "payment_method", "prep_time_min", "delivery_time_min"
+]
+
+# Item-row fields scraped orders don't carry
+ITEM_DEFAULTS = {
+    "quantity": 1,
+    "customer_type": "regular",
+    "payment_method": "card",
+    "prep_time_min": 10,
+    "delivery_time_min": 25
+}
+
+
+def atomic_write(path: str, write: Callable[[str], None]):
+    """Write to a temp file in the same directory, then rename over path."""
+    directory = os.path.dirname(path) or "."
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    os.close(fd)
+    try:
+        write(tmp_path)
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+def normalize_orders(orders: List[Dict[str, Any]], channel: str = "ubereats") -> pd.DataFrame:
+    """
+    Scraped order dicts -> one row per order.
+
+    Args:
+        orders: Raw orders (uuid or id, time, items, total, status)
+        channel: Sales channel the orders came from
+
+    Returns:
+        DataFrame with timestamp, order_id, items, total, status, channel
+    """
+    columns = ["uuid", "id", "time", "items", "total", "status"]
+    # max_level=0 keeps each order's item list as a single list cell
+    raw = pd.json_normalize(orders, max_level=0).reindex(columns=columns) if orders else pd.DataFrame(columns=columns)
+
+    uuid = raw["uuid"].mask(raw["uuid"].eq(""))
+    return pd.DataFrame({
+        "timestamp": raw["time"].fillna(datetime.now().isoformat()),
+        "order_id": uuid.fillna(raw["id"]).fillna("").astype(str),
+        "items": raw["items"],
+        "total": pd.to_numeric(raw["total"], errors="coerce").fillna(0),
+        "status": raw["status"].fillna(""),
+        "channel": channel
+    })
+
+
+def explode_order_items(orders: pd.DataFrame, defaults: Optional[Dict[str, Any]] = None) -> pd.DataFrame:
+    """
+    One row per ordered item in the order store schema.
+
+    Items may be names or dicts with a "name"; an order's total is split
+    evenly across its items. Orders without items produce no rows.
+
+    Args:
+        orders: Output of normalize_orders
+        defaults: Constant columns (ITEM_DEFAULTS if omitted)
+
+    Returns:
+        Order-item rows (ORDER_COLUMNS)
+    """
+    defaults = ITEM_DEFAULTS if defaults is None else defaults
+    if orders.empty:
+        return pd.DataFrame(columns=ORDER_COLUMNS)
+
+    orders = orders.reset_index(drop=True)
+    items = orders["items"].explode()
+    items = items[items.notna()]
+    if items.empty:
+        return pd.DataFrame(columns=ORDER_COLUMNS)
+
+    names = items.astype(str)
+    is_dict = items.map(type).eq(dict)
+    if is_dict.any():
+        details = pd.json_normalize(items[is_dict].tolist())
+        dict_names = details["name"] if "name" in details else pd.Series(index=details.index, dtype=object)
+        names[is_dict] = dict_names.fillna("Unknown").astype(str).to_numpy()
+
+    order_rows = orders.loc[items.index]
+    items_per_order = items.index.value_counts().reindex(items.index).to_numpy()
+
+    rows = pd.DataFrame({
+        "timestamp": order_rows["timestamp"].to_numpy(),
+        "order_id": order_rows["order_id"].to_numpy(),
+        "item": names.to_numpy(),
+        "price": order_rows["total"].to_numpy() / items_per_order,
+        "channel": order_rows["channel"].to_numpy()
+    })
+    rows = rows.assign(**defaults)
+    return rows.reindex(columns=ORDER_COLUMNS + [c for c in rows.columns if c not in ORDER_COLUMNS])
+
+
+class OrderStore:
+    """Deduplicated order rows plus per-source ingestion checkpoints."""
+
+    def __init__(self, orders_file: str = ORDERS_FILE, checkpoint_file: str = CHECKPOINT_FILE):
+        self.orders_file = orders_file
+        self.checkpoint_file = checkpoint_file
+        self._known_ids: Optional[Set[str]] = None
+        self._known_version: Optional[tuple] = None
+
+    def _file_version(self) -> Optional[tuple]:
+        """(mtime, size) of the orders file, None if it doesn't exist."""
+        if not os.path.exists(self.orders_file):
+            return None
+        stat = os.stat(self.orders_file)
+        return stat.st_mtime_ns, stat.st_size
+
+    def known_order_ids(self) -> Set[str]:
+        """
+        Order IDs already stored.
+
+        Kept in sync on append, and reloaded when another process (worker,
+        importer, UI) has written to the file since.
+        """
+        version = self._file_version()
+        if self._known_ids is None or version != self._known_version:
+            if version is not None:
+                ids = pd.read_csv(self.orders_file, usecols=["order_id"], dtype=str)["order_id"]
+                self._known_ids = set(ids.dropna())
+            else:
+                self._known_ids = set()
+            self._known_version = version
+        return self._known_ids
+
+    def get_checkpoint(self, source: str) -> Dict[str, Any]:
+        """Checkpoint for a source (empty dict if never ingested)."""
+        if not os.path.exists(self.checkpoint_file):
+            return {}
+        with open(self.checkpoint_file, "r") as f:
+            return json.load(f).get(source, {})
+
+    def save_checkpoint(self, source: str, **fields):
+        """Merge fields into a source's checkpoint (atomic rewrite)."""
+        state = {}
+        if os.path.exists(self.checkpoint_file):
+            with open(self.checkpoint_file, "r") as f:
+                state = json.load(f)
+
+        checkpoint = state.get(source, {})
+        checkpoint.update(fields)
+        checkpoint["updated_at"] = datetime.now().isoformat()
+        state[source] = checkpoint
+
+        def write(path):
+            with open(path, "w") as f:
+                json.dump(state, f, indent=2)
+
+        atomic_write(self.checkpoint_file, write)
+
+    def append_orders(self, rows: pd.DataFrame, source: Optional[str] = None) -> int:
+        """
+        Append order rows whose order_id is not stored yet.
+
+        An order's item rows are all kept or all skipped, so replaying a
+        page (e.g. after a crash) never duplicates anything.
+
+        Args:
+            rows: Order-item rows with at least timestamp and order_id
+            source: If given, advance this source's high-water mark
+
+        Returns:
+            Number of rows written
+        """
+        if rows is None or rows.empty:
+            return 0
+
+        rows = rows.copy()
+        rows["order_id"] = rows["order_id"].astype(str)
+        known = self.known_order_ids()
+        new_rows = rows[~rows["order_id"].isin(known)]
+
+        if not new_rows.empty:
+            new_rows = new_rows.reindex(columns=self._columns(new_rows))
+            write_header = not os.path.exists(self.orders_file) or os.path.getsize(self.orders_file) == 0
+            os.makedirs(os.path.dirname(self.orders_file) or ".", exist_ok=True)
+            new_rows.to_csv(self.orders_file, mode="a", header=write_header, index=False)
+            known.update(new_rows["order_id"])
+            self._known_version = self._file_version()
+
+        if source is not None:
+            times = pd.to_datetime(rows["timestamp"], errors="coerce")
+            if times.notna().any():
+                newest = times.idxmax()
+                last = self.get_checkpoint(source).get("last_timestamp")
+                if last is None or times[newest] > pd.Timestamp(last):
+                    self.save_checkpoint(
+                        source,
+                        last_timestamp=times[newest].isoformat(),
+                        last_order_id=rows.at[newest, "order_id"]
+                    )
+
+        return len(new_rows)
+
+    def _columns(self, rows: pd.DataFrame) -> List[str]:
+        """Column order of the existing file (or the standard schema)."""
+        if os.path.exists(self.orders_file) and os.path.getsize(self.orders_file) > 0:
+            return list(pd.read_csv(self.orders_file, nrows=0).columns)
+        extra = [c for c in rows.columns if c not in ORDER_COLUMNS]
+        return ORDER_COLUMNS + extra
+
+    def ingest_pages(
+        self,
+        source: str,
+        fetch_page: Callable[[int, Dict[str, Any]], pd.DataFrame],
+        max_pages: int = 50
+    ) -> Dict[str, Any]:
+        """
+        Page through a newest-first order listing until known orders appear.
+
+        Each page is appended and checkpointed before the next is fetched,
+        so a crash resumes from the page after the last one stored.
+
+        Args:
+            source: Checkpoint key (e.g. "ubereats:<restaurant_id>")
+            fetch_page: (page_number, checkpoint) -> order-item rows for that page
+            max_pages: Safety cap on pages per run
+
+        Returns:
+            Dict with pages fetched, rows written, whether a known order was
+            reached and whether the run caught up (False: resumes next run)
+        """
+        checkpoint = self.get_checkpoint(source)
+        resuming = bool(checkpoint.get("resume_page"))
+        page = checkpoint["resume_page"] if resuming else 1
+
+        # Stop at the newest order stored before this run began (pages
+        # appended earlier in the same run must not end it)
+        if not resuming:
+            self.save_checkpoint(source, run_high_water=checkpoint.get("last_timestamp"))
+            checkpoint = self.get_checkpoint(source)
+        baseline = checkpoint.get("run_high_water")
+        high_water = pd.Timestamp(baseline) if baseline else None
+
+        written = 0
+        pages = 0
+        reached_known = False
+        exhausted = False
+
+        while pages < max_pages:
+            rows = fetch_page(page, checkpoint)
+            pages += 1
+            if rows is None or rows.empty:
+                exhausted = True
+                break
+
+            oldest = pd.to_datetime(rows["timestamp"], errors="coerce").min()
+            reached_known = high_water is not None and pd.notna(oldest) and oldest <= high_water
+            if not resuming:
+                # Pages can shift while resuming, so only trust overlap on a fresh run
+                reached_known = reached_known or bool(
+                    rows["order_id"].astype(str).isin(self.known_order_ids()).any()
+                )
+
+            written += self.append_orders(rows, source=source)
+            self.save_checkpoint(source, resume_page=page + 1)
+
+            if reached_known:
+                break
+            page += 1
+
+        if reached_known or exhausted:
+            # Caught up: the next run starts from the newest page again
+            self.save_checkpoint(source, resume_page=None, run_high_water=None)
+        else:
+            # Stopped at max_pages with a gap left: keep resume_page and the
+            # run's high-water mark so the next run finishes the gap first
+            print(f"[WARN] {source}: stopped after {pages} pages before reaching known orders, will resume at page {page}")
+
+        return {
+            "pages": pages,
+            "rows_written": written,
+            "reached_known": reached_known,
+            "complete": reached_known or exhausted
+        }
+
+
+# Global order store instance
+_order_store: Optional[OrderStore] = None
+
+
+def get_order_store() -> OrderStore:
+    """Get or create global order store."""
+    global _order_store
+    if _order_store is None:
+        _order_store = OrderStore()
+    return _order_store
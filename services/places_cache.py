@@ -0,0 +1,522 @@
+"""
+Persistent geo-tile cache for Google Places nearby-search results.
+
+Places are fetched once per geohash tile (plus type and keyword) and stored in
+SQLite. Radius queries are answered from the union of the tiles that overlap
+the search circle, so overlapping queries reuse tiles that are already cached.
+Each tile follows nearby search's result pages; a tile that fills all of
+them (the API stops at 60 results) is flagged as saturated, since its true
+count may be higher.
+"""
+import os
+import json
+import math
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, Any, List, Optional, Tuple
+import requests
+
+
+PLACES_NEARBY_URL = "https://maps.googleapis.com/maps/api/place/nearbysearch/json"
+
+# Nearby search returns at most 3 pages of 20 results
+MAX_PAGES = 3
+MAX_RESULTS = 60
+# A next_page_token only becomes valid a short while after it is issued
+PAGE_TOKEN_DELAY_S = 2.0
+PAGE_TOKEN_RETRIES = 3
+# Concurrent tile fetches when filling a bounding box
+FETCH_WORKERS = 8
+
+_GEOHASH_BASE32 = "0123456789bcdefghjkmnpqrstuvwxyz"
+_EARTH_RADIUS_M = 6371008.8
+_METERS_PER_DEG_LAT = 111320.0
+
+
+def geohash_encode(lat: float, lng: float, precision: int = 6) -> str:
+    """
+    Encode a coordinate as a geohash string.
+
+    Args:
+        lat: Latitude
+        lng: Longitude
+        precision: Number of geohash characters
+
+    Returns:
+        Geohash string
+    """
+    lat_range = [-90.0, 90.0]
+    lng_range = [-180.0, 180.0]
+    chars = []
+    bits = 0
+    bit_count = 0
+    even = True
+
+    while len(chars) < precision:
+        if even:
+            mid = (lng_range[0] + lng_range[1]) / 2
+            if lng >= mid:
+                bits = (bits << 1) | 1
+                lng_range[0] = mid
+            else:
+                bits = bits << 1
+                lng_range[1] = mid
+        else:
+            mid = (lat_range[0] + lat_range[1]) / 2
+            if lat >= mid:
+                bits = (bits << 1) | 1
+                lat_range[0] = mid
+            else:
+                bits = bits << 1
+                lat_range[1] = mid
+
+        even = not even
+        bit_count += 1
+        if bit_count == 5:
+            chars.append(_GEOHASH_BASE32[bits])
+            bits = 0
+            bit_count = 0
+
+    return "".join(chars)
+
+
+def geohash_bbox(geohash: str) -> Tuple[float, float, float, float]:
+    """
+    Decode a geohash into its bounding box.
+
+    Returns:
+        Tuple of (min_lat, min_lng, max_lat, max_lng)
+    """
+    lat_range = [-90.0, 90.0]
+    lng_range = [-180.0, 180.0]
+    even = True
+
+    for char in geohash:
+        value = _GEOHASH_BASE32.index(char)
+        for shift in range(4, -1, -1):
+            bit = (value >> shift) & 1
+            target = lng_range if even else lat_range
+            mid = (target[0] + target[1]) / 2
+            if bit:
+                target[0] = mid
+            else:
+                target[1] = mid
+            even = not even
+
+    return lat_range[0], lng_range[0], lat_range[1], lng_range[1]
+
+
+def geohash_cell_size(precision: int) -> Tuple[float, float]:
+    """Get (lat_height, lng_width) in degrees of a geohash cell."""
+    total_bits = 5 * precision
+    lng_bits = (total_bits + 1) // 2
+    lat_bits = total_bits // 2
+    return 180.0 / (2 ** lat_bits), 360.0 / (2 ** lng_bits)
+
+
+def haversine_m(lat1: float, lng1: float, lat2: float, lng2: float) -> float:
+    """Great-circle distance between two points in meters."""
+    phi1 = math.radians(lat1)
+    phi2 = math.radians(lat2)
+    d_phi = phi2 - phi1
+    d_lambda = math.radians(lng2 - lng1)
+    a = math.sin(d_phi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(d_lambda / 2) ** 2
+    return 2 * _EARTH_RADIUS_M * math.asin(min(1.0, math.sqrt(a)))
+
+
+def tiles_for_bbox(
+    min_lat: float,
+    min_lng: float,
+    max_lat: float,
+    max_lng: float,
+    precision: int = 6
+) -> List[str]:
+    """Get all geohash tiles at a precision that intersect a bounding box."""
+    lat_step, lng_step = geohash_cell_size(precision)
+
+    # Snap to cell centers so every row/column is visited exactly once
+    lat = (math.floor((min_lat + 90.0) / lat_step) + 0.5) * lat_step - 90.0
+    tiles = []
+    while lat - lat_step / 2 <= max_lat:
+        lng = (math.floor((min_lng + 180.0) / lng_step) + 0.5) * lng_step - 180.0
+        while lng - lng_step / 2 <= max_lng:
+            tiles.append(geohash_encode(lat, lng, precision))
+            lng += lng_step
+        lat += lat_step
+
+    return tiles
+
+
+def tiles_for_radius(lat: float, lng: float, radius_m: float, precision: int = 6) -> List[str]:
+    """Get all geohash tiles that overlap a search circle."""
+    d_lat = radius_m / _METERS_PER_DEG_LAT
+    d_lng = radius_m / (_METERS_PER_DEG_LAT * max(math.cos(math.radians(lat)), 1e-6))
+
+    candidates = tiles_for_bbox(lat - d_lat, lng - d_lng, lat + d_lat, lng + d_lng, precision)
+
+    tiles = []
+    for tile in candidates:
+        min_lat, min_lng, max_lat, max_lng = geohash_bbox(tile)
+        # Closest point of the tile to the circle center
+        near_lat = min(max(lat, min_lat), max_lat)
+        near_lng = min(max(lng, min_lng), max_lng)
+        if haversine_m(lat, lng, near_lat, near_lng) <= radius_m:
+            tiles.append(tile)
+
+    return tiles
+
+
+class PlacesTileCache:
+    """On-disk spatial cache of Places nearby-search results keyed by geohash tile."""
+
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        db_path: str = "artifacts/places_cache.sqlite",
+        precision: int = 6,
+        ttl_hours: float = 24 * 7
+    ):
+        self.api_key = api_key
+        self.db_path = db_path
+        self.precision = precision
+        self.ttl_seconds = ttl_hours * 3600
+        self.session = requests.Session()
+        self.stats = {"hits": 0, "misses": 0, "api_calls": 0}
+        self._stats_lock = threading.Lock()
+
+        # Hot tiles for this process: (tile, type, keyword) -> (fetched_at, places)
+        self._memory: Dict[Tuple[str, str, str], Tuple[float, List[Dict[str, Any]]]] = {}
+
+        os.makedirs(os.path.dirname(db_path) or ".", exist_ok=True)
+        self.conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._init_schema()
+
+    def _init_schema(self):
+        """Create cache tables if needed."""
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS tiles (
+                tile TEXT NOT NULL,
+                place_type TEXT NOT NULL,
+                keyword TEXT NOT NULL,
+                radius_m INTEGER NOT NULL,
+                fetched_at REAL NOT NULL,
+                saturated INTEGER NOT NULL DEFAULT 0,
+                PRIMARY KEY (tile, place_type, keyword)
+            );
+            CREATE TABLE IF NOT EXISTS places (
+                tile TEXT NOT NULL,
+                place_type TEXT NOT NULL,
+                keyword TEXT NOT NULL,
+                place_id TEXT NOT NULL,
+                lat REAL NOT NULL,
+                lng REAL NOT NULL,
+                payload TEXT NOT NULL,
+                PRIMARY KEY (tile, place_type, keyword, place_id)
+            );
+        """)
+        # Caches created before saturation was tracked
+        columns = {row[1] for row in self.conn.execute("PRAGMA table_info(tiles)")}
+        if "saturated" not in columns:
+            self.conn.execute("ALTER TABLE tiles ADD COLUMN saturated INTEGER NOT NULL DEFAULT 0")
+        self.conn.commit()
+
+    def tile_radius_m(self, tile: str) -> int:
+        """Search radius that fully covers a tile (half its diagonal)."""
+        min_lat, min_lng, max_lat, max_lng = geohash_bbox(tile)
+        return int(math.ceil(haversine_m(min_lat, min_lng, max_lat, max_lng) / 2)) + 1
+
+    def nearby(
+        self,
+        lat: float,
+        lng: float,
+        radius_m: float,
+        place_type: str,
+        keyword: str = ""
+    ) -> List[Dict[str, Any]]:
+        """
+        Get places within a radius, served from cached tiles where possible.
+
+        Args:
+            lat: Search center latitude
+            lng: Search center longitude
+            radius_m: Search radius in meters
+            place_type: Places type (e.g. "restaurant")
+            keyword: Places keyword filter
+
+        Returns:
+            List of Places results (deduplicated by place_id)
+        """
+        seen = set()
+        results = []
+
+        for tile in tiles_for_radius(lat, lng, radius_m, self.precision):
+            for place in self.get_tile(tile, place_type, keyword):
+                place_id = place.get("place_id")
+                if place_id in seen:
+                    continue
+                location = place.get("geometry", {}).get("location", {})
+                if "lat" not in location or "lng" not in location:
+                    continue
+                if haversine_m(lat, lng, location["lat"], location["lng"]) <= radius_m:
+                    seen.add(place_id)
+                    results.append(place)
+
+        return results
+
+    def points_in_bbox(
+        self,
+        min_lat: float,
+        min_lng: float,
+        max_lat: float,
+        max_lng: float,
+        place_type: str,
+        keyword: str = ""
+    ) -> List[Tuple[float, float]]:
+        """
+        Get (lat, lng) of every cached place inside a bounding box.
+
+        Missing or stale tiles are fetched first (concurrently), so the
+        result covers the box.
+        """
+        seen = set()
+        points = []
+
+        tiles = tiles_for_bbox(min_lat, min_lng, max_lat, max_lng, self.precision)
+        self.prefetch(tiles, place_type, keyword)
+
+        for tile in tiles:
+            for place in self.get_tile(tile, place_type, keyword):
+                place_id = place.get("place_id")
+                location = place.get("geometry", {}).get("location", {})
+                if place_id in seen or "lat" not in location or "lng" not in location:
+                    continue
+                if min_lat <= location["lat"] <= max_lat and min_lng <= location["lng"] <= max_lng:
+                    seen.add(place_id)
+                    points.append((location["lat"], location["lng"]))
+
+        return points
+
+    def prefetch(self, tiles: List[str], place_type: str, keyword: str = "", workers: int = FETCH_WORKERS) -> int:
+        """
+        Fetch missing or stale tiles concurrently (HTTP in worker threads,
+        SQLite writes on this thread).
+
+        Returns:
+            Number of tiles fetched
+        """
+        missing = [
+            tile for tile in dict.fromkeys(tiles)
+            if not self._is_fresh(tile, place_type, keyword)
+        ]
+        if not missing or not self.api_key:
+            return 0
+
+        fetched = 0
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="places") as pool:
+            futures = {pool.submit(self._fetch_tile, tile, place_type, keyword): tile for tile in missing}
+            for future in as_completed(futures):
+                tile = futures[future]
+                self.stats["misses"] += 1
+                outcome = future.result()
+                if outcome is None:
+                    continue
+                places, saturated = outcome
+                self._store_tile(tile, place_type, keyword, places, saturated)
+                self._memory[(tile, place_type, keyword)] = (time.time(), places)
+                fetched += 1
+        return fetched
+
+    def saturated_tiles(self, tiles: List[str], place_type: str, keyword: str = "") -> List[str]:
+        """Tiles among these whose fetch hit the API's result cap."""
+        wanted = list(dict.fromkeys(tiles))
+        found = []
+        # Stay under SQLite's bound-parameter limit
+        for i in range(0, len(wanted), 500):
+            batch = wanted[i:i + 500]
+            rows = self.conn.execute(
+                f"SELECT tile FROM tiles WHERE place_type = ? AND keyword = ? AND saturated = 1 "
+                f"AND tile IN ({','.join('?' * len(batch))})",
+                [place_type, keyword] + batch
+            ).fetchall()
+            found.extend(row[0] for row in rows)
+        return found
+
+    def _is_fresh(self, tile: str, place_type: str, keyword: str) -> bool:
+        cached = self._memory.get((tile, place_type, keyword))
+        if cached is not None and time.time() - cached[0] <= self.ttl_seconds:
+            return True
+        row = self.conn.execute(
+            "SELECT fetched_at FROM tiles WHERE tile = ? AND place_type = ? AND keyword = ?",
+            (tile, place_type, keyword)
+        ).fetchone()
+        return row is not None and time.time() - row[0] <= self.ttl_seconds
+
+    def get_tile(self, tile: str, place_type: str, keyword: str = "") -> List[Dict[str, Any]]:
+        """Get all places for a tile, fetching from the Places API on a miss."""
+        key = (tile, place_type, keyword)
+
+        cached = self._memory.get(key)
+        if cached is not None and time.time() - cached[0] <= self.ttl_seconds:
+            self.stats["hits"] += 1
+            return cached[1]
+
+        cached = self._load_tile(tile, place_type, keyword)
+        if cached is not None:
+            self.stats["hits"] += 1
+            self._memory[key] = cached
+            return cached[1]
+
+        self.stats["misses"] += 1
+        outcome = self._fetch_tile(tile, place_type, keyword)
+        if outcome is None:
+            # API failure - don't cache, just return nothing for this tile
+            return []
+
+        places, saturated = outcome
+        self._store_tile(tile, place_type, keyword, places, saturated)
+        self._memory[key] = (time.time(), places)
+        return places
+
+    def _load_tile(
+        self,
+        tile: str,
+        place_type: str,
+        keyword: str
+    ) -> Optional[Tuple[float, List[Dict[str, Any]]]]:
+        """Load a fresh tile from SQLite as (fetched_at, places), or None if missing/expired."""
+        row = self.conn.execute(
+            "SELECT fetched_at FROM tiles WHERE tile = ? AND place_type = ? AND keyword = ?",
+            (tile, place_type, keyword)
+        ).fetchone()
+
+        if row is None or time.time() - row[0] > self.ttl_seconds:
+            return None
+
+        rows = self.conn.execute(
+            "SELECT payload FROM places WHERE tile = ? AND place_type = ? AND keyword = ?",
+            (tile, place_type, keyword)
+        ).fetchall()
+        return row[0], [json.loads(payload) for (payload,) in rows]
+
+    def _fetch_tile(self, tile: str, place_type: str, keyword: str) -> Optional[Tuple[List[Dict[str, Any]], bool]]:
+        """
+        Query Places nearby search for the circle covering a tile, following
+        result pages.
+
+        Returns:
+            (places, saturated) - saturated when the API's result cap was
+            reached - or None on an API failure
+        """
+        min_lat, min_lng, max_lat, max_lng = geohash_bbox(tile)
+        params = {
+            "location": f"{(min_lat + max_lat) / 2},{(min_lng + max_lng) / 2}",
+            "radius": self.tile_radius_m(tile),
+            "type": place_type,
+            "key": self.api_key
+        }
+        if keyword:
+            params["keyword"] = keyword
+
+        places = []
+        for _ in range(MAX_PAGES):
+            data = self._request(tile, params)
+            if data is None:
+                return None
+            places.extend(data.get("results", []))
+
+            token = data.get("next_page_token")
+            if not token:
+                return places, len(places) >= MAX_RESULTS
+            params = {"pagetoken": token, "key": self.api_key}
+
+        # Every page was full and the API still had more
+        return places, True
+
+    def _request(self, tile: str, params: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """One nearby-search page (waits for page tokens to become valid)."""
+        attempts = PAGE_TOKEN_RETRIES if "pagetoken" in params else 1
+        for attempt in range(attempts):
+            if "pagetoken" in params:
+                time.sleep(PAGE_TOKEN_DELAY_S)
+            try:
+                with self._stats_lock:
+                    self.stats["api_calls"] += 1
+                response = self.session.get(PLACES_NEARBY_URL, params=params, timeout=10)
+                response.raise_for_status()
+                data = response.json()
+            except Exception as e:
+                print(f"Error fetching places for tile {tile}: {e}")
+                return None
+
+            status = data.get("status")
+            if status in ("OK", "ZERO_RESULTS"):
+                return data
+            if status != "INVALID_REQUEST" or attempt == attempts - 1:
+                print(f"Places API error for tile {tile}: {status}")
+                return None
+        return None
+
+    def _store_tile(
+        self,
+        tile: str,
+        place_type: str,
+        keyword: str,
+        places: List[Dict[str, Any]],
+        saturated: bool = False
+    ):
+        """Replace a tile's cached places."""
+        rows = []
+        for place in places:
+            location = place.get("geometry", {}).get("location", {})
+            if "lat" not in location or "lng" not in location or not place.get("place_id"):
+                continue
+            rows.append((
+                tile, place_type, keyword, place["place_id"],
+                location["lat"], location["lng"], json.dumps(place)
+            ))
+
+        with self.conn:
+            self.conn.execute(
+                "DELETE FROM places WHERE tile = ? AND place_type = ? AND keyword = ?",
+                (tile, place_type, keyword)
+            )
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO places VALUES (?, ?, ?, ?, ?, ?, ?)",
+                rows
+            )
+            self.conn.execute(
+                "INSERT OR REPLACE INTO tiles (tile, place_type, keyword, radius_m, fetched_at, saturated) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (tile, place_type, keyword, self.tile_radius_m(tile), time.time(), int(saturated))
+            )
+
+    def clear_expired(self) -> int:
+        """Delete expired tiles. Returns number of tiles removed."""
+        cutoff = time.time() - self.ttl_seconds
+        with self.conn:
+            expired = self.conn.execute(
+                "SELECT tile, place_type, keyword FROM tiles WHERE fetched_at < ?",
+                (cutoff,)
+            ).fetchall()
+            for tile, place_type, keyword in expired:
+                self.conn.execute(
+                    "DELETE FROM places WHERE tile = ? AND place_type = ? AND keyword = ?",
+                    (tile, place_type, keyword)
+                )
+                self._memory.pop((tile, place_type, keyword), None)
+            self.conn.execute("DELETE FROM tiles WHERE fetched_at < ?", (cutoff,))
+        return len(expired)
+
+
+# Global places cache instance
+_places_cache: Optional[PlacesTileCache] = None
+
+
+def get_places_cache() -> PlacesTileCache:
+    """Get or create global Places tile cache."""
+    global _places_cache
+    if _places_cache is None:
+        _places_cache = PlacesTileCache(api_key=os.getenv("GOOGLE_PLACES_API_KEY"))
+    return _places_cache
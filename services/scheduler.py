@@ -0,0 +1,546 @@
+"""
+Scheduled agent runs with versioned results.
+
+Each schedule entry names a runner from the agents registry and a
+cron-style spec ("0 5 * * *" = 5am daily). On every tick the scheduler
+starts entries whose latest scheduled time hasn't run yet; after downtime
+it runs a missed entry once (for its most recent slot) rather than
+replaying every slot. Before running, it fingerprints the entry's inputs
+(arguments, input file contents, upstream result versions) and skips the
+run if nothing changed since the last success. Successful results are
+stored as numbered versions in artifacts/schedule.sqlite, with their
+artifact files copied to artifacts/versions/<entry>/<version>/, so pages
+read precomputed results instead of running agents. A per-entry lease
+in the same database keeps a slow run from overlapping the next one,
+even across processes.
+"""
+import os
+import json
+import time
+import shutil
+import socket
+import sqlite3
+import asyncio
+import hashlib
+import inspect
+import threading
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from typing import Dict, Any, List, Optional, Iterator, Set, Tuple
+from agents import get_agent
+from services.job_queue import json_default
+from services.text_extraction import file_digest
+
+
+DEFAULT_RESTAURANT_NAME = "Charcoal Eats US"
+DEFAULT_RESTAURANT_ADDRESS = "Entrance, 370 Lexington Avenue, E 41st St Store 104, New York, NY 10017"
+
+# Missed slots older than this aren't caught up on start
+CATCHUP_WINDOW = timedelta(days=1)
+# A run holding its lease longer than this is assumed dead
+LEASE_SECONDS = 2 * 3600
+# Failed runs are retried after this long (until the next slot)
+RETRY_SECONDS = 15 * 60
+# Versions (and artifact copies) kept per entry
+KEEP_VERSIONS = 48
+
+VERSIONS_DIR = "artifacts/versions"
+
+
+class CronSpec:
+    """Five-field cron expression (minute hour day-of-month month day-of-week)."""
+
+    RANGES = [(0, 59), (0, 23), (1, 31), (1, 12), (0, 6)]
+
+    def __init__(self, expr: str):
+        fields = expr.split()
+        if len(fields) != 5:
+            raise ValueError(f"Cron spec needs 5 fields: {expr!r}")
+        self.expr = expr
+        self.minutes, self.hours, self.days, self.months, self.weekdays = [
+            self._parse(field, low, high, is_weekday=(i == 4))
+            for i, (field, (low, high)) in enumerate(zip(fields, self.RANGES))
+        ]
+        self.any_day = fields[2] == "*"
+        self.any_weekday = fields[4] == "*"
+
+    @staticmethod
+    def _parse(field: str, low: int, high: int, is_weekday: bool = False) -> Set[int]:
+        values = set()
+        for part in field.split(","):
+            part, _, step = part.partition("/")
+            if part == "*":
+                start, end = low, high
+            elif "-" in part:
+                start, end = (int(v) for v in part.split("-"))
+            else:
+                start = int(part)
+                end = high if step else start
+            for value in range(start, end + 1, int(step or 1)):
+                # Cron allows 7 for Sunday
+                values.add(0 if is_weekday and value == 7 else value)
+        if not values or min(values) < low or max(values) > high:
+            raise ValueError(f"Cron field out of range: {field!r}")
+        return values
+
+    def _day_matches(self, day: datetime) -> bool:
+        if day.month not in self.months:
+            return False
+        in_days = day.day in self.days
+        # Python weekday: Monday=0; cron: Sunday=0
+        in_weekdays = (day.weekday() + 1) % 7 in self.weekdays
+        # Cron semantics: if both are restricted, either may match
+        if not self.any_day and not self.any_weekday:
+            return in_days or in_weekdays
+        return in_days and in_weekdays
+
+    def fire_times(self, after: datetime, until: datetime) -> Iterator[datetime]:
+        """Scheduled times t with after < t <= until, ascending."""
+        day = after.replace(hour=0, minute=0, second=0, microsecond=0)
+        while day <= until:
+            if self._day_matches(day):
+                for hour in sorted(self.hours):
+                    for minute in sorted(self.minutes):
+                        t = day.replace(hour=hour, minute=minute)
+                        if after < t <= until:
+                            yield t
+            day += timedelta(days=1)
+
+    def next_after(self, now: datetime) -> Optional[datetime]:
+        """First scheduled time after now (within a year)."""
+        return next(self.fire_times(now, now + timedelta(days=366)), None)
+
+
+def _restaurant_name() -> str:
+    return os.getenv("RESTAURANT_NAME", DEFAULT_RESTAURANT_NAME)
+
+
+def _weather_kwargs(store: "ScheduleStore") -> Dict[str, Any]:
+    return {
+        "restaurant_name": _restaurant_name(),
+        "restaurant_address": os.getenv("RESTAURANT_ADDRESS", DEFAULT_RESTAURANT_ADDRESS)
+    }
+
+
+def _prep_kwargs(store: "ScheduleStore") -> Optional[Dict[str, Any]]:
+    forecast = store.latest("forecast")
+    weather = store.latest("weather")
+    if not forecast or not weather:
+        return None
+    return {
+        "restaurant_name": _restaurant_name(),
+        "peak_orders": forecast["result"]["peak_orders"],
+        "weather_summary": weather["result"].get("summary", {}),
+        "hourly_forecast": forecast["result"].get("predictions")
+    }
+
+
+# name -> runner, cron spec, kwargs builder, input files, upstream entries.
+# "external": inputs live outside the repo (APIs), so every slot counts as new input.
+# "daily": the result is for a date relative to the run (tomorrow), so a new day is new input.
+DEFAULT_SCHEDULE: Dict[str, Dict[str, Any]] = {
+    "weather": {
+        "runner": "run_weather_agent",
+        "cron": "0 * * * *",
+        "kwargs": _weather_kwargs,
+        "external": True
+    },
+    "forecast": {
+        "runner": "run_forecast_agent_lstm",
+        "cron": "0 5 * * *",
+        "inputs": ["data/orders.csv", "artifacts/weather_features.csv"],
+        "daily": True,
+        # The 05:00 weather run rewrites weather_features.csv; read it after
+        "after": ["weather"]
+    },
+    "prep": {
+        "runner": "run_prep_agent",
+        "cron": "0 22 * * *",
+        "kwargs": _prep_kwargs,
+        "after": ["forecast", "weather"]
+    }
+}
+
+
+class ScheduleStore:
+    """Per-entry run state, leases and result versions."""
+
+    def __init__(self, db_path: str = "artifacts/schedule.sqlite"):
+        self.db_path = db_path
+        os.makedirs(os.path.dirname(db_path) or ".", exist_ok=True)
+        self.conn = sqlite3.connect(db_path, check_same_thread=False, timeout=30)
+        self.conn.row_factory = sqlite3.Row
+        self.lock = threading.Lock()
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS entries (
+                name TEXT PRIMARY KEY,
+                last_slot TEXT,
+                last_status TEXT,
+                last_error TEXT,
+                last_fingerprint TEXT,
+                last_finished TEXT,
+                retry_at TEXT,
+                owner TEXT,
+                lease_until TEXT
+            );
+            CREATE TABLE IF NOT EXISTS versions (
+                name TEXT NOT NULL,
+                version INTEGER NOT NULL,
+                slot TEXT,
+                fingerprint TEXT NOT NULL,
+                output_hash TEXT NOT NULL,
+                created_at TEXT NOT NULL,
+                duration_s REAL,
+                result TEXT NOT NULL,
+                artifacts TEXT NOT NULL,
+                PRIMARY KEY (name, version)
+            ) WITHOUT ROWID;
+        """)
+        self.conn.commit()
+
+    def state(self, name: str) -> Dict[str, Any]:
+        with self.lock:
+            row = self.conn.execute("SELECT * FROM entries WHERE name = ?", (name,)).fetchone()
+        return dict(row) if row else {"name": name}
+
+    def acquire(self, name: str, owner: str) -> bool:
+        """Take the entry's lease; False if another run holds it."""
+        now = datetime.now()
+        with self.lock, self.conn:
+            self.conn.execute("INSERT OR IGNORE INTO entries (name) VALUES (?)", (name,))
+            taken = self.conn.execute(
+                "UPDATE entries SET owner = ?, lease_until = ? "
+                "WHERE name = ? AND (owner IS NULL OR lease_until < ?)",
+                (owner, (now + timedelta(seconds=LEASE_SECONDS)).isoformat(), name, now.isoformat())
+            ).rowcount
+        return taken == 1
+
+    def leased(self, name: str) -> bool:
+        """True while some process holds the entry's lease."""
+        state = self.state(name)
+        return bool(state.get("owner")) and state.get("lease_until", "") > datetime.now().isoformat()
+
+    def release(
+        self,
+        name: str,
+        owner: str,
+        status: str,
+        slot: Optional[datetime] = None,
+        fingerprint: Optional[str] = None,
+        error: Optional[str] = None,
+        retry_at: Optional[datetime] = None
+    ):
+        """
+        Release the lease and record the run outcome.
+
+        Args:
+            name: Schedule entry
+            owner: Lease holder
+            status: ran, unchanged, waiting, failed
+            slot: Scheduled time now covered (None leaves it due)
+            fingerprint: Input fingerprint of a successful/unchanged run
+            error: Failure message
+            retry_at: Earliest retry for a failed run
+        """
+        with self.lock, self.conn:
+            self.conn.execute(
+                """
+                UPDATE entries SET
+                    last_slot = COALESCE(?, last_slot),
+                    last_fingerprint = COALESCE(?, last_fingerprint),
+                    last_status = ?, last_error = ?, last_finished = ?, retry_at = ?,
+                    owner = NULL, lease_until = NULL
+                WHERE name = ? AND owner = ?
+                """,
+                (
+                    slot.isoformat() if slot else None, fingerprint, status, error,
+                    datetime.now().isoformat(), retry_at.isoformat() if retry_at else None,
+                    name, owner
+                )
+            )
+
+    def add_version(
+        self,
+        name: str,
+        slot: Optional[datetime],
+        fingerprint: str,
+        output_hash: str,
+        duration_s: float,
+        result: Dict[str, Any],
+        artifacts: List[str]
+    ) -> int:
+        with self.lock, self.conn:
+            row = self.conn.execute("SELECT MAX(version) FROM versions WHERE name = ?", (name,)).fetchone()
+            version = (row[0] or 0) + 1
+            self.conn.execute(
+                "INSERT INTO versions VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    name, version, slot.isoformat() if slot else None, fingerprint, output_hash,
+                    datetime.now().isoformat(), duration_s,
+                    json.dumps(result, default=json_default), json.dumps(artifacts)
+                )
+            )
+        return version
+
+    def set_artifacts(self, name: str, version: int, artifacts: List[str]):
+        """Record a version's copied artifact files."""
+        with self.lock, self.conn:
+            self.conn.execute(
+                "UPDATE versions SET artifacts = ? WHERE name = ? AND version = ?",
+                (json.dumps(artifacts), name, version)
+            )
+
+    def latest(self, name: str) -> Optional[Dict[str, Any]]:
+        """Newest result version of an entry, or None if it never ran."""
+        versions = self.history(name, limit=1)
+        return versions[0] if versions else None
+
+    def history(self, name: str, limit: int = 10) -> List[Dict[str, Any]]:
+        with self.lock:
+            rows = self.conn.execute(
+                "SELECT * FROM versions WHERE name = ? ORDER BY version DESC LIMIT ?", (name, limit)
+            ).fetchall()
+        return [
+            {**dict(row), "result": json.loads(row["result"]), "artifacts": json.loads(row["artifacts"])}
+            for row in rows
+        ]
+
+    def prune(self, name: str, keep: int = KEEP_VERSIONS) -> List[int]:
+        """Drop versions beyond the newest `keep`; returns dropped version numbers."""
+        with self.lock, self.conn:
+            rows = self.conn.execute(
+                "SELECT version FROM versions WHERE name = ? ORDER BY version DESC LIMIT -1 OFFSET ?",
+                (name, keep)
+            ).fetchall()
+            dropped = [row[0] for row in rows]
+            self.conn.executemany(
+                "DELETE FROM versions WHERE name = ? AND version = ?", [(name, v) for v in dropped]
+            )
+        return dropped
+
+
+class Scheduler:
+    """Runs schedule entries when due, at most once per entry at a time."""
+
+    def __init__(
+        self,
+        schedule: Optional[Dict[str, Dict[str, Any]]] = None,
+        store: Optional[ScheduleStore] = None,
+        max_concurrent: int = 2,
+        versions_dir: str = VERSIONS_DIR
+    ):
+        self.schedule = schedule or DEFAULT_SCHEDULE
+        self.store = store or get_schedule_store()
+        self.versions_dir = versions_dir
+        self.crons = {name: CronSpec(entry["cron"]) for name, entry in self.schedule.items()}
+        self.owner = f"{socket.gethostname()}-{os.getpid()}"
+        self.executor = ThreadPoolExecutor(max_workers=max_concurrent, thread_name_prefix="schedule")
+        self.running: Set[str] = set()
+        self.running_lock = threading.Lock()
+
+    def due(self, now: Optional[datetime] = None) -> List[Tuple[str, datetime, int]]:
+        """
+        Entries with an unrun scheduled time.
+
+        Returns:
+            (name, most recent missed slot, number of missed slots) per due
+            entry (missed is 1 for an entry that has never run)
+        """
+        now = now or datetime.now()
+        due = []
+        for name in self.schedule:
+            state = self.store.state(name)
+            if state.get("retry_at") and datetime.fromisoformat(state["retry_at"]) > now:
+                continue
+            after = now - CATCHUP_WINDOW
+            if state.get("last_slot"):
+                after = max(after, datetime.fromisoformat(state["last_slot"]))
+            slots = list(self.crons[name].fire_times(after, now))
+            if slots:
+                due.append((name, slots[-1], len(slots) if state.get("last_slot") else 1))
+        return due
+
+    def tick(self, now: Optional[datetime] = None) -> List[str]:
+        """Start every due entry that isn't already running; returns started names."""
+        started = []
+        due = self.due(now)
+        pending = {name for name, _, _ in due}
+        for name, slot, missed in due:
+            # Let upstream entries finish first (here or in another process);
+            # this one stays due until then
+            upstream = set(self.schedule[name].get("after", []))
+            with self.running_lock:
+                if upstream & (pending | self.running) or any(self.store.leased(u) for u in upstream):
+                    continue
+                if name in self.running or not self.store.acquire(name, self.owner):
+                    continue
+                self.running.add(name)
+            if missed > 1:
+                print(f"[*] {name}: catching up {missed} missed runs with the {slot:%Y-%m-%d %H:%M} slot")
+            self.executor.submit(self._run_leased, name, slot)
+            started.append(name)
+        return started
+
+    def run_now(self, name: str, force: bool = False) -> Dict[str, Any]:
+        """
+        Run an entry immediately (blocking), outside its schedule.
+
+        Args:
+            name: Schedule entry
+            force: Run even if inputs are unchanged
+
+        Returns:
+            Outcome dict (status, version, error)
+        """
+        if name not in self.schedule:
+            raise KeyError(f"Unknown schedule entry: {name}")
+        with self.running_lock:
+            if name in self.running or not self.store.acquire(name, self.owner):
+                return {"status": "running", "error": f"{name} is already running"}
+            self.running.add(name)
+        return self._run_leased(name, None, force=force)
+
+    def wait(self):
+        """Block until started runs finish."""
+        while True:
+            with self.running_lock:
+                if not self.running:
+                    return
+            time.sleep(0.2)
+
+    def shutdown(self):
+        self.executor.shutdown(wait=True)
+
+    def fingerprint(self, name: str, kwargs: Dict[str, Any], slot: Optional[datetime]) -> str:
+        """Hash of everything a run of this entry reads."""
+        entry = self.schedule[name]
+        inputs = {
+            path: file_digest(path) if os.path.exists(path) else None
+            for path in entry.get("inputs", [])
+        }
+        upstream = {
+            other: (self.store.latest(other) or {}).get("version")
+            for other in entry.get("after", [])
+        }
+        payload = [entry["runner"], kwargs, inputs, upstream]
+        if entry.get("external"):
+            payload.append(slot.isoformat() if slot else datetime.now().isoformat())
+        elif entry.get("daily"):
+            payload.append((slot or datetime.now()).date().isoformat())
+        return hashlib.sha256(json.dumps(payload, sort_keys=True, default=json_default).encode()).hexdigest()[:24]
+
+    def status(self, now: Optional[datetime] = None) -> List[Dict[str, Any]]:
+        """One row per entry for dashboards and the CLI."""
+        now = now or datetime.now()
+        rows = []
+        for name, entry in self.schedule.items():
+            state = self.store.state(name)
+            latest = self.store.latest(name)
+            rows.append({
+                "name": name,
+                "runner": entry["runner"],
+                "cron": entry["cron"],
+                "last_status": state.get("last_status"),
+                "last_finished": state.get("last_finished"),
+                "last_error": state.get("last_error"),
+                "running": bool(state.get("owner")),
+                "next_run": self.crons[name].next_after(now),
+                "version": latest["version"] if latest else None,
+                "version_created": latest["created_at"] if latest else None
+            })
+        return rows
+
+    def _run_leased(self, name: str, slot: Optional[datetime], force: bool = False) -> Dict[str, Any]:
+        try:
+            return self._run(name, slot, force)
+        finally:
+            with self.running_lock:
+                self.running.discard(name)
+
+    def _run(self, name: str, slot: Optional[datetime], force: bool) -> Dict[str, Any]:
+        entry = self.schedule[name]
+        try:
+            build = entry.get("kwargs")
+            kwargs = build(self.store) if build else {}
+            if kwargs is None:
+                # Upstream results not available yet; stays due
+                self.store.release(name, self.owner, "waiting", retry_at=datetime.now() + timedelta(seconds=RETRY_SECONDS))
+                print(f"[WARN] {name}: waiting for {', '.join(entry.get('after', []))}")
+                return {"status": "waiting"}
+
+            fingerprint = self.fingerprint(name, kwargs, slot)
+            if not force and fingerprint == self.store.state(name).get("last_fingerprint"):
+                self.store.release(name, self.owner, "unchanged", slot=slot, fingerprint=fingerprint)
+                print(f"[*] {name}: inputs unchanged, skipped")
+                return {"status": "unchanged"}
+
+            started = time.time()
+            result = get_agent(entry["runner"])(**kwargs)
+            if inspect.isawaitable(result):
+                result = asyncio.run(result)
+            duration = time.time() - started
+            if not result.get("success"):
+                raise RuntimeError(result.get("error") or "agent reported failure")
+
+            output_hash = hashlib.sha256(
+                json.dumps(result, sort_keys=True, default=json_default).encode()
+            ).hexdigest()[:24]
+            latest = self.store.latest(name)
+            if latest and latest["output_hash"] == output_hash:
+                self.store.release(name, self.owner, "unchanged", slot=slot, fingerprint=fingerprint)
+                print(f"[*] {name}: same result as v{latest['version']}, no new version")
+                return {"status": "unchanged", "version": latest["version"]}
+
+            version = self._save_version(name, slot, fingerprint, output_hash, duration, result)
+            self.store.release(name, self.owner, "ran", slot=slot, fingerprint=fingerprint)
+            print(f"[OK] {name}: v{version} in {duration:.1f}s")
+            return {"status": "ran", "version": version}
+
+        except Exception as e:
+            traceback.print_exc()
+            self.store.release(
+                name, self.owner, "failed", error=str(e),
+                retry_at=datetime.now() + timedelta(seconds=RETRY_SECONDS)
+            )
+            print(f"[ERROR] {name} failed: {e}")
+            return {"status": "failed", "error": str(e)}
+
+    def _save_version(
+        self,
+        name: str,
+        slot: Optional[datetime],
+        fingerprint: str,
+        output_hash: str,
+        duration: float,
+        result: Dict[str, Any]
+    ) -> int:
+        """Store a result and copy its artifact files under the version directory."""
+        version = self.store.add_version(name, slot, fingerprint, output_hash, duration, result, [])
+        version_dir = os.path.join(self.versions_dir, name, str(version))
+        copies = []
+        for path in result.get("artifacts", []):
+            if os.path.isfile(path):
+                os.makedirs(version_dir, exist_ok=True)
+                copy = os.path.join(version_dir, os.path.basename(path))
+                shutil.copy2(path, copy)
+                copies.append(copy)
+        if copies:
+            self.store.set_artifacts(name, version, copies)
+
+        for dropped in self.store.prune(name):
+            shutil.rmtree(os.path.join(self.versions_dir, name, str(dropped)), ignore_errors=True)
+        return version
+
+
+# Global schedule store instance
+_schedule_store: Optional[ScheduleStore] = None
+
+
+def get_schedule_store() -> ScheduleStore:
+    """Get or create global schedule store."""
+    global _schedule_store
+    if _schedule_store is None:
+        _schedule_store = ScheduleStore()
+    return _schedule_store
@@ -0,0 +1,316 @@
+"""
+Hour-by-hour staffing optimizer.
+
+Turns an hourly order forecast into per-hour staff requirements per role,
+then covers them with shift assignments from the roster at minimum labor
+cost using a greedy earliest-gap heuristic (start a shift at the first
+uncovered hour, stretch it over the short-staffed run, give it to the
+cheapest available person). Shared by StaffingAgent and the Staffing page.
+"""
+import os
+from dataclasses import dataclass
+from typing import Dict, Any, List, Optional, Callable
+import numpy as np
+import pandas as pd
+
+
+@dataclass
+class StaffMember:
+    """A person on the roster."""
+    name: str
+    role: str
+    hourly_rate: float
+    max_weekly_hours: float = 40.0
+
+
+# Default orders one staff member can handle per hour, by role
+DEFAULT_ORDERS_PER_STAFF_HOUR = {
+    "Cook": 25,
+    "Cashier": 30
+}
+
+# Rate used for to-be-hired placeholders when the roster has nobody in a role
+DEFAULT_HOURLY_RATE = {
+    "Cook": 22.00,
+    "Cashier": 16.50
+}
+
+
+def load_roster(
+    roster_file: str = "data/staff_schedule.csv",
+    staff_names: Optional[List[str]] = None
+) -> List[StaffMember]:
+    """
+    Load the roster (one entry per person) from the staff schedule CSV.
+
+    Args:
+        roster_file: CSV with staff_name, role, hourly_rate columns
+        staff_names: Restrict to these people; full names or unique first
+            names ("Alice" -> "Alice Johnson"). If none of them are on the
+            roster, the whole roster is used. Names that aren't on it are
+            added as cooks at the default rate, with a warning.
+
+    Returns:
+        List of StaffMember
+    """
+    roster: Dict[str, StaffMember] = {}
+
+    if os.path.exists(roster_file):
+        df = pd.read_csv(roster_file)
+        df = df.drop_duplicates(subset="staff_name", keep="last")
+        for row in df.itertuples(index=False):
+            roster[row.staff_name] = StaffMember(
+                name=row.staff_name,
+                role=row.role,
+                hourly_rate=float(row.hourly_rate)
+            )
+
+    if not staff_names:
+        return list(roster.values())
+
+    resolved = {name: _resolve_name(name, roster) for name in staff_names}
+    unknown = [name for name, match in resolved.items() if match is None]
+
+    if roster and len(unknown) == len(resolved):
+        print(f"[WARN] None of {', '.join(staff_names)} are on the roster in {roster_file}; using the full roster")
+        return list(roster.values())
+    if unknown:
+        print(f"[WARN] Not on the roster, staffed as cooks at ${DEFAULT_HOURLY_RATE['Cook']:.2f}/h: {', '.join(unknown)}")
+
+    members = []
+    for name, match in resolved.items():
+        if match is not None:
+            if roster[match] not in members:
+                members.append(roster[match])
+        else:
+            members.append(StaffMember(name=name, role="Cook", hourly_rate=DEFAULT_HOURLY_RATE["Cook"]))
+    return members
+
+
+def _resolve_name(name: str, roster: Dict[str, StaffMember]) -> Optional[str]:
+    """Roster name for a full name or an unambiguous first name."""
+    if name in roster:
+        return name
+    wanted = name.strip().lower()
+    exact = [full for full in roster if full.lower() == wanted]
+    if exact:
+        return exact[0]
+    by_first = [full for full in roster if full.split()[0].lower() == wanted]
+    return by_first[0] if len(by_first) == 1 else None
+
+
+def required_staff(
+    hourly_orders: np.ndarray,
+    orders_per_staff_hour: float,
+    min_staff: int = 1
+) -> np.ndarray:
+    """Staff needed per hour for a capacity ratio (vectorized over any shape)."""
+    needed = np.ceil(np.asarray(hourly_orders, dtype=float) / orders_per_staff_hour).astype(int)
+    return np.maximum(min_staff, needed)
+
+
+class StaffingOptimizer:
+    """Minimum-cost shift assignment against per-hour coverage requirements."""
+
+    def __init__(
+        self,
+        roster: List[StaffMember],
+        min_shift_hours: int = 4,
+        max_shift_hours: int = 8,
+        orders_per_staff_hour: Optional[Dict[str, float]] = None,
+        min_staff: Optional[Dict[str, int]] = None,
+        requirement_fn: Optional[Callable[[str, np.ndarray], np.ndarray]] = None
+    ):
+        """
+        Args:
+            roster: Available staff
+            min_shift_hours: Shortest shift allowed
+            max_shift_hours: Longest shift allowed
+            orders_per_staff_hour: Capacity ratio per role
+            min_staff: Minimum staff on duty per role while open
+            requirement_fn: Optional (role, hourly_orders) -> staff needed per hour,
+                overriding the fixed capacity ratios
+        """
+        self.roster = roster
+        self.min_shift_hours = min_shift_hours
+        self.max_shift_hours = max_shift_hours
+        self.orders_per_staff_hour = orders_per_staff_hour or DEFAULT_ORDERS_PER_STAFF_HOUR
+        self.min_staff = min_staff or {}
+        self.requirement_fn = requirement_fn
+
+    def roles(self) -> List[str]:
+        """Roles that have staff on the roster and a capacity rule."""
+        present = {m.role for m in self.roster}
+        return [role for role in self.orders_per_staff_hour if role in present]
+
+    def requirements(self, role: str, hourly_orders: np.ndarray) -> np.ndarray:
+        """Staff needed per hour for a role."""
+        if self.requirement_fn is not None:
+            needed = np.asarray(self.requirement_fn(role, hourly_orders), dtype=int)
+            return np.maximum(self.min_staff.get(role, 1), needed)
+        return required_staff(
+            hourly_orders,
+            self.orders_per_staff_hour[role],
+            self.min_staff.get(role, 1)
+        )
+
+    def solve_day(
+        self,
+        date: str,
+        hours: List[int],
+        hourly_orders: List[float],
+        roles: Optional[List[str]] = None,
+        hours_used: Optional[Dict[str, float]] = None
+    ) -> Dict[str, Any]:
+        """
+        Assign shifts for one day.
+
+        Args:
+            date: Date string (YYYY-MM-DD)
+            hours: Consecutive opening hours (e.g. 10..21)
+            hourly_orders: Forecast orders for each hour
+            roles: Roles to staff (default: all roles on the roster)
+            hours_used: Weekly hours already worked per person (updated in place)
+
+        Returns:
+            Dict with shifts, coverage per role and labor cost
+        """
+        hours_used = hours_used if hours_used is not None else {}
+        orders = np.asarray(hourly_orders, dtype=float)
+        working_today = set()
+
+        shifts = []
+        coverage = {}
+
+        for role in roles or self.roles():
+            required = self.requirements(role, orders)
+            scheduled = np.zeros(len(hours), dtype=int)
+            tbh_count = 0
+
+            while True:
+                gaps = np.nonzero(scheduled < required)[0]
+                if len(gaps) == 0:
+                    break
+
+                start, end = self._shift_window(gaps[0], scheduled, required)
+                length = end - start
+
+                member = self._cheapest_available(role, length, hours_used, working_today)
+                if member is None:
+                    tbh_count += 1
+                    rates = [m.hourly_rate for m in self.roster if m.role == role]
+                    rate = float(np.mean(rates)) if rates else DEFAULT_HOURLY_RATE.get(role, 20.0)
+                    name = f"{role} {tbh_count} (TBH)"
+                else:
+                    rate = member.hourly_rate
+                    name = member.name
+                    working_today.add(name)
+                    hours_used[name] = hours_used.get(name, 0) + length
+
+                scheduled[start:end] += 1
+                start_hour = hours[start]
+                end_hour = hours[end - 1] + 1
+                shifts.append({
+                    "staff": name,
+                    "role": role,
+                    "date": date,
+                    "start_time": f"{start_hour:02d}:00",
+                    "end_time": f"{end_hour:02d}:00",
+                    "shift_hours": length,
+                    "hourly_rate": rate,
+                    "cost": round(rate * length, 2)
+                })
+
+            coverage[role] = {
+                "hours": list(hours),
+                "required": required.tolist(),
+                "scheduled": scheduled.tolist()
+            }
+
+        return {
+            "date": date,
+            "shifts": shifts,
+            "coverage": coverage,
+            "labor_hours": int(sum(s["shift_hours"] for s in shifts)),
+            "labor_cost": round(sum(s["cost"] for s in shifts), 2)
+        }
+
+    def solve_week(
+        self,
+        forecasts: Dict[str, Dict[str, Any]],
+        roles: Optional[List[str]] = None
+    ) -> Dict[str, Any]:
+        """
+        Assign shifts for several days, respecting weekly hour limits.
+
+        Args:
+            forecasts: {date: {"hours": [...], "orders": [...]}}
+            roles: Roles to staff (default: all roles on the roster)
+
+        Returns:
+            Dict with per-day results and weekly totals
+        """
+        hours_used: Dict[str, float] = {}
+        days = {}
+
+        for date in sorted(forecasts):
+            day = forecasts[date]
+            days[date] = self.solve_day(date, day["hours"], day["orders"], roles, hours_used)
+
+        return {
+            "days": days,
+            "hours_used": hours_used,
+            "labor_hours": int(sum(d["labor_hours"] for d in days.values())),
+            "labor_cost": round(sum(d["labor_cost"] for d in days.values()), 2)
+        }
+
+    def _shift_window(self, first_gap: int, scheduled: np.ndarray, required: np.ndarray) -> tuple:
+        """Pick [start, end) for a shift that starts covering at first_gap."""
+        n = len(required)
+        start = int(first_gap)
+        window_end = min(n, start + self.max_shift_hours)
+        short = scheduled < required
+
+        # Cover the run of short-staffed hours, then pad to the minimum length
+        end = start
+        while end < window_end and short[end]:
+            end += 1
+        end = max(end, min(n, start + self.min_shift_hours))
+
+        # Bridge to later short runs when that's cheaper than a separate shift
+        while end < window_end:
+            run_start = end
+            while run_start < window_end and not short[run_start]:
+                run_start += 1
+            if run_start >= window_end:
+                break
+            run_end = run_start
+            while run_end < n and short[run_end]:
+                run_end += 1
+            # Only bridge runs that fit entirely and cost less than their own shift
+            if run_end > window_end or run_end - end > max(run_end - run_start, self.min_shift_hours):
+                break
+            end = run_end
+
+        # Respect the minimum length near close by starting earlier
+        start = min(start, max(0, end - self.min_shift_hours))
+        return start, end
+
+    def _cheapest_available(
+        self,
+        role: str,
+        length: int,
+        hours_used: Dict[str, float],
+        working_today: set
+    ) -> Optional[StaffMember]:
+        """Cheapest roster member in a role with enough weekly hours left."""
+        candidates = [
+            m for m in self.roster
+            if m.role == role
+            and m.name not in working_today
+            and hours_used.get(m.name, 0) + length <= m.max_weekly_hours
+        ]
+        if not candidates:
+            return None
+        # Cheapest first, then whoever has worked least this week
+        return min(candidates, key=lambda m: (m.hourly_rate, hours_used.get(m.name, 0)))
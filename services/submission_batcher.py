@@ -0,0 +1,274 @@
+"""
+Batched outbound submissions (supplier POs and Asana tasks).
+
+Agents queue work here instead of calling the browser client per item.
+On flush, POs are coalesced into one browser session per supplier and
+Asana tasks into one call per project: the Asana batch API when a token is
+configured, otherwise a single browser session for the whole project.
+"""
+import os
+import asyncio
+from collections import OrderedDict
+from typing import Dict, Any, List, Optional
+from services.weather import get_session
+
+
+ASANA_API_URL = "https://app.asana.com/api/1.0"
+DEFAULT_SUPPLIER_URL = "https://forms.gle/demo"
+
+
+class AsanaBatchAPI:
+    """Minimal Asana REST client using the /batch endpoint."""
+
+    # Asana accepts at most 10 actions per batch request
+    MAX_ACTIONS = 10
+    # Extra attempts for actions that failed inside a batch
+    MAX_RETRIES = 2
+
+    def __init__(self, access_token: str, workspace_gid: str):
+        self.workspace_gid = workspace_gid
+        self.session = get_session()
+        self.headers = {
+            "Authorization": f"Bearer {access_token}",
+            "Accept": "application/json"
+        }
+
+    def _post(self, path: str, data: Dict[str, Any]) -> Any:
+        response = self.session.post(
+            f"{ASANA_API_URL}{path}",
+            json={"data": data},
+            headers=self.headers,
+            timeout=30
+        )
+        response.raise_for_status()
+        return response.json()["data"]
+
+    def _batch(self, actions: List[Dict[str, Any]]) -> List[Optional[Dict[str, Any]]]:
+        """
+        Run actions in as few /batch requests as possible.
+
+        Only the actions that failed are retried (up to MAX_RETRIES times),
+        so nothing that already succeeded is created twice.
+
+        Returns:
+            Result per action, aligned with `actions` (None if it still failed)
+        """
+        results: List[Optional[Dict[str, Any]]] = [None] * len(actions)
+        pending = list(range(len(actions)))
+        error = None
+
+        for _ in range(self.MAX_RETRIES + 1):
+            failed = []
+            for i in range(0, len(pending), self.MAX_ACTIONS):
+                chunk = pending[i:i + self.MAX_ACTIONS]
+                try:
+                    replies = self._post("/batch", {"actions": [actions[j] for j in chunk]})
+                except Exception as e:
+                    failed.extend(chunk)
+                    error = str(e)
+                    continue
+                for j, reply in zip(chunk, replies):
+                    if reply.get("status_code", 200) >= 400:
+                        failed.append(j)
+                        error = reply.get("body")
+                    else:
+                        results[j] = reply
+            pending = failed
+            if not pending:
+                break
+
+        if pending:
+            print(f"[WARN] {len(pending)} Asana batch actions failed: {error}")
+        return results
+
+    def create_project_with_tasks(
+        self,
+        project_name: str,
+        tasks: List[Dict[str, Any]],
+        progress: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        """
+        Create a project, its sections and all tasks.
+
+        Args:
+            project_name: Asana project name
+            tasks: Tasks with name, assignee, due_date, section and notes
+            progress: Filled with what has been created (project, section
+                and task gids); pass the same dict again to resume without
+                recreating any of it
+
+        Returns:
+            Dict with success, project_url and tasks_created
+
+        Raises:
+            Exception if anything is still missing after retries
+        """
+        if progress is None:
+            progress = {}
+        progress.setdefault("sections", {})
+        progress.setdefault("tasks", {})
+
+        if "project" not in progress:
+            project = self._post("/projects", {"name": project_name, "workspace": self.workspace_gid})
+            progress["project"] = {
+                "gid": project["gid"],
+                "url": project.get("permalink_url", f"https://app.asana.com/0/{project['gid']}")
+            }
+        project_gid = progress["project"]["gid"]
+
+        section_names = [
+            name for name in OrderedDict.fromkeys(t.get("section", "General") for t in tasks)
+            if name not in progress["sections"]
+        ]
+        sections = self._batch([
+            {
+                "method": "post",
+                "relative_path": f"/projects/{project_gid}/sections",
+                "data": {"name": name}
+            }
+            for name in section_names
+        ])
+        for name, result in zip(section_names, sections):
+            if result is not None:
+                progress["sections"][name] = result["body"]["data"]["gid"]
+
+        pending = []
+        actions = []
+        for index, t in enumerate(tasks):
+            section_gid = progress["sections"].get(t.get("section", "General"))
+            if index in progress["tasks"] or section_gid is None:
+                continue
+            data = {
+                "name": t["name"],
+                "notes": f"Assignee: {t.get('assignee', 'Unassigned')}\n{t.get('notes', '')}".strip(),
+                "memberships": [{"project": project_gid, "section": section_gid}]
+            }
+            if t.get("due_date"):
+                data["due_on"] = t["due_date"]
+            pending.append(index)
+            actions.append({"method": "post", "relative_path": "/tasks", "data": data})
+        for index, result in zip(pending, self._batch(actions)):
+            if result is not None:
+                progress["tasks"][index] = result["body"]["data"]["gid"]
+
+        missing = len(tasks) - len(progress["tasks"])
+        if missing:
+            raise Exception(f"{missing} of {len(tasks)} Asana tasks could not be created in '{project_name}'")
+
+        return {
+            "success": True,
+            "result": f"Created Asana project '{project_name}' with {len(tasks)} tasks",
+            "project_url": progress["project"]["url"],
+            "tasks_created": len(tasks)
+        }
+
+
+class SubmissionBatcher:
+    """Queue POs and Asana tasks, then submit them in as few sessions as possible."""
+
+    def __init__(self, browser_client, asana_api: Optional[AsanaBatchAPI] = None):
+        """
+        Args:
+            browser_client: BrowserUseClient (real or mock)
+            asana_api: Asana REST client (default: from ASANA_ACCESS_TOKEN /
+                ASANA_WORKSPACE_GID, browser fallback when unset)
+        """
+        self.browser_client = browser_client
+        self.asana_api = asana_api or self._asana_from_env()
+        self.purchase_orders: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self.asana_tasks: "OrderedDict[str, List[Dict[str, Any]]]" = OrderedDict()
+
+    @staticmethod
+    def _asana_from_env() -> Optional[AsanaBatchAPI]:
+        token = os.getenv("ASANA_ACCESS_TOKEN")
+        workspace = os.getenv("ASANA_WORKSPACE_GID")
+        if token and workspace:
+            return AsanaBatchAPI(token, workspace)
+        return None
+
+    def add_purchase_order(
+        self,
+        po_data: Dict[str, Any],
+        supplier: str = "Default",
+        supplier_url: Optional[str] = None
+    ):
+        """Queue one PO line for a supplier."""
+        entry = self.purchase_orders.setdefault(supplier, {
+            "url": supplier_url or os.getenv("SUPPLIER_PORTAL_URL", DEFAULT_SUPPLIER_URL),
+            "lines": []
+        })
+        entry["lines"].append(po_data)
+
+    def add_supplier_orders(self, purchase_orders: List[Dict[str, Any]], delivery_notes: str = ""):
+        """Queue InventoryPlanner.purchase_orders() output."""
+        for po in purchase_orders:
+            for line in po["lines"]:
+                self.add_purchase_order({
+                    "item": line["item"],
+                    "quantity": line["quantity"],
+                    "unit": line["unit"],
+                    "delivery_date": po["delivery_date"],
+                    "notes": delivery_notes
+                }, supplier=po["supplier"])
+
+    def add_tasks(self, project_name: str, tasks: List[Dict[str, Any]]):
+        """Queue Asana tasks for a project."""
+        self.asana_tasks.setdefault(project_name, []).extend(tasks)
+
+    async def flush(self, submit: bool = False) -> Dict[str, Any]:
+        """
+        Submit everything queued and clear the queues.
+
+        Args:
+            submit: Submit supplier forms (otherwise fill only)
+
+        Returns:
+            Dict with per-supplier and per-project results and session count
+        """
+        results = {"suppliers": {}, "projects": {}, "sessions": 0, "api_calls": 0}
+
+        for supplier, entry in self.purchase_orders.items():
+            lines = entry["lines"]
+            if len(lines) == 1:
+                outcome = await self.browser_client.fill_supplier_form(entry["url"], lines[0], submit=submit)
+            else:
+                outcome = await self.browser_client.fill_supplier_forms(entry["url"], lines, submit=submit)
+            outcome["lines"] = len(lines)
+            results["suppliers"][supplier] = outcome
+            results["sessions"] += 1
+
+        for project_name, tasks in self.asana_tasks.items():
+            outcome = None
+            if self.asana_api is not None:
+                # Blocking HTTP calls run off the event loop
+                progress: Dict[str, Any] = {}
+                try:
+                    outcome = await asyncio.to_thread(
+                        self.asana_api.create_project_with_tasks, project_name, tasks, progress
+                    )
+                    results["api_calls"] += 1
+                except Exception as e:
+                    if "project" in progress:
+                        # The project exists: a browser run would create a second one
+                        print(f"[WARN] Asana batch API partially failed: {e}")
+                        outcome = {
+                            "success": False,
+                            "error": str(e),
+                            "project_url": progress["project"]["url"],
+                            "tasks_created": len(progress["tasks"])
+                        }
+                        results["api_calls"] += 1
+                    else:
+                        print(f"[WARN] Asana batch API failed, falling back to browser: {e}")
+            if outcome is None:
+                outcome = await self.browser_client.create_asana_tasks(project_name, tasks)
+                results["sessions"] += 1
+            results["projects"][project_name] = outcome
+
+        self.purchase_orders.clear()
+        self.asana_tasks.clear()
+
+        results["success"] = all(
+            r.get("success") for r in list(results["suppliers"].values()) + list(results["projects"].values())
+        )
+        return results
@@ -0,0 +1,191 @@
+"""
+Text extraction for compliance uploads (PDF, DOCX, images, text).
+
+Files are hashed by their bytes first and looked up in the document
+store's extraction cache, so re-uploading an identical file never re-runs
+PyPDF2 or OCR. Misses are extracted in a process pool: one task per file,
+with large PDFs split into page ranges so a single long binder also uses
+every core. Worker functions live at module level so they can be pickled.
+"""
+import os
+import hashlib
+from concurrent.futures import ProcessPoolExecutor, Executor
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+
+# PDFs longer than this are extracted as page ranges across workers
+PAGES_PER_TASK = 25
+
+IMAGE_SUFFIXES = ['.png', '.jpg', '.jpeg', '.tiff']
+
+
+def file_digest(path: str) -> str:
+    """SHA-256 of a file's bytes (streamed, so large scans stay out of memory)."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def pdf_page_count(path: str) -> int:
+    from PyPDF2 import PdfReader
+    return len(PdfReader(path).pages)
+
+
+def extract_pdf_pages(path: str, start: int, stop: int) -> List[str]:
+    """Text of pages [start, stop) of a PDF (runs in a worker process)."""
+    from PyPDF2 import PdfReader
+    reader = PdfReader(path)
+    return [reader.pages[i].extract_text() or "" for i in range(start, min(stop, len(reader.pages)))]
+
+
+def extract_file(path: str) -> Tuple[str, bool]:
+    """
+    Extract a file's text in this process.
+
+    Args:
+        path: File path
+
+    Returns:
+        (text, ok) - failed extractions return a placeholder and ok=False
+    """
+    file_path = Path(path)
+    suffix = file_path.suffix.lower()
+    name = file_path.name
+
+    if suffix == '.pdf':
+        try:
+            pages = extract_pdf_pages(path, 0, pdf_page_count(path))
+            return "".join(f"{page}\n" for page in pages), True
+        except ImportError:
+            return f"[PDF: {name} - PyPDF2 not installed]", False
+        except Exception as e:
+            return f"[PDF: {name} - Extraction error: {e}]", False
+
+    if suffix in ['.docx', '.doc']:
+        try:
+            from docx import Document
+            doc = Document(path)
+            return "\n".join(para.text for para in doc.paragraphs), True
+        except ImportError:
+            return f"[DOCX: {name} - python-docx not installed]", False
+        except Exception as e:
+            return f"[DOCX: {name} - Extraction error: {e}]", False
+
+    if suffix in IMAGE_SUFFIXES:
+        try:
+            import pytesseract
+            from PIL import Image
+            return pytesseract.image_to_string(Image.open(path)), True
+        except ImportError:
+            return f"[Image: {name} - OCR libraries not installed]", False
+        except Exception as e:
+            return f"[Image: {name} - OCR error: {e}]", False
+
+    if suffix in ['.txt', '.md']:
+        try:
+            return file_path.read_text(encoding='utf-8'), True
+        except Exception as e:
+            print(f"[WARN] Text extraction failed for {path}: {e}")
+            return f"[Document: {name} - Content extraction failed]", False
+
+    print(f"[WARN] Text extraction failed for {path}: Unsupported file type: {suffix}")
+    return f"[Document: {name} - Content extraction failed]", False
+
+
+def _pdf_tasks(path: str) -> Optional[List[Tuple[int, int]]]:
+    """Page ranges for a PDF worth splitting, else None."""
+    if Path(path).suffix.lower() != '.pdf':
+        return None
+    try:
+        pages = pdf_page_count(path)
+    except Exception:
+        return None
+    if pages <= PAGES_PER_TASK:
+        return None
+    return [(start, start + PAGES_PER_TASK) for start in range(0, pages, PAGES_PER_TASK)]
+
+
+def extract_many(paths: List[str], executor: Executor) -> Dict[str, Tuple[str, bool]]:
+    """
+    Extract several files in parallel.
+
+    Args:
+        paths: Files to extract (each once)
+        executor: Pool to run extraction in
+
+    Returns:
+        {path: (text, ok)}
+    """
+    futures = {}
+    for path in paths:
+        ranges = _pdf_tasks(path)
+        if ranges:
+            futures[path] = [executor.submit(extract_pdf_pages, path, start, stop) for start, stop in ranges]
+        else:
+            futures[path] = executor.submit(extract_file, path)
+
+    results = {}
+    for path, future in futures.items():
+        if isinstance(future, list):
+            try:
+                pages = [page for part in future for page in part.result()]
+                results[path] = ("".join(f"{page}\n" for page in pages), True)
+            except Exception as e:
+                results[path] = (f"[PDF: {Path(path).name} - Extraction error: {e}]", False)
+        else:
+            results[path] = future.result()
+    return results
+
+
+class TextExtractor:
+    """Cached, parallel text extraction backed by the document store."""
+
+    def __init__(self, store, max_workers: Optional[int] = None):
+        self.store = store
+        self.max_workers = max_workers or os.cpu_count() or 1
+
+    def extract(self, path: str) -> Tuple[str, str]:
+        """
+        Text for one file (cached by content hash).
+
+        Returns:
+            (file_hash, text)
+        """
+        return self.extract_many([path])[path]
+
+    def extract_many(self, paths: List[str]) -> Dict[str, Tuple[str, str]]:
+        """
+        Text for several files; identical files are extracted once.
+
+        Returns:
+            {path: (file_hash, text)}
+        """
+        hashes = {path: file_digest(path) for path in paths}
+        cached = self.store.cached_texts(set(hashes.values()))
+
+        # One extraction per distinct uncached file content
+        pending: Dict[str, str] = {}
+        for path, file_hash in hashes.items():
+            if file_hash not in cached and file_hash not in pending.values():
+                pending[path] = file_hash
+
+        if pending:
+            extracted = self._run(list(pending))
+            for path, (text, ok) in extracted.items():
+                if ok:
+                    self.store.cache_text(pending[path], text)
+                cached[pending[path]] = text
+
+        return {path: (file_hash, cached[file_hash]) for path, file_hash in hashes.items()}
+
+    def _run(self, paths: List[str]) -> Dict[str, Tuple[str, bool]]:
+        # A single small file isn't worth starting worker processes for
+        if len(paths) == 1 and not _pdf_tasks(paths[0]):
+            return {paths[0]: extract_file(paths[0])}
+        if self.max_workers <= 1:
+            return {path: extract_file(path) for path in paths}
+        with ProcessPoolExecutor(max_workers=self.max_workers) as executor:
+            return extract_many(paths, executor)
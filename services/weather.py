@@ -1,20 +1,202 @@
 """
 Weather service using Open-Meteo API for forecast data.
+
+Geocoding results are cached permanently and forecasts are cached per
+location/day until the next model update, both in artifacts/weather_cache.sqlite.
+All HTTP calls share one pooled requests.Session.
 """
+import os
+import json
+import sqlite3
+import time
 import requests
+from requests.adapters import HTTPAdapter
 import pandas as pd
 from datetime import datetime, timedelta
-from typing import Dict, Any, Tuple
+from typing import Dict, Any, List, Tuple, Optional
 import pytz
 
 
+# Shared HTTP session (connection pooling across all weather/geocoding calls)
+_session: Optional[requests.Session] = None
+
+
+def get_session() -> requests.Session:
+    """Get or create the shared HTTP session."""
+    global _session
+    if _session is None:
+        _session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=16)
+        _session.mount("https://", adapter)
+    return _session
+
+
+class WeatherCache:
+    """SQLite cache for geocoding lookups and forecast responses."""
+    
+    def __init__(self, db_path: str = "artifacts/weather_cache.sqlite"):
+        self.db_path = db_path
+        os.makedirs(os.path.dirname(db_path) or ".", exist_ok=True)
+        self.conn = sqlite3.connect(db_path, check_same_thread=False)
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS geocode (
+                kind TEXT NOT NULL,
+                query TEXT NOT NULL,
+                value TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                PRIMARY KEY (kind, query)
+            );
+            CREATE TABLE IF NOT EXISTS forecasts (
+                key TEXT PRIMARY KEY,
+                payload TEXT NOT NULL,
+                fetched_at REAL NOT NULL,
+                expires_at REAL NOT NULL,
+                etag TEXT,
+                last_modified TEXT
+            );
+        """)
+        self.conn.commit()
+        
+        # In-process copies so warm lookups skip SQLite entirely
+        self._geocode: Dict[Tuple[str, str], Any] = {}
+        self._forecasts: Dict[str, Dict[str, Any]] = {}
+    
+    def get_geocode(self, kind: str, query: str) -> Optional[Any]:
+        """Get a cached geocoding value (never expires)."""
+        key = (kind, query)
+        if key in self._geocode:
+            return self._geocode[key]
+        
+        row = self.conn.execute(
+            "SELECT value FROM geocode WHERE kind = ? AND query = ?", key
+        ).fetchone()
+        if row is None:
+            return None
+        
+        value = json.loads(row[0])
+        self._geocode[key] = value
+        return value
+    
+    def put_geocode(self, kind: str, query: str, value: Any):
+        """Store a geocoding value permanently."""
+        with self.conn:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO geocode VALUES (?, ?, ?, ?)",
+                (kind, query, json.dumps(value), time.time())
+            )
+        self._geocode[(kind, query)] = value
+    
+    def get_forecast(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        Get a cached forecast entry (fresh or stale).
+        
+        Returns:
+            Dict with payload, expires_at, etag, last_modified - or None
+        """
+        if key in self._forecasts:
+            return self._forecasts[key]
+        
+        row = self.conn.execute(
+            "SELECT payload, expires_at, etag, last_modified FROM forecasts WHERE key = ?",
+            (key,)
+        ).fetchone()
+        if row is None:
+            return None
+        
+        entry = {
+            "payload": json.loads(row[0]),
+            "expires_at": row[1],
+            "etag": row[2],
+            "last_modified": row[3]
+        }
+        self._forecasts[key] = entry
+        return entry
+    
+    def put_forecast(
+        self,
+        key: str,
+        payload: Dict[str, Any],
+        expires_at: float,
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None
+    ):
+        """Store a forecast response."""
+        with self.conn:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO forecasts VALUES (?, ?, ?, ?, ?, ?)",
+                (key, json.dumps(payload), time.time(), expires_at, etag, last_modified)
+            )
+        self._forecasts[key] = {
+            "payload": payload,
+            "expires_at": expires_at,
+            "etag": etag,
+            "last_modified": last_modified
+        }
+    
+    def touch_forecast(self, key: str, expires_at: float):
+        """Extend a forecast's expiry after a 304 Not Modified."""
+        with self.conn:
+            self.conn.execute(
+                "UPDATE forecasts SET fetched_at = ?, expires_at = ? WHERE key = ?",
+                (time.time(), expires_at, key)
+            )
+        if key in self._forecasts:
+            self._forecasts[key]["expires_at"] = expires_at
+
+
+# Global weather cache instance
+_weather_cache: Optional[WeatherCache] = None
+
+
+def get_weather_cache() -> WeatherCache:
+    """Get or create global weather cache."""
+    global _weather_cache
+    if _weather_cache is None:
+        _weather_cache = WeatherCache()
+    return _weather_cache
+
+
 class WeatherService:
     """Fetch and process weather forecast data."""
     
     BASE_URL = "https://api.open-meteo.com/v1/forecast"
     
-    def __init__(self, timezone: str = "America/New_York"):
+    # Open-Meteo refreshes its forecast models on a fixed UTC cadence;
+    # cached forecasts expire at the next boundary.
+    MODEL_UPDATE_HOURS = 3
+    
+    def __init__(
+        self,
+        timezone: str = "America/New_York",
+        cache: Optional[WeatherCache] = None,
+        use_cache: bool = True
+    ):
         self.timezone = timezone
+        self.cache = (cache or get_weather_cache()) if use_cache else None
+        self.session = get_session()
+    
+    def _next_model_update(self, now: Optional[float] = None) -> float:
+        """Unix time of the next forecast model update boundary."""
+        now = time.time() if now is None else now
+        interval = self.MODEL_UPDATE_HOURS * 3600
+        return (now // interval + 1) * interval
+    
+    def _forecast_key(self, latitude: float, longitude: float, days_ahead: int) -> str:
+        """Cache key for a forecast: rounded location, local day and horizon."""
+        today = datetime.now(pytz.timezone(self.timezone)).strftime("%Y-%m-%d")
+        return f"{latitude:.4f},{longitude:.4f}|{today}|{days_ahead}|{self.timezone}"
+    
+    def _forecast_params(self, latitude: Any, longitude: Any, days_ahead: int) -> Dict[str, Any]:
+        """Open-Meteo query parameters (latitude/longitude may be comma-separated lists)."""
+        return {
+            "latitude": latitude,
+            "longitude": longitude,
+            "hourly": "temperature_2m,precipitation_probability,precipitation",
+            "temperature_unit": "fahrenheit",
+            "precipitation_unit": "inch",
+            "timezone": self.timezone,
+            "forecast_days": days_ahead + 1
+        }
     
     def get_forecast(
         self, 
@@ -33,23 +215,169 @@ class WeatherService:
         Returns:
             Dict with raw forecast data
         """
-        params = {
-            "latitude": latitude,
-            "longitude": longitude,
-            "hourly": "temperature_2m,precipitation_probability,precipitation",
-            "temperature_unit": "fahrenheit",
-            "precipitation_unit": "inch",
-            "timezone": self.timezone,
-            "forecast_days": days_ahead + 1
-        }
+        params = self._forecast_params(latitude, longitude, days_ahead)
+        
+        key = self._forecast_key(latitude, longitude, days_ahead)
+        cached = self.cache.get_forecast(key) if self.cache else None
+        
+        if cached and cached["expires_at"] > time.time():
+            return cached["payload"]
+        
+        # Conditional refresh of a stale entry
+        headers = {}
+        if cached:
+            if cached.get("etag"):
+                headers["If-None-Match"] = cached["etag"]
+            if cached.get("last_modified"):
+                headers["If-Modified-Since"] = cached["last_modified"]
         
         try:
-            response = requests.get(self.BASE_URL, params=params, timeout=10)
+            response = self.session.get(self.BASE_URL, params=params, headers=headers, timeout=10)
+            
+            if response.status_code == 304 and cached:
+                self.cache.touch_forecast(key, self._next_model_update())
+                return cached["payload"]
+            
             response.raise_for_status()
-            return response.json()
+            data = response.json()
             
         except Exception as e:
             raise Exception(f"Weather API error: {str(e)}")
+        
+        if self.cache:
+            self.cache.put_forecast(
+                key,
+                data,
+                expires_at=self._next_model_update(),
+                etag=response.headers.get("ETag"),
+                last_modified=response.headers.get("Last-Modified")
+            )
+        
+        return data
+    
+    def get_forecast_batch(
+        self,
+        locations: List[Dict[str, Any]],
+        days_ahead: int = 1
+    ) -> List[Dict[str, Any]]:
+        """
+        Get hourly forecasts for many locations in one Open-Meteo request.
+        
+        Fresh cached forecasts are reused; only the remaining locations are
+        fetched, together, using comma-separated latitude/longitude lists.
+        
+        Args:
+            locations: List of dicts with 'lat' and 'lng' (and optionally 'name')
+            days_ahead: Number of days to forecast (1-7)
+            
+        Returns:
+            List of raw forecast dicts, in the same order as locations
+        """
+        now = time.time()
+        keys = [self._forecast_key(loc["lat"], loc["lng"], days_ahead) for loc in locations]
+        results: List[Optional[Dict[str, Any]]] = [None] * len(locations)
+        
+        missing = []
+        for i, key in enumerate(keys):
+            cached = self.cache.get_forecast(key) if self.cache else None
+            if cached and cached["expires_at"] > now:
+                results[i] = cached["payload"]
+            else:
+                missing.append(i)
+        
+        if missing:
+            params = self._forecast_params(
+                ",".join(str(locations[i]["lat"]) for i in missing),
+                ",".join(str(locations[i]["lng"]) for i in missing),
+                days_ahead
+            )
+            
+            try:
+                response = self.session.get(self.BASE_URL, params=params, timeout=20)
+                response.raise_for_status()
+                data = response.json()
+            except Exception as e:
+                raise Exception(f"Weather API error: {str(e)}")
+            
+            # A single location comes back as an object rather than a list
+            if isinstance(data, dict):
+                data = [data]
+            if not isinstance(data, list) or len(data) != len(missing):
+                received = len(data) if isinstance(data, list) else 0
+                raise Exception(
+                    f"Weather API error: expected {len(missing)} forecasts, got {received}"
+                )
+            
+            expires_at = self._next_model_update()
+            for i, payload in zip(missing, data):
+                results[i] = payload
+                if self.cache:
+                    self.cache.put_forecast(keys[i], payload, expires_at=expires_at)
+        
+        return results
+    
+    def process_forecast_batch_df(
+        self,
+        raw_batch: List[Dict[str, Any]],
+        locations: List[Dict[str, Any]],
+        target_date: str = None
+    ) -> pd.DataFrame:
+        """
+        Process batch forecasts into one long-format DataFrame.
+        
+        Args:
+            raw_batch: Raw API responses from get_forecast_batch
+            locations: Locations in the same order (name defaults to "lat,lng")
+            target_date: Target date in YYYY-MM-DD format (default: tomorrow)
+            
+        Returns:
+            DataFrame with columns: location, time, temp, precip_prob, precip, is_rain, hour
+        """
+        names = []
+        times = []
+        temps = []
+        precip_probs = []
+        precips = []
+        
+        for loc, raw in zip(locations, raw_batch):
+            hourly = raw.get("hourly", {})
+            n = len(hourly.get("time", []))
+            names.extend([loc.get("name", f"{loc['lat']},{loc['lng']}")] * n)
+            times.extend(hourly.get("time", []))
+            temps.extend(hourly.get("temperature_2m", []))
+            precip_probs.extend(hourly.get("precipitation_probability", []))
+            precips.extend(hourly.get("precipitation", []))
+        
+        df = pd.DataFrame({
+            "location": names,
+            "time": pd.to_datetime(times),
+            "temp": temps,
+            "precip_prob": precip_probs,
+            "precip": precips
+        })
+        
+        # Filter to target date
+        if target_date is None:
+            tomorrow = datetime.now(pytz.timezone(self.timezone)) + timedelta(days=1)
+            target_date = tomorrow.strftime("%Y-%m-%d")
+        
+        df = df[df["time"].dt.strftime("%Y-%m-%d") == target_date].reset_index(drop=True)
+        
+        # Add derived features
+        df["is_rain"] = (df["precip_prob"] > 50).astype(int)
+        df["hour"] = df["time"].dt.hour
+        
+        return df
+    
+    def get_forecast_batch_df(
+        self,
+        locations: List[Dict[str, Any]],
+        days_ahead: int = 1,
+        target_date: str = None
+    ) -> pd.DataFrame:
+        """Fetch and process forecasts for many locations in one round-trip."""
+        raw_batch = self.get_forecast_batch(locations, days_ahead=days_ahead)
+        return self.process_forecast_batch_df(raw_batch, locations, target_date=target_date)
     
     def process_forecast_df(
         self, 
@@ -109,7 +437,7 @@ class WeatherService:
 
 def get_location_coords(place_id: str, api_key: str) -> Tuple[float, float]:
     """
-    Get coordinates from Google Places API.
+    Get coordinates from Google Places API (cached permanently).
     
     Args:
         place_id: Google Places place_id
@@ -118,6 +446,11 @@ def get_location_coords(place_id: str, api_key: str) -> Tuple[float, float]:
     Returns:
         Tuple of (latitude, longitude)
     """
+    cache = get_weather_cache()
+    cached = cache.get_geocode("coords", place_id)
+    if cached is not None:
+        return cached[0], cached[1]
+    
     url = f"https://maps.googleapis.com/maps/api/place/details/json"
     params = {
         "place_id": place_id,
@@ -126,12 +459,13 @@ def get_location_coords(place_id: str, api_key: str) -> Tuple[float, float]:
     }
     
     try:
-        response = requests.get(url, params=params, timeout=10)
+        response = get_session().get(url, params=params, timeout=10)
         response.raise_for_status()
         data = response.json()
         
         if data.get("status") == "OK":
             location = data["result"]["geometry"]["location"]
+            cache.put_geocode("coords", place_id, [location["lat"], location["lng"]])
             return location["lat"], location["lng"]
         else:
             raise Exception(f"Places API error: {data.get('status')}")
@@ -142,7 +476,7 @@ def get_location_coords(place_id: str, api_key: str) -> Tuple[float, float]:
 
 def search_place(query: str, api_key: str) -> str:
     """
-    Search for a place and get its place_id.
+    Search for a place and get its place_id (cached permanently).
     
     Args:
         query: Search query (name + address)
@@ -151,6 +485,11 @@ def search_place(query: str, api_key: str) -> str:
     Returns:
         place_id string
     """
+    cache = get_weather_cache()
+    cached = cache.get_geocode("place_id", query)
+    if cached is not None:
+        return cached
+    
     url = "https://maps.googleapis.com/maps/api/place/findplacefromtext/json"
     params = {
         "input": query,
@@ -160,12 +499,14 @@ def search_place(query: str, api_key: str) -> str:
     }
     
     try:
-        response = requests.get(url, params=params, timeout=10)
+        response = get_session().get(url, params=params, timeout=10)
         response.raise_for_status()
         data = response.json()
         
         if data.get("status") == "OK" and data.get("candidates"):
-            return data["candidates"][0]["place_id"]
+            place_id = data["candidates"][0]["place_id"]
+            cache.put_geocode("place_id", query, place_id)
+            return place_id
         else:
             raise Exception(f"No place found for query: {query}")
             
@@ -0,0 +1,331 @@
+"""
+Persistent hourly weather archive for forecast model training.
+
+Stores one row per (location, hour) in artifacts/weather_archive.sqlite.
+History is backfilled from the Open-Meteo archive API and appended daily,
+and forecasters read it back by time range to join real past weather.
+"""
+import os
+import sqlite3
+from datetime import datetime, timedelta, date
+from typing import Dict, Any, Optional, Union
+import pandas as pd
+import pytz
+from services.weather import get_session
+
+
+ARCHIVE_URL = "https://archive-api.open-meteo.com/v1/archive"
+FORECAST_URL = "https://api.open-meteo.com/v1/forecast"
+
+# Observed precipitation (inches/hour) that counts as a rain hour
+RAIN_THRESHOLD_IN = 0.01
+# Archive gaps up to this many hours are interpolated for model features
+MAX_GAP_HOURS = 3
+
+
+def rain_series(history: pd.DataFrame, max_gap_hours: int = MAX_GAP_HOURS) -> pd.Series:
+    """
+    Rain hours (is_rain, 0-1) indexed by hour, for model features.
+
+    Models train on is_rain, the same feature the weather forecast provides
+    at prediction time (the archive's precip_prob is only 0 or 100). Gaps
+    of up to max_gap_hours are interpolated; longer gaps stay NaN so callers
+    drop or default those hours instead of reading them as dry.
+    """
+    if history is None or history.empty:
+        return pd.Series(dtype=float)
+    rain = history.set_index("time")["is_rain"].astype(float).sort_index()
+    hourly = rain[~rain.index.duplicated()].resample("h").mean()
+    missing = hourly.isna()
+    gap_length = missing.groupby((~missing).cumsum()).transform("sum")
+    filled = hourly.interpolate(limit_area="inside")
+    return filled.where(~missing | (gap_length <= max_gap_hours))
+
+
+class WeatherArchive:
+    """Hourly weather history keyed by location and local time."""
+
+    # The archive API lags real time by a few days
+    ARCHIVE_LAG_DAYS = 5
+    # Maximum span per archive request
+    BACKFILL_CHUNK_DAYS = 366
+
+    def __init__(
+        self,
+        db_path: str = "artifacts/weather_archive.sqlite",
+        timezone: str = "America/New_York"
+    ):
+        self.db_path = db_path
+        self.timezone = timezone
+        self.session = get_session()
+
+        os.makedirs(os.path.dirname(db_path) or ".", exist_ok=True)
+        self.conn = sqlite3.connect(db_path, check_same_thread=False)
+        # Clustered on (location, time) so range reads are a single index scan
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS hourly (
+                location TEXT NOT NULL,
+                time TEXT NOT NULL,
+                temp REAL,
+                precip_prob REAL,
+                precip REAL,
+                is_rain INTEGER,
+                source TEXT NOT NULL,
+                PRIMARY KEY (location, time)
+            ) WITHOUT ROWID;
+            CREATE TABLE IF NOT EXISTS locations (
+                location TEXT PRIMARY KEY,
+                lat REAL NOT NULL,
+                lng REAL NOT NULL,
+                updated_at TEXT NOT NULL
+            );
+        """)
+        self.conn.commit()
+
+    def register_location(self, location: str, lat: float, lng: float):
+        """Record a location's coordinates (most recent becomes the default)."""
+        with self.conn:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO locations VALUES (?, ?, ?, ?)",
+                (location, lat, lng, datetime.now().isoformat())
+            )
+
+    def default_location(self) -> Optional[str]:
+        """Get the most recently registered location."""
+        row = self.conn.execute(
+            "SELECT location FROM locations ORDER BY updated_at DESC LIMIT 1"
+        ).fetchone()
+        return row[0] if row else None
+
+    def last_time(self, location: str) -> Optional[datetime]:
+        """Get the latest archived hour for a location."""
+        row = self.conn.execute(
+            "SELECT MAX(time) FROM hourly WHERE location = ?", (location,)
+        ).fetchone()
+        return datetime.fromisoformat(row[0]) if row and row[0] else None
+
+    def upsert(self, location: str, df: pd.DataFrame, source: str) -> int:
+        """
+        Insert or replace hourly rows.
+
+        Args:
+            location: Location key
+            df: DataFrame with time, temp, precip_prob, precip, is_rain
+            source: "archive" or "forecast"
+
+        Returns:
+            Number of rows written
+        """
+        if df.empty:
+            return 0
+
+        times = pd.to_datetime(df["time"]).dt.strftime("%Y-%m-%dT%H:%M")
+        rows = list(zip(
+            [location] * len(df),
+            times,
+            df["temp"].astype(float),
+            df["precip_prob"].astype(float),
+            df["precip"].astype(float),
+            df["is_rain"].astype(int),
+            [source] * len(df)
+        ))
+
+        with self.conn:
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO hourly VALUES (?, ?, ?, ?, ?, ?, ?)",
+                rows
+            )
+        return len(rows)
+
+    def read_range(
+        self,
+        start: Union[str, datetime, date],
+        end: Union[str, datetime, date],
+        location: Optional[str] = None
+    ) -> pd.DataFrame:
+        """
+        Read archived hours in [start, end].
+
+        Args:
+            start: Range start (inclusive)
+            end: Range end (inclusive)
+            location: Location key (default: most recently registered)
+
+        Returns:
+            DataFrame with columns: time, temp, precip_prob, precip, is_rain
+        """
+        location = location or self.default_location()
+        columns = ["time", "temp", "precip_prob", "precip", "is_rain"]
+        if location is None:
+            return pd.DataFrame(columns=columns)
+
+        df = pd.read_sql_query(
+            "SELECT time, temp, precip_prob, precip, is_rain FROM hourly "
+            "WHERE location = ? AND time BETWEEN ? AND ? ORDER BY time",
+            self.conn,
+            params=(location, self._to_key(start), self._to_key(end, end_of_day=True))
+        )
+        df["time"] = pd.to_datetime(df["time"])
+        return df
+
+    def backfill(
+        self,
+        location: str,
+        lat: float,
+        lng: float,
+        start_date: str,
+        end_date: Optional[str] = None
+    ) -> int:
+        """
+        Backfill observed hourly weather from the Open-Meteo archive API.
+
+        Args:
+            location: Location key
+            lat: Latitude
+            lng: Longitude
+            start_date: First day (YYYY-MM-DD)
+            end_date: Last day (default: newest day the archive has)
+
+        Returns:
+            Number of rows written
+        """
+        self.register_location(location, lat, lng)
+
+        start = date.fromisoformat(start_date)
+        end = date.fromisoformat(end_date) if end_date else self._local_now().date() - timedelta(days=self.ARCHIVE_LAG_DAYS)
+
+        written = 0
+        while start <= end:
+            chunk_end = min(end, start + timedelta(days=self.BACKFILL_CHUNK_DAYS - 1))
+            params = {
+                "latitude": lat,
+                "longitude": lng,
+                "start_date": start.isoformat(),
+                "end_date": chunk_end.isoformat(),
+                "hourly": "temperature_2m,precipitation",
+                "temperature_unit": "fahrenheit",
+                "precipitation_unit": "inch",
+                "timezone": self.timezone
+            }
+
+            try:
+                response = self.session.get(ARCHIVE_URL, params=params, timeout=60)
+                response.raise_for_status()
+                data = response.json()
+            except Exception as e:
+                raise Exception(f"Weather archive API error: {str(e)}")
+
+            written += self.upsert(location, self._observed_df(data), source="archive")
+            start = chunk_end + timedelta(days=1)
+
+        return written
+
+    def _local_now(self) -> datetime:
+        """Current wall-clock time in the archive's timezone (naive, like stored times)."""
+        return datetime.now(pytz.timezone(self.timezone)).replace(tzinfo=None)
+
+    def append_recent(self, location: str, lat: float, lng: float) -> int:
+        """
+        Append hours since the last archived hour (up to now).
+
+        Uses the forecast API's past_days, which covers the archive lag.
+
+        Returns:
+            Number of rows written
+        """
+        self.register_location(location, lat, lng)
+
+        last = self.last_time(location)
+        past_days = 92 if last is None else min(92, max(1, (self._local_now() - last).days + 1))
+
+        params = {
+            "latitude": lat,
+            "longitude": lng,
+            "hourly": "temperature_2m,precipitation_probability,precipitation",
+            "temperature_unit": "fahrenheit",
+            "precipitation_unit": "inch",
+            "timezone": self.timezone,
+            "past_days": past_days,
+            "forecast_days": 1
+        }
+
+        try:
+            response = self.session.get(FORECAST_URL, params=params, timeout=20)
+            response.raise_for_status()
+            data = response.json()
+        except Exception as e:
+            raise Exception(f"Weather API error: {str(e)}")
+
+        return self.append_from_forecast(location, data)
+
+    def append_from_forecast(self, location: str, raw_forecast: Dict[str, Any]) -> int:
+        """
+        Archive the already-elapsed hours of an Open-Meteo forecast response.
+
+        Rows that already came from the archive API are left untouched.
+
+        Returns:
+            Number of rows written
+        """
+        hourly = raw_forecast.get("hourly", {})
+        if not hourly.get("time"):
+            return 0
+
+        df = pd.DataFrame({
+            "time": pd.to_datetime(hourly["time"]),
+            "temp": hourly["temperature_2m"],
+            "precip_prob": hourly.get("precipitation_probability", [None] * len(hourly["time"])),
+            "precip": hourly["precipitation"]
+        })
+        df = df[df["time"] < pd.Timestamp(self._local_now())].dropna(subset=["temp", "precip"])
+
+        # Past hours: use what actually fell, keep forecast probability where given
+        observed = (df["precip"] >= RAIN_THRESHOLD_IN).astype(int)
+        df["precip_prob"] = df["precip_prob"].fillna(observed * 100)
+        df["is_rain"] = observed
+
+        archived = {
+            row[0] for row in self.conn.execute(
+                "SELECT time FROM hourly WHERE location = ? AND source = 'archive' AND time BETWEEN ? AND ?",
+                (location, self._to_key(df["time"].min()), self._to_key(df["time"].max()))
+            )
+        } if not df.empty else set()
+        df = df[~df["time"].dt.strftime("%Y-%m-%dT%H:%M").isin(archived)]
+
+        return self.upsert(location, df, source="forecast")
+
+    def _observed_df(self, data: Dict[str, Any]) -> pd.DataFrame:
+        """Convert an archive API response into archive rows."""
+        hourly = data.get("hourly", {})
+        df = pd.DataFrame({
+            "time": pd.to_datetime(hourly.get("time", [])),
+            "temp": hourly.get("temperature_2m", []),
+            "precip": hourly.get("precipitation", [])
+        }).dropna()
+
+        # The archive has no probabilities; observed rain maps to 100%
+        df["is_rain"] = (df["precip"] >= RAIN_THRESHOLD_IN).astype(int)
+        df["precip_prob"] = df["is_rain"] * 100.0
+        return df
+
+    @staticmethod
+    def _to_key(value: Union[str, datetime, date], end_of_day: bool = False) -> str:
+        """Normalize a range bound to the stored time format."""
+        if isinstance(value, str):
+            value = datetime.fromisoformat(value) if len(value) > 10 else date.fromisoformat(value)
+        if isinstance(value, datetime):
+            return value.strftime("%Y-%m-%dT%H:%M")
+        # Plain dates cover the whole day
+        return f"{value.isoformat()}T{'23:59' if end_of_day else '00:00'}"
+
+
+# Global weather archive instance
+_weather_archive: Optional[WeatherArchive] = None
+
+
+def get_weather_archive() -> WeatherArchive:
+    """Get or create global weather archive."""
+    global _weather_archive
+    if _weather_archive is None:
+        _weather_archive = WeatherArchive()
+    return _weather_archive
@@ -0,0 +1,96 @@
+"""
+Incremental knowledge graph rebuilds must match a full rebuild.
+"""
+import json
+import pytest
+from agents.knowledge_map_agent import KnowledgeMapAgent
+from services.graph_store import GraphStore
+
+
+ARGS = ["weather_data", "forecast_data", "staffing_data", "prep_data", "scraper_data", "compliance_data", "geo_data"]
+
+# One contribution changes per step; the rest are passed as None (not re-run)
+STEPS = [
+    {
+        "weather_data": {"success": True, "rain_hours": 0, "avg_temp": 65},
+        "forecast_data": {"success": True, "peak_hour": 18, "peak_orders": 40, "total_daily_orders": 193},
+        "staffing_data": {"success": True},
+        "prep_data": {"success": True},
+        "scraper_data": {"success": True},
+        "compliance_data": {"success": True},
+        "geo_data": {"success": True}
+    },
+    {"weather_data": {"success": True, "rain_hours": 3, "avg_temp": 80}},
+    {"forecast_data": {"success": True, "peak_hour": 12, "peak_orders": 55, "total_daily_orders": 240}},
+    {"staffing_data": {"success": True, "cooks": 3}},
+    {"prep_data": {"success": True, "wings_lbs": 20}},
+    {"forecast_data": {"success": False}},
+    {"weather_data": {"success": True, "rain_hours": 0, "avg_temp": 60}},
+    {"compliance_data": {"success": True, "checked": 5}},
+    {"forecast_data": {"success": True, "peak_hour": 19, "peak_orders": 61, "total_daily_orders": 251}}
+]
+
+
+def _graph(graph_data):
+    """Nodes and edges with their attributes, independent of insertion order."""
+    nodes = {node["id"]: json.dumps(node, sort_keys=True, default=str) for node in graph_data["nodes"]}
+    edges = {
+        (edge["source"], edge["target"]): json.dumps(edge, sort_keys=True, default=str)
+        for edge in graph_data["edges"]
+    }
+    return nodes, edges
+
+
+@pytest.fixture
+def workdir(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "artifacts").mkdir()
+    return tmp_path
+
+
+def test_incremental_rebuild_matches_full_rebuild(workdir):
+    store = GraphStore(str(workdir / "store.json"), str(workdir / "delta.json"))
+    agent = KnowledgeMapAgent("test_tenant", store=store)
+    inputs = {}
+
+    for step in STEPS:
+        inputs.update(step)
+        incremental = agent.run(**{arg: step.get(arg) for arg in ARGS})
+        assert incremental["success"], incremental.get("error")
+
+        fresh = GraphStore(str(workdir / "full.json"), str(workdir / "full_delta.json"))
+        full = KnowledgeMapAgent("test_tenant", store=fresh).run(full_rebuild=True, **inputs)
+        assert full["success"], full.get("error")
+
+        assert _graph(incremental["graph_data"]) == _graph(full["graph_data"])
+
+
+def test_unchanged_inputs_recompute_nothing(workdir):
+    store = GraphStore(str(workdir / "store.json"), str(workdir / "delta.json"))
+    agent = KnowledgeMapAgent("test_tenant", store=store)
+
+    first = agent.run(**STEPS[0])
+    again = agent.run(**STEPS[0])
+
+    assert again["changed"] == []
+    assert _graph(again["graph_data"]) == _graph(first["graph_data"])
+
+
+def test_upstream_change_recomputes_dependents(workdir):
+    store = GraphStore(str(workdir / "store.json"), str(workdir / "delta.json"))
+    agent = KnowledgeMapAgent("test_tenant", store=store)
+    agent.run(**STEPS[0])
+
+    result = agent.run(forecast_data=STEPS[2]["forecast_data"])
+
+    assert set(result["changed"]) == {"forecast", "staffing", "prep", "reviews", "compliance", "menu"}
+
+
+def test_stored_contributions_survive_a_new_agent(workdir):
+    store_file, delta_file = str(workdir / "store.json"), str(workdir / "delta.json")
+    first = KnowledgeMapAgent("test_tenant", store=GraphStore(store_file, delta_file)).run(**STEPS[0])
+
+    reloaded = KnowledgeMapAgent("test_tenant", store=GraphStore(store_file, delta_file)).run()
+
+    assert reloaded["changed"] == []
+    assert _graph(reloaded["graph_data"]) == _graph(first["graph_data"])
@@ -0,0 +1,121 @@
+"""
+Checkpointed page ingestion: capped and crashed runs resume without gaps.
+"""
+import pandas as pd
+import pytest
+from services.order_store import OrderStore
+
+
+SOURCE = "ubereats:test"
+PAGE_SIZE = 5
+
+
+def _listing(n_orders, start="2025-11-01 10:00"):
+    """Newest-first order listing, one item row per order."""
+    times = pd.date_range(start, periods=n_orders, freq="min")[::-1]
+    return pd.DataFrame({
+        "timestamp": times.strftime("%Y-%m-%d %H:%M:%S"),
+        "order_id": [f"ORD{int(t.timestamp())}" for t in times],
+        "item": "Butter Chicken Kati Roll",
+        "price": 12.5,
+        "channel": "ubereats"
+    })
+
+
+def _pages(listing):
+    """fetch_page over a listing, recording which pages were requested."""
+    requested = []
+
+    def fetch_page(page, checkpoint):
+        requested.append(page)
+        return listing.iloc[(page - 1) * PAGE_SIZE:page * PAGE_SIZE].reset_index(drop=True)
+
+    return fetch_page, requested
+
+
+@pytest.fixture
+def store(tmp_path):
+    return OrderStore(str(tmp_path / "orders.csv"), str(tmp_path / "state.json"))
+
+
+def _stored_ids(store):
+    return pd.read_csv(store.orders_file, dtype=str)["order_id"].tolist()
+
+
+def test_capped_runs_resume_until_caught_up(store):
+    listing = _listing(40)
+    fetch_page, requested = _pages(listing)
+
+    runs = []
+    for _ in range(10):
+        runs.append(store.ingest_pages(SOURCE, fetch_page, max_pages=3))
+        if runs[-1]["complete"]:
+            break
+
+    # 8 pages of orders and the empty 9th page, three per run, no page twice
+    assert [run["pages"] for run in runs] == [3, 3, 3]
+    assert requested == list(range(1, 10))
+    assert sorted(_stored_ids(store)) == sorted(listing["order_id"])
+    assert not store.get_checkpoint(SOURCE).get("resume_page")
+
+
+def test_capped_ingest_matches_uncapped(tmp_path):
+    listing = _listing(23)
+
+    capped = OrderStore(str(tmp_path / "capped.csv"), str(tmp_path / "capped.json"))
+    fetch_page, _ = _pages(listing)
+    while not capped.ingest_pages(SOURCE, fetch_page, max_pages=2)["complete"]:
+        pass
+
+    uncapped = OrderStore(str(tmp_path / "full.csv"), str(tmp_path / "full.json"))
+    fetch_page, _ = _pages(listing)
+    assert uncapped.ingest_pages(SOURCE, fetch_page)["complete"]
+
+    assert _stored_ids(capped) == _stored_ids(uncapped)
+    assert capped.get_checkpoint(SOURCE)["last_timestamp"] == uncapped.get_checkpoint(SOURCE)["last_timestamp"]
+
+
+def test_next_run_stops_at_known_orders(store):
+    old = _listing(12)
+    fetch_page, _ = _pages(old)
+    assert store.ingest_pages(SOURCE, fetch_page)["complete"]
+
+    # Seven new orders on top of the old listing
+    new = pd.concat([_listing(7, start="2025-11-01 11:00"), old], ignore_index=True)
+    fetch_page, requested = _pages(new)
+    result = store.ingest_pages(SOURCE, fetch_page)
+
+    assert result["reached_known"]
+    assert requested == [1, 2]
+    assert result["rows_written"] == 7
+    assert len(_stored_ids(store)) == 19
+
+
+def test_crash_mid_run_resumes_after_last_stored_page(store):
+    listing = _listing(20)
+    fetch_page, requested = _pages(listing)
+
+    def crashing(page, checkpoint):
+        if page == 3:
+            raise ConnectionError("listing went away")
+        return fetch_page(page, checkpoint)
+
+    with pytest.raises(ConnectionError):
+        store.ingest_pages(SOURCE, crashing)
+    assert store.get_checkpoint(SOURCE)["resume_page"] == 3
+
+    requested.clear()
+    assert store.ingest_pages(SOURCE, fetch_page)["complete"]
+    assert requested == [3, 4, 5]
+    assert sorted(_stored_ids(store)) == sorted(listing["order_id"])
+
+
+def test_known_ids_follow_writes_from_another_process(store):
+    fetch_page, _ = _pages(_listing(5))
+    store.ingest_pages(SOURCE, fetch_page)
+    assert len(store.known_order_ids()) == 5
+
+    other = OrderStore(store.orders_file, store.checkpoint_file)
+    other.append_orders(_listing(3, start="2025-11-02 09:00"))
+
+    assert len(store.known_order_ids()) == 8
@@ -0,0 +1,110 @@
+"""
+Scheduler catch-up and upstream ordering.
+"""
+from datetime import datetime, timedelta
+import pytest
+import services.scheduler as scheduler_module
+from services.scheduler import Scheduler, ScheduleStore, CATCHUP_WINDOW
+
+
+@pytest.fixture
+def calls(monkeypatch):
+    """Runner calls in order; every runner returns a new result per call."""
+    calls = []
+
+    def get_agent(runner):
+        def run(**kwargs):
+            calls.append(runner)
+            return {"success": True, "artifacts": [], "call": len(calls)}
+        return run
+
+    monkeypatch.setattr(scheduler_module, "get_agent", get_agent)
+    return calls
+
+
+def _scheduler(tmp_path, schedule, db="schedule.sqlite"):
+    store = ScheduleStore(str(tmp_path / db))
+    return Scheduler(schedule, store, versions_dir=str(tmp_path / "versions"))
+
+
+def _tick(scheduler, now):
+    started = scheduler.tick(now)
+    scheduler.wait()
+    return started
+
+
+HOURLY = {"sync": {"runner": "run_sync", "cron": "0 * * * *", "external": True}}
+
+
+def test_missed_slots_run_once_with_the_latest(tmp_path, calls):
+    scheduler = _scheduler(tmp_path, HOURLY)
+    _tick(scheduler, datetime(2025, 11, 3, 10, 0))
+
+    assert scheduler.due(datetime(2025, 11, 3, 15, 30)) == [("sync", datetime(2025, 11, 3, 15, 0), 5)]
+    assert _tick(scheduler, datetime(2025, 11, 3, 15, 30)) == ["sync"]
+    assert calls == ["run_sync", "run_sync"]
+    assert scheduler.due(datetime(2025, 11, 3, 15, 30)) == []
+    assert scheduler.store.state("sync")["last_slot"] == datetime(2025, 11, 3, 15, 0).isoformat()
+
+
+def test_late_tick_ends_in_the_same_state_as_hourly_ticks(tmp_path, calls):
+    start = datetime(2025, 11, 3, 8, 0)
+
+    hourly = _scheduler(tmp_path, HOURLY, "hourly.sqlite")
+    for hour in range(9):
+        _tick(hourly, start + timedelta(hours=hour, minutes=5))
+
+    late = _scheduler(tmp_path, HOURLY, "late.sqlite")
+    _tick(late, start + timedelta(minutes=5))
+    _tick(late, start + timedelta(hours=8, minutes=5))
+
+    assert late.store.state("sync")["last_slot"] == hourly.store.state("sync")["last_slot"]
+    assert late.due(start + timedelta(hours=8, minutes=5)) == hourly.due(start + timedelta(hours=8, minutes=5)) == []
+    assert len(calls) == 9 + 2
+
+
+def test_catch_up_is_limited_to_the_window(tmp_path, calls):
+    scheduler = _scheduler(tmp_path, HOURLY)
+    _tick(scheduler, datetime(2025, 11, 1, 10, 0))
+
+    now = datetime(2025, 11, 4, 10, 30)
+    (name, slot, missed), = scheduler.due(now)
+    assert slot == datetime(2025, 11, 4, 10, 0)
+    assert missed == CATCHUP_WINDOW // timedelta(hours=1)
+
+
+def test_never_run_entry_is_due_once(tmp_path, calls):
+    scheduler = _scheduler(tmp_path, HOURLY)
+    assert scheduler.due(datetime(2025, 11, 3, 15, 30)) == [("sync", datetime(2025, 11, 3, 15, 0), 1)]
+
+
+def test_downstream_waits_for_upstream_in_the_same_slot(tmp_path, calls):
+    schedule = {
+        "forecast": {"runner": "run_forecast", "cron": "0 5 * * *", "after": ["weather"], "external": True},
+        "weather": {"runner": "run_weather", "cron": "0 5 * * *", "external": True}
+    }
+    scheduler = _scheduler(tmp_path, schedule)
+    now = datetime(2025, 11, 3, 5, 0)
+
+    assert _tick(scheduler, now) == ["weather"]
+    assert _tick(scheduler, now) == ["forecast"]
+    assert _tick(scheduler, now) == []
+    assert calls == ["run_weather", "run_forecast"]
+
+
+def test_downstream_waits_while_upstream_is_leased_elsewhere(tmp_path, calls):
+    schedule = {
+        "weather": {"runner": "run_weather", "cron": "0 5 * * *", "external": True},
+        "forecast": {"runner": "run_forecast", "cron": "0 5 * * *", "after": ["weather"], "external": True}
+    }
+    scheduler = _scheduler(tmp_path, schedule)
+    now = datetime(2025, 11, 3, 5, 0)
+    _tick(scheduler, now)
+    _tick(scheduler, now)
+
+    # Another process holds weather's lease for the next slot
+    assert scheduler.store.acquire("weather", "other-host")
+    assert _tick(scheduler, now + timedelta(days=1)) == []
+
+    scheduler.store.release("weather", "other-host", "ran", slot=now + timedelta(days=1))
+    assert _tick(scheduler, now + timedelta(days=1)) == ["forecast"]